@@ -4,34 +4,52 @@ Proyecto: Sistema de gestión de clientes
 Empresa: SolutionTech
 
 Este paquete contiene las clases principales del sistema GIC.
-"""
 
-from .cliente import Cliente
-from .cliente_regular import ClienteRegular
-from .cliente_premium import ClientePremium
-from .cliente_corporativo import ClienteCorporativo
-from .gestor_clientes import GestorClientes
-from .excepciones import (
-    ValidacionError,
-    ClienteNoEncontradoError,
-    ClienteDuplicadoError,
-    PersistenciaError
-)
-from .validaciones import (
-    validar_nombre,
-    validar_email,
-    validar_telefono,
-    validar_direccion,
-    validar_descuento,
-    validar_puntos,
-    validar_monto
-)
-from .logs import SistemaLogs
-from .persistencia import PersistenciaJSON
+Los submódulos se importan recién cuando se usa un nombre del paquete:
+"import src" no carga nada y "from src import ClienteRegular" carga
+solo lo que ClienteRegular necesita (no logging ni json, por ejemplo).
+"""
 
 __version__ = "1.0.0"
 __author__ = "SolutionTech"
 
+# Cada nombre público y el submódulo que lo define
+_ORIGENES = {
+    'Cliente': 'cliente',
+    'ClienteRegular': 'cliente_regular',
+    'ClientePremium': 'cliente_premium',
+    'ClienteCorporativo': 'cliente_corporativo',
+    'GestorClientes': 'gestor_clientes',
+    'ValidacionError': 'excepciones',
+    'ClienteNoEncontradoError': 'excepciones',
+    'ClienteDuplicadoError': 'excepciones',
+    'PersistenciaError': 'excepciones',
+    'validar_nombre': 'validaciones',
+    'validar_email': 'validaciones',
+    'validar_telefono': 'validaciones',
+    'normalizar_telefono': 'validaciones',
+    'validar_rut': 'validaciones',
+    'normalizar_rut': 'validaciones',
+    'validar_direccion': 'validaciones',
+    'validar_descuento': 'validaciones',
+    'validar_puntos': 'validaciones',
+    'validar_monto': 'validaciones',
+    'validar_lote': 'validaciones',
+    'SistemaLogs': 'logs',
+    'PersistenciaJSON': 'persistencia',
+    'PersistenciaCSV': 'persistencia_csv',
+    'LibroPuntos': 'libro_puntos',
+    'MotorNiveles': 'niveles',
+    'DetectorDuplicados': 'duplicados',
+    'FiltroBloom': 'filtro_bloom',
+    'RegistroAuditoria': 'auditoria',
+    'Metricas': 'metricas',
+    'exportar_prometheus': 'metricas',
+    'GeneradorClientes': 'generador',
+    'PerfilMemoria': 'memoria',
+    'tamano_profundo': 'memoria',
+}
+
 __all__ = [
     'Cliente',
     'ClienteRegular',
@@ -45,10 +63,42 @@ __all__ = [
     'validar_nombre',
     'validar_email',
     'validar_telefono',
+    'normalizar_telefono',
+    'validar_rut',
+    'normalizar_rut',
     'validar_direccion',
     'validar_descuento',
     'validar_puntos',
     'validar_monto',
+    'validar_lote',
     'SistemaLogs',
     'PersistenciaJSON',
+    'PersistenciaCSV',
+    'LibroPuntos',
+    'MotorNiveles',
+    'DetectorDuplicados',
+    'FiltroBloom',
+    'RegistroAuditoria',
+    'Metricas',
+    'exportar_prometheus',
+    'GeneradorClientes',
+    'PerfilMemoria',
+    'tamano_profundo',
 ]
+
+
+def __getattr__(nombre):
+    """Importa el submódulo de un nombre público la primera vez que se usa."""
+    modulo = _ORIGENES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    # Importación relativa (nivel 1) con la función de import de Python:
+    # equivale a "from .modulo import nombre" y aparece en -X importtime
+    valor = getattr(__import__(modulo, globals(), None, [nombre], 1), nombre)
+    # Lo guardamos en el paquete: las siguientes veces no pasa por aquí
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
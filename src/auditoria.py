@@ -0,0 +1,278 @@
+"""
+Auditoría - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo guarda un registro de auditoría: una línea JSON por cada
+operación sobre un cliente (qué operación, cuándo, qué campos cambiaron
+y de qué valor a qué valor).
+
+Junto al registro se mantiene un índice ("<archivo>.idx") con la
+posición en el archivo de cada registro de cada email. Así, para
+responder "todo lo que se hizo con este cliente" se va directo a sus
+registros en vez de leer el archivo completo.
+"""
+
+# Importamos los módulos necesarios
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+
+# Importamos las excepciones
+from .excepciones import ValidacionError, PersistenciaError
+
+
+# Un solo codificador para todos los registros (json.dumps con opciones crea uno por llamada)
+_CODIFICADOR = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+class RegistroAuditoria:
+    """
+    Registro de auditoría en formato JSON Lines con índice por email.
+
+    Cada registro tiene la forma:
+        {"fecha": "2024-05-10T14:03:22.125", "operacion": "Actualizar",
+         "email": "ana@email.com", "campos": {"telefono": ["+56911111111", "+56922222222"]},
+         "detalles": "..."}
+    ('campos' y 'detalles' solo aparecen si se indican).
+
+    Un registro que cambia el email de un cliente queda en el historial
+    del email anterior y del nuevo.
+
+    Ejemplo:
+        auditoria = RegistroAuditoria("gic_auditoria.jsonl")
+        auditoria.registrar("Eliminar", "ana@email.com")
+        for registro in auditoria.historial("ana@email.com", desde=date(2024, 1, 1)):
+            print(registro['fecha'], registro['operacion'])
+    """
+
+    def __init__(self, nombre_archivo="gic_auditoria.jsonl"):
+        """
+        Abre (o crea) el registro y carga su índice. Si el índice falta o
+        quedó atrasado (por ejemplo, tras una caída), se completa leyendo
+        solo la parte del registro que no estaba indexada.
+
+        Lanza:
+            PersistenciaError: Si no se puede abrir el registro o su índice
+        """
+        self.nombre_archivo = nombre_archivo
+        self.nombre_indice = nombre_archivo + ".idx"
+        self._candado = threading.Lock()
+        # email -> [(segundos, posición en el archivo)], en orden de llegada
+        self._indice = {}
+
+        try:
+            self._archivo = open(nombre_archivo, 'ab')
+            self._tamano = self._archivo.seek(0, os.SEEK_END)
+            self._cargar_indice()
+            self._archivo_indice = open(self.nombre_indice, 'a', encoding='utf-8')
+            self._ponerse_al_dia()
+        except OSError as e:
+            raise PersistenciaError(f"Error al abrir el registro de auditoría: {str(e)}")
+
+    # ========== REGISTRAR ==========
+
+    def registrar(self, operacion, email, campos=None, detalles=None):
+        """
+        Agrega un registro de auditoría.
+
+        Parámetros:
+            operacion (str): Nombre de la operación ("Agregar", "Actualizar", ...)
+            email (str): Email del cliente
+            campos (dict): Campos cambiados {campo: [anterior, nuevo]} (opcional)
+            detalles (str): Texto libre (opcional)
+        """
+        self.registrar_varios(operacion, [(email, campos)], detalles)
+
+    def registrar_varios(self, operacion, registros, detalles=None):
+        """
+        Agrega un registro por cliente de una operación múltiple, con una
+        sola escritura.
+
+        Parámetros:
+            operacion (str): Nombre de la operación
+            registros: Iterable de tuplas (email, campos)
+            detalles (str): Texto libre común a todos (opcional)
+
+        Lanza:
+            PersistenciaError: Si no se puede escribir el registro
+        """
+        with self._candado:
+            segundos = time.time()
+            fecha = datetime.fromtimestamp(segundos).isoformat(timespec='milliseconds')
+            texto_segundos = repr(segundos)
+            codificar = _CODIFICADOR.encode
+            lineas = []
+            lineas_indice = []
+            entradas = []
+            posicion = self._tamano
+            for email, campos in registros:
+                registro = {'fecha': fecha, 'operacion': operacion, 'email': email}
+                if campos:
+                    registro['campos'] = campos
+                if detalles:
+                    registro['detalles'] = detalles
+                linea = (codificar(registro) + "\n").encode('utf-8')
+                lineas.append(linea)
+                for clave in _claves(email, campos):
+                    entradas.append((clave, posicion))
+                    lineas_indice.append(f"{posicion}\t{texto_segundos}\t{clave}\n")
+                posicion += len(linea)
+            if not lineas:
+                return
+
+            try:
+                # Primero el registro y después el índice: si el proceso se
+                # corta entre ambos, al abrir se reindexa lo que faltó
+                self._archivo.write(b"".join(lineas))
+                self._archivo.flush()
+                self._archivo_indice.write("".join(lineas_indice))
+                self._archivo_indice.flush()
+            except OSError as e:
+                raise PersistenciaError(f"Error al escribir el registro de auditoría: {str(e)}")
+            self._tamano = posicion
+            for clave, posicion in entradas:
+                self._agregar_al_indice(clave, segundos, posicion)
+
+    # ========== CONSULTAR ==========
+
+    def historial(self, email, desde=None, hasta=None):
+        """
+        Retorna los registros de un cliente, del más antiguo al más reciente.
+
+        Solo se leen del archivo los registros del cliente dentro del
+        rango de fechas (el índice guarda la fecha de cada uno).
+
+        Parámetros:
+            email (str): Email del cliente
+            desde, hasta: Límites (incluidos) como datetime, date, texto ISO
+                          ("2024-05-10" o "2024-05-10T14:00") o segundos;
+                          una fecha sin hora en 'hasta' incluye todo ese día
+
+        Retorna:
+            list: Diccionarios con los registros
+
+        Lanza:
+            ValidacionError: Si una fecha no es válida
+        """
+        inicio = _a_segundos(desde) if desde is not None else float('-inf')
+        fin = _a_segundos(hasta, fin_del_dia=True) if hasta is not None else float('inf')
+
+        with self._candado:
+            entradas = self._indice.get(email.lower().strip(), [])
+            primera = bisect.bisect_left(entradas, (inicio,))
+            ultima = bisect.bisect_right(entradas, (fin, float('inf')))
+            posiciones = [posicion for _, posicion in entradas[primera:ultima]]
+
+        registros = []
+        try:
+            with open(self.nombre_archivo, 'rb') as archivo:
+                for posicion in posiciones:
+                    archivo.seek(posicion)
+                    registros.append(json.loads(archivo.readline()))
+        except (OSError, ValueError) as e:
+            raise PersistenciaError(f"Error al leer el registro de auditoría: {str(e)}")
+        return registros
+
+    def __len__(self):
+        """Cantidad de emails con registros."""
+        return len(self._indice)
+
+    def cerrar(self):
+        """Cierra el registro y su índice."""
+        with self._candado:
+            self._archivo.close()
+            self._archivo_indice.close()
+
+    # ========== MÉTODOS PRIVADOS (HELPER) ==========
+
+    def _agregar_al_indice(self, clave, segundos, posicion):
+        entradas = self._indice.get(clave)
+        if entradas is None:
+            self._indice[clave] = entradas = []
+        entradas.append((segundos, posicion))
+
+    def _cargar_indice(self):
+        """Lee el índice guardado, ignorando lo que apunte más allá del registro."""
+        self._indexado_hasta = 0
+        if not os.path.exists(self.nombre_indice):
+            return
+        ultima = -1
+        with open(self.nombre_indice, 'r', encoding='utf-8') as archivo:
+            for linea in archivo:
+                partes = linea.rstrip("\n").split("\t", 2)
+                if len(partes) != 3 or not linea.endswith("\n"):
+                    continue
+                try:
+                    posicion, segundos = int(partes[0]), float(partes[1])
+                except ValueError:
+                    continue
+                if posicion >= self._tamano:
+                    continue
+                self._agregar_al_indice(partes[2], segundos, posicion)
+                ultima = max(ultima, posicion)
+        if ultima >= 0:
+            # El índice cubre hasta el final del último registro indexado
+            with open(self.nombre_archivo, 'rb') as archivo:
+                archivo.seek(ultima)
+                self._indexado_hasta = ultima + len(archivo.readline())
+
+    def _ponerse_al_dia(self):
+        """
+        Indexa los registros escritos después del último indexado y quita
+        una última línea incompleta (escrita a medias antes de una caída).
+        """
+        if self._indexado_hasta >= self._tamano:
+            return
+        entradas = []
+        with open(self.nombre_archivo, 'rb') as archivo:
+            archivo.seek(self._indexado_hasta)
+            posicion = self._indexado_hasta
+            for linea in archivo:
+                if not linea.endswith(b"\n"):
+                    break
+                try:
+                    registro = json.loads(linea)
+                    segundos = datetime.fromisoformat(registro['fecha']).timestamp()
+                    claves = _claves(registro['email'], registro.get('campos'))
+                except (ValueError, KeyError, TypeError):
+                    claves = []
+                entradas.extend((clave, segundos, posicion) for clave in claves)
+                posicion += len(linea)
+        if posicion < self._tamano:
+            self._archivo.truncate(posicion)
+            self._tamano = posicion
+        self._archivo_indice.write("".join(f"{p}\t{s!r}\t{c}\n" for c, s, p in entradas))
+        self._archivo_indice.flush()
+        for clave, segundos, posicion in entradas:
+            self._agregar_al_indice(clave, segundos, posicion)
+
+
+def _claves(email, campos):
+    """Emails bajo los que se indexa un registro (también el anterior, si cambió el email)."""
+    claves = [email.lower()]
+    if campos and 'email' in campos:
+        anterior = campos['email'][0].lower()
+        if anterior != claves[0]:
+            claves.append(anterior)
+    return claves
+
+
+def _a_segundos(valor, fin_del_dia=False):
+    """Convierte datetime, date, texto ISO o número a segundos desde 1970."""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        try:
+            valor = datetime.fromisoformat(valor) if 'T' in valor or ' ' in valor else date.fromisoformat(valor)
+        except ValueError:
+            raise ValidacionError(f"Fecha no válida: {valor}")
+    if isinstance(valor, datetime):
+        return valor.timestamp()
+    if isinstance(valor, date):
+        inicio = datetime(valor.year, valor.month, valor.day).timestamp()
+        return inicio + 86400 - 0.001 if fin_del_dia else inicio
+    raise ValidacionError(f"Fecha no válida: {valor}")
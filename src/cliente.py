@@ -1,13 +1,20 @@
 # Clase base Cliente - Proyecto GIC Módulo 4
 
-from .validaciones import validar_nombre, validar_email, validar_telefono, validar_direccion
+from .validaciones import validar_nombre, validar_email, normalizar_telefono, validar_direccion
 from .excepciones import ValidacionError
 
 
 class Cliente:
     """Clase base que representa un cliente del sistema."""
 
+    # Tipo que informa obtener_resumen(); el cliente base cuenta como Regular
+    TIPO_CLIENTE = 'Regular'
+
     def __init__(self, nombre, email, telefono, direccion):
+        # Funciones que se llaman cuando cambia un dato (ej. índices del gestor).
+        # Es una tupla: no se crea una lista por cliente y se puede recorrer
+        # aunque un observador se quite durante la notificación.
+        self._observadores = ()
         self.set_nombre(nombre)
         self.set_email(email)
         self.set_telefono(telefono)
@@ -33,16 +40,35 @@ class Cliente:
 
     def set_email(self, email):
         validar_email(email)
+        anterior = getattr(self, '_email', None)
         self._email = email.lower().strip()
+        if self._observadores:
+            self._notificar('email', anterior, self._email)
 
     def set_telefono(self, telefono):
-        validar_telefono(telefono)
-        self._telefono = telefono.strip()
+        # Se guarda en formato E.164 para que '+56 9 1234 5678' y
+        # '912345678' sean el mismo teléfono
+        anterior = getattr(self, '_telefono', None)
+        self._telefono = normalizar_telefono(telefono)
+        if self._observadores:
+            self._notificar('telefono', anterior, self._telefono)
 
     def set_direccion(self, direccion):
         validar_direccion(direccion)
         self._direccion = direccion.strip()
 
+    # Observadores
+    def agregar_observador(self, observador):
+        """Registra una función observador(cliente, campo, anterior, nuevo)."""
+        self._observadores += (observador,)
+
+    def quitar_observador(self, observador):
+        self._observadores = tuple(obs for obs in self._observadores if obs != observador)
+
+    def _notificar(self, campo, anterior, nuevo):
+        for observador in self._observadores:
+            observador(self, campo, anterior, nuevo)
+
     def mostrar_informacion(self):
         print("--- Información del cliente ---")
         print(f"Nombre:    {self._nombre}")
@@ -1,23 +1,43 @@
 # ClienteCorporativo hereda de Cliente
 
+import itertools
+import threading
+import time
+
 from .cliente import Cliente
-from .validaciones import validar_monto
+from .validaciones import validar_monto, normalizar_rut
 from .excepciones import ValidacionError
 
+# Números de reserva únicos entre todos los clientes (next() es atómico)
+_numeros_reserva = itertools.count(1)
+
 
 class ClienteCorporativo(Cliente):
     """Subclase de Cliente para empresas con crédito corporativo y descuento fijo."""
 
+    TIPO_CLIENTE = 'Corporativo'
+
     def __init__(self, nombre, email, telefono, direccion,
-                 nombre_empresa, rut_empresa, contacto_principal, limite_credito=100000.0):
+                 nombre_empresa, rut_empresa, contacto_principal, limite_credito=100000.0,
+                 credito_utilizado=0.0, verificar_rut=True):
         # Llamamos al constructor de la clase padre
         super().__init__(nombre, email, telefono, direccion)
 
-        self._nombre_empresa = nombre_empresa
-        self._rut_empresa = rut_empresa
+        # Candado propio: los cambios de crédito de este cliente no
+        # esperan a los de otros clientes
+        self._candado = threading.Lock()
+        self._reservas = {}   # número -> (monto, vence)
+        self._credito_reservado = 0.0
+
+        self.set_nombre_empresa(nombre_empresa)
+        # verificar_rut=False solo al cargar datos guardados (ver set_rut_empresa)
+        self.set_rut_empresa(rut_empresa, verificar_rut)
         self._contacto_principal = contacto_principal
         self.set_limite_credito(limite_credito)
-        self._credito_utilizado = 0.0
+        # Distinto de 0 al cargar un cliente guardado
+        if not isinstance(credito_utilizado, (int, float)) or credito_utilizado < 0:
+            raise ValidacionError("El crédito utilizado debe ser un número mayor o igual a 0")
+        self._credito_utilizado = credito_utilizado
 
     def get_nombre_empresa(self):
         return self._nombre_empresa
@@ -37,33 +57,137 @@ class ClienteCorporativo(Cliente):
     def get_credito_disponible(self):
         return self._limite_credito - self._credito_utilizado
 
+    def get_credito_reservado(self):
+        return self._credito_reservado
+
+    def get_credito_libre(self):
+        """Crédito disponible que no está apartado por reservas vigentes."""
+        return self._limite_credito - self._credito_utilizado - self._credito_reservado
+
     def verificar_credito_disponible(self, monto):
-        """Verifica si hay suficiente crédito disponible para el monto solicitado."""
+        """Verifica si hay suficiente crédito libre (sin contar reservas) para el monto solicitado."""
         validar_monto(monto)
-        return self.get_credito_disponible() >= monto
+        with self._candado:
+            self._expirar_reservas()
+            return self.get_credito_libre() >= monto
+
+    def set_nombre_empresa(self, nombre_empresa):
+        if not nombre_empresa or not isinstance(nombre_empresa, str) or not nombre_empresa.strip():
+            raise ValidacionError("El nombre de la empresa no puede estar vacío")
+        anterior = getattr(self, '_nombre_empresa', None)
+        self._nombre_empresa = nombre_empresa.strip()
+        if self._observadores:
+            self._notificar('nombre_empresa', anterior, self._nombre_empresa)
+
+    def set_rut_empresa(self, rut_empresa, verificar_digito=True):
+        # Se guarda normalizado (sin puntos, con guion). Las cargas desde
+        # archivo pasan verificar_digito=False: los datos antiguos tienen RUT
+        # con dígito incorrecto y rechazarlos haría perder esos clientes
+        anterior = getattr(self, '_rut_empresa', None)
+        self._rut_empresa = normalizar_rut(rut_empresa, verificar_digito)
+        if self._observadores:
+            self._notificar('rut_empresa', anterior, self._rut_empresa)
 
     def set_limite_credito(self, limite):
         validar_monto(limite)
-        self._limite_credito = limite
+        with self._candado:
+            anterior = getattr(self, '_limite_credito', None)
+            self._limite_credito = limite
+            if self._observadores:
+                self._notificar('limite_credito', anterior, limite)
 
     def utilizar_credito(self, monto):
         validar_monto(monto)
-        disponible = self.get_credito_disponible()
-        if monto <= disponible:
-            self._credito_utilizado += monto
+        # Revisar y descontar en un solo paso: dos compras simultáneas no
+        # pueden pasar ambas la revisión y exceder el límite
+        with self._candado:
+            self._expirar_reservas()
+            disponible = self.get_credito_libre()
+            exito = monto <= disponible
+            if exito:
+                self._sumar_utilizado(monto)
+        if exito:
             print(f"Crédito utilizado: ${monto}. Disponible: ${self.get_credito_disponible()}")
             return True
-        else:
-            print(f"Sin crédito suficiente. Disponible: ${disponible}, Solicitado: ${monto}")
-            return False
+        print(f"Sin crédito suficiente. Disponible: ${disponible}, Solicitado: ${monto}")
+        return False
 
     def pagar_credito(self, monto):
         validar_monto(monto)
-        if monto > self._credito_utilizado:
-            monto = self._credito_utilizado
-        self._credito_utilizado -= monto
+        with self._candado:
+            if monto > self._credito_utilizado:
+                monto = self._credito_utilizado
+            self._sumar_utilizado(-monto)
         print(f"Pago registrado: ${monto}. Deuda restante: ${self._credito_utilizado}")
 
+    # ========== RESERVAS DE CRÉDITO ==========
+    # Una compra aparta el crédito con reservar_credito y luego lo confirma
+    # (pasa a utilizado) o lo libera. Si no se confirma a tiempo, la reserva
+    # vence sola. No imprimen nada porque se usan en el flujo de pago.
+
+    def reservar_credito(self, monto, duracion=300.0):
+        """Aparta crédito por 'duracion' segundos. Retorna el número de reserva, o None si no alcanza."""
+        validar_monto(monto)
+        if monto <= 0:
+            raise ValidacionError("El monto a reservar debe ser mayor que 0")
+        with self._candado:
+            self._expirar_reservas()
+            if monto > self.get_credito_libre():
+                return None
+            numero = next(_numeros_reserva)
+            self._reservas[numero] = (monto, time.monotonic() + duracion)
+            self._credito_reservado += monto
+            return numero
+
+    def confirmar_reserva(self, numero):
+        """Pasa el monto reservado a crédito utilizado. Retorna False si la reserva no existe o venció."""
+        with self._candado:
+            self._expirar_reservas()
+            reserva = self._reservas.pop(numero, None)
+            if reserva is None:
+                return False
+            self._quitar_reservado(reserva[0])
+            self._sumar_utilizado(reserva[0])
+            return True
+
+    def liberar_reserva(self, numero):
+        """Devuelve el crédito reservado. Retorna False si la reserva no existe o ya venció."""
+        with self._candado:
+            reserva = self._reservas.pop(numero, None)
+            if reserva is None:
+                return False
+            self._quitar_reservado(reserva[0])
+            return True
+
+    def reservas_vigentes(self):
+        """Retorna {número: monto} de las reservas que no han vencido."""
+        with self._candado:
+            self._expirar_reservas()
+            return {numero: monto for numero, (monto, _) in self._reservas.items()}
+
+    def _expirar_reservas(self):
+        # Se llama con el candado tomado
+        if not self._reservas:
+            return
+        ahora = time.monotonic()
+        for numero, (monto, vence) in list(self._reservas.items()):
+            if vence <= ahora:
+                del self._reservas[numero]
+                self._quitar_reservado(monto)
+
+    def _quitar_reservado(self, monto):
+        self._credito_reservado -= monto
+        if not self._reservas:
+            # Sin reservas el total debe ser exactamente 0 (evita restos de redondeo)
+            self._credito_reservado = 0.0
+
+    def _sumar_utilizado(self, monto):
+        # Se llama con el candado tomado
+        anterior = self._credito_utilizado
+        self._credito_utilizado += monto
+        if self._observadores:
+            self._notificar('credito_utilizado', anterior, self._credito_utilizado)
+
     # Método polimórfico: descuento fijo del 15% para empresas
     def calcular_descuento(self, monto):
         return monto * 0.15
@@ -1,6 +1,9 @@
 # ClientePremium hereda de Cliente
 
+import threading
+
 from .cliente import Cliente
+from datetime import date
 from .validaciones import validar_descuento, validar_puntos
 from .excepciones import ValidacionError
 
@@ -8,13 +11,24 @@ from .excepciones import ValidacionError
 class ClientePremium(Cliente):
     """Subclase de Cliente con sistema de puntos y descuentos por membresía."""
 
-    def __init__(self, nombre, email, telefono, direccion, nivel_membresia="Bronce", descuento=10.0):
+    TIPO_CLIENTE = 'Premium'
+
+    def __init__(self, nombre, email, telefono, direccion, nivel_membresia="Bronce", descuento=10.0, fecha_registro=None):
         # Llamamos al constructor de la clase padre
         super().__init__(nombre, email, telefono, direccion)
 
+        # Candado propio para los puntos: agregar o canjear desde varios
+        # hilos (o mientras LibroPuntos consolida) no pierde movimientos
+        self._candado = threading.Lock()
+
         self.set_nivel_membresia(nivel_membresia)
         self.set_descuento(descuento)
         self._puntos_acumulados = 0
+        # La fecha de registro da la antigüedad que usan las reglas de nivel
+        if fecha_registro is None:
+            self._fecha_registro = date.today()
+        else:
+            self._fecha_registro = fecha_registro
 
     def get_nivel_membresia(self):
         return self._nivel_membresia
@@ -25,30 +39,63 @@ class ClientePremium(Cliente):
     def get_puntos_acumulados(self):
         return self._puntos_acumulados
 
+    def get_fecha_registro(self):
+        return self._fecha_registro
+
     def set_nivel_membresia(self, nivel):
         niveles_validos = ["Bronce", "Plata", "Oro"]
         if nivel not in niveles_validos:
             raise ValidacionError(f"El nivel debe ser uno de: {niveles_validos}")
+        anterior = getattr(self, '_nivel_membresia', None)
         self._nivel_membresia = nivel
+        if self._observadores:
+            self._notificar('nivel_membresia', anterior, nivel)
 
     def set_descuento(self, descuento):
         validar_descuento(descuento)
+        anterior = getattr(self, '_descuento', None)
         self._descuento = descuento
+        if self._observadores:
+            self._notificar('descuento', anterior, descuento)
+
+    def set_fecha_registro(self, fecha):
+        anterior = self._fecha_registro
+        self._fecha_registro = fecha
+        if self._observadores:
+            self._notificar('fecha_registro', anterior, fecha)
+
+    def set_puntos_acumulados(self, puntos):
+        validar_puntos(puntos)
+        with self._candado:
+            self._asignar_puntos(puntos)
 
     def agregar_puntos(self, puntos):
         validar_puntos(puntos)
-        self._puntos_acumulados += puntos
-        print(f"Puntos agregados: {puntos}. Total: {self._puntos_acumulados}")
+        # Leer y sumar en un solo paso: dos hilos no pueden pisarse la suma
+        with self._candado:
+            total = self._puntos_acumulados + puntos
+            self._asignar_puntos(total)
+        print(f"Puntos agregados: {puntos}. Total: {total}")
 
     def canjear_puntos(self, puntos):
         validar_puntos(puntos)
-        if self._puntos_acumulados >= puntos:
-            self._puntos_acumulados -= puntos
-            print(f"Puntos canjeados: {puntos}. Quedan: {self._puntos_acumulados}")
+        with self._candado:
+            disponibles = self._puntos_acumulados
+            exito = disponibles >= puntos
+            if exito:
+                self._asignar_puntos(disponibles - puntos)
+        if exito:
+            print(f"Puntos canjeados: {puntos}. Quedan: {disponibles - puntos}")
             return True
-        else:
-            print(f"No tiene suficientes puntos. Tiene {self._puntos_acumulados}")
-            return False
+        print(f"No tiene suficientes puntos. Tiene {disponibles}")
+        return False
+
+    def _asignar_puntos(self, puntos):
+        # Se llama con el candado tomado
+        anterior = self._puntos_acumulados
+        self._puntos_acumulados = puntos
+        if self._observadores:
+            self._notificar('puntos_acumulados', anterior, puntos)
 
     # Método polimórfico: sobrescribe calcular_descuento de la clase padre
     def calcular_descuento(self, monto):
@@ -63,6 +110,7 @@ class ClientePremium(Cliente):
         print(f"Nivel:     {self._nivel_membresia}")
         print(f"Descuento: {self._descuento}%")
         print(f"Puntos:    {self._puntos_acumulados}")
+        print(f"Registro:  {self._fecha_registro}")
 
     def obtener_resumen(self):
         resumen = super().obtener_resumen()
@@ -70,6 +118,7 @@ class ClientePremium(Cliente):
         resumen['nivel_membresia'] = self._nivel_membresia
         resumen['descuento'] = self._descuento
         resumen['puntos_acumulados'] = self._puntos_acumulados
+        resumen['fecha_registro'] = str(self._fecha_registro)
         return resumen
 
     def __str__(self):
@@ -7,6 +7,8 @@ from datetime import date
 class ClienteRegular(Cliente):
     """Subclase de Cliente para clientes regulares, sin beneficios especiales."""
 
+    TIPO_CLIENTE = 'Regular'
+
     def __init__(self, nombre, email, telefono, direccion, fecha_registro=None):
         # Llamamos al constructor de la clase padre con super()
         super().__init__(nombre, email, telefono, direccion)
@@ -19,6 +21,12 @@ class ClienteRegular(Cliente):
     def get_fecha_registro(self):
         return self._fecha_registro
 
+    def set_fecha_registro(self, fecha):
+        anterior = self._fecha_registro
+        self._fecha_registro = fecha
+        if self._observadores:
+            self._notificar('fecha_registro', anterior, fecha)
+
     def calcular_descuento(self, monto):
         # Los clientes regulares no tienen descuento
         return 0.0
@@ -0,0 +1,420 @@
+"""
+Consultas - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo permite armar consultas sobre los clientes del gestor
+combinando condiciones, en vez de escribir un método por cada filtro.
+
+Ejemplo:
+    from src.consultas import Tipo, Rango, NombreContiene, Dominio
+
+    consulta = (gestor.consultar(Rango('puntos_acumulados', 1000, 5000),
+                                 NombreContiene("pérez") | Dominio("empresa.cl"))
+                .ordenar_por('puntos_acumulados', descendente=True)
+                .limite(10))
+    print(consulta.explicar())
+    for cliente in consulta:
+        print(cliente)
+
+Un planificador elige la condición con el índice más selectivo para
+obtener los candidatos y revisa las demás condiciones sobre la marcha.
+"""
+
+# Importamos los módulos necesarios
+import heapq
+from itertools import islice
+
+# Importamos las excepciones
+from .excepciones import ValidacionError
+
+
+# Tipos de cliente que se pueden consultar
+TIPOS_CLIENTE = ('Regular', 'Premium', 'Corporativo')
+
+# Getter que entrega el valor de cada campo consultable u ordenable
+GETTERS_CAMPO = {
+    'nombre': 'get_nombre',
+    'email': 'get_email',
+    'telefono': 'get_telefono',
+    'direccion': 'get_direccion',
+    'fecha_registro': 'get_fecha_registro',
+    'nivel_membresia': 'get_nivel_membresia',
+    'descuento': 'get_descuento',
+    'puntos_acumulados': 'get_puntos_acumulados',
+    'nombre_empresa': 'get_nombre_empresa',
+    'limite_credito': 'get_limite_credito',
+    'credito_utilizado': 'get_credito_utilizado',
+    'credito_disponible': 'get_credito_disponible',
+}
+
+
+def valor_campo(cliente, campo):
+    """Retorna el valor de un campo del cliente, o None si su clase no lo tiene."""
+    getter = getattr(cliente, GETTERS_CAMPO[campo], None)
+    return getter() if getter is not None else None
+
+
+def _validar_campo(campo):
+    if campo not in GETTERS_CAMPO:
+        raise ValidacionError(f"Campo desconocido '{campo}'. Use uno de: {list(GETTERS_CAMPO)}")
+
+
+# ========== CONDICIONES ==========
+
+class Condicion:
+    """
+    Clase base de las condiciones de una consulta.
+
+    Cada condición sabe:
+        - cumple(cliente): si un cliente la cumple
+        - estimar(gestor): cuántos candidatos entrega su índice
+          (None si no tiene índice y hay que recorrer todos los clientes)
+        - candidatos(gestor): los clientes que la cumplen, usando el índice
+
+    Las condiciones se combinan con & (Y) y | (O).
+    """
+
+    def cumple(self, cliente):
+        raise NotImplementedError
+
+    def estimar(self, gestor):
+        return None
+
+    def candidatos(self, gestor, descendente=False):
+        raise NotImplementedError
+
+    def __and__(self, otra):
+        return Y(self, otra)
+
+    def __or__(self, otra):
+        return O(self, otra)
+
+
+class Tipo(Condicion):
+    """Clientes de un tipo: 'Regular', 'Premium' o 'Corporativo'."""
+
+    def __init__(self, tipo):
+        if tipo not in TIPOS_CLIENTE:
+            raise ValidacionError(f"El tipo debe ser uno de: {list(TIPOS_CLIENTE)}")
+        self.tipo = tipo
+
+    def cumple(self, cliente):
+        return cliente.TIPO_CLIENTE == self.tipo
+
+    def estimar(self, gestor):
+        return len(gestor._por_tipo[self.tipo])
+
+    def candidatos(self, gestor, descendente=False):
+        # Copiamos los valores para poder modificar el gestor mientras se recorre
+        return iter(list(gestor._por_tipo[self.tipo].values()))
+
+    def __repr__(self):
+        return f"Tipo({self.tipo!r})"
+
+
+class NombreContiene(Condicion):
+    """Clientes cuyo nombre contiene un texto (sin distinguir mayúsculas)."""
+
+    def __init__(self, texto):
+        self.texto = texto.lower().strip()
+
+    def cumple(self, cliente):
+        return self.texto in cliente.get_nombre().lower()
+
+    def __repr__(self):
+        return f"NombreContiene({self.texto!r})"
+
+
+class Dominio(Condicion):
+    """Clientes con email en un dominio ('empresa.cl')."""
+
+    def __init__(self, dominio):
+        self.dominio = dominio.strip().lower().lstrip('@')
+        self._sufijo = '@' + self.dominio
+
+    def cumple(self, cliente):
+        return cliente.get_email().endswith(self._sufijo)
+
+    def estimar(self, gestor):
+        return gestor.contar_por_dominio(self.dominio)
+
+    def candidatos(self, gestor, descendente=False):
+        return iter(gestor.listar_por_dominio(self.dominio))
+
+    def __repr__(self):
+        return f"Dominio({self.dominio!r})"
+
+
+class Rango(Condicion):
+    """
+    Clientes con desde <= campo <= hasta (None = sin límite).
+
+    Si el campo tiene índice ordenado en el gestor (ver CAMPOS_RANGO)
+    los candidatos salen del índice, ya ordenados por el campo.
+    Los clientes cuya clase no tiene el campo no cumplen la condición.
+    """
+
+    def __init__(self, campo, desde=None, hasta=None):
+        _validar_campo(campo)
+        self.campo = campo
+        self.desde = desde
+        self.hasta = hasta
+
+    def cumple(self, cliente):
+        valor = valor_campo(cliente, self.campo)
+        if valor is None:
+            return False
+        if self.desde is not None and valor < self.desde:
+            return False
+        if self.hasta is not None and valor > self.hasta:
+            return False
+        return True
+
+    def estimar(self, gestor):
+        gestor._sincronizar_credito()
+        indice = gestor._rangos.get(self.campo)
+        if indice is None:
+            return None
+        return indice.contar(self.desde, self.hasta)
+
+    def candidatos(self, gestor, descendente=False):
+        gestor._sincronizar_credito()
+        return gestor._rangos[self.campo].rango(self.desde, self.hasta, descendente)
+
+    def __repr__(self):
+        return f"Rango({self.campo!r}, {self.desde!r}, {self.hasta!r})"
+
+
+class Y(Condicion):
+    """Clientes que cumplen todas las condiciones."""
+
+    def __init__(self, *condiciones):
+        # Aplanamos Y(Y(a, b), c) en Y(a, b, c)
+        self.condiciones = []
+        for condicion in condiciones:
+            if isinstance(condicion, Y):
+                self.condiciones.extend(condicion.condiciones)
+            else:
+                self.condiciones.append(condicion)
+
+    def cumple(self, cliente):
+        return all(condicion.cumple(cliente) for condicion in self.condiciones)
+
+    def mejor_indice(self, gestor):
+        """Retorna (condición, estimado) de la hija con índice más selectivo, o (None, None)."""
+        mejor, mejor_estimado = None, None
+        for condicion in self.condiciones:
+            estimado = condicion.estimar(gestor)
+            if estimado is not None and (mejor_estimado is None or estimado < mejor_estimado):
+                mejor, mejor_estimado = condicion, estimado
+        return mejor, mejor_estimado
+
+    def estimar(self, gestor):
+        return self.mejor_indice(gestor)[1]
+
+    def candidatos(self, gestor, descendente=False):
+        mejor, _ = self.mejor_indice(gestor)
+        resto = [condicion for condicion in self.condiciones if condicion is not mejor]
+        for cliente in mejor.candidatos(gestor, descendente):
+            if all(condicion.cumple(cliente) for condicion in resto):
+                yield cliente
+
+    def __repr__(self):
+        return "Y(" + ", ".join(map(repr, self.condiciones)) + ")"
+
+
+class O(Condicion):
+    """Clientes que cumplen al menos una de las condiciones."""
+
+    def __init__(self, *condiciones):
+        self.condiciones = []
+        for condicion in condiciones:
+            if isinstance(condicion, O):
+                self.condiciones.extend(condicion.condiciones)
+            else:
+                self.condiciones.append(condicion)
+
+    def cumple(self, cliente):
+        return any(condicion.cumple(cliente) for condicion in self.condiciones)
+
+    def estimar(self, gestor):
+        # Solo se puede usar índice si todas las alternativas tienen uno
+        total = 0
+        for condicion in self.condiciones:
+            estimado = condicion.estimar(gestor)
+            if estimado is None:
+                return None
+            total += estimado
+        return total
+
+    def candidatos(self, gestor, descendente=False):
+        # Unión de los candidatos de cada alternativa, sin repetir clientes
+        vistos = set()
+        for condicion in self.condiciones:
+            for cliente in condicion.candidatos(gestor, descendente):
+                if id(cliente) not in vistos:
+                    vistos.add(id(cliente))
+                    yield cliente
+
+    def __repr__(self):
+        return "O(" + ", ".join(map(repr, self.condiciones)) + ")"
+
+
+# ========== CONSULTA ==========
+
+class Consulta:
+    """
+    Consulta sobre los clientes de un gestor: condiciones, orden,
+    límite y desplazamiento. Se crea con gestor.consultar(...).
+
+    Los resultados se generan de forma perezosa al recorrer la consulta;
+    ejecutar() los entrega como lista.
+    """
+
+    def __init__(self, gestor, *condiciones):
+        self._gestor = gestor
+        self._condicion = Y(*condiciones) if condiciones else None
+        self._orden = None
+        self._descendente = False
+        self._limite = None
+        self._desplazamiento = 0
+
+    def donde(self, *condiciones):
+        """Agrega condiciones (todas deben cumplirse)."""
+        if self._condicion is None:
+            self._condicion = Y(*condiciones)
+        else:
+            self._condicion = Y(self._condicion, *condiciones)
+        return self
+
+    def ordenar_por(self, campo, descendente=False):
+        """Ordena por un campo; los clientes sin ese campo quedan al final."""
+        _validar_campo(campo)
+        self._orden = campo
+        self._descendente = descendente
+        return self
+
+    def limite(self, cantidad):
+        if not isinstance(cantidad, int) or cantidad < 0:
+            raise ValidacionError("El límite debe ser un entero mayor o igual a 0")
+        self._limite = cantidad
+        return self
+
+    def desplazamiento(self, cantidad):
+        if not isinstance(cantidad, int) or cantidad < 0:
+            raise ValidacionError("El desplazamiento debe ser un entero mayor o igual a 0")
+        self._desplazamiento = cantidad
+        return self
+
+    # ========== PLANIFICACIÓN ==========
+
+    def _planificar(self):
+        """
+        Elige de dónde salen los candidatos.
+
+        Retorna (driver, estimado, filtros):
+            - driver: condición cuyo índice entrega los candidatos
+              (None = recorrer todos los clientes)
+            - estimado: cantidad de candidatos esperada
+            - filtros: condiciones que se revisan sobre cada candidato
+        """
+        condicion = self._condicion
+        if condicion is None:
+            return None, len(self._gestor), []
+
+        driver, estimado = condicion.mejor_indice(self._gestor)
+        if driver is None:
+            return None, len(self._gestor), list(condicion.condiciones)
+
+        filtros = [otra for otra in condicion.condiciones if otra is not driver]
+        return driver, estimado, filtros
+
+    def _orden_por_indice(self, driver):
+        """True si el índice del driver ya entrega los clientes en el orden pedido."""
+        return (self._orden is not None and isinstance(driver, Rango)
+                and driver.campo == self._orden)
+
+    def explicar(self):
+        """
+        Retorna el plan de ejecución como diccionario (sin ejecutar la consulta).
+
+        Ejemplo:
+            {'indice': "Rango('puntos_acumulados', 1000, 5000)",
+             'candidatos_estimados': 42, 'filtros': ["NombreContiene('pérez')"],
+             'orden': 'por índice', 'desplazamiento': 0, 'limite': 10}
+        """
+        driver, estimado, filtros = self._planificar()
+
+        if self._orden is None:
+            orden = 'sin orden'
+        elif self._orden_por_indice(driver):
+            orden = 'por índice'
+        elif self._limite is not None:
+            orden = f"top-{self._desplazamiento + self._limite} en memoria ({self._orden})"
+        else:
+            orden = f"ordenamiento en memoria ({self._orden})"
+
+        return {
+            'indice': repr(driver) if driver is not None else 'recorrido completo',
+            'candidatos_estimados': estimado,
+            'filtros': [repr(filtro) for filtro in filtros],
+            'orden': orden,
+            'desplazamiento': self._desplazamiento,
+            'limite': self._limite,
+        }
+
+    # Alias en inglés usado por los endpoints de reportes
+    explain = explicar
+
+    # ========== EJECUCIÓN ==========
+
+    def __iter__(self):
+        driver, _, filtros = self._planificar()
+        orden_por_indice = self._orden_por_indice(driver)
+
+        # Candidatos: del índice elegido o de todos los clientes
+        if driver is None:
+            candidatos = iter(list(self._gestor._clientes))
+        else:
+            candidatos = driver.candidatos(self._gestor, self._descendente and orden_por_indice)
+
+        # Filtros perezosos: se revisan al pedir cada resultado
+        if filtros:
+            resultados = (cliente for cliente in candidatos
+                          if all(filtro.cumple(cliente) for filtro in filtros))
+        else:
+            resultados = candidatos
+
+        if self._orden is not None and not orden_por_indice:
+            resultados = iter(self._ordenar(resultados))
+
+        fin = None if self._limite is None else self._desplazamiento + self._limite
+        return islice(resultados, self._desplazamiento, fin)
+
+    def ejecutar(self):
+        """Ejecuta la consulta y retorna la lista de clientes."""
+        return list(self)
+
+    def contar(self):
+        """Cantidad de resultados (respeta límite y desplazamiento)."""
+        return sum(1 for _ in self)
+
+    def _ordenar(self, clientes):
+        campo = self._orden
+        if self._descendente:
+            def clave(cliente):
+                valor = valor_campo(cliente, campo)
+                return (0,) if valor is None else (1, valor)
+        else:
+            def clave(cliente):
+                valor = valor_campo(cliente, campo)
+                return (1,) if valor is None else (0, valor)
+
+        # Con límite solo se necesitan los primeros desplazamiento + límite
+        if self._limite is not None:
+            cantidad = self._desplazamiento + self._limite
+            if self._descendente:
+                return heapq.nlargest(cantidad, clientes, key=clave)
+            return heapq.nsmallest(cantidad, clientes, key=clave)
+        return sorted(clientes, key=clave, reverse=self._descendente)
@@ -0,0 +1,303 @@
+"""
+Detección de duplicados - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo encuentra clientes que probablemente son la misma persona
+registrada dos veces (con el nombre mal escrito, otro email, etc.).
+
+Comparar todos los clientes entre sí es O(n²). En vez de eso, cada
+cliente se pone en "bloques" según claves simples (teléfono, usuario del
+email, sonido del nombre) y solo se comparan los clientes que comparten
+algún bloque. Los pares parecidos se unen en grupos de duplicados.
+"""
+
+# Importamos los módulos necesarios
+import re
+import unicodedata
+
+# Importamos las excepciones
+from .excepciones import ValidacionError
+
+
+# Peso de cada campo en el puntaje de similitud (suman 1)
+PESOS_SIMILITUD = {'nombre': 0.45, 'email': 0.25, 'telefono': 0.15, 'direccion': 0.15}
+
+# Reemplazos para la clave fonética, en orden (español)
+_REEMPLAZOS_FONETICOS = (
+    ('ch', 'x'), ('qu', 'k'), ('ll', 'y'), ('ce', 'se'), ('ci', 'si'),
+    ('ge', 'je'), ('gi', 'ji'), ('h', ''), ('v', 'b'), ('z', 's'),
+    ('c', 'k'), ('w', 'u'),
+)
+_VOCALES = set('aeiou')
+_PATRON_NUMERO = re.compile(r'\d+')
+
+# Tabla para quitar las tildes más comunes con str.translate (en C)
+_SIN_TILDES = str.maketrans('áéíóúüñàèìòù', 'aeiouunaeiou')
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sin tildes y con un solo espacio entre palabras."""
+    texto = texto.lower().translate(_SIN_TILDES)
+    if not texto.isascii():
+        # Caso raro (otras tildes): descomponemos y quitamos las marcas
+        texto = unicodedata.normalize('NFKD', texto)
+        texto = ''.join(letra for letra in texto if not unicodedata.combining(letra))
+    return ' '.join(texto.split())
+
+
+def bigramas(texto):
+    """Conjunto de pares de letras seguidas: 'sara' -> {'sa', 'ar', 'ra'}."""
+    return {texto[i:i + 2] for i in range(len(texto) - 1)}
+
+
+def parecido(bigramas_a, bigramas_b):
+    """
+    Coeficiente de Dice entre dos conjuntos de bigramas (0 a 1).
+    Un error de tipeo cambia pocos bigramas, así que el puntaje baja poco.
+    """
+    total = len(bigramas_a) + len(bigramas_b)
+    if not total:
+        return 1.0
+    return 2 * len(bigramas_a & bigramas_b) / total
+
+
+def clave_fonetica(palabra):
+    """
+    Clave que suena igual para palabras parecidas en español:
+    'Pérez', 'Peres' y 'Perez' dan 'prs'; 'Valeria' y 'Baleria' dan 'blr'.
+    Se conserva la primera letra (ya transformada) y las consonantes sin repetir.
+    """
+    palabra = normalizar_texto(palabra)
+    for anterior, nuevo in _REEMPLAZOS_FONETICOS:
+        palabra = palabra.replace(anterior, nuevo)
+    if not palabra:
+        return ''
+    clave = [palabra[0]]
+    for letra in palabra[1:]:
+        if letra not in _VOCALES and letra != clave[-1] and letra.isalpha():
+            clave.append(letra)
+    return ''.join(clave)
+
+
+def usuario_email(email):
+    """
+    Parte del email antes de '@', sin etiqueta '+...' ni separadores:
+    'Juan.Perez+tienda@gmail.com' y 'juan_perez@hotmail.com' dan 'juanperez'.
+    """
+    usuario = email.lower().split('@', 1)[0].split('+', 1)[0]
+    return ''.join(letra for letra in usuario if letra.isalnum())
+
+
+def claves_bloqueo(cliente):
+    """Retorna las claves de bloque de un cliente (teléfono, usuario, nombre)."""
+    claves = ['t:' + cliente.get_telefono()]
+    usuario = usuario_email(cliente.get_email())
+    if len(usuario) >= 3:
+        claves.append('u:' + usuario)
+    nombre = ' '.join(clave_fonetica(palabra) for palabra in cliente.get_nombre().split())
+    if nombre:
+        # Además de la clave completa, las variantes con una letra menos:
+        # si dos nombres difieren en una letra (cambiada, sobrante o
+        # faltante), comparten al menos una variante
+        variantes = {nombre[:i] + nombre[i + 1:] for i in range(len(nombre))}
+        variantes.add(nombre)
+        claves.extend('n:' + variante for variante in variantes)
+    return claves
+
+
+def similitud(cliente_a, cliente_b):
+    """
+    Retorna un puntaje entre 0 y 1 de qué tan probable es que dos
+    clientes sean la misma persona (ver PESOS_SIMILITUD).
+    """
+    return _Comparador(cliente_a).puntaje(cliente_b)
+
+
+class _Comparador:
+    """
+    Compara un cliente contra muchos otros.
+
+    Los bigramas del cliente se calculan una sola vez; por cada otro
+    cliente solo se calculan los suyos. Los campos se comparan del más
+    pesado al más liviano y se corta apenas el puntaje ya no puede
+    llegar al umbral.
+    """
+
+    def __init__(self, cliente):
+        self.telefono = cliente.get_telefono()
+        usuario = cliente.get_email().split('@', 1)[0]
+        self.clave_usuario = usuario_email(usuario)
+        self.nombre = bigramas(normalizar_texto(cliente.get_nombre()))
+        self.usuario = bigramas(usuario)
+        direccion = normalizar_texto(cliente.get_direccion())
+        self.direccion = bigramas(direccion)
+        self.numeros = _PATRON_NUMERO.findall(direccion)
+
+    def puntaje(self, otro, umbral=0.0):
+        """Puntaje de similitud con otro cliente, o 0.0 si no puede llegar al umbral."""
+        pesos = PESOS_SIMILITUD
+        usuario = otro.get_email().split('@', 1)[0]
+        email_igual = usuario_email(usuario) == self.clave_usuario
+        puntaje = pesos['telefono'] * (otro.get_telefono() == self.telefono) + pesos['email'] * email_igual
+
+        # Nombre: lo que falta sumar en el mejor caso es email (si no fue igual) y dirección
+        restante = pesos['direccion'] + (0.0 if email_igual else pesos['email'])
+        puntaje += pesos['nombre'] * parecido(self.nombre, bigramas(normalizar_texto(otro.get_nombre())))
+        if puntaje + restante < umbral:
+            return 0.0
+        if not email_igual:
+            puntaje += pesos['email'] * parecido(self.usuario, bigramas(usuario))
+            if puntaje + pesos['direccion'] < umbral:
+                return 0.0
+        direccion = normalizar_texto(otro.get_direccion())
+        similitud_direccion = parecido(self.direccion, bigramas(direccion))
+        # "Av. Providencia 2158" y "Av. Providencia 2115" se parecen mucho
+        # como texto, pero son casas distintas
+        if self.numeros and _PATRON_NUMERO.findall(direccion) != self.numeros:
+            similitud_direccion /= 2
+        return puntaje + pesos['direccion'] * similitud_direccion
+
+
+class DetectorDuplicados:
+    """
+    Detector incremental de clientes duplicados.
+
+    Se le agregan clientes por tandas; cada cliente nuevo solo se compara
+    con los que comparten algún bloque con él (los ya agregados y los de
+    su misma tanda). Los pares con puntaje >= umbral se guardan y
+    grupos() los une en grupos ordenados del más probable al menos.
+
+    Ejemplo:
+        detector = DetectorDuplicados(umbral=0.8)
+        detector.agregar(gestor.listar_todos())
+        ...
+        nuevos_pares = detector.agregar([cliente_nuevo])
+        for grupo in detector.grupos():
+            print(grupo['puntaje'], [c.get_email() for c in grupo['clientes']])
+    """
+
+    def __init__(self, umbral=0.72, maximo_por_bloque=50):
+        """
+        Parámetros:
+            umbral (float): Puntaje mínimo (0 a 1) para considerar duplicado un par
+            maximo_por_bloque (int): Con cuántos clientes de un mismo bloque se
+                compara cada cliente nuevo (los más recientes). Evita que un
+                bloque enorme (por ejemplo, el teléfono de una central) vuelva
+                cuadrático el proceso.
+
+        Lanza:
+            ValidacionError: Si el umbral no está entre 0 y 1
+        """
+        if not isinstance(umbral, (int, float)) or not 0 <= umbral <= 1:
+            raise ValidacionError("El umbral debe estar entre 0 y 1")
+        if not isinstance(maximo_por_bloque, int) or maximo_por_bloque <= 0:
+            raise ValidacionError("maximo_por_bloque debe ser un entero positivo")
+        self.umbral = umbral
+        self.maximo_por_bloque = maximo_por_bloque
+        self._bloques = {}   # clave -> [clientes]
+        self._claves = {}    # id(cliente) -> claves del cliente (para quitarlo)
+        self._pares = {}     # (id menor, id mayor) -> (cliente_a, cliente_b, puntaje)
+        self.comparaciones = 0
+
+    def agregar(self, clientes):
+        """
+        Agrega clientes y los compara con los de sus bloques.
+
+        Retorna:
+            list: Pares nuevos [(cliente_a, cliente_b, puntaje)] con puntaje >= umbral,
+                  del más parecido al menos
+        """
+        bloques = self._bloques
+        maximo = self.maximo_por_bloque
+        nuevos = []
+        for cliente in clientes:
+            if id(cliente) in self._claves:
+                continue
+            claves = claves_bloqueo(cliente)
+            comparador = None
+            revisados = set()
+            for clave in claves:
+                bloque = bloques.get(clave)
+                if bloque is None:
+                    bloques[clave] = [cliente]
+                    continue
+                for otro in bloque[-maximo:]:
+                    if id(otro) in revisados:
+                        continue
+                    revisados.add(id(otro))
+                    self.comparaciones += 1
+                    if comparador is None:
+                        comparador = _Comparador(cliente)
+                    puntaje = comparador.puntaje(otro, self.umbral)
+                    if puntaje >= self.umbral:
+                        par = (cliente, otro, puntaje)
+                        self._pares[_clave_par(cliente, otro)] = par
+                        nuevos.append(par)
+                bloque.append(cliente)
+            self._claves[id(cliente)] = claves
+        nuevos.sort(key=lambda par: par[2], reverse=True)
+        return nuevos
+
+    def quitar(self, cliente):
+        """Quita un cliente de sus bloques y de los pares encontrados."""
+        claves = self._claves.pop(id(cliente), None)
+        if claves is None:
+            return
+        for clave in claves:
+            bloque = self._bloques.get(clave, [])
+            for i, otro in enumerate(bloque):
+                if otro is cliente:
+                    del bloque[i]
+                    break
+            if not bloque:
+                self._bloques.pop(clave, None)
+        for clave_par in [par for par in self._pares if id(cliente) in par]:
+            del self._pares[clave_par]
+
+    def grupos(self):
+        """
+        Une los pares encontrados en grupos (si A~B y B~C, el grupo es A, B, C).
+
+        Retorna:
+            list: [{'clientes': list, 'puntaje': float, 'pares': list}]
+                  ordenada por puntaje (el mejor par del grupo) y tamaño
+        """
+        padre = {}
+
+        def raiz(clave):
+            while padre[clave] != clave:
+                padre[clave] = padre[padre[clave]]
+                clave = padre[clave]
+            return clave
+
+        for cliente_a, cliente_b, _ in self._pares.values():
+            padre.setdefault(id(cliente_a), id(cliente_a))
+            padre.setdefault(id(cliente_b), id(cliente_b))
+            raiz_a, raiz_b = raiz(id(cliente_a)), raiz(id(cliente_b))
+            if raiz_a != raiz_b:
+                padre[raiz_b] = raiz_a
+
+        grupos = {}
+        for par in self._pares.values():
+            grupo = grupos.setdefault(raiz(id(par[0])), {'clientes': {}, 'puntaje': 0.0, 'pares': []})
+            grupo['pares'].append(par)
+            grupo['puntaje'] = max(grupo['puntaje'], par[2])
+            grupo['clientes'][id(par[0])] = par[0]
+            grupo['clientes'][id(par[1])] = par[1]
+
+        resultado = []
+        for grupo in grupos.values():
+            grupo['clientes'] = list(grupo['clientes'].values())
+            grupo['pares'].sort(key=lambda par: par[2], reverse=True)
+            resultado.append(grupo)
+        resultado.sort(key=lambda grupo: (grupo['puntaje'], len(grupo['clientes'])), reverse=True)
+        return resultado
+
+    def __len__(self):
+        """Cantidad de clientes agregados."""
+        return len(self._claves)
+
+
+def _clave_par(cliente_a, cliente_b):
+    return (id(cliente_a), id(cliente_b)) if id(cliente_a) < id(cliente_b) else (id(cliente_b), id(cliente_a))
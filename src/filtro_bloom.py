@@ -0,0 +1,167 @@
+"""
+Filtro de Bloom - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Un filtro de Bloom responde "¿está este email?" usando muy poca memoria:
+si dice que NO, es seguro que no está; si dice que SÍ, puede equivocarse
+con una probabilidad pequeña y configurable (falso positivo).
+
+PersistenciaJSON guarda uno junto al archivo de clientes
+("clientes.json.bloom") para no leer el archivo completo cada vez que
+necesita saber si un email ya existe.
+
+Reconstruir el filtro de un archivo desde la terminal:
+    python -m src.filtro_bloom clientes.json
+"""
+
+# Importamos los módulos necesarios
+import hashlib
+import math
+import os
+import struct
+
+# Importamos las excepciones
+from .excepciones import ValidacionError, PersistenciaError
+
+
+# Cabecera del archivo: marca, bits, funciones hash, elementos, capacidad,
+# y tamaño y fecha de modificación del archivo de clientes que describe
+_CABECERA = struct.Struct('<8sQIQQQq')
+_MARCA = b'GICBLM01'
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom de textos (por ejemplo, emails).
+
+    Se dimensiona para 'capacidad' elementos con una tasa de falsos
+    positivos objetivo; si se agregan más, la tasa real sube (ver
+    tasa_estimada) y conviene reconstruirlo con más capacidad.
+
+    Ejemplo:
+        filtro = FiltroBloom(capacidad=100000, tasa_objetivo=0.01)
+        filtro.agregar("juan@email.com")
+        "juan@email.com" in filtro    # True
+        "otro@email.com" in filtro    # False (casi siempre)
+    """
+
+    def __init__(self, capacidad=10000, tasa_objetivo=0.01):
+        """
+        Parámetros:
+            capacidad (int): Cantidad de elementos esperada
+            tasa_objetivo (float): Tasa de falsos positivos buscada (entre 0 y 1)
+
+        Lanza:
+            ValidacionError: Si los parámetros no son válidos
+        """
+        if not isinstance(capacidad, int) or capacidad <= 0:
+            raise ValidacionError("La capacidad debe ser un entero positivo")
+        if not 0 < tasa_objetivo < 1:
+            raise ValidacionError("La tasa objetivo debe estar entre 0 y 1")
+
+        # Fórmulas estándar: m = -n ln(p) / ln(2)^2 bits, k = m/n ln(2) hashes
+        self.bits = max(8, int(-capacidad * math.log(tasa_objetivo) / math.log(2) ** 2))
+        self.funciones = max(1, round(self.bits / capacidad * math.log(2)))
+        self.capacidad = capacidad
+        self.elementos = 0
+        self._arreglo = bytearray((self.bits + 7) // 8)
+
+    def agregar(self, texto):
+        """Agrega un texto al filtro."""
+        arreglo = self._arreglo
+        for posicion in self._posiciones(texto):
+            arreglo[posicion >> 3] |= 1 << (posicion & 7)
+        self.elementos += 1
+
+    def agregar_varios(self, textos):
+        """Agrega muchos textos al filtro."""
+        for texto in textos:
+            self.agregar(texto)
+
+    def __contains__(self, texto):
+        arreglo = self._arreglo
+        for posicion in self._posiciones(texto):
+            if not arreglo[posicion >> 3] & (1 << (posicion & 7)):
+                return False
+        return True
+
+    def tasa_estimada(self):
+        """
+        Tasa de falsos positivos esperada con los elementos actuales:
+        (1 - e^(-k n / m))^k.
+        """
+        return (1 - math.exp(-self.funciones * self.elementos / self.bits)) ** self.funciones
+
+    def _posiciones(self, texto):
+        # Doble hash (Kirsch-Mitzenmacher): k posiciones a partir de un solo blake2b
+        resumen = hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], 'little')
+        h2 = int.from_bytes(resumen[8:], 'little') | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.funciones)]
+
+    # ========== GUARDAR / CARGAR ==========
+
+    def guardar(self, ruta, tamano_origen=0, modificado_origen=0):
+        """
+        Guarda el filtro en un archivo binario (se escribe en un archivo
+        temporal y se reemplaza, así nunca queda a medio escribir).
+
+        tamano_origen y modificado_origen identifican el archivo de datos
+        que el filtro describe, para detectar si quedó desactualizado.
+        """
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(_CABECERA.pack(_MARCA, self.bits, self.funciones, self.elementos,
+                                             self.capacidad, tamano_origen, modificado_origen))
+                archivo.write(self._arreglo)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            raise PersistenciaError(f"Error al guardar el filtro: {str(e)}")
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un filtro guardado con guardar().
+
+        Retorna:
+            tuple: (filtro, tamano_origen, modificado_origen), o None si el
+                   archivo no existe o no es un filtro válido
+        """
+        try:
+            with open(ruta, 'rb') as archivo:
+                cabecera = archivo.read(_CABECERA.size)
+                datos = archivo.read()
+        except OSError:
+            return None
+        if len(cabecera) != _CABECERA.size:
+            return None
+        marca, bits, funciones, elementos, capacidad, tamano, modificado = _CABECERA.unpack(cabecera)
+        if marca != _MARCA or len(datos) != (bits + 7) // 8:
+            return None
+
+        filtro = cls.__new__(cls)
+        filtro.bits = bits
+        filtro.funciones = funciones
+        filtro.elementos = elementos
+        filtro.capacidad = capacidad
+        filtro._arreglo = bytearray(datos)
+        return filtro, tamano, modificado
+
+    def __len__(self):
+        """Cantidad de elementos agregados."""
+        return self.elementos
+
+
+if __name__ == "__main__":
+    # Herramienta de reconstrucción: python -m src.filtro_bloom clientes.json
+    import sys
+    from .persistencia import PersistenciaJSON
+
+    for nombre in sys.argv[1:] or ["clientes.json"]:
+        persistencia = PersistenciaJSON(nombre)
+        filtro = persistencia.reconstruir_filtro()
+        print(f"{nombre}: {filtro.elementos} emails, {filtro.bits // 8} bytes, "
+              f"tasa de falsos positivos estimada {filtro.tasa_estimada():.4%}")
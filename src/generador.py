@@ -0,0 +1,524 @@
+"""
+Generador de datos - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo genera clientes ficticios para pruebas de carga y benchmarks.
+Todos los datos pasan las validaciones del sistema: nombres solo con
+letras (con tildes y ñ), emails válidos, teléfonos chilenos, direcciones
+de al menos 10 caracteres y RUTs con dígito verificador correcto.
+
+La generación es determinista: con la misma semilla y la misma
+configuración se obtienen siempre los mismos clientes, y los primeros N
+clientes de una cartera grande son los mismos que los de una cartera de N.
+
+Los datos se generan por bloques (todos los valores al azar de un bloque
+se piden de una vez) y se pueden entregar como diccionarios, como
+objetos Cliente o escribirse directo a un archivo JSON o CSV.
+
+Generar un archivo desde la terminal:
+    python -m src.generador clientes.json 1000000
+"""
+
+# Importamos los módulos necesarios
+import bisect
+import itertools
+import random
+import sys
+import unicodedata
+from array import array
+from datetime import date, timedelta
+
+# Importamos nuestras clases de cliente
+from .cliente_regular import ClienteRegular
+from .cliente_premium import ClientePremium
+from .cliente_corporativo import ClienteCorporativo
+
+# Importamos las excepciones
+from .excepciones import ValidacionError, PersistenciaError
+
+# Importamos las reglas de nivel (el nivel y el descuento salen de los puntos)
+from .niveles import REGLAS_NIVEL
+
+# Importamos las columnas del CSV y las validaciones
+from .persistencia_csv import COLUMNAS_CSV
+from .validaciones import validar_email
+
+
+# Mezcla de tipos por defecto
+PROPORCIONES = {'Regular': 0.6, 'Premium': 0.3, 'Corporativo': 0.1}
+
+NOMBRES = (
+    "José", "María", "Sofía", "Matías", "Benjamín", "Martina", "Tomás", "Valentina", "Agustín", "Josefa",
+    "Joaquín", "Antonella", "Vicente", "Florencia", "Maximiliano", "Catalina", "Lucas", "Isidora",
+    "Cristóbal", "Emilia", "Ignacio", "Fernanda", "Sebastián", "Constanza", "Nicolás", "Javiera",
+    "Andrés", "Ramón", "Begoña", "Íñigo", "Ana", "Juan", "Pedro", "Camila", "Diego", "Paula",
+    "Felipe", "Daniela", "Gonzalo", "Valeria",
+)
+APELLIDOS = (
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda",
+    "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya", "Flores", "Espinoza",
+    "Valenzuela", "Castillo", "Tapia", "Reyes", "Gutiérrez", "Castro", "Pizarro", "Álvarez", "Vásquez",
+    "Sánchez", "Fernández", "Ramírez", "Carrasco", "Gómez", "Cortés", "Herrera", "Núñez", "Jara",
+    "Vergara", "Rivera", "Figueroa", "Ibáñez", "Peña",
+)
+# Todas tienen 8 caracteres o más: con el número, la dirección llega a 10
+CALLES = (
+    "Av. Providencia", "Av. Apoquindo", "Av. Vicuña Mackenna", "Calle Los Aromos", "Pasaje El Roble",
+    "Av. Irarrázaval", "Calle Huérfanos", "Av. Grecia", "Calle San Martín", "Av. Ñuble",
+    "Av. Libertador", "Calle Merced", "Av. Matta", "Calle Agustinas", "Av. Pajaritos", "Calle Moneda",
+)
+RUBROS = ("Comercial", "Inversiones", "Servicios", "Constructora", "Distribuidora", "Transportes",
+          "Agrícola", "Tecnología")
+SOCIEDADES = ("Ltda.", "SpA", "S.A.")
+DOMINIOS = ("gmail.com", "hotmail.com", "outlook.com", "yahoo.com", "empresa.cl", "correo.cl")
+
+# Fecha hasta la que se generan fechas de registro (fija, para que sea determinista)
+FECHA_REFERENCIA = date(2025, 1, 1)
+
+# Teléfonos y RUTs únicos sin guardar los ya usados. Los teléfonos son
+# consecutivos desde un punto al azar (dan la vuelta al llegar a 10^8); los
+# RUTs salen de i -> (i * A + B) mod M, que es una biyección porque A no
+# tiene factores comunes con M
+_MODULO_TELEFONO = 10 ** 8
+_BASE_RUT = 60000000
+_MODULO_RUT = 30000000
+_MULTIPLICADOR_RUT = 7919
+
+_TAMANO_BLOQUE = 8192
+# Rango de puntos hasta el que se arma la tabla de extras de los Premium
+_MAXIMO_TABLA_PUNTOS = 1 << 20
+# Enteros al azar por cliente: tipo, nombre completo, dominio, calle,
+# número de calle y uno para los datos propios del tipo
+_VALORES_POR_CLIENTE = 6
+_TIPO_ENTERO = 'I' if array('I').itemsize == 4 else 'L'
+
+# Nombres completos (nombre y dos apellidos) y el usuario de email que le
+# corresponde a cada uno; se arman la primera vez que se usan
+_COMBINACIONES = []
+# Suma ponderada del módulo 11 de cada mitad de un RUT de 8 dígitos
+_SUMAS_RUT = []
+
+
+def _telefonos(inicio, cantidad, desplazamiento):
+    """Los 8 dígitos finales de los teléfonos de los clientes inicio..inicio+cantidad."""
+    primero = (inicio + desplazamiento) % _MODULO_TELEFONO
+    if primero + cantidad <= _MODULO_TELEFONO:
+        return range(primero, primero + cantidad)
+    return [(primero + i) % _MODULO_TELEFONO for i in range(cantidad)]
+
+
+def _rut(numero):
+    """
+    RUT con dígito verificador de un número de 8 dígitos. Es lo mismo que
+    validaciones._digito_verificador pero con la suma de cada mitad ya calculada.
+    """
+    if not _SUMAS_RUT:
+        # Factores del módulo 11: 2, 3, 4, 5 para los 4 dígitos de la derecha
+        # y 6, 7, 2, 3 para los 4 de la izquierda
+        for factores in ((5, 4, 3, 2), (3, 2, 7, 6)):
+            _SUMAS_RUT.append([sum(int(digito) * factor for digito, factor in zip(f"{valor:04d}", factores))
+                               for valor in range(10000)])
+    alto, bajo = divmod(numero, 10000)
+    return f"{numero}-{'0K987654321'[(_SUMAS_RUT[0][bajo] + _SUMAS_RUT[1][alto]) % 11]}"
+
+
+def _sin_tildes(texto):
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(letra for letra in texto if not unicodedata.combining(letra)).lower()
+
+
+def _combinaciones():
+    if not _COMBINACIONES:
+        nombres, usuarios = [], []
+        for nombre, paterno in itertools.product(NOMBRES, APELLIDOS):
+            usuario = f"{_sin_tildes(nombre)}.{_sin_tildes(paterno)}"
+            for materno in APELLIDOS:
+                nombres.append(f"{nombre} {paterno} {materno}")
+                usuarios.append(usuario)
+        _COMBINACIONES.extend((nombres, usuarios))
+    return _COMBINACIONES
+
+
+class GeneradorClientes:
+    """
+    Generador determinista de clientes válidos.
+
+    Cada cliente generado es un diccionario con la misma forma que
+    obtener_resumen() (y que los elementos del archivo JSON):
+        {'nombre', 'email', 'telefono', 'direccion', 'tipo_cliente', ...}
+
+    Los emails, teléfonos y RUTs no se repiten, salvo en los duplicados
+    pedidos con tasa_duplicados y tasa_repetidos.
+
+    Ejemplo:
+        generador = GeneradorClientes(semilla=7, proporciones={'Premium': 1})
+        for registro in generador.registros(1000):
+            print(registro['nombre'], registro['nivel_membresia'])
+        generador.escribir("clientes.json", 1000000)
+    """
+
+    def __init__(self, semilla=0, proporciones=None, dominios=DOMINIOS, puntos=(0, 20000),
+                 limite_credito=(100000, 5000000), antiguedad_maxima_dias=3650,
+                 tasa_duplicados=0.0, tasa_repetidos=0.0):
+        """
+        Parámetros:
+            semilla (int): Semilla del generador (misma semilla = mismos clientes)
+            proporciones (dict): Peso de cada tipo, ej. {'Regular': 6, 'Premium': 3}
+                                 (None = PROPORCIONES; los tipos que faltan no se generan)
+            dominios (list): Dominios de email, elegidos con igual probabilidad
+            puntos (tuple): Rango (mínimo, máximo) de puntos de los Premium; el
+                            nivel y el descuento se asignan según REGLAS_NIVEL
+            limite_credito (tuple): Rango del límite de crédito de los Corporativos
+                                    (en múltiplos de 10.000)
+            antiguedad_maxima_dias (int): Las fechas de registro de los Regular
+                                          y Premium caen en los días previos a FECHA_REFERENCIA
+            tasa_duplicados (float): Fracción de clientes que son otra persona ya
+                                     generada con el nombre mal escrito y el email en
+                                     otro dominio (mismo teléfono): posibles duplicados.
+                                     Requiere al menos dos dominios
+            tasa_repetidos (float): Fracción de clientes que repiten exactamente a
+                                    otro (mismo email: el gestor los rechaza)
+
+        Lanza:
+            ValidacionError: Si algún parámetro no es válido
+        """
+        proporciones = PROPORCIONES if proporciones is None else proporciones
+        if not proporciones or any(tipo not in PROPORCIONES for tipo in proporciones):
+            raise ValidacionError(f"Las proporciones deben usar los tipos: {list(PROPORCIONES)}")
+        if any(peso < 0 for peso in proporciones.values()) or sum(proporciones.values()) <= 0:
+            raise ValidacionError("Las proporciones deben ser positivas")
+        if not dominios:
+            raise ValidacionError("Debe indicar al menos un dominio")
+        for dominio in dominios:
+            validar_email("usuario@" + dominio)
+        for nombre, rango in (('puntos', puntos), ('limite_credito', limite_credito)):
+            if len(rango) != 2 or not 0 <= rango[0] <= rango[1]:
+                raise ValidacionError(f"El rango de {nombre} debe ser (mínimo, máximo) con 0 <= mínimo <= máximo")
+        if limite_credito[1] < 10000:
+            raise ValidacionError("El límite de crédito máximo debe ser al menos 10.000")
+        if not isinstance(antiguedad_maxima_dias, int) or antiguedad_maxima_dias < 0:
+            raise ValidacionError("La antigüedad máxima debe ser un entero no negativo")
+        if not (0 <= tasa_duplicados < 1 and 0 <= tasa_repetidos < 1 and tasa_duplicados + tasa_repetidos < 1):
+            raise ValidacionError("Las tasas de duplicados deben estar entre 0 y 1 (y sumar menos de 1)")
+        if tasa_duplicados and len(set(dominios)) < 2:
+            raise ValidacionError("Para generar posibles duplicados se necesitan al menos dos dominios")
+
+        self.semilla = semilla
+        self.proporciones = dict(proporciones)
+        self.dominios = tuple(dominio.lower() for dominio in dominios)
+        self.puntos = puntos
+        self.limite_credito = limite_credito
+        self.antiguedad_maxima_dias = antiguedad_maxima_dias
+        self.tasa_duplicados = tasa_duplicados
+        self.tasa_repetidos = tasa_repetidos
+
+        # Tabla de 65.536 entradas: 16 bits al azar dan el tipo según las
+        # proporciones (con una resolución de 1/65.536)
+        tipos = tuple(self.proporciones)
+        acumulados = list(itertools.accumulate(self.proporciones.values()))
+        self._tabla_tipos = [tipos[bisect.bisect_right(acumulados, (valor + 0.5) / 65536 * acumulados[-1])]
+                             for valor in range(65536)]
+        self._limites = tuple(float(monto) for monto in range(max(10000, limite_credito[0] // 10000 * 10000),
+                                                              limite_credito[1] + 1, 10000))
+        self._fechas = tuple((str(FECHA_REFERENCIA - timedelta(days=dias)),)
+                             for dias in range(antiguedad_maxima_dias + 1))
+        # Puntos mínimos (de menor a mayor) y su (nivel, descuento)
+        reglas = sorted(REGLAS_NIVEL, key=lambda regla: regla['puntos_minimos'])
+        self._minimos_nivel = [regla['puntos_minimos'] for regla in reglas]
+        self._niveles = [(regla['nivel'], regla['descuento']) for regla in reglas]
+        # Con rangos de puntos normales, los extras de cada cantidad de puntos
+        # se arman una sola vez: (nivel, descuento, puntos)
+        self._extras_premium = None
+        if puntos[1] - puntos[0] < _MAXIMO_TABLA_PUNTOS:
+            self._extras_premium = [self._extras_puntos(valor) for valor in range(puntos[0], puntos[1] + 1)]
+
+    def _extras_puntos(self, puntos):
+        return self._niveles[bisect.bisect_right(self._minimos_nivel, puntos) - 1] + (puntos,)
+
+    # ========== DICCIONARIOS Y OBJETOS ==========
+
+    def registros(self, cantidad):
+        """
+        Genera 'cantidad' clientes como diccionarios (forma de obtener_resumen()).
+
+        Es un generador: la memoria usada no depende de la cantidad.
+        """
+        for bloque in self._bloques(cantidad):
+            for tipo, nombre, usuario, numero, dominio, telefono, calle, numero_calle, extra in zip(*bloque):
+                registro = {'nombre': nombre, 'email': f"{usuario}{numero}@{dominio}",
+                            'telefono': f"+569{telefono:08d}", 'direccion': f"{calle} {numero_calle}",
+                            'tipo_cliente': tipo}
+                if tipo == 'Regular':
+                    registro['fecha_registro'] = extra[0]
+                elif tipo == 'Premium':
+                    (registro['nivel_membresia'], registro['descuento'], registro['puntos_acumulados'],
+                     registro['fecha_registro']) = extra
+                else:
+                    (registro['nombre_empresa'], registro['rut_empresa'],
+                     registro['contacto_principal'], registro['limite_credito']) = extra
+                    registro['credito_utilizado'] = 0.0
+                yield registro
+
+    def clientes(self, cantidad):
+        """
+        Genera 'cantidad' clientes como objetos ClienteRegular,
+        ClientePremium y ClienteCorporativo (pasando por sus validaciones).
+        """
+        for registro in self.registros(cantidad):
+            tipo = registro['tipo_cliente']
+            datos = (registro['nombre'], registro['email'], registro['telefono'], registro['direccion'])
+            if tipo == 'Regular':
+                yield ClienteRegular(*datos, date.fromisoformat(registro['fecha_registro']))
+            elif tipo == 'Premium':
+                cliente = ClientePremium(*datos, registro['nivel_membresia'], registro['descuento'],
+                                         date.fromisoformat(registro['fecha_registro']))
+                cliente.set_puntos_acumulados(registro['puntos_acumulados'])
+                yield cliente
+            else:
+                yield ClienteCorporativo(*datos, registro['nombre_empresa'], registro['rut_empresa'],
+                                         registro['contacto_principal'], registro['limite_credito'])
+
+    # ========== ESCRIBIR ARCHIVOS ==========
+
+    def escribir(self, nombre_archivo, cantidad):
+        """
+        Escribe 'cantidad' clientes en un archivo; el formato se elige
+        por la extensión ('.json' como PersistenciaJSON, '.csv' como
+        PersistenciaCSV).
+
+        Retorna:
+            int: Cantidad de clientes escritos
+
+        Lanza:
+            ValidacionError: Si la extensión no es .json ni .csv
+            PersistenciaError: Si no se puede escribir el archivo
+
+        Ejemplo:
+            generador.escribir("clientes.csv", 1000000)
+        """
+        extension = nombre_archivo.lower().rsplit('.', 1)[-1]
+        if extension == 'json':
+            return self.escribir_json(nombre_archivo, cantidad)
+        if extension == 'csv':
+            return self.escribir_csv(nombre_archivo, cantidad)
+        raise ValidacionError(f"Formato no soportado: '{nombre_archivo}' (use .json o .csv)")
+
+    def escribir_json(self, nombre_archivo, cantidad):
+        """
+        Escribe los clientes en un archivo JSON idéntico al que escribiría
+        PersistenciaJSON.guardar_multiples, sin crear los diccionarios ni
+        pasar por json.dump.
+        """
+        def partes():
+            if cantidad <= 0:
+                yield "[]"
+                return
+            separador = "[\n"
+            for bloque in self._bloques(cantidad):
+                yield separador + ",\n".join(_elementos_json(bloque))
+                separador = ",\n"
+            yield "\n]"
+
+        return self._escribir(nombre_archivo, partes(), cantidad)
+
+    def escribir_csv(self, nombre_archivo, cantidad):
+        """
+        Escribe los clientes en un archivo CSV con las columnas y el
+        formato de PersistenciaCSV.exportar.
+        """
+        def partes():
+            yield ",".join(COLUMNAS_CSV) + "\r\n"
+            for bloque in self._bloques(cantidad):
+                yield "".join(_filas_csv(bloque))
+
+        return self._escribir(nombre_archivo, partes(), cantidad)
+
+    # ========== MÉTODOS PRIVADOS (HELPER) ==========
+
+    def _escribir(self, nombre_archivo, partes, cantidad):
+        # 'partes' es un generador: se escribe bloque a bloque
+        try:
+            with open(nombre_archivo, 'w', encoding='utf-8', newline='') as archivo:
+                for parte in partes:
+                    archivo.write(parte)
+        except OSError as e:
+            raise PersistenciaError(f"Error al escribir {nombre_archivo}: {str(e)}")
+        return max(cantidad, 0)
+
+    def _bloques(self, cantidad):
+        """
+        Genera los clientes en bloques de columnas (ver _bloque).
+
+        Siempre se generan bloques completos y se recorta el último, así
+        los primeros clientes no dependen de la cantidad pedida.
+        """
+        azar = random.Random(self.semilla)
+        desplazamiento_telefono = azar.randrange(_MODULO_TELEFONO)
+        desplazamiento_rut = azar.randrange(_MODULO_RUT)
+        for inicio in range(0, cantidad, _TAMANO_BLOQUE):
+            bloque = self._bloque(azar, inicio, desplazamiento_telefono, desplazamiento_rut)
+            faltan = cantidad - inicio
+            if faltan < _TAMANO_BLOQUE:
+                bloque = [columna[:faltan] for columna in bloque]
+            yield bloque
+
+    def _bloque(self, azar, inicio, desplazamiento_telefono, desplazamiento_rut):
+        """
+        Un bloque de clientes como columnas:
+            tipos, nombres, usuarios, números y dominios del email
+            (email = usuario + número + '@' + dominio), teléfonos (los 8
+            dígitos después de +569), calles, números de calle y extras
+
+        Los extras son tuplas con los datos propios de cada tipo:
+        (fecha_registro,), (nivel, descuento, puntos, fecha_registro) o
+        (empresa, rut, contacto, limite).
+
+        Las columnas quedan "crudas" para que escribir_json y escribir_csv
+        armen cada fila con un solo f-string.
+        """
+        n = _TAMANO_BLOQUE
+        indices = range(inicio, inicio + n)
+        # Todos los valores al azar del bloque de una vez: _VALORES_POR_CLIENTE
+        # enteros de 32 bits por cliente, que se reducen con módulo al tamaño
+        # de cada lista (random.choices elige de a uno en Python y es varias
+        # veces más lento; el sesgo del módulo es despreciable)
+        valores = array(_TIPO_ENTERO, azar.randbytes(4 * _VALORES_POR_CLIENTE * n))
+        if sys.byteorder == 'big':
+            valores.byteswap()
+        al_azar = [valores[k::_VALORES_POR_CLIENTE] for k in range(_VALORES_POR_CLIENTE)]
+
+        tabla_tipos = self._tabla_tipos
+        tipos = [tabla_tipos[valor >> 16] for valor in al_azar[0]]
+
+        # El usuario del email sale del nombre y lleva el número del
+        # cliente, así que nunca se repite
+        nombres_completos, usuarios_nombre = _combinaciones()
+        total_nombres = len(nombres_completos)
+        combinaciones = [valor % total_nombres for valor in al_azar[1]]
+        nombres = [nombres_completos[indice] for indice in combinaciones]
+        usuarios = [usuarios_nombre[indice] for indice in combinaciones]
+        numeros = list(indices)
+        lista_dominios, total_dominios = self.dominios, len(self.dominios)
+        dominios = [lista_dominios[valor % total_dominios] for valor in al_azar[2]]
+        telefonos = list(_telefonos(inicio, n, desplazamiento_telefono))
+        total_calles = len(CALLES)
+        calles = [CALLES[valor % total_calles] for valor in al_azar[3]]
+        numeros_calle = [valor % 9999 + 1 for valor in al_azar[4]]
+
+        # Datos propios de cada tipo: todos parten como Regular (fecha) y
+        # después se completan los Premium (que también tienen fecha) y
+        # los Corporativos
+        fechas, total_fechas = self._fechas, len(self._fechas)
+        extras = [fechas[valor % total_fechas] for valor in al_azar[5]]
+        cantidad_puntos = self.puntos[1] - self.puntos[0] + 1
+        extras_premium = self._extras_premium
+        limites = self._limites
+        for posicion, tipo, valor in zip(range(n), tipos, al_azar[5]):
+            if tipo == 'Regular':
+                continue
+            if tipo == 'Premium':
+                if extras_premium is not None:
+                    premium = extras_premium[valor % cantidad_puntos]
+                else:
+                    premium = self._extras_puntos(self.puntos[0] + valor % cantidad_puntos)
+                extras[posicion] = premium + fechas[(valor >> 16) % total_fechas]
+            else:
+                rut = _rut(_BASE_RUT + ((inicio + posicion) * _MULTIPLICADOR_RUT + desplazamiento_rut) % _MODULO_RUT)
+                nombre = nombres[posicion]
+                empresa = (f"{RUBROS[valor % len(RUBROS)]} {nombre.split(' ', 2)[1]} "
+                           f"{SOCIEDADES[(valor >> 8) % len(SOCIEDADES)]}")
+                extras[posicion] = (empresa, rut, nombre,
+                                    limites[(valor >> 12) % len(limites)])
+
+        columnas = [tipos, nombres, usuarios, numeros, dominios, telefonos, calles, numeros_calle, extras]
+        self._agregar_duplicados(azar, columnas, self.tasa_duplicados, casi_iguales=True)
+        self._agregar_duplicados(azar, columnas, self.tasa_repetidos, casi_iguales=False)
+        return columnas
+
+    def _agregar_duplicados(self, azar, columnas, tasa, casi_iguales):
+        """
+        Reemplaza una fracción 'tasa' de las filas del bloque por copias de
+        filas anteriores. Las copias casi iguales tienen el nombre con un
+        error de tipeo y el mismo usuario de email en otro dominio.
+        """
+        cantidad = round(tasa * _TAMANO_BLOQUE)
+        if not cantidad:
+            return
+        nombres, dominios = columnas[1], columnas[4]
+        for posicion in azar.sample(range(1, _TAMANO_BLOQUE), cantidad):
+            original = azar.randrange(posicion)
+            for columna in columnas:
+                columna[posicion] = columna[original]
+            if casi_iguales:
+                nombres[posicion] = _con_error(azar, nombres[original])
+                dominios[posicion] = azar.choice([otro for otro in self.dominios if otro != dominios[original]])
+
+
+# Las dos funciones siguientes arman cada fila con un solo f-string (es la
+# forma más rápida en Python) y el mismo formato que json.dump(..., indent=2,
+# ensure_ascii=False) y que csv.writer. Los textos generados no tienen
+# comillas, barras ni comas, así que no hay que escapar nada.
+
+def _elementos_json(bloque):
+    """Elementos del arreglo JSON de un bloque (ver GeneradorClientes._bloque)."""
+    return [
+        f'  {{\n    "nombre": "{nombre}",\n    "email": "{usuario}{numero}@{dominio}",\n'
+        f'    "telefono": "+569{telefono:08d}",\n    "direccion": "{calle} {numero_calle}",\n'
+        + (f'    "tipo_cliente": "Regular",\n    "fecha_registro": "{extra[0]}"\n  }}' if tipo == 'Regular' else
+           f'    "tipo_cliente": "Premium",\n    "nivel_membresia": "{extra[0]}",\n'
+           f'    "descuento": {extra[1]},\n    "puntos_acumulados": {extra[2]},\n'
+           f'    "fecha_registro": "{extra[3]}"\n  }}' if tipo == 'Premium' else
+           f'    "tipo_cliente": "Corporativo",\n    "nombre_empresa": "{extra[0]}",\n'
+           f'    "rut_empresa": "{extra[1]}",\n    "contacto_principal": "{extra[2]}",\n'
+           f'    "limite_credito": {extra[3]},\n    "credito_utilizado": 0.0\n  }}')
+        for tipo, nombre, usuario, numero, dominio, telefono, calle, numero_calle, extra in zip(*bloque)
+    ]
+
+
+def _filas_csv(bloque):
+    """Filas CSV (columnas de COLUMNAS_CSV) de un bloque."""
+    return [
+        f"Regular,{nombre},{usuario}{numero}@{dominio},+569{telefono:08d},{calle} {numero_calle},"
+        f"{extra[0]},,,,,,,,\r\n" if tipo == 'Regular' else
+        f"Premium,{nombre},{usuario}{numero}@{dominio},+569{telefono:08d},{calle} {numero_calle},"
+        f"{extra[3]},{extra[0]},{extra[1]},{extra[2]},,,,,\r\n" if tipo == 'Premium' else
+        f"Corporativo,{nombre},{usuario}{numero}@{dominio},+569{telefono:08d},{calle} {numero_calle},"
+        f",,,,{extra[0]},{extra[1]},{extra[2]},{extra[3]},0.0\r\n"
+        for tipo, nombre, usuario, numero, dominio, telefono, calle, numero_calle, extra in zip(*bloque)
+    ]
+
+
+def _con_error(azar, nombre):
+    """
+    Nombre con un error de tipeo: una letra de menos o dos letras cambiadas
+    de lugar, en una palabra de 3 letras o más (la primera y la última no
+    se tocan). El nombre puede venir de una copia anterior que ya perdió
+    letras; si no le queda ninguna palabra así, se deja igual.
+    """
+    palabras = nombre.split()
+    largas = [i for i, palabra in enumerate(palabras) if len(palabra) >= 3]
+    if not largas:
+        return nombre
+    indice = azar.choice(largas)
+    palabra = palabras[indice]
+    posicion = azar.randrange(1, len(palabra) - 1)
+    if azar.random() < 0.5:
+        palabra = palabra[:posicion] + palabra[posicion + 1:]
+    else:
+        palabra = palabra[:posicion] + palabra[posicion + 1] + palabra[posicion] + palabra[posicion + 2:]
+    palabras[indice] = palabra
+    return ' '.join(palabras)
+
+
+if __name__ == "__main__":
+    # python -m src.generador clientes.json 1000000 [semilla]
+    import time
+
+    nombre = sys.argv[1] if len(sys.argv) > 1 else "clientes.json"
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    generador = GeneradorClientes(semilla=int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+    inicio = time.perf_counter()
+    generador.escribir(nombre, total)
+    segundos = time.perf_counter() - inicio
+    print(f"{total} clientes escritos en {nombre} en {segundos:.2f} s ({total / segundos:.0f} por segundo)")
@@ -14,14 +14,58 @@ from .cliente_regular import ClienteRegular
 from .cliente_premium import ClientePremium
 from .cliente_corporativo import ClienteCorporativo
 
-# Importamos el sistema de persistencia
-from .persistencia import PersistenciaJSON
-
-# Importamos el sistema de logs
-from .logs import SistemaLogs
+# Importamos el sistema de persistencia CSV (el de JSON y el de logs se
+# importan recién cuando se usan: cargan json, hashlib y logging, que
+# son lo más lento de importar el paquete)
+from .persistencia_csv import PersistenciaCSV
 
 # Importamos las excepciones
-from .excepciones import ClienteNoEncontradoError, ClienteDuplicadoError
+from .excepciones import ClienteNoEncontradoError, ClienteDuplicadoError, ValidacionError
+
+# Importamos la normalización de teléfonos y RUT para buscar por ellos
+from .validaciones import normalizar_telefono, normalizar_rut
+
+# Importamos los índices en memoria
+from .indices import IndiceAgrupado, IndiceOrdenado
+
+# Importamos las métricas de latencia
+from .metricas import Metricas, exportar_prometheus
+
+# Importamos el motor de consultas
+from .consultas import Consulta
+
+# Importamos el motor de reglas de niveles de membresía
+from .niveles import MotorNiveles
+
+# Importamos el detector de clientes duplicados
+from .duplicados import DetectorDuplicados
+
+# Para cortar los resultados de un rango sin armar la lista completa
+from itertools import islice
+
+# Para proteger los índices de cambios hechos desde varios hilos
+import threading
+
+# Para pausar el recolector de ciclos durante las cargas masivas
+import gc
+from contextlib import contextmanager
+
+
+# Atributos que crea _crear_indices: el primero que se usa crea los
+# índices y carga los clientes del archivo (ver __getattr__)
+_ATRIBUTOS_DATOS = frozenset((
+    '_clientes', '_secuencias', '_ultima_secuencia', '_por_email', '_por_tipo', '_por_dominio',
+    '_por_telefono', '_por_rut', '_por_empresa', '_totales_empresa', '_totales', '_rangos',
+    '_credito_pendiente',
+))
+
+# Campos con índice ordenado (consultas por rango) y las clases que los tienen
+CAMPOS_RANGO = {
+    'puntos_acumulados': ClientePremium,
+    'credito_utilizado': ClienteCorporativo,
+    'credito_disponible': ClienteCorporativo,
+    'fecha_registro': (ClienteRegular, ClientePremium),
+}
 
 
 class GestorClientes:
@@ -34,38 +78,179 @@ class GestorClientes:
     - Listar todos los clientes
     - Eliminar clientes
     - Guardar y cargar datos desde archivo
+    - Importar y exportar clientes en formato CSV
+    
+    Usa una lista interna para almacenar los clientes en memoria
+    e índices para buscar por email, dominio del email, teléfono, RUT
+    o empresa en O(1), y por rangos de puntos, crédito o fecha de registro.
+    Los índices se mantienen al día porque el gestor se registra como
+    observador de cada cliente que agrega.
     
-    Usa una lista interna para almacenar los clientes en memoria.
+    Crear el gestor no abre archivos: los logs se crean y los clientes
+    se cargan del archivo la primera vez que se usan (o con preparar()).
     """
     
-    def __init__(self, usar_persistencia=True, usar_logs=True):
+    # Métodos que mide activar_metricas()
+    OPERACIONES_MEDIDAS = ('agregar_cliente', 'agregar_multiples', 'buscar_por_email', 'buscar_por_nombre',
+                           'listar_por_tipo', 'actualizar_cliente', 'eliminar_cliente', 'guardar_todos')
+    
+    def __init__(self, usar_persistencia=True, usar_logs=True, archivo_logs="gic_logs.txt",
+                 archivo_auditoria=None, medir=False, perfil_memoria=False,
+                 muestreo_operaciones=None):
         """
         Inicializa el gestor de clientes.
         
         Parámetros:
             usar_persistencia (bool): Si True, guarda/carga desde archivo JSON
             usar_logs (bool): Si True, registra operaciones en archivo de logs
+            archivo_logs (str): Archivo de logs de este gestor (cada gestor
+                                escribe en el suyo, por ejemplo uno por empresa)
+            archivo_auditoria (str): Registro de auditoría por cliente (JSON Lines)
+                                     usado por historial_cliente. Por defecto no
+                                     hay auditoría: cada operación la escribe en
+                                     disco (registro e índice) antes de volver
+                                     ("gic_auditoria.jsonl" para activarla)
+            medir (bool): Si True, activa las métricas de latencia desde el
+                          inicio (ver activar_metricas)
+            perfil_memoria (bool): Si True, activa el perfil de memoria desde
+                                   el inicio (ver activar_perfil_memoria)
+            muestreo_operaciones (dict): Operación -> N para registrar en los
+                                         logs solo 1 de cada N mensajes de esa
+                                         operación (ej. {"Agregar": 100}); la
+                                         auditoría registra todo igual
             
         Ejemplo:
             gestor = GestorClientes()
+            gestor_sur = GestorClientes(usar_persistencia=False, archivo_logs="logs_sur.txt")
+            auditado = GestorClientes(archivo_auditoria="gic_auditoria.jsonl")
         """
-        # Lista para almacenar los clientes en memoria
-        self._clientes = []
+        # Los clientes en memoria y los índices (ver _crear_indices) se
+        # crean en el primer uso, junto con la carga del archivo (ver __getattr__)
         
-        # Configuración de persistencia
-        self.usar_persistencia = usar_persistencia
-        if usar_persistencia:
-            # Creamos el sistema de persistencia
-            self.persistencia = PersistenciaJSON("clientes.json")
-            # Intentamos cargar clientes existentes
-            self._cargar_clientes()
+        # Candado para los cambios de clientes que llegan por el observador
+        self._candado_indices = threading.Lock()
         
-        # Configuración de logs
+        # Candado para crear los logs y cargar los clientes una sola vez
+        # aunque el primer uso llegue desde varios hilos (reentrante: la
+        # carga escribe en los logs)
+        self._candado_inicio = threading.RLock()
+        
+        # Guardamos el método observador una sola vez para no crear
+        # un objeto nuevo por cada cliente que se indexa
+        self._observador = self._al_cambiar_cliente
+        
+        # Configuración de logs (el archivo se abre en el primer uso, ver logs)
         self.usar_logs = usar_logs
-        if usar_logs:
-            # Creamos el sistema de logs
-            self.logs = SistemaLogs("gic_logs.txt")
-            self.logs.info("Gestor de Clientes iniciado")
+        self._archivo_logs = archivo_logs
+        self._archivo_auditoria = archivo_auditoria
+        self._muestreo_operaciones = muestreo_operaciones
+        self._logs = None
+        
+        # Configuración de persistencia (el archivo se lee en el primer uso)
+        self.usar_persistencia = usar_persistencia
+        self._persistencia = None
+        
+        # Métricas (antes de cargar, para medir también la carga inicial)
+        self._metricas = None
+        if medir:
+            self.activar_metricas()
+        
+        # Perfil de memoria (también antes de cargar)
+        self._perfil_memoria = None
+        if perfil_memoria:
+            self.activar_perfil_memoria()
+    
+    # ========== INICIO DIFERIDO ==========
+    
+    @property
+    def logs(self):
+        """
+        Sistema de logs del gestor. Se crea (y se abre el archivo de logs)
+        la primera vez que se usa.
+        """
+        if self._logs is None:
+            with self._candado_inicio:
+                if self._logs is None:
+                    # Importamos aquí para no cargar logging al importar el gestor
+                    from .logs import SistemaLogs
+                    logs = SistemaLogs(self._archivo_logs, archivo_auditoria=self._archivo_auditoria,
+                                       muestreo_operaciones=self._muestreo_operaciones)
+                    logs.info("Gestor de Clientes iniciado")
+                    self._logs = logs
+        return self._logs
+    
+    @logs.setter
+    def logs(self, logs):
+        self._logs = logs
+    
+    @property
+    def persistencia(self):
+        """Sistema de persistencia JSON del gestor ("clientes.json"); se crea en el primer uso."""
+        if self._persistencia is None:
+            with self._candado_inicio:
+                if self._persistencia is None:
+                    # Importamos aquí para no cargar json ni hashlib al importar el gestor
+                    from .persistencia import PersistenciaJSON
+                    self._persistencia = PersistenciaJSON("clientes.json")
+        return self._persistencia
+    
+    @persistencia.setter
+    def persistencia(self, persistencia):
+        self._persistencia = persistencia
+    
+    def preparar(self):
+        """
+        Crea los índices, carga los clientes del archivo y abre los logs
+        ahora, en vez de en el primer uso. Sirve para pagar ese costo al
+        arrancar un servicio (y antes de compartir el gestor entre hilos).
+        
+        Retorna:
+            GestorClientes: El mismo gestor, para encadenar
+            
+        Ejemplo:
+            gestor = GestorClientes().preparar()
+        """
+        if self.usar_logs:
+            self.logs
+        self._clientes
+        return self
+    
+    def cerrar(self):
+        """
+        Escribe los logs pendientes y cierra el archivo de logs y la
+        auditoría (si otros gestores usan los mismos archivos, quedan
+        abiertos para ellos). También guarda el filtro de Bloom del
+        archivo de clientes y detiene el perfil de memoria.
+        
+        Si el gestor se sigue usando, los logs se vuelven a abrir.
+        
+        Ejemplo:
+            gestor.cerrar()
+        """
+        with self._candado_inicio:
+            logs, self._logs = self._logs, None
+        if logs is not None:
+            logs.cerrar()
+        if self._persistencia is not None:
+            self._persistencia.guardar_filtro()
+        if self._perfil_memoria is not None:
+            self.desactivar_perfil_memoria()
+    
+    def __getattr__(self, nombre):
+        """
+        Solo se llama cuando el atributo no existe: si es uno de los
+        índices, los crea y carga los clientes del archivo (una sola vez).
+        """
+        if nombre not in _ATRIBUTOS_DATOS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{nombre}'")
+        with self._candado_inicio:
+            if nombre not in self.__dict__:
+                if self.usar_persistencia:
+                    # Intentamos cargar clientes existentes
+                    self._cargar_clientes()
+                else:
+                    self._crear_indices()
+        return self.__dict__[nombre]
     
     # ========== MÉTODOS PARA AGREGAR CLIENTES ==========
     
@@ -86,13 +271,13 @@ class GestorClientes:
         if self._buscar_por_email_interno(cliente.get_email()):
             raise ClienteDuplicadoError(f"Ya existe un cliente con email {cliente.get_email()}")
         
-        # Agregamos el cliente a la lista
-        self._clientes.append(cliente)
+        # Agregamos el cliente al final del orden y a los índices
+        self._agregar_al_orden(cliente)
+        self._indexar(cliente)
         
-        # Registramos en logs
+        # Registramos en logs (el detalle solo se arma si el nivel de logs lo deja pasar)
         if self.usar_logs:
-            tipo = cliente.obtener_resumen().get('tipo_cliente', 'Regular')
-            self.logs.registrar_operacion("Agregar", cliente.get_email(), f"Tipo: {tipo}")
+            self.logs.registrar_operacion("Agregar", cliente.get_email(), lambda: f"Tipo: {cliente.TIPO_CLIENTE}")
         
         # Guardamos en archivo si está habilitada la persistencia
         if self.usar_persistencia:
@@ -100,6 +285,46 @@ class GestorClientes:
         
         print(f"✓ Cliente {cliente.get_nombre()} agregado exitosamente")
     
+    def agregar_multiples(self, clientes, permitir_telefono_duplicado=True):
+        """
+        Agrega muchos clientes de una vez (carga masiva).
+        
+        A diferencia de agregar_cliente, un email duplicado no detiene
+        la carga: se registra como error y se sigue con el siguiente.
+        Los emails se revisan también contra el archivo (con su filtro de
+        Bloom, que casi nunca obliga a leerlo) y los clientes nuevos se
+        escriben una sola vez al final del archivo, sin reescribirlo.
+        
+        Parámetros:
+            clientes: Iterable de objetos Cliente (o sus subclases)
+            permitir_telefono_duplicado (bool): Si False, también se rechazan
+                los clientes cuyo teléfono ya está registrado
+            
+        Retorna:
+            dict: {'agregados': int, 'errores': list}
+                  Cada error es un diccionario {'fila', 'email', 'error'},
+                  donde 'fila' es la posición (desde 1) en el iterable
+            
+        Ejemplo:
+            resultado = gestor.agregar_multiples([cliente1, cliente2])
+            print(resultado['agregados'])
+        """
+        errores = []
+        with _sin_recolector():
+            nuevos = self._agregar_lote(list(enumerate(clientes, 1)), errores, permitir_telefono_duplicado)
+        agregados = len(nuevos)
+        
+        # Guardamos una sola vez
+        if agregados and self.usar_persistencia:
+            self.persistencia.agregar_multiples(nuevos, revisar_existentes=False)
+        
+        if self.usar_logs:
+            self.logs.registrar_operacion("Agregar múltiples", "-",
+                                          f"Agregados: {agregados} | Errores: {len(errores)}")
+        
+        print(f"✓ {agregados} cliente(s) agregados, {len(errores)} con error")
+        return {'agregados': agregados, 'errores': errores}
+    
     # ========== MÉTODOS PARA BUSCAR CLIENTES ==========
     
     def buscar_por_email(self, email):
@@ -127,6 +352,51 @@ class GestorClientes:
         else:
             raise ClienteNoEncontradoError(f"No se encontró cliente con email: {email}")
     
+    def buscar_por_telefono(self, telefono):
+        """
+        Busca los clientes que tienen un teléfono.
+        
+        El teléfono se normaliza antes de buscar, así que
+        '+56 9 1234 5678', '912345678' y '(56)9-1234-5678' encuentran
+        a los mismos clientes.
+        
+        Parámetros:
+            telefono (str): Teléfono en cualquier formato aceptado
+            
+        Retorna:
+            list: Clientes con ese teléfono (vacía si no hay ninguno)
+            
+        Lanza:
+            ValidacionError: Si el teléfono no es válido
+            
+        Ejemplo:
+            clientes = gestor.buscar_por_telefono("+56 9 1234 5678")
+        """
+        return self._por_telefono.obtener(normalizar_telefono(telefono))
+    
+    def buscar_por_rut(self, rut_empresa):
+        """
+        Busca los clientes corporativos (contactos) de una empresa por su RUT.
+        
+        El RUT se normaliza antes de buscar: '76.543.210-3' y
+        '76543210-3' son el mismo RUT. Los RUT antiguos con dígito
+        verificador incorrecto se encuentran igual si hay clientes con
+        ellos; si no hay, el dígito incorrecto es un error.
+        
+        Parámetros:
+            rut_empresa (str): RUT de la empresa con dígito verificador
+            
+        Retorna:
+            list: Clientes corporativos con ese RUT (vacía si no hay)
+            
+        Lanza:
+            ValidacionError: Si el RUT no es válido
+            
+        Ejemplo:
+            contactos = gestor.buscar_por_rut("76.543.210-3")
+        """
+        return self._por_rut.obtener(_clave_rut(rut_empresa, self._totales_empresa))
+    
     def buscar_por_nombre(self, nombre):
         """
         Busca clientes por nombre (búsqueda parcial).
@@ -157,11 +427,76 @@ class GestorClientes:
         print(f"Se encontraron {len(encontrados)} cliente(s) con nombre '{nombre}'")
         return encontrados
     
+    def buscar_duplicados(self, umbral=0.72):
+        """
+        Busca clientes que probablemente están registrados dos veces
+        (nombre con errores, otro email, mismo teléfono...).
+        
+        Solo compara clientes que comparten teléfono, usuario de email o
+        sonido del nombre, así que no compara todos contra todos. Para
+        revisar solo los clientes nuevos de forma incremental use
+        DetectorDuplicados directamente.
+        
+        Parámetros:
+            umbral (float): Puntaje mínimo de similitud (0 a 1)
+            
+        Retorna:
+            list: Grupos [{'clientes', 'puntaje', 'pares'}], del más probable al menos
+            
+        Ejemplo:
+            for grupo in gestor.buscar_duplicados():
+                print(grupo['puntaje'], [c.get_email() for c in grupo['clientes']])
+        """
+        detector = DetectorDuplicados(umbral)
+        detector.agregar(self._clientes)
+        grupos = detector.grupos()
+        
+        if self.usar_logs:
+            self.logs.info("Búsqueda de duplicados: %d grupo(s) en %d clientes", len(grupos), len(detector))
+        
+        print(f"Se encontraron {len(grupos)} grupo(s) de posibles duplicados")
+        return grupos
+    
+    def historial_cliente(self, email, desde=None, hasta=None):
+        """
+        Retorna todas las operaciones registradas sobre un cliente, de la
+        más antigua a la más reciente, usando el registro de auditoría.
+        
+        No lee el registro completo: el índice por email indica dónde
+        están los registros del cliente. Funciona también para clientes
+        ya eliminados, y si el cliente cambió de email, aparece en el
+        historial de ambos emails.
+        
+        Parámetros:
+            email (str): Email del cliente
+            desde, hasta: Rango de fechas (incluido) como date, datetime o
+                          texto "AAAA-MM-DD"; None = sin límite
+            
+        Retorna:
+            list: Registros {'fecha', 'operacion', 'email', 'campos', 'detalles'}
+                  ('campos' y 'detalles' solo si los hay). Lista vacía si
+                  el gestor no usa logs o no tiene archivo_auditoria.
+            
+        Lanza:
+            ValidacionError: Si una fecha no es válida
+            
+        Ejemplo:
+            for registro in gestor.historial_cliente("ana@email.com", desde="2024-01-01"):
+                print(registro['fecha'], registro['operacion'], registro.get('campos', {}))
+        """
+        if not self.usar_logs:
+            return []
+        return self.logs.historial_cliente(email, desde, hasta)
+    
     # ========== MÉTODOS PARA LISTAR CLIENTES ==========
     
     def listar_todos(self):
         """
-        Retorna la lista completa de clientes.
+        Retorna una lista con todos los clientes, en orden de llegada.
+        
+        La lista es una copia: modificarla no afecta al gestor. Para
+        recorrer muchos clientes sin copiarlos use iterar() o
+        iterar_clientes().
         
         Retorna:
             list: Lista con todos los clientes
@@ -170,7 +505,86 @@ class GestorClientes:
             clientes = gestor.listar_todos()
             print(f"Total: {len(clientes)} clientes")
         """
-        return self._clientes
+        return list(self._clientes)
+    
+    def iterar(self, pagina=None, tamano=100, desde=None):
+        """
+        Retorna una página de clientes en orden de llegada.
+        
+        Cada cliente recibe un número de secuencia al agregarse que nunca
+        se reutiliza, así que el cursor 'desde' sigue siendo válido aunque
+        entre página y página se agreguen o eliminen clientes: no se
+        repiten ni se saltan clientes. Pedir una página con cursor cuesta
+        O(log n + tamano) y no copia la lista de clientes.
+        
+        Parámetros:
+            pagina (int): Número de página desde 1 (por posición). No se
+                          puede usar junto con 'desde'
+            tamano (int): Cantidad de clientes por página
+            desde (int): Cursor retornado por la página anterior
+                         ('siguiente'); None para empezar desde el inicio
+            
+        Retorna:
+            dict: {
+                'clientes': list,        # clientes de la página
+                'siguiente': int | None, # cursor de la próxima página
+                'total': int,            # total de clientes del gestor
+            }
+            
+        Lanza:
+            ValidacionError: Si tamano o pagina no son enteros positivos,
+                             o si se indican pagina y desde a la vez
+            
+        Ejemplo:
+            respuesta = gestor.iterar(tamano=50)
+            while respuesta['siguiente'] is not None:
+                respuesta = gestor.iterar(tamano=50, desde=respuesta['siguiente'])
+        """
+        if not isinstance(tamano, int) or tamano <= 0:
+            raise ValidacionError("El tamaño de página debe ser un entero positivo")
+        if pagina is not None and desde is not None:
+            raise ValidacionError("Indique 'pagina' o 'desde', no ambos")
+        
+        if pagina is not None:
+            if not isinstance(pagina, int) or pagina <= 0:
+                raise ValidacionError("La página debe ser un entero positivo")
+            candidatos = self._clientes.desde_posicion((pagina - 1) * tamano)
+        elif desde is not None:
+            candidatos = self._clientes.rango(desde=desde + 1)
+        else:
+            candidatos = iter(self._clientes)
+        
+        # Pedimos uno más para saber si hay otra página
+        clientes = list(islice(candidatos, tamano + 1))
+        siguiente = None
+        if len(clientes) > tamano:
+            clientes.pop()
+            siguiente = self._secuencias[id(clientes[-1])]
+        
+        return {'clientes': clientes, 'siguiente': siguiente, 'total': len(self._clientes)}
+    
+    def iterar_clientes(self, desde=None, tamano=500):
+        """
+        Generador que recorre todos los clientes en orden de llegada.
+        
+        Lee por páginas con iterar(), así que se puede agregar o eliminar
+        clientes mientras se recorre: los agregados después aparecen al
+        final y los eliminados antes de llegar a ellos no aparecen.
+        
+        Parámetros:
+            desde (int): Cursor desde donde continuar (None = desde el inicio)
+            tamano (int): Clientes que se leen por página
+            
+        Ejemplo:
+            for cliente in gestor.iterar_clientes():
+                print(cliente.get_email())
+        """
+        while True:
+            respuesta = self.iterar(tamano=tamano, desde=desde)
+            yield from respuesta['clientes']
+            desde = respuesta['siguiente']
+            if desde is None:
+                return
     
     def listar_por_tipo(self, tipo_cliente):
         """
@@ -186,18 +600,252 @@ class GestorClientes:
             premium = gestor.listar_por_tipo("Premium")
             print(f"Clientes premium: {len(premium)}")
         """
-        # Lista para almacenar clientes del tipo buscado
-        filtrados = []
-        
-        # Filtramos por tipo
-        for cliente in self._clientes:
-            tipo = cliente.obtener_resumen().get('tipo_cliente', 'Regular')
-            if tipo == tipo_cliente:
-                filtrados.append(cliente)
+        # Leemos el índice de tipos en vez de recorrer todos los clientes
+        filtrados = list(self._por_tipo.get(tipo_cliente, {}).values())
         
         print(f"Se encontraron {len(filtrados)} cliente(s) de tipo '{tipo_cliente}'")
         return filtrados
     
+    def consultar(self, *condiciones):
+        """
+        Crea una consulta que combina condiciones, orden, límite y desplazamiento.
+        
+        Las condiciones están en src/consultas.py (Tipo, NombreContiene,
+        Dominio, Rango) y se combinan con & (Y) y | (O). Un planificador
+        usa el índice más selectivo y revisa el resto de las condiciones
+        sobre los candidatos; explicar() muestra el plan elegido.
+        
+        Parámetros:
+            *condiciones: Condiciones que deben cumplirse todas
+            
+        Retorna:
+            Consulta: Se recorre con for, o se ejecuta con .ejecutar()
+            
+        Ejemplo:
+            from src.consultas import Tipo, Rango, NombreContiene
+            
+            consulta = (gestor.consultar(Rango('puntos_acumulados', 1000),
+                                         NombreContiene("soto"))
+                        .ordenar_por('puntos_acumulados', descendente=True)
+                        .limite(10))
+            print(consulta.explicar())
+            top = consulta.ejecutar()
+        """
+        return Consulta(self, *condiciones)
+    
+    def listar_por_empresa(self, nombre_empresa):
+        """
+        Lista los clientes corporativos de una empresa por su nombre.
+        
+        La búsqueda no distingue mayúsculas ni espacios al inicio o al final.
+        
+        Parámetros:
+            nombre_empresa (str): Nombre de la empresa
+            
+        Retorna:
+            list: Clientes corporativos de esa empresa
+            
+        Ejemplo:
+            contactos = gestor.listar_por_empresa("Empresa XYZ")
+        """
+        return self._por_empresa.obtener(_clave_empresa(nombre_empresa))
+    
+    def listar_por_dominio(self, dominio):
+        """
+        Lista los clientes cuyo email es de un dominio.
+        
+        Parámetros:
+            dominio (str): Dominio del email, con o sin '@' ("empresa.cl")
+            
+        Retorna:
+            list: Clientes con email en ese dominio
+            
+        Ejemplo:
+            clientes = gestor.listar_por_dominio("@empresa.cl")
+        """
+        return self._por_dominio.obtener(_clave_dominio(dominio))
+    
+    def contar_por_dominio(self, dominio):
+        """
+        Retorna cuántos clientes tienen email en un dominio (sin recorrerlos).
+        
+        Ejemplo:
+            total = gestor.contar_por_dominio("empresa.cl")
+        """
+        return self._por_dominio.contar(_clave_dominio(dominio))
+    
+    def conteo_dominios(self):
+        """
+        Retorna un diccionario dominio -> cantidad de clientes.
+        
+        Ejemplo:
+            for dominio, total in gestor.conteo_dominios().items():
+                print(dominio, total)
+        """
+        indice = self._por_dominio
+        return {dominio: indice.contar(dominio) for dominio in indice.claves()}
+    
+    def resumen_empresa(self, rut_empresa):
+        """
+        Retorna los totales de crédito de una empresa.
+        
+        Los totales se actualizan cada vez que un contacto de la empresa
+        usa o paga crédito, así que leerlos no recorre los clientes.
+        
+        Parámetros:
+            rut_empresa (str): RUT de la empresa
+            
+        Retorna:
+            dict: {'rut_empresa', 'contactos', 'limite_credito',
+                   'credito_utilizado', 'credito_disponible'}
+            
+        Lanza:
+            ValidacionError: Si el RUT no es válido
+            ClienteNoEncontradoError: Si no hay clientes con ese RUT
+            
+        Ejemplo:
+            totales = gestor.resumen_empresa("76.543.210-3")
+            print(totales['credito_disponible'])
+        """
+        self._sincronizar_credito()
+        rut = _clave_rut(rut_empresa, self._totales_empresa)
+        totales = self._totales_empresa.get(rut)
+        if totales is None:
+            raise ClienteNoEncontradoError(f"No hay clientes de la empresa con RUT: {rut_empresa}")
+        
+        resumen = dict(totales)
+        resumen['rut_empresa'] = rut
+        resumen['credito_disponible'] = totales['limite_credito'] - totales['credito_utilizado']
+        return resumen
+    
+    def rango(self, campo, desde=None, hasta=None, descendente=False, limite=None):
+        """
+        Lista los clientes con un valor entre 'desde' y 'hasta' (incluidos).
+        
+        Usa un índice ordenado, así que el costo depende de la cantidad
+        de resultados y no del total de clientes.
+        
+        Parámetros:
+            campo (str): Uno de CAMPOS_RANGO:
+                'puntos_acumulados' (Premium), 'credito_utilizado' y
+                'credito_disponible' (Corporativo), 'fecha_registro'
+                (Regular y Premium)
+            desde: Valor mínimo (None = sin mínimo)
+            hasta: Valor máximo (None = sin máximo)
+            descendente (bool): Si True, de mayor a menor
+            limite (int): Cantidad máxima de resultados (None = todos)
+            
+        Retorna:
+            list: Clientes ordenados por el campo
+            
+        Lanza:
+            ValidacionError: Si el campo no tiene índice
+            
+        Ejemplo:
+            # Premium con entre 1000 y 5000 puntos
+            clientes = gestor.rango('puntos_acumulados', 1000, 5000)
+            # Corporativos con menos de $10.000 disponibles
+            en_riesgo = gestor.rango('credito_disponible', hasta=10000)
+        """
+        resultados = self._indice_rango(campo).rango(desde, hasta, descendente)
+        if limite is not None:
+            resultados = islice(resultados, limite)
+        return list(resultados)
+    
+    def ranking(self, campo='puntos_acumulados', k=100):
+        """
+        Retorna los k clientes con el valor más alto de un campo
+        (por ejemplo, "top 100 Premium por puntos").
+        
+        El índice ordenado del campo se mantiene al día con cada
+        agregar_puntos, canjear_puntos, utilizar_credito y pagar_credito,
+        así que leer el ranking cuesta O(k) y no ordena todos los clientes.
+        
+        Parámetros:
+            campo (str): Uno de CAMPOS_RANGO ('puntos_acumulados',
+                'credito_utilizado', 'credito_disponible', 'fecha_registro')
+            k (int): Cantidad de posiciones
+            
+        Retorna:
+            list: Tuplas (cliente, valor) de mayor a menor
+            
+        Lanza:
+            ValidacionError: Si el campo no tiene índice o k no es válido
+            
+        Ejemplo:
+            for posicion, (cliente, puntos) in enumerate(gestor.ranking(k=10), 1):
+                print(posicion, cliente.get_nombre(), puntos)
+            
+            mayores_deudores = gestor.ranking('credito_utilizado', k=20)
+        """
+        if not isinstance(k, int) or k < 0:
+            raise ValidacionError("k debe ser un entero mayor o igual a 0")
+        return [(cliente, valor) for valor, cliente in self._indice_rango(campo).mayores(k)]
+    
+    def posicion_en_ranking(self, email, campo='puntos_acumulados'):
+        """
+        Retorna la posición de un cliente en el ranking de un campo
+        (1 = valor más alto).
+        
+        Parámetros:
+            email (str): Email del cliente
+            campo (str): Campo del ranking (ver ranking())
+            
+        Retorna:
+            int o None: Posición, o None si el cliente no tiene ese campo
+            
+        Lanza:
+            ClienteNoEncontradoError: Si no existe el cliente
+            
+        Ejemplo:
+            print(gestor.posicion_en_ranking("maria@email.com"))
+        """
+        indice = self._indice_rango(campo)
+        cliente = self.buscar_por_email(email)
+        for campo_cliente, valor in self._valores_rango(cliente):
+            if campo_cliente == campo:
+                return indice.posicion(valor, cliente)
+        return None
+    
+    def estadisticas(self):
+        """
+        Retorna estadísticas de todos los clientes en O(1).
+        
+        Los totales se mantienen al día con cada alta, baja y cambio
+        (puntos, nivel, descuento, crédito), así que consultarlos no
+        recorre los clientes.
+        
+        Retorna:
+            dict: {
+                'total_clientes': int,
+                'por_tipo': {'Regular': int, 'Premium': int, 'Corporativo': int},
+                'por_nivel_membresia': {'Bronce': int, 'Plata': int, 'Oro': int},
+                'puntos_total': int, 'puntos_promedio': float,
+                'descuento_promedio_premium': float,
+                'limite_credito_total': float, 'credito_utilizado_total': float,
+                'credito_disponible_total': float,
+            }
+            Los promedios son sobre los clientes Premium (0 si no hay).
+            
+        Ejemplo:
+            stats = gestor.estadisticas()
+            print(stats['por_tipo']['Premium'], stats['puntos_promedio'])
+        """
+        self._sincronizar_credito()
+        totales = self._totales
+        premium = len(self._por_tipo['Premium'])
+        return {
+            'total_clientes': len(self._clientes),
+            'por_tipo': {tipo: len(clientes) for tipo, clientes in self._por_tipo.items()},
+            'por_nivel_membresia': dict(totales['por_nivel']),
+            'puntos_total': totales['puntos'],
+            'puntos_promedio': totales['puntos'] / premium if premium else 0.0,
+            'descuento_promedio_premium': totales['descuento'] / premium if premium else 0.0,
+            'limite_credito_total': totales['limite_credito'],
+            'credito_utilizado_total': totales['credito_utilizado'],
+            'credito_disponible_total': totales['limite_credito'] - totales['credito_utilizado'],
+        }
+    
     def mostrar_resumen(self):
         """
         Muestra un resumen de todos los clientes registrados.
@@ -210,11 +858,8 @@ class GestorClientes:
         print("=" * 70)
         print(f"Total de clientes: {len(self._clientes)}")
         
-        # Contamos por tipo
-        tipos = {'Regular': 0, 'Premium': 0, 'Corporativo': 0}
-        for cliente in self._clientes:
-            tipo = cliente.obtener_resumen().get('tipo_cliente', 'Regular')
-            tipos[tipo] = tipos.get(tipo, 0) + 1
+        # Los conteos por tipo vienen de las estadísticas (sin recorrer clientes)
+        tipos = self.estadisticas()['por_tipo']
         
         print(f"  - Clientes Regular:     {tipos['Regular']}")
         print(f"  - Clientes Premium:     {tipos['Premium']}")
@@ -250,16 +895,11 @@ class GestorClientes:
         cliente = self.buscar_por_email(email)
         
         # Actualizamos los campos proporcionados
-        if 'nombre' in kwargs:
-            cliente.set_nombre(kwargs['nombre'])
-        if 'telefono' in kwargs:
-            cliente.actualizar_telefono(kwargs['telefono'])
-        if 'direccion' in kwargs:
-            cliente.actualizar_direccion(kwargs['direccion'])
+        campos = self._aplicar_cambios(cliente, kwargs)
         
-        # Registramos en logs
+        # Registramos en logs (y en la auditoría, con los valores anteriores y nuevos)
         if self.usar_logs:
-            self.logs.registrar_operacion("Actualizar", email, f"Campos: {list(kwargs.keys())}")
+            self.logs.registrar_operacion("Actualizar", email, lambda: f"Campos: {list(kwargs.keys())}", campos)
         
         # Guardamos cambios
         if self.usar_persistencia:
@@ -267,47 +907,266 @@ class GestorClientes:
         
         print(f"✓ Cliente {email} actualizado exitosamente")
     
-    # ========== MÉTODOS PARA ELIMINAR CLIENTES ==========
-    
-    def eliminar_cliente(self, email):
+    def actualizar_multiples(self, emails=None, dominio=None, **kwargs):
         """
-        Elimina un cliente por su email.
+        Actualiza los mismos datos en varios clientes y guarda una sola vez.
+        
+        Los clientes se eligen por una lista de emails o por el dominio
+        de su email (usando el índice de dominios, sin recorrer la lista).
         
         Parámetros:
-            email (str): Email del cliente a eliminar
+            emails (list): Emails de los clientes a actualizar
+            dominio (str): Dominio de email ("empresa.cl") de los clientes a actualizar
+            **kwargs: Datos a actualizar (nombre, telefono, direccion)
             
         Retorna:
-            bool: True si se eliminó, False si no se encontró
+            dict: {'actualizados': int, 'errores': list}
+                  Cada error es un diccionario {'email', 'error'}
+            
+        Lanza:
+            ValidacionError: Si no se indica emails ni dominio
             
         Ejemplo:
-            if gestor.eliminar_cliente("juan@email.com"):
-                print("Cliente eliminado")
+            gestor.actualizar_multiples(dominio="empresa.cl",
+                                        direccion="Av. Apoquindo 3000, Las Condes")
         """
-        # Buscamos el cliente
-        email_buscar = email.lower().strip()
-        
-        # Buscamos y eliminamos
-        for i, cliente in enumerate(self._clientes):
-            if cliente.get_email().lower() == email_buscar:
-                # Eliminamos de la lista
-                eliminado = self._clientes.pop(i)
-                
-                # Registramos en logs
-                if self.usar_logs:
-                    self.logs.registrar_operacion("Eliminar", email, f"Cliente: {eliminado.get_nombre()}")
-                
-                # Guardamos cambios
-                if self.usar_persistencia:
-                    self.guardar_todos()
-                
-                print(f"✓ Cliente {eliminado.get_nombre()} eliminado exitosamente")
-                return True
+        clientes, errores = self._seleccionar(emails, dominio)
+        actualizados = []
         
-        # Si no lo encontramos
-        print(f"✗ No se encontró cliente con email: {email}")
-        return False
+        for cliente in clientes:
+            try:
+                actualizados.append((cliente.get_email(), self._aplicar_cambios(cliente, kwargs)))
+            except ValidacionError as e:
+                errores.append({'email': cliente.get_email(), 'error': str(e)})
+        
+        self._terminar_operacion_multiple("Actualizar múltiples", dominio,
+                                          f"Campos: {list(kwargs.keys())} | Actualizados: {len(actualizados)}",
+                                          actualizados)
+        actualizados = len(actualizados)
+        print(f"✓ {actualizados} cliente(s) actualizados, {len(errores)} con error")
+        return {'actualizados': actualizados, 'errores': errores}
     
-    # ========== MÉTODOS DE PERSISTENCIA ==========
+    def cambiar_dominio(self, dominio_anterior, dominio_nuevo):
+        """
+        Cambia el dominio del email de todos los clientes de un dominio
+        (por ejemplo, cuando una empresa cambia de proveedor de correo).
+        
+        'ana@empresa.cl' pasa a ser 'ana@nuevo.cl'. Los clientes cuyo
+        nuevo email ya existe se informan como error y no cambian.
+        
+        Parámetros:
+            dominio_anterior (str): Dominio actual ("empresa.cl")
+            dominio_nuevo (str): Dominio nuevo ("nuevo.cl")
+            
+        Retorna:
+            dict: {'actualizados': int, 'errores': list}
+            
+        Ejemplo:
+            gestor.cambiar_dominio("empresa.cl", "empresa.com")
+        """
+        dominio_nuevo = _clave_dominio(dominio_nuevo)
+        clientes, errores = self._seleccionar(None, dominio_anterior)
+        actualizados = []
+        
+        for cliente in clientes:
+            anterior = cliente.get_email()
+            usuario = anterior.rsplit('@', 1)[0]
+            try:
+                # set_email avisa al gestor, que mueve el cliente en los índices
+                cliente.set_email(f"{usuario}@{dominio_nuevo}")
+                actualizados.append((cliente.get_email(), {'email': [anterior, cliente.get_email()]}))
+            except (ValidacionError, ClienteDuplicadoError) as e:
+                errores.append({'email': cliente.get_email(), 'error': str(e)})
+        
+        self._terminar_operacion_multiple("Cambiar dominio", dominio_anterior,
+                                          f"Nuevo: {dominio_nuevo} | Actualizados: {len(actualizados)}",
+                                          actualizados)
+        actualizados = len(actualizados)
+        print(f"✓ {actualizados} email(s) cambiados a @{dominio_nuevo}, {len(errores)} con error")
+        return {'actualizados': actualizados, 'errores': errores}
+    
+    def recalcular_niveles(self, reglas=None, procesos=None, tamano_bloque=50000):
+        """
+        Recalcula el nivel de membresía y el descuento de todos los
+        clientes Premium según reglas de puntos (ver MotorNiveles).
+        
+        Solo se modifican los clientes cuyo nivel o descuento cambia, y
+        se guarda una sola vez al final.
+        
+        Parámetros:
+            reglas (list): Reglas de nivel (None = REGLAS_NIVEL)
+            procesos (int): Procesos para repartir el cálculo (None = uno)
+            tamano_bloque (int): Clientes por bloque
+            
+        Retorna:
+            dict: Reporte con 'revisados', 'cambiados', 'transiciones',
+                  'cambios' y 'segundos' (ver MotorNiveles.recalcular)
+            
+        Lanza:
+            ValidacionError: Si las reglas no son válidas
+            
+        Ejemplo:
+            reporte = gestor.recalcular_niveles(procesos=4)
+            print(reporte['transiciones'])   # {'Bronce->Plata': 120, ...}
+        """
+        motor = MotorNiveles(reglas)
+        reporte = motor.recalcular(self._por_tipo['Premium'].values(), procesos, tamano_bloque)
+        
+        transiciones = ", ".join(f"{clave}: {total}" for clave, total in reporte['transiciones'].items())
+        self._terminar_operacion_multiple("Recalcular niveles", None,
+                                          f"Revisados: {reporte['revisados']} | "
+                                          f"Cambiados: {reporte['cambiados']} | {transiciones or 'sin cambios de nivel'}",
+                                          [(cambio['email'], _campos_cambiados(cambio)) for cambio in reporte['cambios']])
+        print(f"✓ {reporte['cambiados']} de {reporte['revisados']} cliente(s) Premium cambiaron de nivel o descuento")
+        return reporte
+    
+    # ========== MÉTODOS PARA ELIMINAR CLIENTES ==========
+    
+    def eliminar_cliente(self, email):
+        """
+        Elimina un cliente por su email.
+        
+        Parámetros:
+            email (str): Email del cliente a eliminar
+            
+        Retorna:
+            bool: True si se eliminó, False si no se encontró
+            
+        Ejemplo:
+            if gestor.eliminar_cliente("juan@email.com"):
+                print("Cliente eliminado")
+        """
+        # Buscamos el cliente en el índice
+        eliminado = self._por_email.get(email.lower().strip())
+        
+        # Si no lo encontramos
+        if eliminado is None:
+            print(f"✗ No se encontró cliente con email: {email}")
+            return False
+        
+        # Eliminamos del orden y de los índices
+        self._quitar_del_orden(eliminado)
+        self._desindexar(eliminado)
+        
+        # Registramos en logs
+        if self.usar_logs:
+            self.logs.registrar_operacion("Eliminar", email, lambda: f"Cliente: {eliminado.get_nombre()}")
+        
+        # Guardamos cambios
+        if self.usar_persistencia:
+            self.guardar_todos()
+        
+        print(f"✓ Cliente {eliminado.get_nombre()} eliminado exitosamente")
+        return True
+    
+    def eliminar_multiples(self, emails=None, dominio=None):
+        """
+        Elimina varios clientes de una vez y guarda una sola vez.
+        
+        Parámetros:
+            emails (list): Emails de los clientes a eliminar
+            dominio (str): Dominio de email de los clientes a eliminar
+            
+        Retorna:
+            dict: {'eliminados': int, 'errores': list}
+                  Los emails que no existen se informan en 'errores'
+            
+        Lanza:
+            ValidacionError: Si no se indica emails ni dominio
+            
+        Ejemplo:
+            gestor.eliminar_multiples(dominio="empresa-cerrada.cl")
+        """
+        clientes, errores = self._seleccionar(emails, dominio)
+        
+        for cliente in clientes:
+            self._quitar_del_orden(cliente)
+            self._desindexar(cliente)
+        
+        self._terminar_operacion_multiple("Eliminar múltiples", dominio,
+                                          f"Eliminados: {len(clientes)}",
+                                          [(cliente.get_email(), None) for cliente in clientes])
+        print(f"✓ {len(clientes)} cliente(s) eliminados")
+        return {'eliminados': len(clientes), 'errores': errores}
+    
+    # ========== MÉTODOS DE IMPORTACIÓN / EXPORTACIÓN CSV ==========
+    
+    def importar_csv(self, nombre_archivo, tamano_lote=5000, permitir_telefono_duplicado=True):
+        """
+        Importa clientes desde un archivo CSV.
+        
+        El archivo se lee por lotes de 'tamano_lote' filas; cada lote se
+        valida y se agrega con la carga masiva. La columna 'tipo_cliente'
+        indica si la fila es Regular, Premium o Corporativo.
+        Las filas inválidas o duplicadas se informan en 'errores' sin
+        detener la importación.
+        
+        Parámetros:
+            nombre_archivo (str): Ruta del archivo CSV
+            tamano_lote (int): Filas por lote
+            permitir_telefono_duplicado (bool): Si False, las filas con un
+                teléfono ya registrado se informan como error
+            
+        Retorna:
+            dict: {'agregados': int, 'errores': list}
+                  Cada error es un diccionario {'fila', 'email', 'error'},
+                  donde 'fila' es la línea del archivo CSV
+            
+        Lanza:
+            PersistenciaError: Si el archivo no se puede leer
+            
+        Ejemplo:
+            resultado = gestor.importar_csv("crm.csv")
+            for error in resultado['errores']:
+                print(error['fila'], error['error'])
+        """
+        lector = PersistenciaCSV(nombre_archivo, tamano_lote)
+        nuevos = []
+        errores = []
+        
+        with _sin_recolector():
+            for clientes_lote, errores_lote in lector.importar_lotes():
+                errores.extend(errores_lote)
+                nuevos.extend(self._agregar_lote(clientes_lote, errores, permitir_telefono_duplicado))
+        agregados = len(nuevos)
+        
+        # Guardamos una sola vez al final de la importación (al final del archivo)
+        if agregados and self.usar_persistencia:
+            self.persistencia.agregar_multiples(nuevos, revisar_existentes=False)
+        
+        if self.usar_logs:
+            self.logs.registrar_operacion("Importar CSV", "-",
+                                          f"Archivo: {nombre_archivo} | Agregados: {agregados} | "
+                                          f"Errores: {len(errores)}")
+        
+        print(f"✓ Importación CSV: {agregados} cliente(s) agregados, {len(errores)} con error")
+        return {'agregados': agregados, 'errores': errores}
+    
+    def exportar_csv(self, nombre_archivo):
+        """
+        Exporta todos los clientes a un archivo CSV.
+        
+        Parámetros:
+            nombre_archivo (str): Ruta del archivo CSV
+            
+        Retorna:
+            int: Cantidad de clientes exportados
+            
+        Lanza:
+            PersistenciaError: Si el archivo no se puede escribir
+            
+        Ejemplo:
+            gestor.exportar_csv("crm.csv")
+        """
+        total = PersistenciaCSV(nombre_archivo).exportar(self._clientes)
+        
+        if self.usar_logs:
+            self.logs.info("Se exportaron %d clientes a %s", total, nombre_archivo)
+        
+        print(f"✓ {total} cliente(s) exportados a {nombre_archivo}")
+        return total
+    
+    # ========== MÉTODOS DE PERSISTENCIA ==========
     
     def guardar_todos(self):
         """
@@ -319,22 +1178,241 @@ class GestorClientes:
         if self.usar_persistencia:
             self.persistencia.guardar_multiples(self._clientes)
             if self.usar_logs:
-                self.logs.info(f"Se guardaron {len(self._clientes)} clientes en archivo")
+                self.logs.info("Se guardaron %d clientes en archivo", len(self._clientes))
         else:
             print("Persistencia deshabilitada")
     
+    # ========== MÉTRICAS ==========
+    
+    def activar_metricas(self):
+        """
+        Empieza a medir la latencia de las operaciones de OPERACIONES_MEDIDAS
+        (y de las de PersistenciaJSON, junto con bytes leídos/escritos y fsync).
+        
+        Solo se reemplazan los métodos de ESTE gestor por versiones que
+        miden (menos de un microsegundo por llamada); otros gestores, y
+        este mismo después de desactivar_metricas(), no pagan nada.
+        
+        Retorna:
+            Metricas: El objeto donde se acumulan las métricas
+            
+        Ejemplo:
+            gestor.activar_metricas()
+            ...
+            print(gestor.metricas()['operaciones']['gestor.buscar_por_email']['p99_segundos'])
+        """
+        if self._metricas is not None:
+            return self._metricas
+        self._metricas = Metricas()
+        self._metricas.instrumentar(self, self.OPERACIONES_MEDIDAS, "gestor.")
+        if self.usar_persistencia:
+            self._metricas.instrumentar(self.persistencia, self.persistencia.OPERACIONES_MEDIDAS, "persistencia.")
+            self.persistencia.metricas = self._metricas
+        return self._metricas
+    
+    def desactivar_metricas(self):
+        """
+        Deja de medir y devuelve los métodos originales.
+        
+        Retorna:
+            dict: Las métricas acumuladas hasta ahora (ver metricas())
+        """
+        if self._metricas is None:
+            return {}
+        resumen = self._metricas.resumen()
+        self._metricas.desinstrumentar()
+        if self.usar_persistencia:
+            self.persistencia.metricas = None
+        self._metricas = None
+        return resumen
+    
+    def metricas(self):
+        """
+        Retorna una foto de las métricas: por operación, llamadas, errores y
+        latencias en segundos (promedio, p50, p95, p99 y máximo); además,
+        bytes leídos y escritos y cantidad de fsync.
+        
+        Retorna:
+            dict: Ver Metricas.resumen() (vacío si las métricas no están activas)
+        """
+        return self._metricas.resumen() if self._metricas is not None else {}
+    
+    def metricas_prometheus(self):
+        """
+        Retorna las métricas en el formato de texto de Prometheus, listo
+        para servir en /metrics o escribir en un archivo del node exporter.
+        """
+        if self._metricas is None:
+            return ""
+        return exportar_prometheus(self._metricas)
+    
+    # ========== MEMORIA ==========
+    
+    def reporte_memoria(self):
+        """
+        Reparte la memoria del gestor entre sus partes, recorriendo los
+        objetos (sys.getsizeof de cada objeto alcanzable, lo compartido
+        se cuenta una sola vez, en la primera parte que lo alcanza):
+            - clientes: por clase, cantidad, bytes y promedio por cliente
+              (el objeto, sus atributos y sus textos)
+            - lista: el orden de llegada (sin los clientes)
+            - indices: bytes de cada índice (sin los clientes)
+            - caches: totales precalculados y métricas
+            - persistencia: el objeto de persistencia y su filtro de Bloom
+        
+        Los logs no se incluyen (su memoria es casi toda de logging).
+        Si el perfil de memoria está activo, se agrega 'tracemalloc' con
+        los bytes vivos por componente según dónde se asignaron (ver
+        PerfilMemoria): ahí los textos que un cliente guardó tal como
+        los leyó json.load cuentan como 'persistencia', no como 'clientes'.
+        
+        El recorrido toma del orden de 2 segundos cada 100.000 clientes.
+        
+        Retorna:
+            dict: {'clientes': {...}, 'lista', 'indices': {...}, 'caches': {...},
+                   'persistencia', 'total_bytes'[, 'tracemalloc': {...}]}
+            
+        Ejemplo:
+            reporte = gestor.reporte_memoria()
+            print(reporte['clientes']['ClientePremium']['promedio_bytes'])
+        """
+        # Importamos aquí para no cargar tracemalloc (y pickle) al importar el gestor
+        from .memoria import tamano_profundo
+        
+        # La foto de tracemalloc va primero: el recorrido de objetos
+        # también ocupa memoria mientras dura
+        asignado = None
+        if self._perfil_memoria is not None:
+            asignado = self._perfil_memoria.foto("reporte_memoria")
+        
+        # El gestor y las otras partes no se recorren desde los clientes
+        # ni los índices (los métodos instrumentados y los observadores
+        # tampoco: tamano_profundo no entra en funciones ni métodos)
+        persistencia, metricas = self._persistencia, self._metricas
+        visitados = {id(self), id(self._logs), id(persistencia), id(metricas), id(self._perfil_memoria)}
+        
+        with self._candado_indices:
+            clientes = {}
+            for cliente in self._clientes:
+                datos = clientes.get(type(cliente).__name__)
+                if datos is None:
+                    datos = clientes[type(cliente).__name__] = {'cantidad': 0, 'bytes': 0}
+                datos['cantidad'] += 1
+                datos['bytes'] += tamano_profundo(cliente, visitados)
+            for datos in clientes.values():
+                datos['promedio_bytes'] = datos['bytes'] / datos['cantidad']
+            
+            lista = tamano_profundo(self._clientes, visitados) + tamano_profundo(self._secuencias, visitados)
+            indices = {nombre: tamano_profundo(indice, visitados) for nombre, indice in (
+                ('email', self._por_email), ('tipo', self._por_tipo), ('dominio', self._por_dominio),
+                ('telefono', self._por_telefono), ('rut', self._por_rut), ('empresa', self._por_empresa),
+                ('rangos', self._rangos))}
+            caches = {'totales': tamano_profundo(self._totales, visitados),
+                      'totales_empresa': tamano_profundo(self._totales_empresa, visitados),
+                      'metricas': 0}
+        
+        if metricas is not None:
+            visitados.discard(id(metricas))
+            caches['metricas'] = tamano_profundo(metricas, visitados)
+        bytes_persistencia = 0
+        if persistencia is not None:
+            visitados.discard(id(persistencia))
+            bytes_persistencia = tamano_profundo(persistencia, visitados)
+        
+        reporte = {
+            'clientes': clientes,
+            'lista': lista,
+            'indices': indices,
+            'caches': caches,
+            'persistencia': bytes_persistencia,
+            'total_bytes': (sum(datos['bytes'] for datos in clientes.values()) + lista + sum(indices.values())
+                            + sum(caches.values()) + bytes_persistencia),
+        }
+        if asignado is not None:
+            reporte['tracemalloc'] = asignado
+        return reporte
+    
+    def activar_perfil_memoria(self, marcos=5):
+        """
+        Activa el modo de perfil de memoria: tracemalloc registra cada
+        asignación (el programa anda varias veces más lento mientras está
+        activo) y se pueden tomar fotos con foto_memoria() y compararlas
+        con diferencia_memoria().
+        
+        Parámetros:
+            marcos (int): Marcos de la traza que se guardan por asignación
+            
+        Retorna:
+            PerfilMemoria: El perfil donde se guardan las fotos
+            
+        Ejemplo:
+            gestor.activar_perfil_memoria()
+            gestor.foto_memoria("antes")
+            gestor.importar_csv("clientes.csv")
+            print(gestor.diferencia_memoria("antes"))
+        """
+        if self._perfil_memoria is None:
+            from .memoria import PerfilMemoria
+            self._perfil_memoria = PerfilMemoria(marcos).iniciar()
+        return self._perfil_memoria
+    
+    def desactivar_perfil_memoria(self):
+        """Detiene tracemalloc (si lo inició este gestor) y descarta las fotos."""
+        if self._perfil_memoria is not None:
+            self._perfil_memoria.detener()
+            self._perfil_memoria = None
+    
+    def foto_memoria(self, nombre):
+        """
+        Toma una foto de la memoria con ese nombre.
+        
+        Retorna:
+            dict: Bytes asignados por componente ('clientes', 'gestor',
+                  'indices', 'persistencia', 'logs', ..., 'otros')
+            
+        Lanza:
+            ValidacionError: Si el perfil de memoria no está activo
+        """
+        if self._perfil_memoria is None:
+            raise ValidacionError("El perfil de memoria no está activo (use activar_perfil_memoria())")
+        return self._perfil_memoria.foto(nombre)
+    
+    def diferencia_memoria(self, desde, hasta=None, agrupar='componente', limite=20):
+        """
+        Compara dos fotos de memoria (ver PerfilMemoria.diferencia).
+        
+        Parámetros:
+            desde (str): Nombre de la foto inicial
+            hasta (str): Nombre de la foto final (None = tomar una ahora)
+            agrupar (str): 'componente', 'archivo' o 'linea'
+            limite (int): Cantidad máxima de lugares
+            
+        Retorna:
+            list: Diccionarios {'lugar', 'bytes', 'diferencia_bytes', ...}
+            
+        Lanza:
+            ValidacionError: Si el perfil no está activo o la foto no existe
+        """
+        if self._perfil_memoria is None:
+            raise ValidacionError("El perfil de memoria no está activo (use activar_perfil_memoria())")
+        return self._perfil_memoria.diferencia(desde, hasta, agrupar, limite)
+    
     def _cargar_clientes(self):
         """
-        Método privado para cargar clientes del archivo al iniciar.
+        Método privado para cargar clientes del archivo (en el primer uso, ver __getattr__).
         """
         try:
             # Cargamos objetos desde el archivo
-            self._clientes = self.persistencia.cargar_objetos()
+            self._reconstruir_indices(self.persistencia.cargar_objetos())
             if self.usar_logs:
-                self.logs.info(f"Se cargaron {len(self._clientes)} clientes desde archivo")
+                self.logs.info("Se cargaron %d clientes desde archivo", len(self._clientes))
+                if self.persistencia.errores_carga:
+                    self.logs.warning("%d clientes del archivo no se pudieron cargar; "
+                                      "no se guardará sobre el archivo hasta corregirlos",
+                                      self.persistencia.errores_carga)
         except Exception as e:
             print(f"Error al cargar clientes: {e}")
-            self._clientes = []
+            self._reconstruir_indices([])
     
     # ========== MÉTODOS PRIVADOS (HELPER) ==========
     
@@ -344,13 +1422,451 @@ class GestorClientes:
         
         Retorna el objeto o None si no se encuentra.
         """
-        email_buscar = email.lower().strip()
+        return self._por_email.get(email.lower().strip())
+    
+    def _aplicar_cambios(self, cliente, cambios):
+        """
+        Método privado que aplica los campos de actualizar_cliente a un cliente.
         
-        for cliente in self._clientes:
-            if cliente.get_email().lower() == email_buscar:
-                return cliente
+        Retorna:
+            dict: Campos que cambiaron {campo: [valor anterior, valor nuevo]}
+        """
+        campos = {}
+        for campo, obtener, actualizar in (
+                ('nombre', cliente.get_nombre, cliente.set_nombre),
+                ('telefono', cliente.get_telefono, cliente.actualizar_telefono),
+                ('direccion', cliente.get_direccion, cliente.actualizar_direccion)):
+            if campo in cambios:
+                anterior = obtener()
+                actualizar(cambios[campo])
+                if obtener() != anterior:
+                    campos[campo] = [anterior, obtener()]
+        return campos
+    
+    def _seleccionar(self, emails, dominio):
+        """
+        Método privado que elige clientes por lista de emails o por dominio.
         
-        return None
+        Cada cliente se elige una sola vez, aunque su email aparezca
+        repetido en la lista (o escrito con otras mayúsculas).
+        
+        Retorna:
+            tuple: (clientes, errores) con los emails no encontrados como errores
+        """
+        if dominio is not None:
+            return self.listar_por_dominio(dominio), []
+        if emails is None:
+            raise ValidacionError("Debe indicar 'emails' o 'dominio'")
+        
+        clientes = []
+        errores = []
+        elegidos = set()
+        for email in emails:
+            cliente = self._buscar_por_email_interno(email)
+            if cliente is None:
+                errores.append({'email': email, 'error': f"No se encontró cliente con email: {email}"})
+            elif id(cliente) not in elegidos:
+                elegidos.add(id(cliente))
+                clientes.append(cliente)
+        return clientes, errores
+    
+    def _terminar_operacion_multiple(self, operacion, dominio, detalles, cambiados):
+        """
+        Método privado que registra en logs y guarda después de una operación múltiple.
+        
+        'cambiados' es la lista de (email, campos) de los clientes
+        modificados, que van uno por uno a la auditoría.
+        """
+        if self.usar_logs:
+            selector = f"@{_clave_dominio(dominio)}" if dominio is not None else "-"
+            self.logs.registrar_operacion(operacion, selector, detalles)
+            self.logs.auditar_varios(operacion, cambiados)
+        if cambiados and self.usar_persistencia:
+            self.guardar_todos()
+    
+    def _agregar_lote(self, numerados, errores, permitir_telefono_duplicado=True):
+        """
+        Método privado de carga masiva: agrega clientes sin imprimir ni
+        guardar por cada uno.
+        
+        Con persistencia, los emails que no están en memoria se revisan
+        también contra el archivo, de una vez para todo el lote (ver
+        PersistenciaJSON.emails_existentes): por ejemplo, los de filas que
+        no se pudieron cargar.
+        
+        Parámetros:
+            numerados: Lista de tuplas (fila, cliente)
+            errores (list): Lista donde se agregan los duplicados encontrados
+            permitir_telefono_duplicado (bool): Si False, rechaza teléfonos repetidos
+            
+        Retorna:
+            list: Los clientes agregados
+        """
+        nuevos = []
+        por_email = self._por_email
+        por_telefono = self._por_telefono
+        en_archivo = ()
+        if self.usar_persistencia:
+            en_archivo = self.persistencia.emails_existentes(
+                [cliente.get_email() for _, cliente in numerados if cliente.get_email() not in por_email])
+        
+        # Emails y teléfonos del lote ya aceptados (los índices se llenan al final)
+        emails_lote = set()
+        telefonos_lote = set()
+        for fila, cliente in numerados:
+            email = cliente.get_email()
+            if email in por_email or email in emails_lote or email in en_archivo:
+                errores.append({'fila': fila, 'email': email,
+                                'error': f"Ya existe un cliente con email {email}"})
+                continue
+            if not permitir_telefono_duplicado:
+                telefono = cliente.get_telefono()
+                if telefono in por_telefono or telefono in telefonos_lote:
+                    errores.append({'fila': fila, 'email': email,
+                                    'error': f"Ya existe un cliente con teléfono {telefono}"})
+                    continue
+                telefonos_lote.add(telefono)
+            emails_lote.add(email)
+            nuevos.append(cliente)
+        
+        # Todos los índices se cargan juntos al final del lote
+        self._indexar_lote(nuevos)
+        if self.usar_logs:
+            self.logs.auditar_varios("Agregar", ((cliente.get_email(), None) for cliente in nuevos))
+        return nuevos
+    
+    def _crear_indices(self):
+        """
+        Método privado que crea los índices vacíos.
+        """
+        # Clientes ordenados por número de secuencia (orden de llegada).
+        # La secuencia nunca se reutiliza: sirve de cursor en iterar()
+        self._clientes = IndiceOrdenado()
+        self._secuencias = {}   # id(cliente) -> secuencia
+        self._ultima_secuencia = 0
+        
+        # Índice email -> cliente
+        self._por_email = {}
+        
+        # Índice tipo -> {id(cliente): cliente} (diccionario para quitar en O(1))
+        self._por_tipo = {'Regular': {}, 'Premium': {}, 'Corporativo': {}}
+        
+        # Índice dominio del email -> clientes
+        self._por_dominio = IndiceAgrupado()
+        
+        # Índice teléfono (E.164) -> clientes
+        self._por_telefono = IndiceAgrupado()
+        
+        # Índices de clientes corporativos: RUT -> clientes y empresa -> clientes
+        self._por_rut = IndiceAgrupado()
+        self._por_empresa = IndiceAgrupado()
+        
+        # Totales de crédito por RUT de empresa
+        self._totales_empresa = {}
+        
+        # Totales de todos los clientes (ver estadisticas)
+        self._totales = {
+            'por_nivel': {'Bronce': 0, 'Plata': 0, 'Oro': 0},
+            'puntos': 0,
+            'descuento': 0.0,
+            'limite_credito': 0.0,
+            'credito_utilizado': 0.0,
+        }
+        
+        # Índices ordenados para consultas por rango (campo -> índice)
+        self._rangos = {campo: IndiceOrdenado() for campo in CAMPOS_RANGO}
+        
+        # Cambios de crédito que todavía no están en los totales ni en los
+        # índices de crédito: id(cliente) -> (cliente, utilizado, límite)
+        # con los valores que sí están (ver _aplicar_credito)
+        self._credito_pendiente = {}
+    
+    def _indexar(self, cliente):
+        """
+        Método privado que agrega un cliente a todos los índices y
+        registra al gestor como observador de sus cambios.
+        """
+        email = cliente.get_email()
+        self._por_email[email] = cliente
+        self._por_tipo[cliente.TIPO_CLIENTE][id(cliente)] = cliente
+        self._por_dominio.agregar(_dominio_de(email), cliente)
+        self._por_telefono.agregar(cliente.get_telefono(), cliente)
+        if isinstance(cliente, ClienteCorporativo):
+            self._indexar_corporativo(cliente, cliente.get_rut_empresa())
+        self._indexar_rangos(cliente)
+        self._sumar_totales(cliente, 1)
+        cliente.agregar_observador(self._observador)
+    
+    def _indexar_lote(self, clientes):
+        """
+        Método privado de la carga masiva: hace lo mismo que _indexar con
+        muchos clientes nuevos, pero índice por índice y separados por
+        clase, en vez de pasar por todos los índices con cada cliente.
+        """
+        if not clientes:
+            return
+        self._agregar_al_orden_lote(clientes)
+        
+        emails = [cliente.get_email() for cliente in clientes]
+        self._por_email.update(zip(emails, clientes))
+        self._por_dominio.agregar_varios(zip(map(_dominio_de, emails), clientes))
+        self._por_telefono.agregar_varios([(cliente.get_telefono(), cliente) for cliente in clientes])
+        
+        premium = [cliente for cliente in clientes if isinstance(cliente, ClientePremium)]
+        corporativos = [cliente for cliente in clientes if isinstance(cliente, ClienteCorporativo)]
+        for cliente in clientes:
+            self._por_tipo[cliente.TIPO_CLIENTE][id(cliente)] = cliente
+        
+        # Premium: totales e índice de puntos
+        totales = self._totales
+        por_nivel = totales['por_nivel']
+        puntos = [cliente.get_puntos_acumulados() for cliente in premium]
+        for cliente in premium:
+            por_nivel[cliente.get_nivel_membresia()] += 1
+        totales['puntos'] += sum(puntos)
+        totales['descuento'] += sum(cliente.get_descuento() for cliente in premium)
+        self._rangos['puntos_acumulados'].agregar_varios(zip(puntos, premium))
+        
+        # Corporativos: RUT, empresa y crédito (por cliente: son los menos)
+        for cliente in corporativos:
+            self._indexar_corporativo(cliente, cliente.get_rut_empresa())
+        limites = [cliente.get_limite_credito() for cliente in corporativos]
+        utilizados = [cliente.get_credito_utilizado() for cliente in corporativos]
+        totales['limite_credito'] += sum(limites)
+        totales['credito_utilizado'] += sum(utilizados)
+        self._rangos['credito_utilizado'].agregar_varios(zip(utilizados, corporativos))
+        # Igual que get_credito_disponible: la clave debe ser idéntica para poder quitarla
+        self._rangos['credito_disponible'].agregar_varios(
+            (cliente.get_credito_disponible(), cliente) for cliente in corporativos)
+        
+        fechadas = CAMPOS_RANGO['fecha_registro']
+        self._rangos['fecha_registro'].agregar_varios(
+            (cliente.get_fecha_registro(), cliente) for cliente in clientes if isinstance(cliente, fechadas))
+        
+        observador = self._observador
+        for cliente in clientes:
+            cliente.agregar_observador(observador)
+    
+    def _desindexar(self, cliente):
+        """
+        Método privado que quita un cliente de todos los índices.
+        """
+        cliente.quitar_observador(self._observador)
+        if isinstance(cliente, ClienteCorporativo):
+            # Los índices deben tener su crédito actual para poder quitarlo
+            self._aplicar_credito(cliente)
+        email = cliente.get_email()
+        self._por_email.pop(email, None)
+        self._por_tipo[cliente.TIPO_CLIENTE].pop(id(cliente), None)
+        self._por_dominio.quitar(_dominio_de(email), cliente)
+        self._por_telefono.quitar(cliente.get_telefono(), cliente)
+        if isinstance(cliente, ClienteCorporativo):
+            self._desindexar_corporativo(cliente, cliente.get_rut_empresa())
+        self._desindexar_rangos(cliente)
+        self._sumar_totales(cliente, -1)
+    
+    def _sumar_totales(self, cliente, signo):
+        """
+        Método privado que suma (signo=1) o resta (signo=-1) los datos
+        del cliente a los totales de estadisticas().
+        """
+        totales = self._totales
+        if isinstance(cliente, ClientePremium):
+            totales['por_nivel'][cliente.get_nivel_membresia()] += signo
+            totales['puntos'] += signo * cliente.get_puntos_acumulados()
+            totales['descuento'] += signo * cliente.get_descuento()
+        elif isinstance(cliente, ClienteCorporativo):
+            totales['limite_credito'] += signo * cliente.get_limite_credito()
+            totales['credito_utilizado'] += signo * cliente.get_credito_utilizado()
+    
+    def _valores_rango(self, cliente):
+        """
+        Método privado que retorna los pares (campo, valor) de los índices
+        ordenados que le corresponden al cliente según su clase.
+        """
+        if isinstance(cliente, ClientePremium):
+            return (('puntos_acumulados', cliente.get_puntos_acumulados()),
+                    ('fecha_registro', cliente.get_fecha_registro()))
+        if isinstance(cliente, ClienteCorporativo):
+            return (('credito_utilizado', cliente.get_credito_utilizado()),
+                    ('credito_disponible', cliente.get_credito_disponible()))
+        if isinstance(cliente, ClienteRegular):
+            return (('fecha_registro', cliente.get_fecha_registro()),)
+        return ()
+    
+    def _indice_rango(self, campo):
+        """
+        Método privado que retorna el índice ordenado de un campo.
+        """
+        indice = self._rangos.get(campo)
+        if indice is None:
+            raise ValidacionError(f"El campo '{campo}' no tiene índice. Use uno de: {list(CAMPOS_RANGO)}")
+        self._sincronizar_credito()
+        return indice
+    
+    def _indexar_rangos(self, cliente):
+        """
+        Método privado que agrega el cliente a sus índices ordenados.
+        """
+        for campo, valor in self._valores_rango(cliente):
+            self._rangos[campo].agregar(valor, cliente)
+    
+    def _desindexar_rangos(self, cliente):
+        """
+        Método privado que quita el cliente de sus índices ordenados.
+        """
+        for campo, valor in self._valores_rango(cliente):
+            self._rangos[campo].quitar(valor, cliente)
+    
+    def _indexar_corporativo(self, cliente, rut):
+        """
+        Método privado que agrega un cliente corporativo a los índices
+        de RUT y empresa, y suma su crédito a los totales de la empresa.
+        """
+        self._por_rut.agregar(rut, cliente)
+        self._por_empresa.agregar(_clave_empresa(cliente.get_nombre_empresa()), cliente)
+        
+        totales = self._totales_empresa.get(rut)
+        if totales is None:
+            totales = {'contactos': 0, 'limite_credito': 0.0, 'credito_utilizado': 0.0}
+            self._totales_empresa[rut] = totales
+        totales['contactos'] += 1
+        totales['limite_credito'] += cliente.get_limite_credito()
+        totales['credito_utilizado'] += cliente.get_credito_utilizado()
+    
+    def _desindexar_corporativo(self, cliente, rut):
+        """
+        Método privado que revierte _indexar_corporativo.
+        """
+        self._por_rut.quitar(rut, cliente)
+        self._por_empresa.quitar(_clave_empresa(cliente.get_nombre_empresa()), cliente)
+        
+        totales = self._totales_empresa[rut]
+        totales['contactos'] -= 1
+        if totales['contactos'] == 0:
+            del self._totales_empresa[rut]
+        else:
+            totales['limite_credito'] -= cliente.get_limite_credito()
+            totales['credito_utilizado'] -= cliente.get_credito_utilizado()
+    
+    def _al_cambiar_cliente(self, cliente, campo, anterior, nuevo):
+        """
+        Método privado (observador) que actualiza los índices cuando
+        cambia un dato de un cliente registrado.
+        """
+        if campo == 'credito_utilizado' or campo == 'limite_credito':
+            # Compras y pagos llegan de muchos hilos con el candado de cada
+            # cliente tomado: no esperan a un candado del gestor. Solo se
+            # anota que el cliente cambió (con los valores que tienen los
+            # índices) y los totales e índices de crédito se ponen al día
+            # al consultarlos (ver _sincronizar_credito)
+            pendientes = self._credito_pendiente
+            if id(cliente) not in pendientes:
+                if campo == 'credito_utilizado':
+                    pendientes[id(cliente)] = (cliente, anterior, cliente.get_limite_credito())
+                else:
+                    pendientes[id(cliente)] = (cliente, cliente.get_credito_utilizado(), anterior)
+            return
+        
+        # Los demás cambios también pueden llegar desde varios hilos: los
+        # índices son compartidos, así que se actualizan de a un cambio a la vez
+        with self._candado_indices:
+            if campo == 'email':
+                otro = self._por_email.get(nuevo)
+                if otro is not None and otro is not cliente:
+                    # Deshacemos el cambio: el email ya es de otro cliente
+                    cliente._email = anterior
+                    raise ClienteDuplicadoError(f"Ya existe un cliente con email {nuevo}")
+                self._por_email.pop(anterior, None)
+                self._por_email[nuevo] = cliente
+                self._por_dominio.mover(_dominio_de(anterior), _dominio_de(nuevo), cliente)
+            elif campo == 'telefono':
+                self._por_telefono.mover(anterior, nuevo, cliente)
+            elif campo == 'puntos_acumulados':
+                self._rangos[campo].mover(anterior, nuevo, cliente)
+                self._totales['puntos'] += nuevo - anterior
+            elif campo == 'fecha_registro':
+                self._rangos[campo].mover(anterior, nuevo, cliente)
+            elif campo == 'nivel_membresia':
+                self._totales['por_nivel'][anterior] -= 1
+                self._totales['por_nivel'][nuevo] += 1
+            elif campo == 'descuento':
+                self._totales['descuento'] += nuevo - anterior
+            elif campo == 'nombre_empresa':
+                self._por_empresa.mover(_clave_empresa(anterior), _clave_empresa(nuevo), cliente)
+            elif campo == 'rut_empresa':
+                # Pasamos el cliente de la empresa anterior a la nueva
+                self._aplicar_credito(cliente)
+                self._desindexar_corporativo(cliente, anterior)
+                self._indexar_corporativo(cliente, nuevo)
+    
+    def _sincronizar_credito(self):
+        """
+        Método privado que pasa a los totales y a los índices de crédito
+        los cambios de crédito anotados por _al_cambiar_cliente.
+        """
+        if self._credito_pendiente:
+            with self._candado_indices:
+                for cliente, _, _ in list(self._credito_pendiente.values()):
+                    self._aplicar_credito(cliente)
+    
+    def _aplicar_credito(self, cliente):
+        """
+        Método privado que pone al día los totales y los índices de crédito
+        de un cliente corporativo con cambios anotados (si no tiene, no hace nada).
+        """
+        # Con el candado del cliente: ningún cambio de crédito queda entre
+        # sacar la anotación y leer los valores actuales
+        with cliente._candado:
+            anotado = self._credito_pendiente.pop(id(cliente), None)
+            if anotado is None:
+                return
+            _, utilizado, limite = anotado
+            utilizado_actual = cliente.get_credito_utilizado()
+            limite_actual = cliente.get_limite_credito()
+        
+        # Sumamos solo la diferencia a los totales de la empresa y generales
+        totales_empresa = self._totales_empresa[cliente.get_rut_empresa()]
+        for campo, diferencia in (('credito_utilizado', utilizado_actual - utilizado),
+                                  ('limite_credito', limite_actual - limite)):
+            totales_empresa[campo] += diferencia
+            self._totales[campo] += diferencia
+        # El disponible se calcula igual que get_credito_disponible
+        # (limite - utilizado) para que la clave del índice sea idéntica
+        self._rangos['credito_utilizado'].mover(utilizado, utilizado_actual, cliente)
+        self._rangos['credito_disponible'].mover(limite - utilizado, limite_actual - utilizado_actual, cliente)
+    
+    def _reconstruir_indices(self, clientes):
+        """
+        Método privado que vuelve a armar el orden y los índices a partir
+        de una lista de clientes.
+        """
+        self._crear_indices()
+        self._indexar_lote(clientes)
+    
+    def _agregar_al_orden(self, cliente):
+        """
+        Método privado que agrega un cliente al final del orden de llegada.
+        """
+        self._ultima_secuencia += 1
+        self._secuencias[id(cliente)] = self._ultima_secuencia
+        self._clientes.agregar(self._ultima_secuencia, cliente)
+    
+    def _agregar_al_orden_lote(self, clientes):
+        """
+        Método privado que agrega varios clientes al final del orden de
+        llegada, con secuencias consecutivas.
+        """
+        secuencias = range(self._ultima_secuencia + 1, self._ultima_secuencia + len(clientes) + 1)
+        self._secuencias.update(zip(map(id, clientes), secuencias))
+        self._clientes.agregar_varios(zip(secuencias, clientes))
+        self._ultima_secuencia += len(clientes)
+    
+    def _quitar_del_orden(self, cliente):
+        """
+        Método privado que quita un cliente del orden de llegada.
+        """
+        self._clientes.quitar(self._secuencias.pop(id(cliente)), cliente)
     
     # ========== MÉTODOS ESPECIALES ==========
     
@@ -365,6 +1881,20 @@ class GestorClientes:
         """
         return len(self._clientes)
     
+    def __enter__(self):
+        """
+        Permite usar el gestor con "with": al salir se llama a cerrar().
+        
+        Ejemplo:
+            with GestorClientes() as gestor:
+                gestor.agregar_cliente(cliente1)
+        """
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+    
     def __str__(self):
         """
         Retorna una representación en texto del gestor.
@@ -373,3 +1903,60 @@ class GestorClientes:
             print(gestor)
         """
         return f"GestorClientes(total={len(self._clientes)} clientes)"
+
+
+
+
+def _clave_rut(rut_empresa, registrados):
+    """
+    Clave del índice de RUT para una búsqueda: el RUT normalizado. El
+    dígito verificador se revisa solo si no hay una empresa registrada
+    con ese RUT (los datos antiguos pueden tener dígitos incorrectos).
+    """
+    clave = normalizar_rut(rut_empresa, verificar_digito=False)
+    if clave not in registrados:
+        normalizar_rut(rut_empresa)
+    return clave
+
+
+@contextmanager
+def _sin_recolector():
+    """
+    Pausa el recolector de ciclos durante una carga masiva. Los miles de
+    clientes nuevos no son basura, pero al crearlos el recolector se
+    dispara una y otra vez y recorre todos los objetos vivos: con 100.000
+    clientes era la mitad del tiempo de _agregar_lote. Al terminar se
+    reactiva (si estaba activo).
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def _clave_empresa(nombre_empresa):
+    """Clave del índice de empresas: sin mayúsculas ni espacios extra."""
+    return " ".join(nombre_empresa.lower().split())
+
+
+def _dominio_de(email):
+    """Dominio de un email ya normalizado ('ana@empresa.cl' -> 'empresa.cl')."""
+    return email[email.rfind('@') + 1:]
+
+
+def _clave_dominio(dominio):
+    """Normaliza un dominio escrito por el usuario ('@Empresa.CL ' -> 'empresa.cl')."""
+    return dominio.strip().lower().lstrip('@')
+
+
+def _campos_cambiados(cambio):
+    """Pasa un cambio de MotorNiveles al formato de campos de la auditoría."""
+    campos = {}
+    if cambio['nivel_nuevo'] != cambio['nivel_anterior']:
+        campos['nivel_membresia'] = [cambio['nivel_anterior'], cambio['nivel_nuevo']]
+    if cambio['descuento_nuevo'] != cambio['descuento_anterior']:
+        campos['descuento'] = [cambio['descuento_anterior'], cambio['descuento_nuevo']]
+    return campos
@@ -0,0 +1,369 @@
+"""
+Índices en memoria - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo contiene las estructuras que usa GestorClientes para
+encontrar clientes sin recorrer la lista completa.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+class IndiceAgrupado:
+    """
+    Índice clave -> clientes, donde varios clientes pueden compartir clave
+    (por ejemplo, un teléfono o una empresa).
+
+    Internamente guarda clave -> cliente cuando la clave es de un solo
+    cliente (el caso normal) y clave -> lista cuando la comparten varios.
+    Así no se crea una lista por cada cliente indexado.
+
+    Ejemplo:
+        indice = IndiceAgrupado()
+        indice.agregar("+56912345678", cliente)
+        indice.obtener("+56912345678")   # [cliente]
+    """
+
+    def __init__(self):
+        self._grupos = {}
+
+    def agregar(self, clave, cliente):
+        """Agrega un cliente al grupo de una clave."""
+        grupos = self._grupos
+        valor = grupos.get(clave)
+        if valor is None:
+            grupos[clave] = cliente
+        elif type(valor) is list:
+            valor.append(cliente)
+        else:
+            grupos[clave] = [valor, cliente]
+
+    def agregar_varios(self, pares):
+        """Agrega muchos pares (clave, cliente) de una vez (carga masiva)."""
+        grupos = self._grupos
+        for clave, cliente in pares:
+            # Una sola búsqueda en el caso normal: la clave todavía no existe
+            valor = grupos.setdefault(clave, cliente)
+            if valor is cliente:
+                continue
+            if type(valor) is list:
+                valor.append(cliente)
+            else:
+                grupos[clave] = [valor, cliente]
+
+    def quitar(self, clave, cliente):
+        """Quita un cliente del grupo de una clave y borra la clave si queda vacía."""
+        grupos = self._grupos
+        valor = grupos.get(clave)
+        if valor is None:
+            return
+        if type(valor) is not list:
+            if valor is cliente:
+                del grupos[clave]
+            return
+        for i, otro in enumerate(valor):
+            if otro is cliente:
+                del valor[i]
+                break
+        if len(valor) == 1:
+            grupos[clave] = valor[0]
+        elif not valor:
+            del grupos[clave]
+
+    def mover(self, anterior, nueva, cliente):
+        """Cambia la clave de un cliente."""
+        self.quitar(anterior, cliente)
+        self.agregar(nueva, cliente)
+
+    def obtener(self, clave):
+        """Retorna una lista nueva con los clientes de la clave (vacía si no hay)."""
+        valor = self._grupos.get(clave)
+        if valor is None:
+            return []
+        if type(valor) is list:
+            return list(valor)
+        return [valor]
+
+    def contar(self, clave):
+        """Retorna cuántos clientes tienen la clave."""
+        valor = self._grupos.get(clave)
+        if valor is None:
+            return 0
+        if type(valor) is list:
+            return len(valor)
+        return 1
+
+    def __contains__(self, clave):
+        return clave in self._grupos
+
+    def __len__(self):
+        """Cantidad de claves distintas."""
+        return len(self._grupos)
+
+    def claves(self):
+        return self._grupos.keys()
+
+
+class IndiceOrdenado:
+    """
+    Índice ordenado por un valor numérico o fecha, para consultas por rango.
+
+    Guarda entradas (valor, id(cliente), cliente) ordenadas en bloques de
+    tamaño acotado, como las hojas de un árbol B: agregar o quitar una
+    entrada solo mueve los elementos de un bloque, y una consulta por
+    rango busca el inicio con bisect y recorre solo los resultados.
+
+    id(cliente) desempata clientes con el mismo valor, así nunca se
+    comparan objetos Cliente entre sí.
+
+    Ejemplo:
+        indice = IndiceOrdenado()
+        indice.agregar(150, cliente)
+        list(indice.rango(100, 200))   # [cliente]
+    """
+
+    # Cantidad máxima de entradas por bloque antes de dividirlo
+    TAMANO_BLOQUE = 512
+
+    def __init__(self):
+        self._bloques = []   # listas ordenadas de entradas
+        self._maximos = []   # última entrada de cada bloque (para bisect)
+        self._total = 0
+
+    def agregar(self, valor, cliente):
+        """Agrega un cliente con su valor."""
+        entrada = (valor, id(cliente), cliente)
+        self._total += 1
+        if not self._bloques:
+            self._bloques.append([entrada])
+            self._maximos.append(entrada)
+            return
+
+        # Bloque donde cae la entrada (el último si es mayor que todos)
+        i = bisect_left(self._maximos, entrada)
+        if i == len(self._bloques):
+            i -= 1
+        bloque = self._bloques[i]
+        insort(bloque, entrada)
+        self._maximos[i] = bloque[-1]
+
+        # Si el bloque creció mucho, lo dividimos en dos
+        if len(bloque) > 2 * self.TAMANO_BLOQUE:
+            mitad = len(bloque) // 2
+            self._bloques[i:i + 1] = [bloque[:mitad], bloque[mitad:]]
+            self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+
+    def agregar_varios(self, pares):
+        """
+        Agrega muchos pares (valor, cliente) de una vez.
+
+        Las entradas nuevas se ordenan y se reparten entre los bloques
+        donde caen (cortando la lista ordenada con bisect en el máximo de
+        cada bloque); cada bloque que recibe entradas se ordena una sola
+        vez (timsort junta las dos partes ya ordenadas) y se divide si
+        creció mucho. Si son muy pocas, se insertan una a una.
+        """
+        entradas = sorted((valor, id(cliente), cliente) for valor, cliente in pares)
+        if not entradas:
+            return
+        if self._agregar_al_final(entradas):
+            return
+        if len(entradas) * 16 < len(self._bloques):
+            for valor, _, cliente in entradas:
+                self.agregar(valor, cliente)
+            return
+
+        tamano = self.TAMANO_BLOQUE
+        bloques = []
+        ultimo = len(self._bloques) - 1
+        inicio = 0
+        for i, (bloque, maximo) in enumerate(zip(self._bloques, self._maximos)):
+            # Van a este bloque las entradas hasta su máximo (al último, todas las que quedan)
+            fin = len(entradas) if i == ultimo else bisect_right(entradas, maximo, inicio)
+            if fin > inicio:
+                bloque.extend(entradas[inicio:fin])
+                bloque.sort()
+                inicio = fin
+            if len(bloque) > 2 * tamano:
+                bloques.extend(bloque[j:j + tamano] for j in range(0, len(bloque), tamano))
+            else:
+                bloques.append(bloque)
+        self._bloques = bloques
+        self._maximos = [bloque[-1] for bloque in bloques]
+        self._total += len(entradas)
+
+    def _agregar_al_final(self, entradas):
+        """
+        Si las entradas ya vienen ordenadas y son todas mayores que la
+        última del índice (por ejemplo, números de secuencia crecientes),
+        las agrega al final rellenando el último bloque y creando bloques
+        nuevos, sin reordenar nada. Retorna False si no se pudo.
+        """
+        if self._maximos and entradas[0] <= self._maximos[-1]:
+            return False
+        anterior = entradas[0]
+        for entrada in entradas:
+            if entrada < anterior:
+                return False
+            anterior = entrada
+
+        tamano = self.TAMANO_BLOQUE
+        inicio = 0
+        if self._bloques and len(self._bloques[-1]) < tamano:
+            inicio = tamano - len(self._bloques[-1])
+            self._bloques[-1].extend(entradas[:inicio])
+            self._maximos[-1] = self._bloques[-1][-1]
+        for i in range(inicio, len(entradas), tamano):
+            bloque = entradas[i:i + tamano]
+            self._bloques.append(bloque)
+            self._maximos.append(bloque[-1])
+        self._total += len(entradas)
+        return True
+
+    def quitar(self, valor, cliente):
+        """Quita un cliente; valor debe ser el valor con que se agregó."""
+        clave = (valor, id(cliente))
+        i = bisect_left(self._maximos, clave)
+        if i == len(self._bloques):
+            return
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, clave)
+        if j == len(bloque) or bloque[j][2] is not cliente:
+            return
+        del bloque[j]
+        self._total -= 1
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+
+    def contar(self, desde=None, hasta=None):
+        """
+        Cuenta los clientes con desde <= valor <= hasta sin recorrerlos:
+        solo suma los tamaños de los bloques anteriores a cada extremo.
+        """
+        fin = self._total if hasta is None else self._posicion((hasta, float('inf')), bisect_right)
+        inicio = 0 if desde is None else self._posicion((desde,), bisect_left)
+        return max(fin - inicio, 0)
+
+    def mayores(self, cantidad):
+        """
+        Retorna [(valor, cliente)] con los 'cantidad' valores más altos,
+        de mayor a menor. Lee desde el final de los bloques: O(cantidad).
+        """
+        resultado = []
+        if cantidad <= 0:
+            return resultado
+        for bloque in reversed(self._bloques):
+            for valor, _, cliente in reversed(bloque):
+                resultado.append((valor, cliente))
+                if len(resultado) == cantidad:
+                    return resultado
+        return resultado
+
+    def posicion(self, valor, cliente):
+        """
+        Posición del cliente contando desde el valor más alto (1 = el mayor),
+        o None si no está en el índice.
+        """
+        clave = (valor, id(cliente))
+        i = bisect_left(self._maximos, clave)
+        if i == len(self._bloques):
+            return None
+        j = bisect_left(self._bloques[i], clave)
+        if j == len(self._bloques[i]) or self._bloques[i][j][2] is not cliente:
+            return None
+        return self._total - (sum(map(len, self._bloques[:i])) + j)
+
+    def _posicion(self, clave, buscar):
+        """Posición global de una clave (bisect_left o bisect_right)."""
+        i = buscar(self._maximos, clave)
+        if i == len(self._bloques):
+            return self._total
+        return sum(map(len, self._bloques[:i])) + buscar(self._bloques[i], clave)
+
+    def mover(self, anterior, nuevo, cliente):
+        """Cambia el valor de un cliente."""
+        self.quitar(anterior, cliente)
+        self.agregar(nuevo, cliente)
+
+    def rango(self, desde=None, hasta=None, descendente=False):
+        """
+        Genera los clientes con desde <= valor <= hasta, ordenados por valor.
+        None en un extremo significa sin límite. El costo es O(log n + k),
+        con k la cantidad de resultados.
+        """
+        if descendente:
+            yield from self._rango_descendente(desde, hasta)
+            return
+
+        if desde is None:
+            i, j = 0, 0
+        else:
+            i = bisect_left(self._maximos, (desde,))
+            if i == len(self._bloques):
+                return
+            j = bisect_left(self._bloques[i], (desde,))
+
+        bloques = self._bloques
+        while i < len(bloques):
+            bloque = bloques[i]
+            while j < len(bloque):
+                entrada = bloque[j]
+                if hasta is not None and entrada[0] > hasta:
+                    return
+                yield entrada[2]
+                j += 1
+            i += 1
+            j = 0
+
+    def _rango_descendente(self, desde, hasta):
+        bloques = self._bloques
+        if hasta is None:
+            i = len(bloques) - 1
+            j = len(bloques[i]) - 1 if bloques else -1
+        else:
+            # Primera entrada con valor > hasta; empezamos justo antes
+            i = bisect_right(self._maximos, (hasta, float('inf')))
+            if i == len(bloques):
+                i -= 1
+            if i < 0:
+                return
+            j = bisect_right(bloques[i], (hasta, float('inf'))) - 1
+            if j < 0:
+                i -= 1
+                j = len(bloques[i]) - 1 if i >= 0 else -1
+
+        while i >= 0:
+            bloque = bloques[i]
+            while j >= 0:
+                entrada = bloque[j]
+                if desde is not None and entrada[0] < desde:
+                    return
+                yield entrada[2]
+                j -= 1
+            i -= 1
+            if i >= 0:
+                j = len(bloques[i]) - 1
+
+    def desde_posicion(self, posicion):
+        """
+        Genera los clientes en orden a partir de la posición indicada
+        (0 = el menor). Salta bloques completos: O(n / TAMANO_BLOQUE + k).
+        """
+        for bloque in self._bloques:
+            if posicion >= len(bloque):
+                posicion -= len(bloque)
+                continue
+            for entrada in bloque[posicion:]:
+                yield entrada[2]
+            posicion = 0
+
+    def __iter__(self):
+        """Recorre los clientes de menor a mayor valor."""
+        return self.rango()
+
+    def __len__(self):
+        return self._total
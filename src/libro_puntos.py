@@ -0,0 +1,512 @@
+"""
+Libro de puntos - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo registra los movimientos de puntos de los clientes Premium
+(acumulación y canje) a alta velocidad y desde varios hilos a la vez.
+
+Cada movimiento se escribe primero en un registro de eventos (un archivo
+de texto al que solo se le agregan líneas) y se suma a un saldo pendiente
+en memoria. Cada cierta cantidad de eventos, o cada cierto tiempo (un
+hilo de fondo lo revisa aunque no lleguen más movimientos), los saldos
+pendientes se consolidan en puntos_acumulados y se guardan con el gestor.
+
+Los puntos se pueden seguir cambiando directamente en el cliente
+(agregar_puntos, canjear_puntos) mientras el libro está abierto: cada
+cliente Premium tiene su candado y la consolidación suma los saldos con
+ese candado tomado, así que no se pierde ningún movimiento.
+
+Al consolidar, los puntos que quedan en cada cliente se escriben en un
+punto de control (<registro>.consolidado) y el registro de eventos se
+cambia por uno vacío; el gestor se guarda después, sin detener a los
+demás hilos, y recién ahí se borra el punto de control. Si el proceso se
+cae antes de borrarlo, al reiniciar se vuelven a asignar esos mismos
+puntos (no se suman), así que ningún evento se aplica dos veces.
+"""
+
+# Importamos los módulos necesarios
+import os
+import threading
+import time
+
+# Importamos nuestras clases
+from .cliente_premium import ClientePremium
+
+# Importamos las excepciones
+from .excepciones import ValidacionError, PersistenciaError
+
+
+# Cantidad de candados (debe ser potencia de 2). Cada cliente usa siempre
+# el mismo, así dos hilos solo se esperan si tocan clientes del mismo grupo.
+CANTIDAD_CANDADOS = 64
+
+
+class LibroPuntos:
+    """
+    Libro de movimientos de puntos de los clientes Premium de un gestor.
+
+    Un movimiento es una tupla (email, puntos): puntos positivos acumulan
+    y negativos canjean. Un canje que deja al cliente con saldo negativo
+    se rechaza.
+
+    Ejemplo:
+        libro = LibroPuntos(gestor, "puntos_eventos.log")
+        libro.registrar_lote([("ana@email.com", 150), ("ana@email.com", -50)])
+        print(libro.saldo("ana@email.com"))   # 100 (más los puntos que ya tenía)
+        libro.cerrar()
+    """
+
+    def __init__(self, gestor, nombre_archivo="puntos_eventos.log",
+                 consolidar_cada=100000, intervalo_consolidacion=60.0, sincronizar=False):
+        """
+        Inicializa el libro y recupera los eventos no consolidados que
+        hayan quedado en el registro (por ejemplo, tras una caída), junto
+        con el punto de control de una consolidación que no alcanzó a
+        terminar.
+
+        Parámetros:
+            gestor: GestorClientes con los clientes Premium
+            nombre_archivo (str): Ruta del registro de eventos
+            consolidar_cada (int): Eventos tras los cuales se consolida solo
+            intervalo_consolidacion (float): Segundos tras los cuales se consolida solo,
+                                             revisados por un hilo de fondo (None
+                                             para no consolidar por tiempo)
+            sincronizar (bool): Si True, fuerza cada lote al disco con os.fsync
+                                (más lento, pero no se pierde nada si se corta la luz)
+
+        Lanza:
+            ValidacionError: Si consolidar_cada no es un entero positivo
+            PersistenciaError: Si no se puede abrir el registro de eventos (o guardar
+                               el gestor al terminar una consolidación pendiente)
+
+        Ejemplo:
+            libro = LibroPuntos(gestor, consolidar_cada=50000)
+        """
+        if not isinstance(consolidar_cada, int) or consolidar_cada <= 0:
+            raise ValidacionError("consolidar_cada debe ser un entero positivo")
+
+        self._gestor = gestor
+        self.nombre_archivo = nombre_archivo
+        self.consolidar_cada = consolidar_cada
+        self.intervalo_consolidacion = intervalo_consolidacion
+        self.sincronizar = sincronizar
+
+        # Saldos pendientes por grupo de candado: {cliente: puntos}
+        self._candados = [threading.Lock() for _ in range(CANTIDAD_CANDADOS)]
+        self._pendientes = [{} for _ in range(CANTIDAD_CANDADOS)]
+        self._candado_archivo = threading.Lock()
+        # Una consolidación a la vez (incluye guardar el gestor)
+        self._candado_consolidacion = threading.Lock()
+        self._eventos_sin_consolidar = 0
+        self._ultima_consolidacion = time.monotonic()
+
+        self._detener = threading.Event()
+        self._hilo = None
+
+        self._archivo_consolidado = nombre_archivo + ".consolidado"
+        self._archivo_anterior = nombre_archivo + ".anterior"
+
+        self.recuperados = self._recuperar()
+        self._terminar_consolidacion()
+        try:
+            self._archivo = open(nombre_archivo, 'a', encoding='utf-8')
+        except OSError as e:
+            raise PersistenciaError(f"Error al abrir el registro de puntos: {str(e)}")
+
+        if intervalo_consolidacion is not None:
+            self._hilo = threading.Thread(target=self._consolidar_por_tiempo, daemon=True,
+                                          name=f"LibroPuntos({nombre_archivo})")
+            self._hilo.start()
+
+    # ========== REGISTRAR MOVIMIENTOS ==========
+
+    def acumular(self, email, puntos):
+        """
+        Suma puntos a un cliente. Retorna True si se registró.
+
+        Ejemplo:
+            libro.acumular("ana@email.com", 100)
+        """
+        return self._registrar_uno(email, puntos)
+
+    def canjear(self, email, puntos):
+        """
+        Descuenta puntos a un cliente. Retorna False si no le alcanzan.
+
+        Ejemplo:
+            if not libro.canjear("ana@email.com", 500):
+                print("Puntos insuficientes")
+        """
+        return self._registrar_uno(email, -puntos if isinstance(puntos, int) else puntos)
+
+    def registrar_lote(self, eventos):
+        """
+        Registra muchos movimientos de una vez.
+
+        Los movimientos de cada cliente se aplican en el orden recibido y
+        de forma atómica respecto de otros hilos. Los movimientos válidos
+        se escriben en el registro con una sola escritura por lote.
+
+        Parámetros:
+            eventos: Iterable de tuplas (email, puntos)
+
+        Retorna:
+            dict: {'aplicados': int, 'errores': list}
+                  errores contiene {'email', 'error'} por cada movimiento rechazado
+                  (y por cada cliente que no se pudo consolidar, si el lote
+                  disparó la consolidación; ver consolidar)
+
+        Lanza:
+            PersistenciaError: Si no se puede escribir el registro (en ese
+                               caso no se aplica ningún movimiento del lote)
+
+        Ejemplo:
+            resultado = libro.registrar_lote([("ana@email.com", 10), ("luis@email.com", -5)])
+        """
+        por_email = self._gestor._por_email
+        grupos = {}
+        errores = []
+
+        for email, puntos in eventos:
+            cliente = por_email.get(email.lower().strip()) if isinstance(email, str) else None
+            if cliente is None:
+                errores.append({'email': email, 'error': "Cliente no encontrado"})
+            elif not isinstance(cliente, ClientePremium):
+                errores.append({'email': email, 'error': "El cliente no es Premium"})
+            elif type(puntos) is not int or puntos == 0:
+                errores.append({'email': email, 'error': "Los puntos deben ser un entero distinto de 0"})
+            else:
+                grupo = (id(cliente) >> 4) & (CANTIDAD_CANDADOS - 1)
+                movimientos = grupos.get(grupo)
+                if movimientos is None:
+                    grupos[grupo] = movimientos = []
+                movimientos.append((cliente, puntos))
+
+        # Tomamos los candados siempre en el mismo orden para no bloquearnos
+        orden = sorted(grupos)
+        for grupo in orden:
+            self._candados[grupo].acquire()
+        try:
+            aplicados = []
+            for grupo in orden:
+                pendientes = self._pendientes[grupo]
+                for cliente, puntos in grupos[grupo]:
+                    actual = pendientes.get(cliente, 0) + puntos
+                    if puntos < 0 and cliente.get_puntos_acumulados() + actual < 0:
+                        errores.append({'email': cliente.get_email(), 'error': "Puntos insuficientes"})
+                        continue
+                    pendientes[cliente] = actual
+                    aplicados.append((grupo, cliente, puntos))
+
+            if aplicados:
+                try:
+                    self._escribir([f"{cliente.get_email()},{puntos}\n" for _, cliente, puntos in aplicados])
+                except PersistenciaError:
+                    # Deshacemos el lote: lo que no quedó escrito no se aplica
+                    for grupo, cliente, puntos in aplicados:
+                        self._pendientes[grupo][cliente] -= puntos
+                    raise
+        finally:
+            for grupo in reversed(orden):
+                self._candados[grupo].release()
+
+        # Si otro hilo ya está consolidando, no lo esperamos
+        if self._toca_consolidar() and self._candado_consolidacion.acquire(blocking=False):
+            try:
+                if self._toca_consolidar():
+                    _, negativos = self._consolidar()
+                    errores.extend({'email': cliente.get_email(),
+                                    'error': "Al consolidar quedaría con saldo negativo (sigue pendiente)"}
+                                   for cliente in negativos)
+            finally:
+                self._candado_consolidacion.release()
+        return {'aplicados': len(aplicados), 'errores': errores}
+
+    # ========== CONSULTAR ==========
+
+    def saldo(self, email):
+        """
+        Retorna los puntos del cliente incluyendo los movimientos aún no
+        consolidados.
+
+        Lanza:
+            ValidacionError: Si el email no es de un cliente Premium del gestor
+
+        Ejemplo:
+            print(libro.saldo("ana@email.com"))
+        """
+        cliente = self._gestor._por_email.get(email.lower().strip())
+        if not isinstance(cliente, ClientePremium):
+            raise ValidacionError(f"No hay un cliente Premium con email {email}")
+        grupo = (id(cliente) >> 4) & (CANTIDAD_CANDADOS - 1)
+        with self._candados[grupo]:
+            return cliente.get_puntos_acumulados() + self._pendientes[grupo].get(cliente, 0)
+
+    def pendientes(self):
+        """Retorna la cantidad de eventos registrados desde la última consolidación."""
+        return self._eventos_sin_consolidar
+
+    # ========== CONSOLIDAR ==========
+
+    def consolidar(self):
+        """
+        Pasa los saldos pendientes a puntos_acumulados de cada cliente,
+        cambia el registro de eventos por uno vacío y guarda el gestor
+        (si usa persistencia).
+
+        Los demás hilos esperan para registrar solo mientras se aplican
+        los saldos y se cambia el registro, no mientras se guarda.
+
+        Si otro código canjeó puntos directamente en un cliente y sus
+        movimientos pendientes lo dejarían con saldo negativo, ese
+        cliente no se consolida: sus movimientos siguen pendientes (y en
+        el registro) y se informa con ValidacionError al terminar.
+
+        Retorna:
+            int: Cantidad de clientes actualizados
+
+        Lanza:
+            ValidacionError: Si algún cliente quedaría con saldo negativo
+            PersistenciaError: Si no se pueden escribir los archivos o guardar el gestor
+
+        Ejemplo:
+            libro.consolidar()
+        """
+        with self._candado_consolidacion:
+            actualizados, negativos = self._consolidar()
+        if negativos:
+            emails = ", ".join(cliente.get_email() for cliente in negativos)
+            raise ValidacionError(f"{len(negativos)} cliente(s) quedarían con saldo negativo al "
+                                  f"consolidar ({emails}); sus movimientos siguen pendientes")
+        return actualizados
+
+    def cerrar(self):
+        """Detiene el hilo de fondo, consolida lo pendiente y cierra el registro de eventos."""
+        if self._archivo.closed:
+            return
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        try:
+            self.consolidar()
+        finally:
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    # ========== MÉTODOS PRIVADOS (HELPER) ==========
+
+    def _registrar_uno(self, email, puntos):
+        return self.registrar_lote(((email, puntos),))['aplicados'] == 1
+
+    def _consolidar_por_tiempo(self):
+        """
+        Hilo de fondo: consolida cuando pasó el intervalo aunque no lleguen
+        más movimientos. Los errores no tienen a quién volver: quedan en
+        los logs del gestor y se reintenta en la siguiente vuelta.
+        """
+        espera = min(self.intervalo_consolidacion, 1.0)
+        while not self._detener.wait(espera):
+            if not self._toca_consolidar() or not self._candado_consolidacion.acquire(blocking=False):
+                continue
+            try:
+                if self._toca_consolidar():
+                    _, negativos = self._consolidar()
+                    if negativos and self._gestor.usar_logs:
+                        self._gestor.logs.registrar_error(
+                            "Consolidar puntos", f"{len(negativos)} cliente(s) quedarían con saldo negativo")
+            except PersistenciaError as e:
+                if self._gestor.usar_logs:
+                    self._gestor.logs.registrar_error("Consolidar puntos", str(e))
+            finally:
+                self._candado_consolidacion.release()
+
+    def _toca_consolidar(self):
+        if self._eventos_sin_consolidar >= self.consolidar_cada:
+            return True
+        return (self.intervalo_consolidacion is not None and self._eventos_sin_consolidar
+                and time.monotonic() - self._ultima_consolidacion >= self.intervalo_consolidacion)
+
+    def _consolidar(self):
+        """
+        Consolida con _candado_consolidacion tomado. Retorna (actualizados,
+        clientes que quedarían con saldo negativo).
+        """
+        for candado in self._candados:
+            candado.acquire()
+        try:
+            finales = {}   # email -> puntos después de consolidar
+            negativos = []
+            for pendientes in self._pendientes:
+                for cliente, puntos in list(pendientes.items()):
+                    if not puntos:
+                        del pendientes[cliente]
+                        continue
+                    # Con el candado del cliente: un agregar_puntos directo
+                    # desde otro hilo no se pierde entre la lectura y la suma
+                    with cliente._candado:
+                        total = cliente.get_puntos_acumulados() + puntos
+                        if total >= 0:
+                            cliente._asignar_puntos(total)
+                    if total < 0:
+                        # Otro código canjeó puntos directamente en el cliente
+                        negativos.append(cliente)
+                        continue
+                    finales[cliente.get_email()] = total
+                    del pendientes[cliente]
+
+            guardar = bool(finales) and self._gestor.usar_persistencia
+            restantes = [f"{cliente.get_email()},{self._pendientes[self._grupo(cliente)][cliente]}\n"
+                         for cliente in negativos]
+            with self._candado_archivo:
+                self._cambiar_registro(finales if guardar else None, restantes)
+                self._eventos_sin_consolidar = len(restantes)
+            self._ultima_consolidacion = time.monotonic()
+        finally:
+            for candado in reversed(self._candados):
+                candado.release()
+
+        if guardar:
+            self._terminar_consolidacion()
+        return len(finales), negativos
+
+    def _cambiar_registro(self, finales, restantes):
+        """
+        Cambia el registro de eventos por uno nuevo que solo tiene las
+        líneas 'restantes'. Si hay 'finales' ({email: puntos}), antes se
+        escribe el punto de control, en este orden:
+            1. <registro>.consolidado.tmp con los puntos finales
+            2. registro -> <registro>.anterior
+            3. .tmp -> <registro>.consolidado
+            4. se borra <registro>.anterior y se crea el registro nuevo
+        Así, tras una caída en cualquier punto, _recuperar sabe si los
+        eventos del registro anterior ya están en el punto de control.
+        """
+        try:
+            self._archivo.close()
+            if finales is not None:
+                temporal = self._archivo_consolidado + ".tmp"
+                # Un punto de control que quedó sin borrar (el gestor no se
+                # pudo guardar) sigue valiendo para los clientes que no cambiaron
+                puntos = self._leer_consolidado()
+                puntos.update(finales)
+                self._escribir_archivo(temporal, [f"{email},{valor}\n" for email, valor in puntos.items()])
+                os.replace(self.nombre_archivo, self._archivo_anterior)
+                os.replace(temporal, self._archivo_consolidado)
+                os.remove(self._archivo_anterior)
+            self._archivo = open(self.nombre_archivo, 'w', encoding='utf-8')
+            if restantes:
+                self._archivo.write("".join(restantes))
+                self._archivo.flush()
+        except OSError as e:
+            raise PersistenciaError(f"Error al cambiar el registro de puntos: {str(e)}")
+
+    def _terminar_consolidacion(self):
+        """
+        Guarda el gestor y borra el punto de control (si hay uno). Se
+        llama después de consolidar y al abrir el libro, por si una
+        consolidación anterior no alcanzó a terminar.
+        """
+        if not os.path.exists(self._archivo_consolidado):
+            return
+        if self._gestor.usar_persistencia:
+            self._gestor.guardar_todos()
+        try:
+            os.remove(self._archivo_consolidado)
+        except OSError as e:
+            raise PersistenciaError(f"Error al borrar el punto de control de puntos: {str(e)}")
+
+    def _escribir_archivo(self, nombre, lineas):
+        """Escribe un archivo completo (y lo fuerza al disco si se pidió sincronizar)."""
+        with open(nombre, 'w', encoding='utf-8') as archivo:
+            archivo.write("".join(lineas))
+            archivo.flush()
+            if self.sincronizar:
+                os.fsync(archivo.fileno())
+
+    def _grupo(self, cliente):
+        return (id(cliente) >> 4) & (CANTIDAD_CANDADOS - 1)
+
+    def _escribir(self, lineas):
+        """Agrega líneas al registro de eventos con una sola escritura."""
+        try:
+            with self._candado_archivo:
+                self._archivo.write("".join(lineas))
+                self._archivo.flush()
+                if self.sincronizar:
+                    os.fsync(self._archivo.fileno())
+                self._eventos_sin_consolidar += len(lineas)
+        except OSError as e:
+            raise PersistenciaError(f"Error al escribir el registro de puntos: {str(e)}")
+
+    def _recuperar(self):
+        """
+        Retoma lo que quedó de una ejecución anterior:
+            - Si hay un punto de control, asigna sus puntos a los clientes
+              (los eventos de <registro>.anterior ya están incluidos).
+            - Si no lo hay pero quedó <registro>.anterior, la consolidación
+              se cortó antes de escribirlo: vuelve a ser el registro.
+            - Los eventos del registro se cargan como pendientes.
+        Las líneas incompletas (por ejemplo, la última si el proceso se
+        cortó a medio escribir) y los clientes que ya no existen se ignoran.
+
+        Retorna la cantidad de eventos recuperados.
+        """
+        por_email = self._gestor._por_email
+        try:
+            if os.path.exists(self._archivo_consolidado + ".tmp"):
+                os.remove(self._archivo_consolidado + ".tmp")
+            if os.path.exists(self._archivo_consolidado):
+                for email, puntos in self._leer_consolidado().items():
+                    cliente = por_email.get(email)
+                    if isinstance(cliente, ClientePremium):
+                        cliente.set_puntos_acumulados(int(puntos))
+                if os.path.exists(self._archivo_anterior):
+                    os.remove(self._archivo_anterior)
+            elif os.path.exists(self._archivo_anterior) and not os.path.exists(self.nombre_archivo):
+                os.replace(self._archivo_anterior, self.nombre_archivo)
+        except (OSError, ValueError) as e:
+            raise PersistenciaError(f"Error al leer el punto de control de puntos: {str(e)}")
+
+        recuperados = 0
+        for cliente, puntos in self._leer_lineas(self.nombre_archivo):
+            pendientes = self._pendientes[self._grupo(cliente)]
+            pendientes[cliente] = pendientes.get(cliente, 0) + puntos
+            recuperados += 1
+
+        self._eventos_sin_consolidar = recuperados
+        return recuperados
+
+    def _leer_consolidado(self):
+        """Retorna {email: puntos} del punto de control (vacío si no existe)."""
+        if not os.path.exists(self._archivo_consolidado):
+            return {}
+        with open(self._archivo_consolidado, 'r', encoding='utf-8') as archivo:
+            return {email: puntos for email, _, puntos in
+                    (linea.rstrip("\n").rpartition(",") for linea in archivo if linea.endswith("\n"))}
+
+    def _leer_lineas(self, nombre):
+        """Recorre las líneas completas 'email,puntos' de un archivo como (cliente Premium, puntos)."""
+        if not os.path.exists(nombre):
+            return
+        por_email = self._gestor._por_email
+        try:
+            with open(nombre, 'r', encoding='utf-8') as archivo:
+                for linea in archivo:
+                    email, _, puntos = linea.rstrip("\n").rpartition(",")
+                    cliente = por_email.get(email)
+                    if not isinstance(cliente, ClientePremium) or not linea.endswith("\n"):
+                        continue
+                    try:
+                        puntos = int(puntos)
+                    except ValueError:
+                        continue
+                    yield cliente, puntos
+        except OSError as e:
+            raise PersistenciaError(f"Error al leer el registro de puntos: {str(e)}")
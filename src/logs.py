@@ -1,62 +1,492 @@
 # Sistema de logs para el proyecto GIC
 
+import atexit
+import collections
+import gzip
 import logging
 import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+
+from .auditoria import RegistroAuditoria
+
+
+# Qué hacer cuando la cola de registros está llena
+POLITICAS_DESBORDE = ('bloquear', 'descartar', 'muestrear')
+
+# Archivos abiertos (logs y auditoría), compartidos por todas las
+# instancias que usan el mismo archivo: clave -> [recurso, instancias].
+# Al terminar el programa se vacían y se cierran los que quedaron abiertos
+_compartidos = {}
+_candado_compartidos = threading.Lock()
+
+
+def _abrir_compartido(clave, crear):
+    """Retorna el recurso de esa clave (creándolo con crear() si no existe) y suma un uso."""
+    with _candado_compartidos:
+        entrada = _compartidos.get(clave)
+        if entrada is None:
+            entrada = _compartidos[clave] = [crear(), 0]
+        entrada[1] += 1
+        return entrada[0]
+
+
+def _soltar_compartido(clave):
+    """Resta un uso del recurso de esa clave y lo cierra si era el último."""
+    with _candado_compartidos:
+        entrada = _compartidos[clave]
+        entrada[1] -= 1
+        if entrada[1] == 0:
+            del _compartidos[clave]
+            entrada[0].cerrar()
+
+
+class _ManejadorCola(QueueHandler):
+    """QueueHandler con cola acotada y política de desborde."""
+
+    def __init__(self, cola, politica, muestreo):
+        super().__init__(cola)
+        self.politica = politica
+        self.muestreo = muestreo
+        self.descartados = 0
+        self._contador = 0
+
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        # El mensaje se arma aquí; el formato con fecha lo hace el hilo de fondo
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        cola = self.queue
+        if self.politica == 'bloquear' or (self.politica == 'muestrear' and record.levelno >= logging.WARNING):
+            # Las advertencias y errores no se pierden nunca al muestrear
+            cola.put(record)
+            return
+        if self.politica == 'muestrear' and cola.qsize() * 2 >= cola.maxsize:
+            # Con la cola a más de la mitad, solo pasa 1 de cada 'muestreo' registros
+            self._contador += 1
+            if self._contador % self.muestreo:
+                self.descartados += 1
+                return
+        try:
+            cola.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+def leer_ultimas_lineas(ruta, cantidad, tamano_bloque=65536):
+    """
+    Retorna las últimas 'cantidad' líneas de un archivo de texto leyendo
+    bloques desde el final: no importa cuánto mida el archivo, solo se
+    lee (y se guarda en memoria) lo necesario.
+    """
+    if cantidad <= 0:
+        return []
+    with open(ruta, 'rb') as archivo:
+        posicion = archivo.seek(0, os.SEEK_END)
+        bloques = []
+        saltos = 0
+        while posicion > 0 and saltos <= cantidad:
+            largo = min(tamano_bloque, posicion)
+            posicion -= largo
+            archivo.seek(posicion)
+            bloque = archivo.read(largo)
+            bloques.append(bloque)
+            saltos += bloque.count(b'\n')
+
+    datos = b''.join(reversed(bloques))
+    if not datos:
+        return []
+    lineas = [linea + b'\n' for linea in datos.split(b'\n')]
+    if datos.endswith(b'\n'):
+        lineas.pop()
+    else:
+        lineas[-1] = lineas[-1][:-1]
+    if posicion > 0:
+        # La primera línea leída puede estar cortada
+        lineas = lineas[1:]
+    return [linea.decode('utf-8', errors='replace') for linea in lineas[-cantidad:]]
+
+
+def _ultimas_lineas_comprimido(ruta, cantidad):
+    # Un .gz no se puede leer desde el final: se recorre guardando solo las últimas
+    with gzip.open(ruta, 'rt', encoding='utf-8', errors='replace') as archivo:
+        return list(collections.deque(archivo, maxlen=cantidad))
+
+
+class _ManejadorArchivoLotes(logging.FileHandler):
+    """
+    FileHandler que no fuerza cada línea al disco (se vacía por lotes) y
+    que rota el archivo al pasar 'tamano_maximo' bytes o 'rotar_cada'
+    segundos: el actual se comprime como <archivo>.1.gz, el .1.gz pasa a
+    .2.gz, etc., y se conservan 'archivos_rotados' archivos.
+    """
+
+    def __init__(self, nombre_archivo, tamano_maximo=None, rotar_cada=None, archivos_rotados=5):
+        super().__init__(nombre_archivo, encoding='utf-8')
+        self.tamano_maximo = tamano_maximo
+        self.rotar_cada = rotar_cada
+        self.archivos_rotados = archivos_rotados
+        self._tamano = os.path.getsize(self.baseFilename)
+        self._proxima_rotacion = None
+        if rotar_cada:
+            # Si ya se rotó antes, contamos desde esa rotación y no desde que arrancó el programa
+            anterior = self.archivo_rotado(1)
+            inicio = os.path.getmtime(anterior) if os.path.exists(anterior) else time.time()
+            self._proxima_rotacion = inicio + rotar_cada
+
+    def archivo_rotado(self, numero):
+        return f"{self.baseFilename}.{numero}.gz"
+
+    def emit(self, record):
+        try:
+            linea = self.format(record) + self.terminator
+            if ((self.tamano_maximo and self._tamano and self._tamano + len(linea) > self.tamano_maximo) or
+                    (self._proxima_rotacion is not None and record.created >= self._proxima_rotacion)):
+                self.rotar()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(linea)
+            # Caracteres, no bytes: alcanza para decidir cuándo rotar
+            self._tamano += len(linea)
+        except Exception:
+            self.handleError(record)
+
+    def rotar(self):
+        """Comprime el archivo actual como .1.gz y empieza uno vacío."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.archivos_rotados > 0:
+            for numero in range(self.archivos_rotados - 1, 0, -1):
+                if os.path.exists(self.archivo_rotado(numero)):
+                    os.replace(self.archivo_rotado(numero), self.archivo_rotado(numero + 1))
+            with open(self.baseFilename, 'rb') as entrada, gzip.open(self.archivo_rotado(1), 'wb') as salida:
+                shutil.copyfileobj(entrada, salida)
+        self.stream = open(self.baseFilename, 'w', encoding='utf-8')
+        self._tamano = 0
+        if self.rotar_cada:
+            self._proxima_rotacion = time.time() + self.rotar_cada
+
+    def limpiar(self):
+        """Vacía el archivo actual y borra los rotados."""
+        with self.lock:
+            if self.stream is not None:
+                self.stream.flush()
+                self.stream.truncate(0)
+            else:
+                open(self.baseFilename, 'w').close()
+            self._tamano = 0
+            for numero in range(1, self.archivos_rotados + 1):
+                if os.path.exists(self.archivo_rotado(numero)):
+                    os.remove(self.archivo_rotado(numero))
+
+
+class _ManejadorMemoria(MemoryHandler):
+    """
+    MemoryHandler que se vacía al llenarse, con un error, o cuando llega un
+    registro y pasaron más de 'intervalo' segundos desde el último vaciado.
+    Reparte los registros a varios manejadores (archivo y consola).
+    """
+
+    def __init__(self, capacidad, intervalo, destinos):
+        super().__init__(capacidad, flushLevel=logging.ERROR, target=destinos[0])
+        self.intervalo = intervalo
+        self.destinos = destinos
+        self._ultimo_vaciado = time.monotonic()
+
+    def shouldFlush(self, record):
+        return (super().shouldFlush(record) or
+                (self.intervalo is not None and time.monotonic() - self._ultimo_vaciado >= self.intervalo))
+
+    def flush(self):
+        with self.lock:
+            for record in self.buffer:
+                for destino in self.destinos:
+                    destino.handle(record)
+            self.buffer.clear()
+            for destino in self.destinos:
+                destino.flush()
+            self._ultimo_vaciado = time.monotonic()
+
+
+class _Escuchador(QueueListener):
+    """QueueListener que vacía los archivos cuando la cola queda vacía."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            if not block:
+                raise
+        # Terminó el lote: lo escribimos y esperamos el siguiente
+        for manejador in self.handlers:
+            manejador.flush()
+        return self.queue.get()
+
+    def enqueue_sentinel(self):
+        # Con la cola llena put_nowait fallaría: esperamos lugar
+        self.queue.put(self._sentinel)
+
+
+class _Destino:
+    """
+    Lo que se abre una sola vez por archivo de logs: el logger
+    ("gic.<ruta del archivo>"), el manejador del archivo (que es el único
+    que lo rota), la consola y el hilo de fondo o el buffer en memoria.
+    """
+
+    def __init__(self, ruta, tamano_cola, politica_desborde, muestreo, mostrar_en_consola,
+                 buffer, intervalo_buffer, tamano_maximo, rotar_cada, archivos_rotados):
+        # Nombre fijo por archivo (sin puntos: logging los usa para la jerarquía)
+        self.logger = logging.getLogger("gic." + ruta.replace('.', '_'))
+        self.logger.propagate = False
+        # El nivel lo filtra cada SistemaLogs: el logger deja pasar todo
+        self.logger.setLevel(logging.DEBUG)
+
+        self.archivo = _ManejadorArchivoLotes(ruta, tamano_maximo, rotar_cada, archivos_rotados)
+        self.archivo.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+        manejadores = [self.archivo]
+        if mostrar_en_consola:
+            consola = logging.StreamHandler(sys.stdout)
+            consola.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+            manejadores.append(consola)
+        self.manejadores = manejadores
+
+        self.cola = None
+        self.escuchador = None
+        if buffer:
+            self.manejador = _ManejadorMemoria(buffer, intervalo_buffer, manejadores)
+        else:
+            self.cola = queue.Queue(maxsize=tamano_cola)
+            self.manejador = _ManejadorCola(self.cola, politica_desborde, muestreo)
+            self.escuchador = _Escuchador(self.cola, *manejadores)
+            self.escuchador.start()
+        self.logger.addHandler(self.manejador)
+
+    def vaciar(self):
+        if self.escuchador is not None:
+            self.cola.join()
+            self.archivo.flush()
+        else:
+            self.manejador.flush()
+
+    def cerrar(self):
+        self.logger.removeHandler(self.manejador)
+        if self.escuchador is not None:
+            self.escuchador.stop()
+            self.escuchador = None
+        self.manejador.close()
+        for manejador in self.manejadores:
+            manejador.flush()
+        self.archivo.close()
 
 
 class SistemaLogs:
-    """Clase para registrar eventos del sistema en un archivo de texto."""
+    """
+    Clase para registrar eventos del sistema en un archivo de texto.
+
+    Cada archivo de logs tiene su propio logger ("gic.<ruta>") que no
+    propaga al logger raíz: instancias con distinto archivo (por ejemplo,
+    una por gestor) escriben cada una en el suyo, y los logs de otras
+    bibliotecas no terminan en el nuestro. Las instancias que usan el
+    mismo archivo comparten el logger, el manejador del archivo y el hilo
+    de fondo: los abre la primera (con sus opciones de cola, buffer,
+    consola y rotación) y los cierra la última en llamar a cerrar().
+    El nivel y el muestreo de operaciones son de cada instancia, y la
+    auditoría se comparte igual que el archivo de logs.
+
+    Por defecto, registrar un evento solo lo pone en una cola; un hilo de
+    fondo escribe los registros en el archivo (y en la consola) por lotes.
+    Si la cola se llena, la política de desborde decide: 'bloquear' espera
+    lugar, 'descartar' pierde el registro y 'muestrear' conserva 1 de cada
+    'muestreo' mensajes informativos (advertencias y errores esperan lugar).
+
+    El archivo rota al pasar 'tamano_maximo' bytes (y, si se indica, cada
+    'rotar_cada' segundos); los anteriores quedan comprimidos como
+    <archivo>.1.gz (el más reciente), <archivo>.2.gz, ... hasta
+    'archivos_rotados'. leer_logs los recorre si hacen falta más líneas.
+
+    Con 'archivo_auditoria', además, cada operación sobre un cliente se
+    guarda como registro JSON con índice por email (ver RegistroAuditoria)
+    y se puede consultar con historial_cliente().
 
-    def __init__(self, nombre_archivo="gic_logs.txt"):
+    Los mensajes solo se arman si el nivel del logger ('nivel', o
+    set_nivel()) los deja pasar: info("Se cargaron %d clientes", total) y
+    registrar_operacion(..., detalles=lambda: ...) no cuestan casi nada
+    con el nivel en WARNING. 'muestreo_operaciones' ({"Agregar": 100})
+    deja pasar solo 1 de cada N mensajes de esas operaciones; la
+    auditoría, en cambio, siempre registra todo.
+
+    Con 'buffer', en cambio, no se crea un hilo: los registros se juntan en
+    un MemoryHandler y se escriben cuando hay 'buffer' registros, llega un
+    error o pasaron 'intervalo_buffer' segundos. Conviene cuando hay muchas
+    instancias a la vez.
+    """
+
+    def __init__(self, nombre_archivo="gic_logs.txt", tamano_cola=10000,
+                 politica_desborde='bloquear', muestreo=10, mostrar_en_consola=True,
+                 buffer=None, intervalo_buffer=5.0, tamano_maximo=10 * 1024 * 1024,
+                 rotar_cada=None, archivos_rotados=5, archivo_auditoria=None,
+                 nivel=logging.INFO, muestreo_operaciones=None):
+        if politica_desborde not in POLITICAS_DESBORDE:
+            raise ValueError(f"La política de desborde debe ser una de: {list(POLITICAS_DESBORDE)}")
+        if buffer is not None and (not isinstance(buffer, int) or buffer <= 0):
+            raise ValueError("El buffer debe ser un entero positivo")
         self.nombre_archivo = nombre_archivo
+        self.nivel = nivel
+        self._muestreo_operaciones = dict(muestreo_operaciones or {})
+        self._conteo_operaciones = {}
 
-        logging.basicConfig(
-            filename=self.nombre_archivo,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        ruta = os.path.abspath(nombre_archivo)
+        self._clave = ('logs', ruta)
+        self._destino = _abrir_compartido(self._clave, lambda: _Destino(
+            ruta, tamano_cola, politica_desborde, muestreo, mostrar_en_consola, buffer,
+            intervalo_buffer, tamano_maximo, rotar_cada, archivos_rotados))
+        self.logger = self._destino.logger
+        self._archivo = self._destino.archivo
+        self._manejador = self._destino.manejador
+
+        self.auditoria = None
+        self._clave_auditoria = None
+        if archivo_auditoria:
+            self._clave_auditoria = ('auditoria', os.path.abspath(archivo_auditoria))
+            try:
+                self.auditoria = _abrir_compartido(self._clave_auditoria,
+                                                   lambda: RegistroAuditoria(archivo_auditoria))
+            except Exception:
+                self._clave_auditoria = None
+                self.cerrar()
+                raise
 
-        self.logger = logging.getLogger()
         self.info("Sistema de logs iniciado")
 
-    def info(self, mensaje):
-        self.logger.info(mensaje)
-        print(f"[INFO] {mensaje}")
+    def info(self, mensaje, *args):
+        if self.nivel <= logging.INFO:
+            self.logger.info(mensaje, *args)
 
-    def error(self, mensaje):
-        self.logger.error(mensaje)
-        print(f"[ERROR] {mensaje}")
+    def error(self, mensaje, *args):
+        if self.nivel <= logging.ERROR:
+            self.logger.error(mensaje, *args)
 
-    def warning(self, mensaje):
-        self.logger.warning(mensaje)
-        print(f"[WARNING] {mensaje}")
+    def warning(self, mensaje, *args):
+        if self.nivel <= logging.WARNING:
+            self.logger.warning(mensaje, *args)
 
-    def registrar_operacion(self, operacion, cliente_email, detalles=""):
-        if detalles:
-            mensaje = f"Operacion: {operacion} | Cliente: {cliente_email} | {detalles}"
-        else:
-            mensaje = f"Operacion: {operacion} | Cliente: {cliente_email}"
-        self.info(mensaje)
+    def set_nivel(self, nivel):
+        """Cambia el nivel mínimo de los mensajes (logging.INFO, logging.WARNING, ...)."""
+        self.nivel = nivel
+
+    def activo(self, nivel=logging.INFO):
+        """True si un mensaje de ese nivel se registraría."""
+        return nivel >= self.nivel
+
+    def registrar_operacion(self, operacion, cliente_email, detalles="", campos=None):
+        """
+        Registra una operación. 'detalles' puede ser un texto o una función
+        sin parámetros que lo arma; la función solo se llama si el mensaje
+        se va a registrar.
+        """
+        if self.nivel <= logging.INFO and self._toca_registrar(operacion):
+            texto = detalles() if callable(detalles) else detalles
+            if texto:
+                self.logger.info("Operacion: %s | Cliente: %s | %s", operacion, cliente_email, texto)
+            else:
+                self.logger.info("Operacion: %s | Cliente: %s", operacion, cliente_email)
+        if self.auditoria is not None and '@' in cliente_email[1:]:
+            # Solo las operaciones sobre un cliente (no "-" ni "@dominio")
+            texto = detalles if isinstance(detalles, str) and detalles else None
+            self.auditoria.registrar(operacion, cliente_email, campos, texto)
+
+    def _toca_registrar(self, operacion):
+        cada = self._muestreo_operaciones.get(operacion)
+        if not cada:
+            return True
+        conteo = self._conteo_operaciones.get(operacion, 0)
+        self._conteo_operaciones[operacion] = conteo + 1
+        return conteo % cada == 0
+
+    def auditar_varios(self, operacion, registros, detalles=None):
+        """
+        Guarda en la auditoría un registro (email, campos) por cliente de una
+        operación múltiple. 'registros' puede ser un generador: si no hay
+        auditoría, no se recorre.
+        """
+        if self.auditoria is not None:
+            self.auditoria.registrar_varios(operacion, registros, detalles)
+
+    def historial_cliente(self, email, desde=None, hasta=None):
+        """Registros de auditoría de un cliente (ver RegistroAuditoria.historial)."""
+        if self.auditoria is None:
+            return []
+        return self.auditoria.historial(email, desde, hasta)
 
     def registrar_error(self, operacion, descripcion_error):
-        self.error(f"Error en {operacion}: {descripcion_error}")
+        self.error("Error en %s: %s", operacion, descripcion_error)
+
+    def descartados(self):
+        """Cantidad de registros del archivo perdidos por la política de desborde."""
+        return getattr(self._manejador, 'descartados', 0)
+
+    def vaciar(self):
+        """Escribe en el archivo todo lo que está en la cola o en el buffer."""
+        if self._destino is not None:
+            self._destino.vaciar()
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y suelta el archivo de logs y la auditoría. Si
+        era la última instancia que los usaba, detiene el hilo de fondo (si
+        hay) y cierra los archivos.
+        """
+        if self._destino is None:
+            return
+        self._destino.vaciar()
+        self._destino = None
+        _soltar_compartido(self._clave)
+        if self._clave_auditoria is not None:
+            _soltar_compartido(self._clave_auditoria)
+            self._clave_auditoria = None
 
     def leer_logs(self, ultimas_lineas=20):
+        self.vaciar()
         if not os.path.exists(self.nombre_archivo):
             print("No hay archivo de logs todavía")
             return []
 
-        with open(self.nombre_archivo, 'r', encoding='utf-8') as archivo:
-            lineas = archivo.readlines()
+        # Mientras leemos, el hilo de fondo no puede rotar el archivo
+        with self._archivo.lock:
+            ultimas = leer_ultimas_lineas(self.nombre_archivo, ultimas_lineas)
+            numero = 1
+            while len(ultimas) < ultimas_lineas and os.path.exists(self._archivo.archivo_rotado(numero)):
+                faltan = ultimas_lineas - len(ultimas)
+                ultimas = _ultimas_lineas_comprimido(self._archivo.archivo_rotado(numero), faltan) + ultimas
+                numero += 1
 
-        ultimas = lineas[-ultimas_lineas:]
         print("\n--- Últimas líneas del log ---")
         for linea in ultimas:
             print(linea.strip())
         return ultimas
 
     def limpiar_logs(self):
-        with open(self.nombre_archivo, 'w', encoding='utf-8') as archivo:
-            pass
+        self.vaciar()
+        self._archivo.limpiar()
         print("Logs limpiados")
+
+
+@atexit.register
+def _cerrar_abiertos():
+    # Al terminar el programa no se pierde lo que quedó en las colas
+    with _candado_compartidos:
+        abiertos = [recurso for recurso, _ in _compartidos.values()]
+        _compartidos.clear()
+    for recurso in abiertos:
+        recurso.cerrar()
@@ -0,0 +1,273 @@
+"""
+Memoria - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo ayuda a saber en qué se va la memoria del sistema, con dos
+herramientas:
+
+- tamano_profundo(): bytes de un objeto y de todo lo que alcanza (sus
+  atributos y contenedores), contando una sola vez lo que se comparte.
+  Es lo que usa GestorClientes.reporte_memoria() para repartir la
+  memoria entre clientes, lista, índices, cachés y persistencia.
+
+- PerfilMemoria: modo de perfil con tracemalloc. Toma fotos de la
+  memoria asignada, la reparte por componente (según el módulo de src
+  que hizo la asignación) y compara dos fotos.
+
+tracemalloc hace más lento todo el programa mientras está activo (con 5
+marcos por traza, agregar clientes tarda unas 5 veces más): es para
+medir, no para dejarlo encendido.
+"""
+
+# Importamos los módulos necesarios
+import itertools
+import os
+import sys
+import tracemalloc
+import types
+import weakref
+from datetime import date, datetime
+
+# Importamos las excepciones
+from .excepciones import ValidacionError
+
+
+# Objetos que no se recorren ni se cuentan: son de todo el programa
+# (clases, módulos, funciones) o llevan a otras partes del sistema (un
+# método ligado lleva a su objeto, por ejemplo el observador al gestor)
+_NO_RECORRER = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.MethodType, types.CodeType, types.FrameType, weakref.ref)
+
+# Valores sin referencias a otros objetos
+_SIMPLES = frozenset((str, int, float, bool, complex, bytes, type(None), date, datetime))
+
+# Componente al que se le cargan las asignaciones hechas en cada módulo de src
+COMPONENTES = {
+    'cliente': 'clientes',
+    'cliente_regular': 'clientes',
+    'cliente_premium': 'clientes',
+    'cliente_corporativo': 'clientes',
+    'validaciones': 'clientes',
+    'gestor_clientes': 'gestor',
+    'indices': 'indices',
+    'consultas': 'indices',
+    'persistencia': 'persistencia',
+    'persistencia_csv': 'persistencia',
+    'filtro_bloom': 'persistencia',
+    'logs': 'logs',
+    'auditoria': 'logs',
+    'metricas': 'metricas',
+    'memoria': 'perfil',
+}
+
+# Formas de agrupar en PerfilMemoria.diferencia()
+AGRUPACIONES = ('componente', 'archivo', 'linea')
+
+_DIRECTORIO_SRC = os.path.dirname(os.path.abspath(__file__))
+
+
+def tamano_profundo(objeto, visitados=None):
+    """
+    Bytes (según sys.getsizeof) de un objeto y de todo lo que alcanza:
+    claves y valores de diccionarios, elementos de listas, tuplas y
+    conjuntos, y atributos de los objetos.
+
+    Los objetos cuyo id está en 'visitados' no se cuentan, y los contados
+    se agregan al conjunto: usando el mismo conjunto en varias llamadas,
+    lo compartido se cuenta una sola vez (en la primera que lo alcanza).
+
+    Ejemplo:
+        visitados = set()
+        tamano_profundo(cliente_a, visitados)
+        tamano_profundo(cliente_b, visitados)   # sin lo que comparte con cliente_a
+    """
+    if visitados is None:
+        visitados = set()
+    tamano = sys.getsizeof
+    simples = _SIMPLES
+    total = 0
+    pendientes = [objeto]
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in visitados or isinstance(actual, _NO_RECORRER):
+            continue
+        visitados.add(id(actual))
+        total += tamano(actual)
+        if isinstance(actual, dict):
+            hijos = itertools.chain(actual.keys(), actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            hijos = actual
+        else:
+            atributos = getattr(actual, '__dict__', None)
+            hijos = () if atributos is None else (atributos,)
+        # Los valores simples (la mayoría) se cuentan aquí mismo, sin
+        # pasar por la pila: el recorrido es bastante más rápido
+        for hijo in hijos:
+            if type(hijo) in simples:
+                identificador = id(hijo)
+                if identificador not in visitados:
+                    visitados.add(identificador)
+                    total += tamano(hijo)
+            else:
+                pendientes.append(hijo)
+    return total
+
+
+def _componente_de_archivo(archivo):
+    """Componente de las asignaciones hechas en un archivo (None si no es de src)."""
+    if os.path.dirname(os.path.abspath(archivo)) != _DIRECTORIO_SRC:
+        return None
+    modulo = os.path.splitext(os.path.basename(archivo))[0]
+    return COMPONENTES.get(modulo, modulo)
+
+
+class PerfilMemoria:
+    """
+    Fotos de la memoria con tracemalloc, repartidas por componente.
+
+    Cada asignación se le carga al componente del módulo de src más
+    cercano en su traza (ver COMPONENTES), o sea, a quien la creó y no a
+    quien la guarda: lo que arma json.load dentro de PersistenciaJSON
+    cuenta como 'persistencia' aunque después lo guarde un cliente, y lo
+    que se crea en Cliente.__init__, como 'clientes'. Lo que no pasa por
+    src queda en 'otros'.
+
+    Ejemplo:
+        perfil = PerfilMemoria().iniciar()
+        perfil.foto("antes")
+        gestor.importar_csv("clientes.csv")
+        perfil.foto("despues")
+        for fila in perfil.diferencia("antes", "despues"):
+            print(fila['lugar'], fila['diferencia_bytes'])
+        perfil.detener()
+    """
+
+    def __init__(self, marcos=5):
+        """
+        Parámetros:
+            marcos (int): Marcos de la traza que guarda tracemalloc por
+                          asignación (con más marcos se reparte mejor,
+                          pero el perfil es más lento)
+        """
+        if not isinstance(marcos, int) or marcos < 1:
+            raise ValidacionError("La cantidad de marcos debe ser un entero positivo")
+        self.marcos = marcos
+        self.fotos = {}
+        self._por_componente = {}   # nombre de la foto -> bytes por componente
+        self._iniciado_aqui = False
+        self._componentes = {}   # archivo -> componente (None si no es de src)
+
+    def iniciar(self):
+        """Empieza a registrar asignaciones (si tracemalloc no estaba activo)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.marcos)
+            self._iniciado_aqui = True
+        return self
+
+    def detener(self):
+        """Deja de registrar (si lo inició este perfil) y descarta las fotos."""
+        if self._iniciado_aqui and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._iniciado_aqui = False
+        self.fotos = {}
+        self._por_componente = {}
+
+    def activo(self):
+        """True si tracemalloc está registrando asignaciones."""
+        return tracemalloc.is_tracing()
+
+    def foto(self, nombre):
+        """
+        Toma una foto de la memoria y la guarda con ese nombre.
+
+        Retorna:
+            dict: Bytes por componente en la foto (ver por_componente)
+
+        Lanza:
+            ValidacionError: Si el perfil no está activo
+        """
+        if not tracemalloc.is_tracing():
+            raise ValidacionError("El perfil de memoria no está activo (use iniciar())")
+        self.fotos[nombre] = tracemalloc.take_snapshot()
+        self._por_componente.pop(nombre, None)
+        return self.por_componente(nombre)
+
+    def por_componente(self, nombre):
+        """
+        Bytes asignados (y todavía vivos) por componente en una foto,
+        de mayor a menor: {'clientes': ..., 'gestor': ..., 'otros': ...}
+        """
+        # Se calcula una vez por foto: recorrer las trazas es lo lento
+        if nombre not in self._por_componente:
+            totales = {}
+            for estadistica in self._foto(nombre).statistics('traceback'):
+                componente = self._componente(estadistica.traceback)
+                totales[componente] = totales.get(componente, 0) + estadistica.size
+            self._por_componente[nombre] = dict(sorted(totales.items(), key=lambda par: par[1], reverse=True))
+        return dict(self._por_componente[nombre])
+
+    def diferencia(self, desde, hasta=None, agrupar='componente', limite=20):
+        """
+        Compara dos fotos: cuánta memoria creció (o se liberó) en cada lugar.
+
+        Parámetros:
+            desde (str): Nombre de la foto inicial
+            hasta (str): Nombre de la foto final (None = tomar una foto ahora)
+            agrupar (str): 'componente', 'archivo' o 'linea' (archivo:línea
+                           donde se hizo la asignación)
+            limite (int): Cantidad máxima de lugares (los que más cambiaron)
+
+        Retorna:
+            list: Diccionarios {'lugar', 'bytes', 'diferencia_bytes'} (y
+                  'bloques' y 'diferencia_bloques' al agrupar por archivo
+                  o línea), del mayor cambio al menor
+
+        Lanza:
+            ValidacionError: Si alguna foto no existe o la agrupación no es válida
+        """
+        if agrupar not in AGRUPACIONES:
+            raise ValidacionError(f"La agrupación debe ser una de: {list(AGRUPACIONES)}")
+        anterior = self._foto(desde)
+        if hasta is None:
+            hasta = f"{desde} (ahora)"
+            self.foto(hasta)
+        posterior = self._foto(hasta)
+
+        if agrupar == 'componente':
+            antes, despues = self.por_componente(desde), self.por_componente(hasta)
+            filas = [{'lugar': componente, 'bytes': despues.get(componente, 0),
+                      'diferencia_bytes': despues.get(componente, 0) - antes.get(componente, 0)}
+                     for componente in set(antes) | set(despues)]
+            filas.sort(key=lambda fila: abs(fila['diferencia_bytes']), reverse=True)
+            return filas[:limite]
+
+        filas = []
+        for estadistica in posterior.compare_to(anterior, 'filename' if agrupar == 'archivo' else 'lineno'):
+            marco = estadistica.traceback[0]
+            lugar = marco.filename if agrupar == 'archivo' else f"{marco.filename}:{marco.lineno}"
+            filas.append({'lugar': lugar, 'bytes': estadistica.size, 'diferencia_bytes': estadistica.size_diff,
+                          'bloques': estadistica.count, 'diferencia_bloques': estadistica.count_diff})
+            if len(filas) == limite:
+                break
+        return filas
+
+    # ========== MÉTODOS PRIVADOS (HELPER) ==========
+
+    def _foto(self, nombre):
+        foto = self.fotos.get(nombre)
+        if foto is None:
+            raise ValidacionError(f"No hay una foto de memoria llamada '{nombre}'")
+        return foto
+
+    def _componente(self, traza):
+        # Del marco más reciente al más antiguo: el primero que es de src
+        componentes = self._componentes
+        for marco in reversed(traza):
+            archivo = marco.filename
+            componente = componentes.get(archivo, False)
+            if componente is False:
+                componente = componentes[archivo] = _componente_de_archivo(archivo)
+            if componente is not None:
+                return componente
+        return 'otros'
@@ -0,0 +1,198 @@
+"""
+Niveles de membresía - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo recalcula el nivel de membresía (Bronce, Plata, Oro) y el
+descuento de los clientes Premium a partir de sus puntos acumulados
+(y, si la regla lo pide, de su antigüedad), según reglas configurables.
+
+El cálculo se hace por bloques y puede repartirse entre varios procesos;
+solo se modifican los clientes cuyo nivel o descuento cambió.
+"""
+
+# Importamos los módulos necesarios
+import time
+from datetime import date
+
+# Importamos las excepciones
+from .excepciones import ValidacionError
+
+# Importamos las validaciones
+from .validaciones import validar_descuento
+
+
+# Reglas por defecto, de la más exigente a la menos exigente.
+# Se asigna la primera regla que el cliente cumple.
+REGLAS_NIVEL = [
+    {'nivel': 'Oro', 'puntos_minimos': 10000, 'descuento': 20.0},
+    {'nivel': 'Plata', 'puntos_minimos': 5000, 'descuento': 15.0},
+    {'nivel': 'Bronce', 'puntos_minimos': 0, 'descuento': 10.0},
+]
+
+NIVELES = ('Bronce', 'Plata', 'Oro')
+
+
+class MotorNiveles:
+    """
+    Motor de reglas para recalcular niveles de membresía.
+
+    Cada regla es un diccionario con:
+        - 'nivel': 'Bronce', 'Plata' u 'Oro'
+        - 'puntos_minimos' (int): puntos necesarios
+        - 'antiguedad_minima_dias' (int, opcional): días desde fecha_registro
+        - 'descuento' (float, opcional): descuento del nivel; si falta, el
+          cliente conserva el suyo
+
+    Ejemplo:
+        motor = MotorNiveles([
+            {'nivel': 'Oro', 'puntos_minimos': 8000, 'antiguedad_minima_dias': 365, 'descuento': 25.0},
+            {'nivel': 'Plata', 'puntos_minimos': 3000, 'descuento': 15.0},
+            {'nivel': 'Bronce', 'puntos_minimos': 0, 'descuento': 10.0},
+        ])
+        motor.calcular(9000)   # ('Plata', 15.0) si no tiene antigüedad
+    """
+
+    def __init__(self, reglas=None):
+        """
+        Inicializa el motor con las reglas (REGLAS_NIVEL si no se indican).
+
+        Lanza:
+            ValidacionError: Si alguna regla no es válida o ninguna regla
+                             acepta 0 puntos (habría clientes sin nivel)
+        """
+        reglas = REGLAS_NIVEL if reglas is None else reglas
+        if not reglas:
+            raise ValidacionError("Debe indicar al menos una regla")
+
+        self.reglas = []
+        for regla in reglas:
+            if regla.get('nivel') not in NIVELES:
+                raise ValidacionError(f"El nivel debe ser uno de: {list(NIVELES)}")
+            puntos = regla.get('puntos_minimos')
+            if not isinstance(puntos, int) or puntos < 0:
+                raise ValidacionError("'puntos_minimos' debe ser un entero no negativo")
+            antiguedad = regla.get('antiguedad_minima_dias', 0)
+            if not isinstance(antiguedad, int) or antiguedad < 0:
+                raise ValidacionError("'antiguedad_minima_dias' debe ser un entero no negativo")
+            descuento = regla.get('descuento')
+            if descuento is not None:
+                validar_descuento(descuento)
+            # Tuplas simples: se copian rápido a los procesos
+            self.reglas.append((regla['nivel'], puntos, antiguedad, descuento))
+
+        if not any(puntos == 0 and antiguedad == 0 for _, puntos, antiguedad, _ in self.reglas):
+            raise ValidacionError("Debe haber una regla con 0 puntos y sin antigüedad mínima")
+
+        self.usa_antiguedad = any(antiguedad for _, _, antiguedad, _ in self.reglas)
+
+    def calcular(self, puntos, antiguedad_dias=0):
+        """Retorna (nivel, descuento) para los puntos y antigüedad dados (descuento None = sin cambio)."""
+        for nivel, minimo, antiguedad, descuento in self.reglas:
+            if puntos >= minimo and antiguedad_dias >= antiguedad:
+                return nivel, descuento
+        # No se llega aquí: __init__ exige una regla que todos cumplen
+        return None, None
+
+    def recalcular(self, clientes, procesos=None, tamano_bloque=50000, hoy=None):
+        """
+        Recalcula el nivel de muchos clientes Premium y aplica los cambios.
+
+        Los datos de cada cliente (puntos, antigüedad, nivel y descuento
+        actuales) se copian a tuplas y se evalúan por bloques; con
+        procesos > 1 los bloques se reparten en un ProcessPoolExecutor.
+        Luego se llama a set_nivel_membresia / set_descuento solo en los
+        clientes que cambian, así los índices y estadísticas del gestor
+        se actualizan por el observador de cada cliente.
+
+        Parámetros:
+            clientes: Lista de ClientePremium
+            procesos (int): Cantidad de procesos (None o 1 = en este proceso)
+            tamano_bloque (int): Clientes por bloque
+            hoy (date): Fecha para calcular la antigüedad (por defecto, hoy)
+
+        Retorna:
+            dict: {
+                'revisados': int,
+                'cambiados': int,
+                'transiciones': {'Bronce->Plata': int, ...},
+                'cambios': [{'email', 'nivel_anterior', 'nivel_nuevo',
+                             'descuento_anterior', 'descuento_nuevo'}],
+                'segundos': float,
+            }
+
+        Ejemplo:
+            reporte = MotorNiveles().recalcular(premium, procesos=4)
+            print(reporte['transiciones'])
+        """
+        if not isinstance(tamano_bloque, int) or tamano_bloque <= 0:
+            raise ValidacionError("El tamaño de bloque debe ser un entero positivo")
+        inicio = time.perf_counter()
+
+        clientes = list(clientes)
+        datos = self._extraer(clientes, hoy or date.today())
+        bloques = [(i, datos[i:i + tamano_bloque], self.reglas)
+                   for i in range(0, len(datos), tamano_bloque)]
+
+        if procesos and procesos > 1 and len(bloques) > 1:
+            # Importamos aquí para no cargar multiprocessing en el uso normal
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                resultados = list(ejecutor.map(_calcular_bloque, bloques))
+        else:
+            resultados = [_calcular_bloque(bloque) for bloque in bloques]
+
+        cambios = []
+        transiciones = {}
+        for resultado in resultados:
+            for indice, nivel, descuento in resultado:
+                cliente = clientes[indice]
+                nivel_anterior = cliente.get_nivel_membresia()
+                descuento_anterior = cliente.get_descuento()
+                if nivel != nivel_anterior:
+                    cliente.set_nivel_membresia(nivel)
+                    clave = f"{nivel_anterior}->{nivel}"
+                    transiciones[clave] = transiciones.get(clave, 0) + 1
+                if descuento != descuento_anterior:
+                    cliente.set_descuento(descuento)
+                cambios.append({
+                    'email': cliente.get_email(),
+                    'nivel_anterior': nivel_anterior, 'nivel_nuevo': nivel,
+                    'descuento_anterior': descuento_anterior, 'descuento_nuevo': descuento,
+                })
+
+        return {
+            'revisados': len(clientes),
+            'cambiados': len(cambios),
+            'transiciones': transiciones,
+            'cambios': cambios,
+            'segundos': time.perf_counter() - inicio,
+        }
+
+    def _extraer(self, clientes, hoy):
+        """Copia los datos que usan las reglas a tuplas (puntos, antigüedad, nivel, descuento)."""
+        if not self.usa_antiguedad:
+            return [(c.get_puntos_acumulados(), 0, c.get_nivel_membresia(), c.get_descuento())
+                    for c in clientes]
+        return [(c.get_puntos_acumulados(), (hoy - c.get_fecha_registro()).days,
+                 c.get_nivel_membresia(), c.get_descuento())
+                for c in clientes]
+
+
+def _calcular_bloque(bloque):
+    """
+    Evalúa un bloque (indice_inicial, datos, reglas) y retorna solo los
+    clientes que cambian, como tuplas (indice, nivel, descuento).
+    Es una función de módulo para poder enviarla a otros procesos.
+    """
+    inicio, datos, reglas = bloque
+    cambios = []
+    for indice, (puntos, antiguedad_dias, nivel_actual, descuento_actual) in enumerate(datos, inicio):
+        for nivel, minimo, antiguedad, descuento in reglas:
+            if puntos >= minimo and antiguedad_dias >= antiguedad:
+                break
+        if descuento is None:
+            descuento = descuento_actual
+        if nivel != nivel_actual or descuento != descuento_actual:
+            cambios.append((indice, nivel, descuento))
+    return cambios
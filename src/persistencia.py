@@ -21,6 +21,9 @@ from .cliente_corporativo import ClienteCorporativo
 # Importamos las excepciones
 from .excepciones import PersistenciaError
 
+# Importamos el filtro de Bloom de emails
+from .filtro_bloom import FiltroBloom
+
 # Importamos datetime para manejar fechas
 from datetime import date
 
@@ -39,18 +42,44 @@ class PersistenciaJSON:
     }
     """
     
-    def __init__(self, nombre_archivo="clientes.json"):
+    # Métodos que mide GestorClientes.activar_metricas()
+    OPERACIONES_MEDIDAS = ('guardar_cliente', 'guardar_multiples', 'cargar_todos', 'cargar_objetos',
+                           'buscar_por_email', 'eliminar_por_email', 'limpiar_archivo', 'agregar_multiples')
+    
+    def __init__(self, nombre_archivo="clientes.json", tasa_filtro=0.01, sincronizar=False):
         """
         Inicializa el sistema de persistencia.
         
+        Junto al archivo JSON se mantiene un filtro de Bloom con los
+        emails guardados ("<archivo>.bloom"), que permite saber que un
+        email NO existe sin leer el archivo.
+        
         Parámetros:
             nombre_archivo (str): Nombre del archivo JSON donde guardar los datos
+            tasa_filtro (float): Tasa de falsos positivos buscada para el filtro
+            sincronizar (bool): Si True, fuerza cada escritura al disco con os.fsync
             
         Ejemplo:
             persistencia = PersistenciaJSON("mi_base_datos.json")
         """
         # Guardamos el nombre del archivo
         self.nombre_archivo = nombre_archivo
+        
+        # Filtro de Bloom de emails (se carga recién cuando se necesita)
+        self.nombre_filtro = nombre_archivo + ".bloom"
+        self.tasa_filtro = tasa_filtro
+        self._filtro = None
+        self._firma_filtro = None
+        # True si el filtro en memoria tiene cambios que no están en el .bloom
+        self._filtro_sin_guardar = False
+        self.estadisticas_filtro = {'consultas': 0, 'descartados': 0, 'falsos_positivos': 0}
+        
+        self.sincronizar = sincronizar
+        # Clientes que la última carga no pudo leer (ver cargar_objetos):
+        # mientras sea mayor a 0 no se reescribe el archivo
+        self.errores_carga = 0
+        # Objeto Metricas donde se cuentan bytes y fsync (None = sin métricas)
+        self.metricas = None
     
     def guardar_cliente(self, cliente):
         """
@@ -59,6 +88,10 @@ class PersistenciaJSON:
         Si el archivo ya existe, agrega el cliente a la lista existente.
         Si el archivo no existe, lo crea.
         
+        Si el filtro de Bloom descarta el email, el cliente es nuevo y se
+        escribe al final del archivo sin leerlo; si no, se lee el archivo
+        para reemplazar al cliente guardado con ese email.
+        
         Parámetros:
             cliente: Instancia de Cliente (o sus subclases)
             
@@ -69,12 +102,18 @@ class PersistenciaJSON:
             persistencia.guardar_cliente(cliente1)
         """
         try:
-            # Primero cargamos los clientes existentes (si hay)
-            clientes_existentes = self.cargar_todos()
-            
             # Convertimos el cliente a diccionario
             cliente_dict = cliente.obtener_resumen()
             
+            # Si el filtro dice que no está, lo agregamos al final sin leer el archivo
+            if not self.puede_existir(cliente_dict['email']):
+                self._agregar_nuevos([cliente_dict], escribir_filtro=False)
+                print(f"Cliente {cliente_dict['email']} guardado en archivo")
+                return
+            
+            # Cargamos los clientes existentes
+            clientes_existentes = self.cargar_todos()
+            
             # Verificamos si el cliente ya existe (por email)
             # Recorremos la lista de clientes existentes
             for i, cli in enumerate(clientes_existentes):
@@ -83,17 +122,16 @@ class PersistenciaJSON:
                     # Lo actualizamos (reemplazamos)
                     clientes_existentes[i] = cliente_dict
                     print(f"Cliente {cliente_dict['email']} actualizado en archivo")
-                    # Guardamos y salimos
-                    self._guardar_lista(clientes_existentes)
+                    # Guardamos y salimos (los emails del archivo no cambian)
+                    self._guardar_lista(clientes_existentes, emails_nuevos=())
                     return
             
-            # Si llegamos aquí, el cliente no existía, lo agregamos
-            clientes_existentes.append(cliente_dict)
+            # Si llegamos aquí, el cliente no existía (falso positivo del
+            # filtro): lo agregamos al final
+            self.estadisticas_filtro['falsos_positivos'] += 1
+            self._agregar_nuevos([cliente_dict], escribir_filtro=False)
             print(f"Cliente {cliente_dict['email']} guardado en archivo")
             
-            # Guardamos la lista actualizada
-            self._guardar_lista(clientes_existentes)
-            
         except Exception as e:
             # Si hay algún error, lanzamos excepción personalizada
             raise PersistenciaError(f"Error al guardar cliente: {str(e)}")
@@ -149,11 +187,15 @@ class PersistenciaJSON:
             with open(self.nombre_archivo, 'r', encoding='utf-8') as archivo:
                 # json.load() convierte el JSON en lista de Python
                 clientes = json.load(archivo)
+                if self.metricas is not None:
+                    self.metricas.contar_io(leidos=os.fstat(archivo.fileno()).st_size)
                 return clientes
             
         except json.JSONDecodeError:
-            # Si el archivo JSON está corrupto
+            # Si el archivo JSON está corrupto: se cuenta como error de
+            # carga para no reescribirlo con una lista vacía
             print(f"Advertencia: El archivo {self.nombre_archivo} está corrupto. Retornando lista vacía.")
+            self.errores_carga = max(self.errores_carga, 1)
             return []
         except Exception as e:
             raise PersistenciaError(f"Error al cargar clientes: {str(e)}")
@@ -162,6 +204,11 @@ class PersistenciaJSON:
         """
         Carga todos los clientes y los convierte en objetos (instancias de clases).
         
+        Los registros que no se pueden convertir se omiten y se cuentan en
+        errores_carga. Mientras haya errores de carga, guardar sobre el
+        archivo lanza PersistenciaError: reescribirlo con los objetos
+        cargados borraría esos registros (ver descartar_errores_carga).
+        
         Retorna:
             list: Lista de objetos Cliente, ClienteRegular, ClientePremium, etc.
             
@@ -172,6 +219,7 @@ class PersistenciaJSON:
         """
         try:
             # Cargamos los diccionarios
+            self.errores_carga = 0
             clientes_dict = self.cargar_todos()
             
             # Lista para almacenar los objetos
@@ -183,13 +231,27 @@ class PersistenciaJSON:
                 objeto = self._dict_a_objeto(cli_dict)
                 if objeto:
                     objetos.append(objeto)
+                else:
+                    self.errores_carga += 1
             
             print(f"{len(objetos)} clientes cargados como objetos")
+            if self.errores_carga:
+                print(f"Advertencia: {self.errores_carga} clientes de {self.nombre_archivo} "
+                      f"no se pudieron cargar")
             return objetos
             
         except Exception as e:
             raise PersistenciaError(f"Error al cargar objetos: {str(e)}")
     
+    def descartar_errores_carga(self):
+        """
+        Permite volver a guardar después de una carga con errores.
+        
+        ¡ADVERTENCIA! El siguiente guardado reemplaza el archivo y los
+        registros que no se pudieron cargar se pierden.
+        """
+        self.errores_carga = 0
+    
     def buscar_por_email(self, email):
         """
         Busca un cliente por su email.
@@ -205,19 +267,25 @@ class PersistenciaJSON:
             if cliente:
                 print(f"Cliente encontrado: {cliente['nombre']}")
         """
-        # Cargamos todos los clientes
-        clientes = self.cargar_todos()
-        
         # Convertimos el email a minúsculas para comparar
         email_buscar = email.lower().strip()
         
+        # Si el filtro dice que no está, no hace falta leer el archivo
+        if not self.puede_existir(email_buscar):
+            print(f"No se encontró cliente con email: {email}")
+            return None
+        
+        # Cargamos todos los clientes
+        clientes = self.cargar_todos()
+        
         # Buscamos el cliente
         for cliente in clientes:
             if cliente.get('email', '').lower() == email_buscar:
                 print(f"Cliente encontrado: {cliente.get('nombre')}")
                 return cliente
         
-        # Si no lo encontramos
+        # Si no lo encontramos, el filtro se equivocó (falso positivo)
+        self.estadisticas_filtro['falsos_positivos'] += 1
         print(f"No se encontró cliente con email: {email}")
         return None
     
@@ -236,19 +304,26 @@ class PersistenciaJSON:
                 print("Cliente eliminado")
         """
         try:
-            # Cargamos todos los clientes
-            clientes = self.cargar_todos()
-            
             # Convertimos el email a minúsculas
             email_buscar = email.lower().strip()
             
+            # Si el filtro dice que no está, no hace falta leer el archivo
+            if not self.puede_existir(email_buscar):
+                print(f"No se encontró cliente con email: {email}")
+                return False
+            
+            # Cargamos todos los clientes
+            clientes = self.cargar_todos()
+            
             # Buscamos y eliminamos el cliente
             for i, cliente in enumerate(clientes):
                 if cliente.get('email', '').lower() == email_buscar:
                     # Eliminamos el cliente de la lista
                     eliminado = clientes.pop(i)
-                    # Guardamos la lista actualizada
-                    self._guardar_lista(clientes)
+                    # Guardamos la lista actualizada (el filtro no puede
+                    # quitar el email: queda como falso positivo hasta
+                    # que se rearme)
+                    self._guardar_lista(clientes, emails_nuevos=())
                     print(f"Cliente {eliminado.get('nombre')} eliminado")
                     return True
             
@@ -268,24 +343,304 @@ class PersistenciaJSON:
         Ejemplo:
             persistencia.limpiar_archivo()
         """
+        # Se borra todo a propósito: los errores de carga ya no importan
+        self.errores_carga = 0
         self._guardar_lista([])
         print(f"Archivo {self.nombre_archivo} limpiado")
     
+    def agregar_multiples(self, lista_clientes, revisar_existentes=True):
+        """
+        Agrega clientes NUEVOS al archivo sin cargarlo completo.
+        
+        Los emails se revisan primero en el filtro de Bloom: solo si
+        alguno podría existir se lee el archivo (una vez) para
+        confirmarlo. Los clientes nuevos se escriben al final del
+        archivo, sin reescribir los que ya estaban.
+        
+        Parámetros:
+            lista_clientes (list): Lista de objetos Cliente
+            revisar_existentes (bool): Si False, no se revisa si los emails
+                ya están en el archivo (quien llama ya lo hizo, por ejemplo
+                con emails_existentes)
+            
+        Retorna:
+            dict: {'agregados': int, 'duplicados': list de emails}
+            
+        Lanza:
+            PersistenciaError: Si hay problemas al leer o escribir
+            
+        Ejemplo:
+            resultado = persistencia.agregar_multiples(nuevos)
+            print(f"{resultado['agregados']} agregados")
+        """
+        nuevos = []
+        duplicados = []
+        vistos = set()
+        for cliente in lista_clientes:
+            cliente_dict = cliente.obtener_resumen()
+            email = cliente_dict['email']
+            if email in vistos:
+                duplicados.append(email)
+                continue
+            vistos.add(email)
+            nuevos.append(cliente_dict)
+        
+        # Solo los posibles duplicados obligan a leer el archivo
+        existentes = self.emails_existentes(vistos) if revisar_existentes else ()
+        if existentes:
+            duplicados.extend(email for email in vistos if email in existentes)
+            nuevos = [cliente_dict for cliente_dict in nuevos if cliente_dict['email'] not in existentes]
+        
+        if nuevos:
+            self._agregar_nuevos(nuevos)
+        
+        print(f"{len(nuevos)} clientes agregados al archivo, {len(duplicados)} duplicados")
+        return {'agregados': len(nuevos), 'duplicados': duplicados}
+    
+    # ========== FILTRO DE BLOOM DE EMAILS ==========
+    
+    def puede_existir(self, email):
+        """
+        Consulta el filtro de Bloom: False significa que el email
+        seguro NO está en el archivo; True, que podría estar.
+        
+        Ejemplo:
+            if not persistencia.puede_existir("nuevo@email.com"):
+                print("Email libre")
+        """
+        self.estadisticas_filtro['consultas'] += 1
+        if email.lower().strip() in self.obtener_filtro():
+            return True
+        self.estadisticas_filtro['descartados'] += 1
+        return False
+    
+    def emails_existentes(self, emails):
+        """
+        Retorna el conjunto de emails (de los dados) que ya están en el
+        archivo. Lee el archivo solo si el filtro no descarta alguno.
+        
+        Ejemplo:
+            repetidos = persistencia.emails_existentes(["a@email.com", "b@email.com"])
+        """
+        # Un solo filtro (y un solo os.stat del archivo) para todo el lote
+        filtro = self.obtener_filtro()
+        emails = list(emails)
+        posibles = [email for email in emails if email.lower().strip() in filtro]
+        self.estadisticas_filtro['consultas'] += len(emails)
+        self.estadisticas_filtro['descartados'] += len(emails) - len(posibles)
+        if not posibles:
+            return set()
+        guardados = {cliente.get('email', '').lower() for cliente in self.cargar_todos()}
+        existentes = {email for email in posibles if email in guardados}
+        self.estadisticas_filtro['falsos_positivos'] += len(posibles) - len(existentes)
+        return existentes
+    
+    def obtener_filtro(self):
+        """
+        Retorna el filtro de Bloom del archivo.
+        
+        Si el archivo .bloom no existe o no corresponde al archivo de
+        clientes actual (otro tamaño o fecha, por ejemplo porque se
+        editó a mano), se reconstruye.
+        """
+        firma = self._firma_archivo()
+        if self._filtro is not None and self._firma_filtro == firma:
+            return self._filtro
+        
+        cargado = FiltroBloom.cargar(self.nombre_filtro)
+        if cargado is not None and self.metricas is not None:
+            self.metricas.contar_io(leidos=(cargado[0].bits + 7) // 8)
+        if cargado is not None and cargado[1:] == firma:
+            self._filtro, self._firma_filtro = cargado[0], firma
+            return self._filtro
+        return self.reconstruir_filtro()
+    
+    def reconstruir_filtro(self, capacidad=None):
+        """
+        Vuelve a armar el filtro de Bloom leyendo todos los emails del archivo.
+        
+        Parámetros:
+            capacidad (int): Emails que debe soportar (por defecto, el doble de los actuales)
+            
+        Retorna:
+            FiltroBloom: El filtro nuevo (ver tasa_estimada())
+            
+        Ejemplo:
+            filtro = persistencia.reconstruir_filtro()
+            print(f"Tasa estimada: {filtro.tasa_estimada():.4%}")
+        """
+        emails = [cliente.get('email', '').lower() for cliente in self.cargar_todos()]
+        return self._crear_filtro(emails, capacidad)
+    
+    def guardar_filtro(self):
+        """
+        Escribe el archivo .bloom si el filtro en memoria tiene cambios.
+        
+        Guardar un solo cliente (guardar_cliente, eliminar_por_email) solo
+        actualiza el filtro en memoria; si el .bloom no se escribe, la
+        próxima vez que se abra el archivo se rearma leyéndolo.
+        """
+        if self._filtro_sin_guardar and self._filtro is not None and self._firma_filtro == self._firma_archivo():
+            self._guardar_filtro(self._filtro)
+    
+    def tasa_falsos_positivos(self):
+        """
+        Retorna {'estimada', 'observada'}: la tasa que predice el filtro
+        según su llenado y la medida en las consultas hechas (falsos
+        positivos / consultas que el filtro no descartó).
+        """
+        posibles = self.estadisticas_filtro['consultas'] - self.estadisticas_filtro['descartados']
+        observada = self.estadisticas_filtro['falsos_positivos'] / posibles if posibles else 0.0
+        return {'estimada': self.obtener_filtro().tasa_estimada(), 'observada': observada}
+    
     # ========== MÉTODOS PRIVADOS (HELPER) ==========
     
-    def _guardar_lista(self, lista_clientes):
+    def _guardar_lista(self, lista_clientes, emails_nuevos=None):
         """
         Método privado para guardar una lista en el archivo JSON.
         
         Parámetros:
             lista_clientes (list): Lista de diccionarios a guardar
+            emails_nuevos: Emails de la lista que no estaban en el archivo
+                (se agregan al filtro sin rearmarlo), o None si no se sabe
+                (el filtro se rearma con todos los emails de la lista)
+            
+        Lanza:
+            PersistenciaError: Si la última carga tuvo errores (ver cargar_objetos)
         """
+        if self.errores_carga:
+            raise PersistenciaError(
+                f"No se reescribe {self.nombre_archivo}: la última carga omitió "
+                f"{self.errores_carga} clientes con errores que se perderían. "
+                f"Corrija el archivo y vuelva a cargarlo, o use descartar_errores_carga()")
+        # Tomamos el filtro antes de escribir: después el archivo ya no coincide con él
+        filtro = self.obtener_filtro() if emails_nuevos is not None else None
+        
         # Abrimos el archivo en modo escritura
         with open(self.nombre_archivo, 'w', encoding='utf-8') as archivo:
             # json.dump() convierte la lista a JSON y lo guarda
             # indent=2 hace que el JSON sea más legible (con sangrías)
             # ensure_ascii=False permite caracteres especiales (tildes, ñ)
             json.dump(lista_clientes, archivo, indent=2, ensure_ascii=False)
+            self._terminar_escritura(archivo)
+        
+        if filtro is None:
+            # El filtro se rearma con la lista que acabamos de escribir
+            self._crear_filtro([cliente.get('email', '').lower() for cliente in lista_clientes])
+        else:
+            self._actualizar_filtro(filtro, emails_nuevos, escribir=False)
+    
+    def _agregar_al_final(self, clientes_dict):
+        """
+        Método privado que agrega diccionarios al final de la lista JSON
+        sin leer ni reescribir el resto: busca el ']' final y escribe los
+        nuevos elementos antes de él, con el mismo formato que json.dump.
+        """
+        if not os.path.exists(self.nombre_archivo) or os.path.getsize(self.nombre_archivo) == 0:
+            # Archivo nuevo o vacío: se escribe la lista completa (el filtro
+            # lo actualiza quien llama, ver _agregar_nuevos)
+            with open(self.nombre_archivo, 'w', encoding='utf-8') as archivo:
+                json.dump(clientes_dict, archivo, indent=2, ensure_ascii=False)
+                self._terminar_escritura(archivo)
+            return
+        
+        elementos = ",\n".join(
+            "\n".join("  " + linea for linea in json.dumps(cliente_dict, indent=2, ensure_ascii=False).split("\n"))
+            for cliente_dict in clientes_dict)
+        
+        with open(self.nombre_archivo, 'r+b') as archivo:
+            fin = archivo.seek(0, os.SEEK_END)
+            inicio_cola = max(0, fin - 4096)
+            archivo.seek(inicio_cola)
+            cola = archivo.read().rstrip()
+            if not cola.endswith(b']'):
+                raise ValueError(f"El archivo {self.nombre_archivo} no termina en una lista JSON")
+            antes = cola[:-1].rstrip()
+            separador = "\n" if antes.endswith(b'[') else ",\n"
+            archivo.seek(inicio_cola + len(antes))
+            datos = (separador + elementos + "\n]").encode('utf-8')
+            archivo.write(datos)
+            archivo.truncate()
+            if self.metricas is not None:
+                self.metricas.contar_io(leidos=fin - inicio_cola)
+            self._terminar_escritura(archivo, len(datos))
+    
+    def _agregar_nuevos(self, clientes_dict, escribir_filtro=True):
+        """
+        Método privado que escribe clientes nuevos al final del archivo y
+        agrega sus emails al filtro (sin rearmarlo).
+        """
+        # Tomamos el filtro antes de escribir: después el archivo ya no coincide con él
+        filtro = self.obtener_filtro()
+        try:
+            self._agregar_al_final(clientes_dict)
+        except (OSError, ValueError) as e:
+            raise PersistenciaError(f"Error al agregar clientes: {str(e)}")
+        self._actualizar_filtro(filtro, [cliente_dict['email'] for cliente_dict in clientes_dict],
+                                escribir_filtro)
+    
+    def _actualizar_filtro(self, filtro, emails_nuevos, escribir):
+        """
+        Método privado que agrega emails al filtro después de escribir el
+        archivo y lo deja asociado al archivo nuevo. Con escribir=False
+        no se reescribe el .bloom (ver guardar_filtro).
+        """
+        filtro.agregar_varios(email.lower() for email in emails_nuevos)
+        if filtro.elementos > filtro.capacidad:
+            # Se llenó: lo reconstruimos con más capacidad
+            self.reconstruir_filtro()
+        elif escribir:
+            self._guardar_filtro(filtro)
+        else:
+            self._filtro, self._firma_filtro = filtro, self._firma_archivo()
+            self._filtro_sin_guardar = True
+    
+    def _terminar_escritura(self, archivo, escritos=None):
+        """
+        Método privado que, si se pidió, fuerza el archivo al disco y, si
+        hay métricas, cuenta los bytes escritos (por defecto, todo el archivo).
+        """
+        if self.sincronizar:
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        if self.metricas is not None:
+            archivo.flush()
+            if escritos is None:
+                escritos = os.fstat(archivo.fileno()).st_size
+            self.metricas.contar_io(escritos=escritos, fsyncs=1 if self.sincronizar else 0)
+    
+    def _crear_filtro(self, emails, capacidad=None):
+        """
+        Método privado que arma un filtro con los emails dados y lo guarda.
+        """
+        capacidad = capacidad or max(2 * len(emails), 1000)
+        filtro = FiltroBloom(capacidad, self.tasa_filtro)
+        filtro.agregar_varios(emails)
+        self._guardar_filtro(filtro)
+        return filtro
+    
+    def _guardar_filtro(self, filtro):
+        """
+        Método privado que guarda el filtro junto con la firma (tamaño y
+        fecha) del archivo de clientes que describe.
+        """
+        firma = self._firma_archivo()
+        filtro.guardar(self.nombre_filtro, *firma)
+        self._filtro, self._firma_filtro = filtro, firma
+        self._filtro_sin_guardar = False
+        if self.metricas is not None:
+            self.metricas.contar_io(escritos=(filtro.bits + 7) // 8)
+    
+    def _firma_archivo(self):
+        """
+        Método privado que retorna (tamaño, fecha de modificación en ns)
+        del archivo de clientes, o (0, 0) si no existe.
+        """
+        try:
+            estado = os.stat(self.nombre_archivo)
+        except OSError:
+            return (0, 0)
+        return (estado.st_size, estado.st_mtime_ns)
     
     def _dict_a_objeto(self, cliente_dict):
         """
@@ -312,7 +667,8 @@ class PersistenciaJSON:
                 # Cliente Premium
                 nivel = cliente_dict.get('nivel_membresia', 'Bronce')
                 descuento = cliente_dict.get('descuento', 10.0)
-                cliente = ClientePremium(nombre, email, telefono, direccion, nivel, descuento)
+                cliente = ClientePremium(nombre, email, telefono, direccion, nivel, descuento,
+                                         self._leer_fecha(cliente_dict))
                 # Restauramos los puntos
                 puntos = cliente_dict.get('puntos_acumulados', 0)
                 cliente.set_puntos_acumulados(puntos)
@@ -324,27 +680,33 @@ class PersistenciaJSON:
                 rut_empresa = cliente_dict.get('rut_empresa', '00.000.000-0')
                 contacto = cliente_dict.get('contacto_principal', nombre)
                 limite = cliente_dict.get('limite_credito', 100000.0)
-                cliente = ClienteCorporativo(nombre, email, telefono, direccion,
-                                            nombre_empresa, rut_empresa, contacto, limite)
-                # Restauramos el crédito utilizado
+                # Restauramos también el crédito utilizado
                 utilizado = cliente_dict.get('credito_utilizado', 0.0)
-                cliente._credito_utilizado = utilizado
+                cliente = ClienteCorporativo(nombre, email, telefono, direccion,
+                                            nombre_empresa, rut_empresa, contacto, limite,
+                                            utilizado, verificar_rut=False)
                 return cliente
                 
             else:
                 # Cliente Regular (por defecto)
-                cliente = ClienteRegular(nombre, email, telefono, direccion)
-                # Restauramos la fecha de registro si existe
-                if 'fecha_registro' in cliente_dict:
-                    # Convertimos el string de fecha a objeto date
-                    fecha_str = cliente_dict['fecha_registro']
-                    # Formato: "2026-02-15" -> date(2026, 2, 15)
-                    fecha_parts = fecha_str.split('-')
-                    if len(fecha_parts) == 3:
-                        fecha = date(int(fecha_parts[0]), int(fecha_parts[1]), int(fecha_parts[2]))
-                        cliente.set_fecha_registro(fecha)
+                cliente = ClienteRegular(nombre, email, telefono, direccion,
+                                         self._leer_fecha(cliente_dict))
                 return cliente
                 
         except Exception as e:
             print(f"Error al convertir diccionario a objeto: {e}")
             return None
+    
+    def _leer_fecha(self, cliente_dict):
+        """
+        Método privado que retorna la fecha de registro guardada en el
+        diccionario (None si no tiene, y el cliente queda con la de hoy).
+        """
+        fecha_str = cliente_dict.get('fecha_registro')
+        if not fecha_str:
+            return None
+        # Formato: "2026-02-15" -> date(2026, 2, 15)
+        fecha_parts = fecha_str.split('-')
+        if len(fecha_parts) != 3:
+            return None
+        return date(int(fecha_parts[0]), int(fecha_parts[1]), int(fecha_parts[2]))
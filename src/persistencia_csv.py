@@ -0,0 +1,240 @@
+"""
+Persistencia CSV - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Este módulo permite importar y exportar clientes en formato CSV,
+el formato que usa el CRM para intercambiar datos.
+La lectura y la escritura se hacen fila a fila (streaming), por lo que
+la memoria usada no depende del tamaño del archivo.
+"""
+
+# Importamos los módulos necesarios
+import csv  # Para leer y escribir archivos CSV
+from datetime import date
+
+# Importamos nuestras clases de cliente
+from .cliente_regular import ClienteRegular
+from .cliente_premium import ClientePremium
+from .cliente_corporativo import ClienteCorporativo
+
+# Importamos las excepciones
+from .excepciones import ValidacionError, PersistenciaError
+
+
+# Columnas del archivo CSV, en el orden en que se escriben.
+# Las columnas que no aplican a un tipo de cliente quedan vacías.
+COLUMNAS_CSV = [
+    'tipo_cliente', 'nombre', 'email', 'telefono', 'direccion',
+    'fecha_registro',
+    'nivel_membresia', 'descuento', 'puntos_acumulados',
+    'nombre_empresa', 'rut_empresa', 'contacto_principal',
+    'limite_credito', 'credito_utilizado',
+]
+
+# Tipos de cliente aceptados en la columna 'tipo_cliente'
+TIPOS_CSV = ('Regular', 'Premium', 'Corporativo')
+
+
+class PersistenciaCSV:
+    """
+    Clase para importar y exportar clientes en formato CSV.
+
+    La columna 'tipo_cliente' indica qué clase se usa para cada fila
+    (ClienteRegular, ClientePremium o ClienteCorporativo).
+
+    Ejemplo de CSV:
+        tipo_cliente,nombre,email,telefono,direccion,...
+        Regular,Juan Pérez,juan@email.com,912345678,Av. Libertador 1234,...
+    """
+
+    def __init__(self, nombre_archivo="clientes.csv", tamano_lote=5000):
+        """
+        Inicializa la persistencia CSV.
+
+        Parámetros:
+            nombre_archivo (str): Ruta del archivo CSV
+            tamano_lote (int): Cantidad de filas que se procesan por lote al importar
+
+        Ejemplo:
+            persistencia = PersistenciaCSV("exportacion_crm.csv")
+        """
+        if not isinstance(tamano_lote, int) or tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser un entero positivo")
+        self.nombre_archivo = nombre_archivo
+        self.tamano_lote = tamano_lote
+
+    # ========== EXPORTAR ==========
+
+    def exportar(self, clientes):
+        """
+        Escribe los clientes en el archivo CSV, uno por fila.
+
+        Recorre los clientes directamente (sin armar una lista de
+        diccionarios con obtener_resumen()), así que sirve para
+        cualquier iterable, incluso un generador.
+
+        Parámetros:
+            clientes: Iterable de objetos Cliente (o sus subclases)
+
+        Retorna:
+            int: Cantidad de filas escritas
+
+        Lanza:
+            PersistenciaError: Si hay problemas al escribir el archivo
+
+        Ejemplo:
+            total = persistencia.exportar(gestor.listar_todos())
+        """
+        try:
+            with open(self.nombre_archivo, 'w', encoding='utf-8', newline='') as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(COLUMNAS_CSV)
+                total = 0
+                for cliente in clientes:
+                    escritor.writerow(self._cliente_a_fila(cliente))
+                    total += 1
+                return total
+        except (OSError, csv.Error) as e:
+            raise PersistenciaError(f"Error al exportar CSV: {str(e)}")
+
+    # ========== IMPORTAR ==========
+
+    def importar_lotes(self):
+        """
+        Lee el archivo CSV y entrega los clientes por lotes.
+
+        Cada lote es una tupla (clientes, errores):
+            - clientes: lista de tuplas (numero_fila, cliente) válidas
+            - errores: lista de diccionarios {'fila', 'email', 'error'}
+              con las filas que no pasaron la validación
+
+        Una fila inválida no detiene la importación.
+
+        Lanza:
+            PersistenciaError: Si el archivo no existe o no tiene cabecera
+
+        Ejemplo:
+            for clientes, errores in persistencia.importar_lotes():
+                print(len(clientes), len(errores))
+        """
+        try:
+            archivo = open(self.nombre_archivo, 'r', encoding='utf-8', newline='')
+        except OSError as e:
+            raise PersistenciaError(f"Error al abrir CSV: {str(e)}")
+
+        with archivo:
+            lector = csv.reader(archivo)
+            cabecera = next(lector, None)
+            if cabecera is None:
+                raise PersistenciaError(f"El archivo {self.nombre_archivo} está vacío")
+
+            cabecera = [nombre.strip() for nombre in cabecera]
+            for obligatoria in ('nombre', 'email', 'telefono', 'direccion'):
+                if obligatoria not in cabecera:
+                    raise PersistenciaError(f"Falta la columna '{obligatoria}' en el CSV")
+
+            clientes = []
+            errores = []
+            for fila in lector:
+                if not fila:
+                    continue
+                numero = lector.line_num
+                # zip y dict trabajan en C: es la forma más rápida de nombrar las columnas
+                valores = dict(zip(cabecera, fila))
+                try:
+                    clientes.append((numero, self._fila_a_cliente(valores)))
+                except (ValidacionError, ValueError, TypeError) as e:
+                    errores.append({'fila': numero, 'email': valores.get('email', ''),
+                                    'error': str(e)})
+
+                if len(clientes) + len(errores) >= self.tamano_lote:
+                    yield clientes, errores
+                    clientes = []
+                    errores = []
+
+            if clientes or errores:
+                yield clientes, errores
+
+    # ========== MÉTODOS PRIVADOS (HELPER) ==========
+
+    def _cliente_a_fila(self, cliente):
+        """
+        Convierte un cliente en una fila del CSV usando sus getters.
+        """
+        fila = [
+            '', cliente.get_nombre(), cliente.get_email(),
+            cliente.get_telefono(), cliente.get_direccion(),
+            '', '', '', '', '', '', '', '', '',
+        ]
+        if isinstance(cliente, ClientePremium):
+            fila[0] = 'Premium'
+            fila[6] = cliente.get_nivel_membresia()
+            fila[7] = cliente.get_descuento()
+            fila[8] = cliente.get_puntos_acumulados()
+            fila[5] = cliente.get_fecha_registro()
+        elif isinstance(cliente, ClienteCorporativo):
+            fila[0] = 'Corporativo'
+            fila[9] = cliente.get_nombre_empresa()
+            fila[10] = cliente.get_rut_empresa()
+            fila[11] = cliente.get_contacto_principal()
+            fila[12] = cliente.get_limite_credito()
+            fila[13] = cliente.get_credito_utilizado()
+        else:
+            fila[0] = 'Regular'
+            if isinstance(cliente, ClienteRegular):
+                fila[5] = cliente.get_fecha_registro()
+        return fila
+
+    def _fila_a_cliente(self, valores):
+        """
+        Convierte una fila del CSV (diccionario columna -> texto) en el
+        objeto del tipo indicado.
+
+        Lanza ValidacionError (o ValueError en números/fechas mal escritos)
+        si la fila no es válida. Los constructores ya quitan los espacios
+        de nombre, email, teléfono y dirección.
+        """
+        tipo = valores.get('tipo_cliente', '').strip() or 'Regular'
+        nombre = valores.get('nombre', '')
+        email = valores.get('email', '')
+        telefono = valores.get('telefono', '')
+        direccion = valores.get('direccion', '')
+
+        if tipo == 'Regular' or tipo == 'Premium':
+            fecha = valores.get('fecha_registro', '').strip()
+            fecha = date.fromisoformat(fecha) if fecha else None
+        if tipo == 'Regular':
+            return ClienteRegular(nombre, email, telefono, direccion, fecha)
+
+        if tipo == 'Premium':
+            nivel = valores.get('nivel_membresia', '').strip() or 'Bronce'
+            descuento = valores.get('descuento', '').strip()
+            descuento = float(descuento) if descuento else 10.0
+            cliente = ClientePremium(nombre, email, telefono, direccion, nivel, descuento, fecha)
+            puntos = valores.get('puntos_acumulados', '').strip()
+            if puntos:
+                cliente.set_puntos_acumulados(int(puntos))
+            return cliente
+
+        if tipo == 'Corporativo':
+            limite = valores.get('limite_credito', '').strip()
+            limite = float(limite) if limite else 100000.0
+            utilizado = valores.get('credito_utilizado', '').strip()
+            utilizado = float(utilizado) if utilizado else 0.0
+            if utilizado > limite:
+                raise ValidacionError("El crédito utilizado debe estar entre 0 y el límite")
+            # Sin empresa o sin RUT la fila es un error (el constructor lo
+            # informa): un valor por defecto juntaría esas filas en una
+            # empresa inventada en el índice por RUT y en sus totales
+            return ClienteCorporativo(
+                nombre, email, telefono, direccion,
+                valores.get('nombre_empresa', ''),
+                valores.get('rut_empresa', '').strip(),
+                valores.get('contacto_principal', '').strip() or nombre,
+                limite,
+                utilizado,
+                verificar_rut=False,
+            )
+
+        raise ValidacionError(f"Tipo de cliente desconocido '{tipo}'. Debe ser uno de: {list(TIPOS_CSV)}")
@@ -3,6 +3,20 @@
 import re
 from .excepciones import ValidacionError
 
+# Patrones compilados una sola vez al importar el módulo
+# Solo letras, espacios, tildes y ñ
+_PATRON_NOMBRE = re.compile(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$')
+_PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Teléfono chileno: puede tener +56 y debe empezar con 9
+_PATRON_TELEFONO = re.compile(r'^(\+?56)?[9][0-9]{8}$')
+
+# Tabla para str.translate que elimina espacios, guiones y paréntesis
+_LIMPIEZA_TELEFONO = str.maketrans('', '', ' -()')
+
+# RUT chileno sin puntos: número, guion opcional y dígito verificador
+_PATRON_RUT = re.compile(r'^([0-9]{1,8})-?([0-9K])$')
+_LIMPIEZA_RUT = str.maketrans('', '', '. ')
+
 
 def validar_nombre(nombre):
     if not nombre or not isinstance(nombre, str):
@@ -13,8 +27,7 @@ def validar_nombre(nombre):
     if len(nombre_limpio) < 3:
         raise ValidacionError("El nombre debe tener al menos 3 caracteres")
 
-    # Solo letras, espacios, tildes y ñ
-    if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$', nombre_limpio):
+    if not _PATRON_NOMBRE.match(nombre_limpio):
         raise ValidacionError("El nombre solo puede contener letras y espacios")
 
     return True
@@ -24,28 +37,35 @@ def validar_email(email):
     if not email or not isinstance(email, str):
         raise ValidacionError("El email no puede estar vacío")
 
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-    if not re.match(patron, email.strip()):
+    if not _PATRON_EMAIL.match(email.strip()):
         raise ValidacionError(f"El email '{email}' no tiene formato válido")
 
     return True
 
 
 def validar_telefono(telefono):
+    _limpiar_telefono(telefono)
+    return True
+
+
+def normalizar_telefono(telefono):
+    """Valida el teléfono y lo retorna en formato E.164 (+569XXXXXXXX)."""
+    # Los últimos 9 dígitos son el número; el prefijo +56 es opcional
+    return '+56' + _limpiar_telefono(telefono)[-9:]
+
+
+def _limpiar_telefono(telefono):
+    """Valida el teléfono y retorna solo sus dígitos (y el + inicial si lo tiene)."""
     if not telefono or not isinstance(telefono, str):
         raise ValidacionError("El teléfono no puede estar vacío")
 
-    # Eliminar espacios y guiones para validar solo los dígitos
-    telefono_limpio = telefono.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    # Eliminar espacios, guiones y paréntesis para validar solo los dígitos
+    telefono_limpio = telefono.translate(_LIMPIEZA_TELEFONO)
 
-    # Teléfono chileno: puede tener +56 y debe empezar con 9
-    patron = r'^(\+?56)?[9][0-9]{8}$'
-
-    if not re.match(patron, telefono_limpio):
+    if not _PATRON_TELEFONO.match(telefono_limpio):
         raise ValidacionError(f"Teléfono inválido '{telefono}'. Debe ser número chileno que empiece con 9")
 
-    return True
+    return telefono_limpio
 
 
 def validar_direccion(direccion):
@@ -58,6 +78,55 @@ def validar_direccion(direccion):
     return True
 
 
+def validar_rut(rut, verificar_digito=True):
+    _limpiar_rut(rut, verificar_digito)
+    return True
+
+
+def normalizar_rut(rut, verificar_digito=True):
+    """
+    Valida el RUT y lo retorna sin puntos y con guion (ej. 76543210-3).
+
+    Con verificar_digito=False solo se revisa el formato: así se aceptan
+    los RUT antiguos guardados con un dígito verificador que no corresponde.
+    """
+    numero, digito = _limpiar_rut(rut, verificar_digito)
+    return f"{numero}-{digito}"
+
+
+def _limpiar_rut(rut, verificar_digito=True):
+    """Valida formato y (si se pide) dígito verificador; retorna (numero, digito)."""
+    if not rut or not isinstance(rut, str):
+        raise ValidacionError("El RUT no puede estar vacío")
+
+    coincidencia = _PATRON_RUT.match(rut.translate(_LIMPIEZA_RUT).upper())
+    if not coincidencia:
+        raise ValidacionError(f"RUT inválido '{rut}'. Formato esperado: 12.345.678-5")
+
+    numero, digito = coincidencia.groups()
+    numero = numero.lstrip('0') or '0'
+
+    if verificar_digito and _digito_verificador(numero) != digito:
+        raise ValidacionError(f"RUT inválido '{rut}'. El dígito verificador no corresponde")
+
+    return numero, digito
+
+
+def _digito_verificador(numero):
+    """Calcula el dígito verificador (módulo 11) del número de un RUT."""
+    suma = 0
+    factor = 2
+    for digito in reversed(numero):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    if resto == 11:
+        return '0'
+    if resto == 10:
+        return 'K'
+    return str(resto)
+
+
 def validar_descuento(descuento):
     if not isinstance(descuento, (int, float)):
         raise ValidacionError("El descuento debe ser un número")
@@ -86,3 +155,76 @@ def validar_monto(monto):
         raise ValidacionError("El monto debe ser mayor a 0")
 
     return True
+
+
+# Validador que corresponde a cada campo de un registro
+VALIDADORES_POR_CAMPO = {
+    'nombre': validar_nombre,
+    'email': validar_email,
+    'telefono': validar_telefono,
+    'direccion': validar_direccion,
+    'descuento': validar_descuento,
+    'puntos_acumulados': validar_puntos,
+    'limite_credito': validar_monto,
+    'rut_empresa': validar_rut,
+}
+
+# Campos que todo registro de cliente debe tener
+CAMPOS_OBLIGATORIOS = ('nombre', 'email', 'telefono', 'direccion')
+
+
+def validar_lote(registros, procesos=None, tamano_bloque=10000):
+    """
+    Valida muchos registros (diccionarios) en una sola pasada.
+
+    En vez de lanzar ValidacionError con el primer problema, junta todos
+    los errores de cada registro, agrupados por campo. Solo se validan
+    los campos presentes que tienen validador; los campos de
+    CAMPOS_OBLIGATORIOS que falten se informan como error.
+
+    Con procesos > 1 los registros se reparten en bloques de
+    'tamano_bloque' entre varios procesos (útil para lotes muy grandes).
+
+    Retorna un diccionario {indice: {campo: [mensajes]}} solo con los
+    registros que tienen errores; un lote válido retorna {}.
+    """
+    if not procesos or procesos <= 1:
+        return _validar_bloque((0, registros))
+
+    registros = list(registros)
+    if len(registros) <= tamano_bloque:
+        return _validar_bloque((0, registros))
+
+    # Importamos aquí para no cargar multiprocessing en el uso normal
+    from concurrent.futures import ProcessPoolExecutor
+
+    bloques = [(inicio, registros[inicio:inicio + tamano_bloque])
+               for inicio in range(0, len(registros), tamano_bloque)]
+    errores = {}
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for parcial in ejecutor.map(_validar_bloque, bloques):
+            errores.update(parcial)
+    return errores
+
+
+def _validar_bloque(bloque):
+    """Valida un bloque (indice_inicial, registros) y retorna sus errores."""
+    inicio, registros = bloque
+    errores = {}
+    validadores = VALIDADORES_POR_CAMPO
+    for indice, registro in enumerate(registros, inicio):
+        errores_registro = {}
+        for campo in CAMPOS_OBLIGATORIOS:
+            if campo not in registro:
+                errores_registro[campo] = ["El campo es obligatorio"]
+        for campo, valor in registro.items():
+            validador = validadores.get(campo)
+            if validador is None:
+                continue
+            try:
+                validador(valor)
+            except ValidacionError as e:
+                errores_registro.setdefault(campo, []).append(str(e))
+        if errores_registro:
+            errores[indice] = errores_registro
+    return errores
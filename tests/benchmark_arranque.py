@@ -0,0 +1,101 @@
+"""
+Benchmark de arranque - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide lo que paga una herramienta de línea de comandos (o un proceso
+de corta vida) al arrancar, cada medición en un intérprete nuevo:
+    - import src y from src import GestorClientes
+    - crear GestorClientes() con un clientes.json de N clientes
+      (no abre archivos: los logs y la carga se hacen en el primer uso)
+    - crear el gestor y hacer la primera búsqueda (ahí se carga el archivo)
+
+Cada medición se repite y se informa la mediana y el mínimo. Al final
+se muestran los módulos que más tardan en importarse, en el formato
+de python -X importtime.
+
+Uso:
+    python3 benchmark_arranque.py                 # clientes.json de 10.000 clientes
+    python3 benchmark_arranque.py 100000          # cantidad personalizada
+    python3 benchmark_arranque.py 10000 --repeticiones 30
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, RAIZ)
+
+from src.generador import GeneradorClientes
+
+# Cada programa escribe en stderr los segundos que tardó la parte medida
+# (en stdout se mezclaría con los logs del gestor, que salen por consola)
+PROGRAMAS = [
+    ("import src", "import time; t = time.perf_counter(); import src"),
+    ("from src import GestorClientes",
+     "import time; t = time.perf_counter(); from src import GestorClientes"),
+    ("GestorClientes()",
+     "import time; from src import GestorClientes; t = time.perf_counter(); GestorClientes()"),
+    ("GestorClientes() + 1ª búsqueda",
+     "import time; from src import GestorClientes; t = time.perf_counter(); "
+     "GestorClientes().buscar_por_telefono('+56900000000')"),
+    ("import + gestor + 1ª búsqueda",
+     "import time; t = time.perf_counter(); from src import GestorClientes; "
+     "GestorClientes().buscar_por_telefono('+56900000000')"),
+]
+
+
+def ejecutar_python(codigo, directorio, opciones=()):
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    return subprocess.run([sys.executable, *opciones, "-c", codigo], cwd=directorio, env=entorno,
+                          capture_output=True, text=True, check=True)
+
+
+def medir(codigo, directorio, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = ejecutar_python(codigo + "; import sys; sys.stderr.write(f'{time.perf_counter() - t}\\n')",
+                                 directorio)
+        tiempos.append(float(salida.stderr.split()[-1]))
+    return statistics.median(tiempos), min(tiempos)
+
+
+def tiempos_de_importacion(directorio, cantidad=15):
+    """Los módulos que más tardan (tiempo acumulado), como python -X importtime."""
+    salida = ejecutar_python("from src import GestorClientes", directorio, ("-X", "importtime"))
+    filas = []
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "[us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        filas.append((int(acumulado), int(propio), modulo.strip()))
+    filas.sort(reverse=True)
+    print("import time: self [us] | cumulative | imported package")
+    for acumulado, propio, modulo in filas[:cantidad]:
+        print(f"import time: {propio:>9} | {acumulado:>10} | {modulo}")
+
+
+def ejecutar(cantidad, repeticiones):
+    with tempfile.TemporaryDirectory() as directorio:
+        GeneradorClientes().escribir(os.path.join(directorio, "clientes.json"), cantidad)
+        print(f"Arranque con clientes.json de {cantidad:,} clientes ({repeticiones} repeticiones)\n")
+        print(f"{'medición':<34} {'mediana':>10} {'mínimo':>10}")
+        for nombre, codigo in PROGRAMAS:
+            mediana, minimo = medir(codigo, directorio, repeticiones)
+            print(f"{nombre:<34} {mediana * 1000:>8.2f} ms {minimo * 1000:>7.2f} ms")
+        print()
+        tiempos_de_importacion(directorio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de importación y de creación del gestor")
+    parser.add_argument("cantidad", nargs="?", type=int, default=10000, help="clientes en clientes.json")
+    parser.add_argument("--repeticiones", type=int, default=15, help="intérpretes nuevos por medición")
+    argumentos = parser.parse_args()
+    ejecutar(argumentos.cantidad, argumentos.repeticiones)
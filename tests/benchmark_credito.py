@@ -0,0 +1,114 @@
+"""
+Benchmark de crédito - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Simula compras concurrentes con reservas de crédito de clientes
+corporativos (reservar -> esperar al medio de pago -> confirmar).
+
+1. Escalamiento: cada hilo compra para clientes distintos. Como cada
+   cliente tiene su propio candado, las compras por segundo deben crecer
+   casi en proporción a la cantidad de hilos.
+2. Escalamiento sin espera (espera=0): mide solo los candados. Con la
+   espera del medio de pago el tiempo se va en dormir y la contención
+   no se nota; sin ella, un candado compartido por todas las compras
+   (por ejemplo, uno del gestor) haría caer las compras por segundo al
+   agregar hilos.
+3. Contención: todos los hilos compran para el mismo cliente; al final
+   el crédito utilizado nunca debe superar el límite.
+
+Uso:
+    python3 benchmark_credito.py
+    python3 benchmark_credito.py 0.002    # espera del medio de pago en segundos
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gestor_clientes import GestorClientes
+from src.cliente_corporativo import ClienteCorporativo
+
+COMPRAS_POR_HILO = 200
+
+
+def crear_clientes(gestor, cantidad, limite):
+    clientes = [ClienteCorporativo("Cliente Empresa", f"empresa{i}@empresa.cl", f"9{i:08d}",
+                                   f"Av. Apoquindo {i}", f"Empresa {i}", "76.543.210-3",
+                                   "Contacto Empresa", limite)
+                for i in range(cantidad)]
+    gestor.agregar_multiples(clientes)
+    return clientes
+
+
+def comprar(clientes, espera, monto):
+    """Hace COMPRAS_POR_HILO compras repartidas entre los clientes dados."""
+    for i in range(COMPRAS_POR_HILO):
+        cliente = clientes[i % len(clientes)]
+        numero = cliente.reservar_credito(monto)
+        if numero is None:
+            continue
+        # Espera del medio de pago: aquí el candado del cliente está libre
+        if espera:
+            time.sleep(espera)
+        cliente.confirmar_reserva(numero)
+
+
+def en_hilos(objetivos):
+    hilos = [threading.Thread(target=objetivo) for objetivo in objetivos]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return time.perf_counter() - inicio
+
+
+def escalamiento(espera):
+    print(f"Espera del medio de pago: {espera * 1000:g} ms")
+    base = None
+    for cantidad_hilos in (1, 2, 4, 8, 16):
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        clientes = crear_clientes(gestor, cantidad_hilos * 4, 1e12)
+        # Cada hilo usa sus propios 4 clientes
+        segundos = en_hilos([lambda propios=clientes[i * 4:(i + 1) * 4]: comprar(propios, espera, 10.0)
+                             for i in range(cantidad_hilos)])
+        por_segundo = cantidad_hilos * COMPRAS_POR_HILO / segundos
+        base = base or por_segundo
+        print(f"{cantidad_hilos:>3} hilos, clientes distintos: {por_segundo:>9.0f} compras/s "
+              f"(x{por_segundo / base:.1f})")
+
+
+def verificar_totales():
+    """Compras sin espera en 8 hilos: el total del gestor debe coincidir con la suma de los clientes."""
+    gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+    clientes = crear_clientes(gestor, 32, 1e12)
+    en_hilos([lambda propios=clientes[i * 4:(i + 1) * 4]: comprar(propios, 0, 10.0) for i in range(8)])
+    suma = sum(cliente.get_credito_utilizado() for cliente in clientes)
+    total = gestor.estadisticas()['credito_utilizado_total']
+    return "OK" if total == suma else f"DIFERENCIA (${total:.0f} != ${suma:.0f})"
+
+
+def contencion(espera):
+    gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+    cliente = crear_clientes(gestor, 1, 100000.0)[0]
+    en_hilos([lambda: comprar([cliente], espera, 70.0) for _ in range(16)])
+    utilizado = cliente.get_credito_utilizado()
+    estado = "OK" if utilizado <= cliente.get_limite_credito() else "SOBREGIRO"
+    print(f" 16 hilos, un solo cliente: utilizado ${utilizado:.0f} de ${cliente.get_limite_credito():.0f} "
+          f"-> {estado}")
+    print(f"    total en el gestor: ${gestor.estadisticas()['credito_utilizado_total']:.0f}")
+
+
+if __name__ == "__main__":
+    espera = float(sys.argv[1]) if len(sys.argv) > 1 else 0.001
+    escalamiento(espera)
+    print()
+    escalamiento(0)
+    print(f"    total en el gestor al día: {verificar_totales()}")
+    print()
+    contencion(espera)
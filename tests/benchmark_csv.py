@@ -0,0 +1,83 @@
+"""
+Benchmark CSV - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide la velocidad (filas por segundo) y la memoria máxima de
+importar_csv y exportar_csv con archivos de distintos tamaños.
+
+Uso:
+    python3 benchmark_csv.py            # 10.000 y 100.000 filas
+    python3 benchmark_csv.py 500000     # tamaños personalizados
+"""
+
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gestor_clientes import GestorClientes
+from src.persistencia_csv import COLUMNAS_CSV
+
+
+def generar_csv(ruta, cantidad):
+    """Escribe un CSV con una mezcla de 60% Regular, 30% Premium y 10% Corporativo."""
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        archivo.write(",".join(COLUMNAS_CSV) + "\n")
+        for i in range(cantidad):
+            telefono = f"9{i % 100000000:08d}"
+            if i % 10 < 6:
+                archivo.write(f"Regular,Cliente Regular,regular{i}@email.com,{telefono},"
+                              f"Calle Principal {i},2025-01-15,,,,,,,,\n")
+            elif i % 10 < 9:
+                archivo.write(f"Premium,Cliente Premium,premium{i}@email.com,{telefono},"
+                              f"Av. Providencia {i},,Plata,15.0,{i % 5000},,,,,\n")
+            else:
+                archivo.write(f"Corporativo,Cliente Empresa,empresa{i}@empresa.cl,{telefono},"
+                              f"Av. Apoquindo {i},,,,,Empresa {i},76.543.210-3,Contacto Empresa,"
+                              f"500000.0,1000.0\n")
+
+
+def medir(funcion):
+    """Ejecuta la función y retorna (resultado, segundos, pico de memoria en MB)."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico / (1024 * 1024)
+
+
+def ejecutar(cantidades):
+    with tempfile.TemporaryDirectory() as directorio:
+        for cantidad in cantidades:
+            entrada = os.path.join(directorio, "entrada.csv")
+            salida = os.path.join(directorio, "salida.csv")
+            generar_csv(entrada, cantidad)
+
+            gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+
+            # Importación sin tracemalloc (mide solo velocidad)
+            inicio = time.perf_counter()
+            resultado = gestor.importar_csv(entrada)
+            segundos = time.perf_counter() - inicio
+            print(f"importar_csv  {cantidad:>9} filas: {cantidad / segundos:>10.0f} filas/s "
+                  f"({resultado['agregados']} agregados, {len(resultado['errores'])} errores)")
+
+            # Exportación: la memoria máxima no debe crecer con el tamaño
+            inicio = time.perf_counter()
+            gestor.exportar_csv(salida)
+            segundos = time.perf_counter() - inicio
+            _, _, pico = medir(lambda: gestor.exportar_csv(salida))
+            print(f"exportar_csv  {cantidad:>9} filas: {cantidad / segundos:>10.0f} filas/s "
+                  f"(pico de memoria {pico:.2f} MB)")
+
+
+if __name__ == "__main__":
+    tamanos = [int(argumento) for argumento in sys.argv[1:]] or [10000, 100000]
+    ejecutar(tamanos)
@@ -0,0 +1,96 @@
+"""
+Benchmark de duplicados - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide cuántos clientes por segundo revisa DetectorDuplicados sobre datos
+sintéticos con un 5% de clientes re-registrados (nombre con un error de
+tipeo, otro email y a veces otro teléfono), y cuántos de esos encuentra.
+
+Uso:
+    python3 benchmark_duplicados.py            # 20.000 y 100.000 clientes
+    python3 benchmark_duplicados.py 1000000    # tamaños personalizados
+"""
+
+import sys
+import os
+import time
+import random
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cliente_regular import ClienteRegular
+from src.duplicados import DetectorDuplicados, normalizar_texto
+
+NOMBRES = ["Juan", "María", "José", "Ana", "Luis", "Carmen", "Pedro", "Sofía", "Diego", "Valentina",
+           "Jorge", "Camila", "Carlos", "Isidora", "Felipe", "Javiera", "Andrés", "Catalina",
+           "Miguel", "Fernanda", "Tomás", "Daniela", "Matías", "Constanza", "Ignacio"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+             "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández",
+             "Torres", "Araya", "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia",
+             "Reyes", "Gutiérrez", "Castro", "Vargas", "Álvarez", "Vásquez", "Sánchez", "Fernández"]
+CALLES = ["Av. Providencia", "Av. Libertador", "Calle Moneda", "Av. Apoquindo", "Calle Huérfanos"]
+
+
+def con_error(texto, azar):
+    """Cambia, quita o duplica una letra al azar."""
+    i = azar.randrange(1, len(texto))
+    cambio = azar.randrange(3)
+    if cambio == 0:
+        return texto[:i] + texto[i:].replace(texto[i], azar.choice("aeiosrnl"), 1)
+    if cambio == 1:
+        return texto[:i] + texto[i + 1:]
+    return texto[:i] + texto[i] + texto[i:]
+
+
+def usuario(nombre):
+    """'María Pérez Soto' -> 'maria.perez' (sin tildes, válido para un email)."""
+    palabras = normalizar_texto(nombre).split()
+    return f"{palabras[0]}.{palabras[1]}"
+
+
+def generar(cantidad, azar):
+    clientes = []
+    originales = {}
+    for i in range(cantidad):
+        if clientes and azar.random() < 0.05:
+            original = azar.choice(clientes)
+            nombre = con_error(original.get_nombre(), azar)
+            telefono = original.get_telefono() if azar.random() < 0.7 else f"9{azar.randrange(10**8):08d}"
+            cliente = ClienteRegular(nombre, f"{usuario(original.get_nombre())}.{i}@gmail.com",
+                                     telefono, original.get_direccion())
+            originales[id(cliente)] = original
+        else:
+            nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+            cliente = ClienteRegular(nombre, f"{usuario(nombre)}{i}@email.com", f"9{azar.randrange(10**8):08d}",
+                                     f"{azar.choice(CALLES)} {azar.randrange(1, 9999)}")
+        clientes.append(cliente)
+    return clientes, originales
+
+
+def ejecutar(cantidades):
+    for cantidad in cantidades:
+        clientes, originales = generar(cantidad, random.Random(7))
+        detector = DetectorDuplicados()
+        inicio = time.perf_counter()
+        pares = detector.agregar(clientes)
+        segundos = time.perf_counter() - inicio
+
+        # Dos clientes son la misma persona si vienen del mismo original
+        def persona(cliente):
+            while id(cliente) in originales:
+                cliente = originales[id(cliente)]
+            return id(cliente)
+
+        correctos = [par for par in pares if persona(par[0]) == persona(par[1])]
+        encontrados = {id(a) for a, b, _ in correctos} | {id(b) for a, b, _ in correctos}
+        print(f"{cantidad:>9} clientes: {cantidad / segundos:>8.0f} clientes/s, "
+              f"{detector.comparaciones / cantidad:.1f} comparaciones por cliente, "
+              f"{len(encontrados & set(originales))}/{len(originales)} duplicados encontrados, "
+              f"{len(pares) - len(correctos)} pares falsos")
+
+
+if __name__ == "__main__":
+    tamanos = [int(argumento) for argumento in sys.argv[1:]] or [20000, 100000]
+    ejecutar(tamanos)
@@ -0,0 +1,425 @@
+"""
+Benchmark del gestor - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide todas las operaciones de GestorClientes con carteras de distintos
+tamaños (por defecto 1.000, 10.000 y 100.000 clientes, 60% Regular,
+30% Premium y 10% Corporativo), además de guardar y cargar en cada
+formato (JSON y CSV), las validaciones y el cálculo de descuentos.
+Con 1.000.000 de clientes (hay que pedirlo) tarda más de una hora y
+necesita unos 3 GB de memoria; buscar_duplicados se mide solo hasta
+100.000 clientes.
+
+Las operaciones masivas (sobre toda la cartera) se repiten 5 veces (3
+con más de 100.000 clientes), cada una desde el mismo estado: una sola
+medición depende mucho de lo que haga el resto de la máquina en ese
+momento.
+
+Para cada operación informa:
+    - por_segundo: llamadas por segundo (en las operaciones masivas,
+      clientes por segundo en la repetición más rápida)
+    - p50/p95/p99/max en microsegundos por llamada (en las masivas, por
+      repetición, junto con min: la repetición más rápida)
+    - pico_mb: memoria máxima (tracemalloc) de las operaciones masivas
+    - ruido (masivas): cuánto más lenta es la repetición mediana que la
+      más rápida (0.1 = 10%)
+
+Los resultados se guardan en JSON. Con --comparar se contrastan con un
+archivo anterior y se marca como regresión toda operación cuyo p50 o
+pico de memoria suba, o cuyo rendimiento baje, más que el umbral (20%
+por defecto) o que el ruido medido en cualquiera de los dos archivos,
+lo que sea mayor; en ese caso el programa termina con código 1.
+
+Uso:
+    python3 benchmark_gestor.py                                  # 1k, 10k y 100k
+    python3 benchmark_gestor.py 1000 10000 100000 1000000        # hasta 1M
+    python3 benchmark_gestor.py 1000 10000 --salida base.json
+    python3 benchmark_gestor.py 1000 10000 --comparar base.json  # marca regresiones
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+import itertools
+import statistics
+import platform
+import tempfile
+import contextlib
+import tracemalloc
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gestor_clientes import GestorClientes
+from src.cliente_regular import ClienteRegular
+from src.cliente_premium import ClientePremium
+from src.cliente_corporativo import ClienteCorporativo
+from src.persistencia import PersistenciaJSON
+from src.persistencia_csv import PersistenciaCSV
+from src.consultas import Tipo, Rango
+from src.metricas import HistogramaLatencia
+from src.validaciones import (
+    validar_nombre, validar_email, validar_telefono, validar_direccion, validar_rut, validar_lote
+)
+
+TAMANOS = [1000, 10000, 100000]
+LLAMADAS = 2000          # llamadas por operación puntual (como máximo)
+REPETICIONES = 5         # repeticiones de cada operación masiva (3 con más de 100.000 clientes)
+UMBRAL = 0.20            # 20% peor que la base = regresión
+
+NOMBRES = ["Ana", "José", "María", "Íñigo", "Sofía", "Matías", "Benjamín", "Martina", "Tomás", "Valentina"]
+APELLIDOS = ["Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda", "Núñez"]
+CALLES = ["Av. Providencia", "Calle Los Aromos", "Av. Apoquindo", "Pasaje El Roble", "Av. Libertador"]
+DOMINIOS = [f"empresa{i}.cl" for i in range(50)] + ["gmail.com", "hotmail.com", "email.com"]
+
+
+def _rut(numero):
+    """RUT con dígito verificador válido (módulo 11)."""
+    suma, factor = 0, 2
+    for digito in reversed(str(numero)):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    return f"{numero}-{'0' if resto == 11 else 'K' if resto == 10 else resto}"
+
+
+def generar_registros(cantidad, semilla=42):
+    """Diccionarios de clientes válidos: 60% Regular, 30% Premium y 10% Corporativo."""
+    azar = random.Random(semilla)
+    registros = []
+    for i in range(cantidad):
+        nombre = f"{azar.choice(NOMBRES)} {azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+        registro = {
+            'nombre': nombre,
+            'email': f"cliente{i}@{DOMINIOS[i % len(DOMINIOS)]}",
+            'telefono': f"9{i % 100000000:08d}",
+            'direccion': f"{azar.choice(CALLES)} {azar.randint(1, 9999)}",
+        }
+        tipo = i % 10
+        if tipo < 6:
+            registro['tipo'] = 'Regular'
+        elif tipo < 9:
+            registro['tipo'] = 'Premium'
+            registro['puntos_acumulados'] = azar.randint(0, 20000)
+        else:
+            registro['tipo'] = 'Corporativo'
+            registro['rut_empresa'] = _rut(76000000 + i)
+            registro['nombre_empresa'] = f"Empresa {i}"
+            registro['limite_credito'] = float(azar.randint(1, 100) * 10000)
+        registros.append(registro)
+    return registros
+
+
+def crear_cliente(registro):
+    if registro['tipo'] == 'Regular':
+        return ClienteRegular(registro['nombre'], registro['email'], registro['telefono'], registro['direccion'])
+    if registro['tipo'] == 'Premium':
+        cliente = ClientePremium(registro['nombre'], registro['email'], registro['telefono'], registro['direccion'])
+        cliente.set_puntos_acumulados(registro['puntos_acumulados'])
+        return cliente
+    return ClienteCorporativo(registro['nombre'], registro['email'], registro['telefono'], registro['direccion'],
+                              registro['nombre_empresa'], registro['rut_empresa'], registro['nombre'],
+                              registro['limite_credito'])
+
+
+# ========== MEDICIÓN ==========
+
+def _resultado(histograma, elementos, segundos, pico=None):
+    resumen = histograma.resumen()
+    datos = {
+        'llamadas': resumen['llamadas'],
+        'por_segundo': elementos / segundos if segundos else 0.0,
+        'p50_us': resumen['p50_segundos'] * 1e6,
+        'p95_us': resumen['p95_segundos'] * 1e6,
+        'p99_us': resumen['p99_segundos'] * 1e6,
+        'max_us': resumen['max_segundos'] * 1e6,
+    }
+    if pico is not None:
+        datos['pico_mb'] = pico / (1024 * 1024)
+    return datos
+
+
+def medir_llamadas(funcion, argumentos):
+    """Llama a funcion(argumento) con cada argumento; una medición por llamada."""
+    histograma = HistogramaLatencia()
+    reloj = time.perf_counter_ns
+    inicio = reloj()
+    for argumento in argumentos:
+        antes = reloj()
+        funcion(argumento)
+        histograma.registrar(reloj() - antes)
+    return _resultado(histograma, len(argumentos), (reloj() - inicio) / 1e9)
+
+
+def medir_masiva(funcion, elementos, repeticiones=REPETICIONES, preparar=None, memoria=True):
+    """
+    Operación sobre toda la cartera: se mide cada repetición; el
+    rendimiento es elementos por segundo en la repetición más rápida y
+    p50 es la mediana de las repeticiones.
+
+    Si la operación cambia el estado (por ejemplo, elimina clientes),
+    preparar() debe dejarlo como estaba antes de cada repetición (no se
+    mide) y lo que retorne se le pasa a funcion. Con memoria=True se
+    repite una vez más con tracemalloc (aparte, porque tracemalloc la
+    hace más lenta).
+    """
+    histograma = HistogramaLatencia()
+    duraciones = []
+    for _ in range(repeticiones):
+        argumento = preparar() if preparar else None
+        antes = time.perf_counter_ns()
+        funcion(argumento) if preparar else funcion()
+        duracion = time.perf_counter_ns() - antes
+        histograma.registrar(duracion)
+        duraciones.append(duracion)
+    pico = None
+    if memoria:
+        argumento = preparar() if preparar else None
+        tracemalloc.start()
+        funcion(argumento) if preparar else funcion()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    mediana = statistics.median(duraciones)
+    datos = _resultado(histograma, elementos, min(duraciones) / 1e9, pico)
+    # El histograma agrupa en cubetas: con pocas repeticiones se informa la mediana exacta
+    datos['p50_us'] = mediana / 1e3
+    datos['min_us'] = min(duraciones) / 1e3
+    datos['ruido'] = mediana / min(duraciones) - 1 if min(duraciones) else 0.0
+    return datos
+
+
+def medir_tamano(cantidad, directorio, semilla):
+    """Mide todas las operaciones con una cartera de 'cantidad' clientes."""
+    azar = random.Random(semilla)
+    registros = generar_registros(cantidad, semilla)
+    repeticiones = REPETICIONES if cantidad <= 100000 else 3
+    llamadas = min(cantidad, LLAMADAS)
+    # Operaciones que recorren toda la cartera: menos llamadas cuanto más grande
+    llamadas_lineales = max(3, min(100, 1000000 // cantidad))
+    muestra = [registros[azar.randrange(cantidad)] for _ in range(llamadas)]
+    resultados = {}
+
+    # --- Creación y validación ---
+    resultados['crear_clientes'] = medir_masiva(lambda: [crear_cliente(r) for r in registros], cantidad,
+                                                repeticiones, memoria=False)
+    resultados['validar_lote'] = medir_masiva(lambda: validar_lote(registros), cantidad, repeticiones, memoria=False)
+    resultados['validar_nombre'] = medir_llamadas(validar_nombre, [r['nombre'] for r in muestra])
+    resultados['validar_email'] = medir_llamadas(validar_email, [r['email'] for r in muestra])
+    resultados['validar_telefono'] = medir_llamadas(validar_telefono, [r['telefono'] for r in muestra])
+    resultados['validar_direccion'] = medir_llamadas(validar_direccion, [r['direccion'] for r in muestra])
+    resultados['validar_rut'] = medir_llamadas(validar_rut, [_rut(76000000 + i) for i in range(llamadas)])
+
+    def nuevo_gestor(clientes=None):
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        if clientes is not None:
+            gestor.agregar_multiples(clientes)
+        return gestor
+
+    resultados['agregar_multiples'] = medir_masiva(lambda clientes: nuevo_gestor(clientes), cantidad, repeticiones,
+                                                   preparar=lambda: [crear_cliente(r) for r in registros])
+    gestor = nuevo_gestor([crear_cliente(r) for r in registros])
+    clientes = gestor.listar_todos()
+
+    # --- Descuentos ---
+    for tipo in ('Regular', 'Premium', 'Corporativo'):
+        del_tipo = gestor.listar_por_tipo(tipo)[:llamadas]
+        resultados[f'calcular_descuento_{tipo.lower()}'] = medir_llamadas(
+            lambda cliente: cliente.calcular_descuento(15000.0), del_tipo)
+    resultados['calcular_descuento_cartera'] = medir_masiva(
+        lambda: sum(cliente.calcular_descuento(15000.0) for cliente in clientes), cantidad, repeticiones, memoria=False)
+
+    # --- Búsquedas y listados ---
+    corporativos = [r for r in registros if r['tipo'] == 'Corporativo'][:llamadas] or registros[:1]
+    premium = [r['email'] for r in registros if r['tipo'] == 'Premium'][:llamadas]
+    resultados['buscar_por_email'] = medir_llamadas(gestor.buscar_por_email, [r['email'] for r in muestra])
+    resultados['buscar_por_telefono'] = medir_llamadas(gestor.buscar_por_telefono, [r['telefono'] for r in muestra])
+    resultados['buscar_por_rut'] = medir_llamadas(gestor.buscar_por_rut, [r['rut_empresa'] for r in corporativos])
+    resultados['buscar_por_nombre'] = medir_llamadas(gestor.buscar_por_nombre,
+                                                     [r['nombre'].split()[2] for r in muestra[:llamadas_lineales]])
+    resultados['listar_todos'] = medir_llamadas(lambda _: gestor.listar_todos(), range(llamadas_lineales))
+    resultados['listar_por_tipo'] = medir_llamadas(gestor.listar_por_tipo,
+                                                   ['Regular', 'Premium', 'Corporativo'] * llamadas_lineales)
+    resultados['listar_por_dominio'] = medir_llamadas(gestor.listar_por_dominio,
+                                                      [DOMINIOS[i % len(DOMINIOS)] for i in range(llamadas)])
+    resultados['contar_por_dominio'] = medir_llamadas(gestor.contar_por_dominio,
+                                                      [DOMINIOS[i % len(DOMINIOS)] for i in range(llamadas)])
+    resultados['conteo_dominios'] = medir_llamadas(lambda _: gestor.conteo_dominios(), range(llamadas_lineales))
+    resultados['iterar'] = medir_llamadas(lambda pagina: gestor.iterar(pagina=pagina, tamano=100),
+                                          [1 + i % max(1, cantidad // 100) for i in range(llamadas)])
+    resultados['consultar'] = medir_llamadas(
+        lambda desde: list(gestor.consultar(Tipo('Premium'), Rango('puntos_acumulados', desde, desde + 100))),
+        [azar.randint(0, 20000) for _ in range(llamadas)])
+    resultados['rango'] = medir_llamadas(
+        lambda desde: gestor.rango('puntos_acumulados', desde, desde + 100),
+        [azar.randint(0, 20000) for _ in range(llamadas)])
+    resultados['ranking'] = medir_llamadas(lambda _: gestor.ranking('puntos_acumulados', 100), range(llamadas))
+    resultados['posicion_en_ranking'] = medir_llamadas(gestor.posicion_en_ranking, premium)
+    resultados['estadisticas'] = medir_llamadas(lambda _: gestor.estadisticas(), range(llamadas_lineales))
+    if cantidad <= 100000:
+        resultados['buscar_duplicados'] = medir_masiva(gestor.buscar_duplicados, cantidad, repeticiones,
+                                                       memoria=cantidad <= 10000)
+
+    # --- Guardar y cargar ---
+    ruta_json = os.path.join(directorio, "clientes.json")
+    ruta_csv = os.path.join(directorio, "clientes.csv")
+    persistencia = PersistenciaJSON(ruta_json)
+    resultados['json_guardar'] = medir_masiva(lambda: persistencia.guardar_multiples(clientes), cantidad, repeticiones)
+    resultados['json_cargar_todos'] = medir_masiva(persistencia.cargar_todos, cantidad, repeticiones)
+    resultados['json_cargar_objetos'] = medir_masiva(persistencia.cargar_objetos, cantidad, repeticiones)
+    resultados['json_buscar_por_email'] = medir_llamadas(persistencia.buscar_por_email,
+                                                         [f"nadie{i}@email.com" for i in range(llamadas)])
+    nuevos_json = [crear_cliente(r) for r in generar_registros(min(cantidad, 1000), semilla + 1)]
+    for nuevo in nuevos_json:
+        nuevo.set_email("nuevo." + nuevo.get_email())
+    # Antes de cada repetición el archivo vuelve a tener solo la cartera
+    resultados['json_agregar_multiples'] = medir_masiva(lambda _: persistencia.agregar_multiples(nuevos_json),
+                                                        len(nuevos_json), repeticiones, memoria=False,
+                                                        preparar=lambda: persistencia.guardar_multiples(clientes))
+    gestor.usar_persistencia = True
+    gestor.persistencia = persistencia
+    resultados['guardar_todos'] = medir_masiva(gestor.guardar_todos, cantidad, repeticiones)
+
+    persistencia_csv = PersistenciaCSV(ruta_csv)
+    resultados['csv_exportar'] = medir_masiva(lambda: persistencia_csv.exportar(clientes), cantidad, repeticiones)
+    resultados['csv_importar'] = medir_masiva(lambda importador: importador.importar_csv(ruta_csv),
+                                              cantidad, repeticiones, preparar=nuevo_gestor)
+
+    # --- Modificaciones (en el gestor con la cartera completa, sin archivo) ---
+    gestor.usar_persistencia = False
+    nuevos = [crear_cliente(r) for r in generar_registros(llamadas, semilla + 2)]
+    for indice, nuevo in enumerate(nuevos):
+        nuevo.set_email(f"alta{indice}@nuevo.cl")
+        nuevo.set_telefono(f"9{99999999 - indice:08d}")
+    resultados['agregar_cliente'] = medir_llamadas(gestor.agregar_cliente, nuevos)
+    resultados['actualizar_cliente'] = medir_llamadas(
+        lambda registro: gestor.actualizar_cliente(registro['email'], direccion=registro['direccion'] + " B"), muestra)
+    # Las operaciones masivas que modifican la cartera se repiten desde el
+    # mismo estado: cada repetición cambia todo (dirección y dominio van y
+    # vuelven, los niveles parten todos en Bronce, lo eliminado se repone)
+    direcciones = itertools.cycle(["Av. Nueva Dirección 100", "Av. Nueva Dirección 200"])
+    resultados['actualizar_multiples'] = medir_masiva(
+        lambda direccion: gestor.actualizar_multiples(dominio=DOMINIOS[0], direccion=direccion),
+        gestor.contar_por_dominio(DOMINIOS[0]), repeticiones, preparar=lambda: next(direcciones), memoria=False)
+    dominios = itertools.cycle([(DOMINIOS[1], "cambiado.cl"), ("cambiado.cl", DOMINIOS[1])])
+    resultados['cambiar_dominio'] = medir_masiva(
+        lambda par: gestor.cambiar_dominio(*par), gestor.contar_por_dominio(DOMINIOS[1]), repeticiones,
+        preparar=lambda: next(dominios), memoria=False)
+    todos_premium = gestor.listar_por_tipo('Premium')
+    resultados['recalcular_niveles'] = medir_masiva(
+        lambda _: gestor.recalcular_niveles(), len(todos_premium), repeticiones, memoria=False,
+        preparar=lambda: [cliente.set_nivel_membresia('Bronce') for cliente in todos_premium])
+    resultados['eliminar_cliente'] = medir_llamadas(gestor.eliminar_cliente, [c.get_email() for c in nuevos])
+    eliminados = gestor.listar_por_dominio(DOMINIOS[2])
+
+    def reponer():
+        if not gestor.contar_por_dominio(DOMINIOS[2]):
+            gestor.agregar_multiples(eliminados)
+
+    resultados['eliminar_multiples'] = medir_masiva(
+        lambda _: gestor.eliminar_multiples(dominio=DOMINIOS[2]), len(eliminados), repeticiones, memoria=False,
+        preparar=reponer)
+    return resultados
+
+
+# ========== COMPARACIÓN ==========
+
+def comparar(actual, base, umbral=UMBRAL):
+    """
+    Compara dos resultados (diccionarios como los de ejecutar()).
+
+    En las operaciones masivas se compara la repetición más rápida (el
+    ruido de la máquina solo agrega tiempo) y el cambio tolerado es el
+    umbral o, si es mayor, el ruido medido en la operación (en la base o
+    en la actual): una diferencia del tamaño de lo que varían las
+    repeticiones entre sí no es una regresión.
+
+    Retorna una lista de regresiones (tamano, operacion, medida, base, actual, cambio).
+    """
+    regresiones = []
+    for tamano, operaciones in actual['tamanos'].items():
+        for operacion, datos in operaciones.items():
+            anterior = base.get('tamanos', {}).get(tamano, {}).get(operacion)
+            if not anterior:
+                continue
+            tolerancia = max(umbral, datos.get('ruido', 0.0), anterior.get('ruido', 0.0))
+            # (medida, True si más alto es peor); en las masivas, la mejor repetición
+            tiempo = 'min_us' if 'min_us' in datos else 'p50_us'
+            for medida, subir_es_peor in ((tiempo, True), ('por_segundo', False), ('pico_mb', True)):
+                if medida not in datos or not anterior.get(medida):
+                    continue
+                # Diferencias de menos de 1 µs son ruido del reloj
+                if medida == tiempo and datos[medida] - anterior[medida] < 1:
+                    continue
+                cambio = datos[medida] / anterior[medida] - 1
+                # La memoria no depende de la carga de la máquina: solo el umbral
+                limite = umbral if medida == 'pico_mb' else tolerancia
+                if (cambio > limite) if subir_es_peor else (cambio < -limite):
+                    regresiones.append((tamano, operacion, medida, anterior[medida], datos[medida], cambio))
+    return regresiones
+
+
+def _maxrss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Linux informa KB; macOS, bytes
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / (1024 * 1024) if sys.platform == 'darwin' else maximo / 1024
+
+
+def ejecutar(tamanos, semilla=42):
+    resultados = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semilla': semilla,
+        'tamanos': {},
+    }
+    for cantidad in tamanos:
+        inicio = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directorio, contextlib.redirect_stdout(io.StringIO()):
+            operaciones = medir_tamano(cantidad, directorio, semilla)
+        resultados['tamanos'][str(cantidad)] = operaciones
+        print(f"\n{cantidad:,} clientes ({time.perf_counter() - inicio:.1f} s)")
+        print(f"{'operación':<28} {'por segundo':>13} {'p50 µs':>11} {'p95 µs':>11} {'p99 µs':>11} "
+              f"{'pico MB':>9} {'ruido':>7}")
+        for nombre, datos in operaciones.items():
+            pico = f"{datos['pico_mb']:.1f}" if 'pico_mb' in datos else ""
+            ruido = f"{datos['ruido']:.0%}" if 'ruido' in datos else ""
+            print(f"{nombre:<28} {datos['por_segundo']:>13,.0f} {datos['p50_us']:>11.1f} "
+                  f"{datos['p95_us']:>11.1f} {datos['p99_us']:>11.1f} {pico:>9} {ruido:>7}")
+    resultados['max_rss_mb'] = _maxrss_mb()
+    return resultados
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark de todas las operaciones del gestor")
+    argumentos.add_argument('tamanos', nargs='*', type=int, default=TAMANOS, help="Cantidades de clientes")
+    argumentos.add_argument('--salida', default="benchmark_gestor.json", help="Archivo JSON de resultados")
+    argumentos.add_argument('--comparar', help="Resultados anteriores (JSON) contra los que comparar")
+    argumentos.add_argument('--umbral', type=float, default=UMBRAL, help="Empeoramiento tolerado (0.2 = 20%%)")
+    argumentos.add_argument('--semilla', type=int, default=42)
+    opciones = argumentos.parse_args()
+
+    resultados = ejecutar(opciones.tamanos, opciones.semilla)
+    with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, 'r', encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(resultados, base, opciones.umbral)
+        for tamano, operacion, medida, anterior, actual, cambio in regresiones:
+            print(f"REGRESIÓN {tamano:>8} {operacion:<28} {medida:<12} {anterior:>12.1f} -> {actual:>12.1f} "
+                  f"({cambio:+.0%})")
+        if regresiones:
+            sys.exit(1)
+        print(f"Sin regresiones respecto de {opciones.comparar} (umbral {opciones.umbral:.0%})")
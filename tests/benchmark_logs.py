@@ -0,0 +1,114 @@
+"""
+Benchmark de logs - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide cuánto tarda una llamada a registrar_operacion en el hilo que la
+hace: escribiendo directo al archivo (como antes, con FileHandler) y
+con SistemaLogs, que solo pone el registro en una cola o en un buffer.
+
+También mide actualizar_cliente en el gestor con los logs en INFO y en
+WARNING (con WARNING los mensajes no se arman), y compara leer las
+últimas 20 líneas de un log grande con
+readlines() (como antes) y con la lectura desde el final.
+
+Uso:
+    python3 benchmark_logs.py            # 100.000 registros
+    python3 benchmark_logs.py 500000     # cantidad personalizada
+"""
+
+import sys
+import os
+import time
+import io
+import logging
+import tempfile
+import contextlib
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logs import SistemaLogs, leer_ultimas_lineas
+from src.gestor_clientes import GestorClientes
+from src.cliente_regular import ClienteRegular
+
+
+def medir(nombre, cantidad, registrar, terminar=None):
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        registrar("Agregar", f"cliente{i}@email.com", "Tipo: Premium")
+    llamadas = time.perf_counter() - inicio
+    if terminar:
+        terminar()
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<30} {llamadas / cantidad * 1e6:>7.2f} µs/llamada   total con escritura: {total:>6.2f} s")
+
+
+def ejecutar(cantidad):
+    with tempfile.TemporaryDirectory() as directorio:
+        # Referencia: escritura sincrónica, una línea al disco por llamada
+        directo = logging.getLogger("benchmark.directo")
+        directo.propagate = False
+        directo.setLevel(logging.INFO)
+        manejador = logging.FileHandler(os.path.join(directorio, "directo.txt"), encoding='utf-8')
+        manejador.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        directo.addHandler(manejador)
+        medir("FileHandler sincrónico", cantidad,
+              lambda operacion, email, detalles: directo.info(
+                  f"Operacion: {operacion} | Cliente: {email} | {detalles}"))
+        manejador.close()
+
+        for politica in ('bloquear', 'descartar', 'muestrear'):
+            logs = SistemaLogs(os.path.join(directorio, f"{politica}.txt"),
+                               politica_desborde=politica, mostrar_en_consola=False)
+            medir(f"SistemaLogs ({politica})", cantidad, logs.registrar_operacion, logs.cerrar)
+            if logs.descartados():
+                print(f"{'':<30} {logs.descartados()} registros descartados")
+
+        # Sin hilo: buffer en memoria (pensado para muchas instancias a la vez)
+        logs = SistemaLogs(os.path.join(directorio, "buffer.txt"), mostrar_en_consola=False, buffer=1000)
+        medir("SistemaLogs (buffer de 1000)", cantidad, logs.registrar_operacion, logs.cerrar)
+
+
+def medir_gestor(cantidad):
+    with tempfile.TemporaryDirectory() as directorio, contextlib.redirect_stdout(io.StringIO()):
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        gestor.agregar_multiples([ClienteRegular("Cliente Prueba", f"cliente{i}@email.com", f"9{i:08d}",
+                                                 "Calle Uno 123") for i in range(1000)])
+        gestor.usar_logs = True
+        resultados = []
+        for nivel in (logging.INFO, logging.WARNING):
+            gestor.logs = SistemaLogs(os.path.join(directorio, f"gestor{nivel}.txt"),
+                                      mostrar_en_consola=False, nivel=nivel)
+            inicio = time.perf_counter()
+            for i in range(cantidad):
+                gestor.actualizar_cliente(f"cliente{i % 1000}@email.com", direccion=f"Calle Dos {i}")
+            resultados.append((logging.getLevelName(nivel), (time.perf_counter() - inicio) / cantidad))
+            gestor.logs.cerrar()
+    for nombre, segundos in resultados:
+        print(f"{'actualizar_cliente (' + nombre + ')':<30} {segundos * 1e6:>7.2f} µs/llamada")
+
+
+def medir_lectura(megabytes=200):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "grande.txt")
+        linea = "2024-01-01 12:00:00 - INFO - Operacion: Agregar | Cliente: cliente@email.com | Tipo: Premium\n"
+        bloque = linea * 10000
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            for _ in range(megabytes * 1024 * 1024 // len(bloque)):
+                archivo.write(bloque)
+
+        inicio = time.perf_counter()
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            archivo.readlines()[-20:]
+        print(f"{'readlines() de ' + str(megabytes) + ' MB':<30} {time.perf_counter() - inicio:>9.4f} s")
+
+        inicio = time.perf_counter()
+        leer_ultimas_lineas(ruta, 20)
+        print(f"{'leer_ultimas_lineas(20)':<30} {time.perf_counter() - inicio:>9.4f} s")
+
+
+if __name__ == "__main__":
+    ejecutar(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    medir_gestor(20000)
+    medir_lectura()
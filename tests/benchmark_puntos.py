@@ -0,0 +1,84 @@
+"""
+Benchmark de puntos - Gestor Inteligente de Clientes
+Proyecto: GIC
+Empresa: SolutionTech
+
+Mide cuántos movimientos de puntos por segundo registra LibroPuntos,
+en lotes y de a uno, con un solo hilo y con varios hilos.
+
+Uso:
+    python3 benchmark_puntos.py            # 200.000 eventos sobre 10.000 clientes
+    python3 benchmark_puntos.py 1000000    # cantidad de eventos personalizada
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+import threading
+
+# Agregar el directorio padre al path para importar desde src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gestor_clientes import GestorClientes
+from src.cliente_premium import ClientePremium
+from src.libro_puntos import LibroPuntos
+
+CLIENTES = 10000
+TAMANO_LOTE = 1000
+
+
+def crear_gestor():
+    gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+    gestor.agregar_multiples([
+        ClientePremium("Cliente Premium", f"premium{i}@email.com", f"9{i:08d}", f"Av. Providencia {i}")
+        for i in range(CLIENTES)
+    ])
+    return gestor
+
+
+def generar_eventos(cantidad):
+    """Eventos aleatorios: 90% acumulación y 10% canje."""
+    azar = random.Random(42)
+    return [(f"premium{azar.randrange(CLIENTES)}@email.com",
+             azar.randint(1, 100) if azar.random() < 0.9 else -azar.randint(1, 20))
+            for _ in range(cantidad)]
+
+
+def medir(nombre, cantidad, funcion):
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<28} {cantidad:>9} eventos: {cantidad / segundos:>10.0f} eventos/s")
+
+
+def ejecutar(cantidad):
+    eventos = generar_eventos(cantidad)
+    lotes = [eventos[i:i + TAMANO_LOTE] for i in range(0, cantidad, TAMANO_LOTE)]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, "puntos.log")
+
+        with LibroPuntos(crear_gestor(), archivo) as libro:
+            medir(f"lotes de {TAMANO_LOTE}", cantidad,
+                  lambda: [libro.registrar_lote(lote) for lote in lotes])
+
+        with LibroPuntos(crear_gestor(), archivo) as libro:
+            uno = eventos[:cantidad // 10]
+            medir("de a uno", len(uno),
+                  lambda: [libro.acumular(email, abs(puntos)) for email, puntos in uno])
+
+        with LibroPuntos(crear_gestor(), archivo) as libro:
+            def en_hilos():
+                hilos = [threading.Thread(target=lambda parte=lotes[i::4]: [libro.registrar_lote(l) for l in parte])
+                         for i in range(4)]
+                for hilo in hilos:
+                    hilo.start()
+                for hilo in hilos:
+                    hilo.join()
+            medir("lotes en 4 hilos", cantidad, en_hilos)
+
+
+if __name__ == "__main__":
+    ejecutar(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
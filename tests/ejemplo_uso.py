@@ -65,7 +65,7 @@ def ejemplo_1_crear_clientes_basicos():
         telefono="+56955667788",
         direccion="Av. Apoquindo 4500, Las Condes",
         nombre_empresa="Tech Solutions SpA",
-        rut_empresa="76.123.456-7",
+        rut_empresa="76.123.456-0",
         contacto_principal="Pedro Sánchez",
         limite_credito=500000.0
     )
@@ -92,7 +92,7 @@ def ejemplo_2_polimorfismo_descuentos():
     regular = ClienteRegular("Ana González", "ana@email.com", "912345678", "Calle 1 #123")
     premium = ClientePremium("Carlos Díaz", "carlos@email.com", "987654321", "Calle 2 #456", "Oro", 25.0)
     corporativo = ClienteCorporativo("Luis Rojas", "luis@empresa.com", "955667788", "Calle 3 #789",
-                                    "Empresa ABC", "12.345.678-9", "Luis Rojas", 1000000.0)
+                                    "Empresa ABC", "12.345.678-5", "Luis Rojas", 1000000.0)
     
     # Monto de compra
     monto_compra = 100000.0
@@ -186,7 +186,7 @@ def ejemplo_4_credito_corporativo():
         telefono="933445566",
         direccion="Av. Kennedy 5600, Vitacura",
         nombre_empresa="InnovaTech Ltda.",
-        rut_empresa="77.654.321-0",
+        rut_empresa="77.654.321-7",
         contacto_principal="Roberto Flores",
         limite_credito=300000.0
     )
@@ -248,7 +248,7 @@ def ejemplo_5_gestor_clientes():
     gestor.agregar_cliente(cliente2)
     
     cliente3 = ClienteCorporativo("Carmen Vega", "carmen@corp.cl", "933445566", "Av. Las Condes 789",
-                                 "CorpSA", "88.999.888-7", "Carmen Vega", 600000.0)
+                                 "CorpSA", "88.999.888-1", "Carmen Vega", 600000.0)
     gestor.agregar_cliente(cliente3)
     print()
     
@@ -11,6 +11,13 @@ que todas las funcionalidades del sistema funcionan correctamente.
 import unittest
 import sys
 import os
+import tempfile
+import json
+import subprocess
+import threading
+import time
+import logging
+from datetime import date
 
 # Agregar el directorio padre al path para importar desde src/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -21,16 +28,31 @@ from src.cliente_regular import ClienteRegular
 from src.cliente_premium import ClientePremium
 from src.cliente_corporativo import ClienteCorporativo
 from src.gestor_clientes import GestorClientes
+from src.persistencia_csv import COLUMNAS_CSV
+from src.indices import IndiceOrdenado
+from src.libro_puntos import LibroPuntos
+from src.niveles import MotorNiveles
+from src.duplicados import DetectorDuplicados, clave_fonetica
+from src.filtro_bloom import FiltroBloom
+from src.persistencia import PersistenciaJSON
+from src.logs import SistemaLogs, leer_ultimas_lineas
+from src.auditoria import RegistroAuditoria
+from src.metricas import HistogramaLatencia, Metricas, exportar_prometheus
+from src.generador import GeneradorClientes
+from src.memoria import PerfilMemoria, tamano_profundo
+from src.consultas import Tipo, NombreContiene, Dominio, Rango
 
 # Importamos las excepciones
-from src.excepciones import ValidacionError, ClienteDuplicadoError
+from src.excepciones import ValidacionError, ClienteDuplicadoError, ClienteNoEncontradoError, PersistenciaError
 
 # Importamos validaciones
 from src.validaciones import (
     validar_email,
     validar_telefono,
     validar_nombre,
-    validar_direccion
+    validar_direccion,
+    validar_lote,
+    validar_rut
 )
 
 
@@ -89,6 +111,49 @@ class TestValidaciones(unittest.TestCase):
         """Test: Dirección inválida debe lanzar excepción."""
         with self.assertRaises(ValidacionError):
             validar_direccion("Calle 1")  # Muy corta
+    
+    def test_validar_rut(self):
+        """Test: El RUT se valida con su dígito verificador."""
+        self.assertTrue(validar_rut("76.543.210-3"))
+        self.assertTrue(validar_rut("12345678-5"))
+        self.assertTrue(validar_rut("11.111.111-1"))
+        with self.assertRaises(ValidacionError):
+            validar_rut("76.543.210-9")  # Dígito verificador incorrecto
+        with self.assertRaises(ValidacionError):
+            validar_rut("76.543.210")  # Sin dígito verificador
+
+
+class TestValidarLote(unittest.TestCase):
+    """Tests para la validación por lotes."""
+    
+    def setUp(self):
+        """Preparar un lote con registros válidos e inválidos."""
+        self.registros = [
+            {'nombre': "Juan Pérez", 'email': "juan@email.com",
+             'telefono': "912345678", 'direccion': "Av. Libertador 1234"},
+            {'nombre': "Juan123", 'email': "sin_arroba",
+             'telefono': "(56)9-1234-5678", 'direccion': "Corta"},
+            {'nombre': "María Soto", 'email': "maria@email.com", 'telefono': "912345678"},
+            {'nombre': "Ana Lagos", 'email': "ana@email.com", 'telefono': "912345678",
+             'direccion': "Av. Brasil 456 Santiago", 'puntos_acumulados': -5},
+        ]
+    
+    def test_errores_por_campo(self):
+        """Test: Se informan todos los campos inválidos de cada registro."""
+        errores = validar_lote(self.registros)
+        self.assertEqual(sorted(errores), [1, 2, 3])
+        self.assertEqual(sorted(errores[1]), ['direccion', 'email', 'nombre'])
+        self.assertEqual(list(errores[2]), ['direccion'])
+        self.assertEqual(list(errores[3]), ['puntos_acumulados'])
+    
+    def test_lote_valido(self):
+        """Test: Un lote sin errores retorna un diccionario vacío."""
+        self.assertEqual(validar_lote(self.registros[:1]), {})
+    
+    def test_varios_procesos(self):
+        """Test: Con varios procesos el resultado es el mismo."""
+        errores = validar_lote(self.registros * 3, procesos=2, tamano_bloque=4)
+        self.assertEqual(sorted(errores), [1, 2, 3, 5, 6, 7, 9, 10, 11])
 
 
 class TestClienteSimple(unittest.TestCase):
@@ -111,7 +176,8 @@ class TestClienteSimple(unittest.TestCase):
         # assertEqual verifica que dos valores sean iguales
         self.assertEqual(self.cliente.get_nombre(), "Juan Pérez")
         self.assertEqual(self.cliente.get_email(), "juan@email.com")
-        self.assertEqual(self.cliente.get_telefono(), "912345678")
+        # El teléfono se guarda en formato E.164
+        self.assertEqual(self.cliente.get_telefono(), "+56912345678")
     
     def test_actualizar_email(self):
         """Test: Actualizar email de un cliente."""
@@ -121,7 +187,13 @@ class TestClienteSimple(unittest.TestCase):
     def test_actualizar_telefono(self):
         """Test: Actualizar teléfono de un cliente."""
         self.cliente.set_telefono("987654321")
-        self.assertEqual(self.cliente.get_telefono(), "987654321")
+        self.assertEqual(self.cliente.get_telefono(), "+56987654321")
+    
+    def test_normalizar_telefono(self):
+        """Test: Distintos formatos del mismo teléfono quedan iguales."""
+        for formato in ("+56 9 1234 5678", "912345678", "(56)9-1234-5678"):
+            self.cliente.set_telefono(formato)
+            self.assertEqual(self.cliente.get_telefono(), "+56912345678")
     
     def test_obtener_resumen(self):
         """Test: Obtener resumen del cliente como diccionario."""
@@ -223,7 +295,7 @@ class TestClienteCorporativo(unittest.TestCase):
             telefono="933445566",
             direccion="Av. Kennedy 5000, Vitacura",
             nombre_empresa="Empresa XYZ",
-            rut_empresa="76.543.210-9",
+            rut_empresa="76.543.210-3",
             contacto_principal="Luis Rojas",
             limite_credito=500000.0
         )
@@ -261,11 +333,64 @@ class TestClienteCorporativo(unittest.TestCase):
         resultado = self.cliente.verificar_credito_disponible(100000.0)
         self.assertTrue(resultado)
     
+    def test_rut_normalizado(self):
+        """Test: El RUT se guarda sin puntos; el dígito verificador se revisa."""
+        self.assertEqual(self.cliente.get_rut_empresa(), "76543210-3")
+        self.cliente.set_rut_empresa("76.123.456-0")
+        self.assertEqual(self.cliente.get_rut_empresa(), "76123456-0")
+        with self.assertRaises(ValidacionError):
+            self.cliente.set_rut_empresa("76.543.210-X")
+        with self.assertRaises(ValidacionError):
+            self.cliente.set_rut_empresa("76.123.456-7")
+        self.assertEqual(self.cliente.get_rut_empresa(), "76123456-0")
+    
+    def test_cliente_nuevo_con_digito_incorrecto(self):
+        """Test: Un cliente nuevo con dígito verificador incorrecto se rechaza."""
+        with self.assertRaises(ValidacionError):
+            ClienteCorporativo("Pedro Díaz", "pedro@empresa.cl", "912345678", "Av. Empresa 456",
+                               "Empresa S.A.", "76.123.456-7", "Pedro Díaz")
+    
     def test_verificar_credito_insuficiente(self):
         """Test: Verificar crédito cuando no hay suficiente."""
         self.cliente.utilizar_credito(450000.0)
         resultado = self.cliente.verificar_credito_disponible(100000.0)
         self.assertFalse(resultado)
+    
+    def test_reservar_confirmar_y_liberar(self):
+        """Test: Las reservas apartan crédito hasta confirmarlas o liberarlas."""
+        primera = self.cliente.reservar_credito(300000.0)
+        segunda = self.cliente.reservar_credito(150000.0)
+        self.assertIsNone(self.cliente.reservar_credito(100000.0))
+        self.assertFalse(self.cliente.utilizar_credito(100000.0))
+        self.assertEqual(self.cliente.get_credito_libre(), 50000.0)
+        
+        self.assertTrue(self.cliente.confirmar_reserva(primera))
+        self.assertFalse(self.cliente.confirmar_reserva(primera))
+        self.assertTrue(self.cliente.liberar_reserva(segunda))
+        self.assertEqual(self.cliente.get_credito_utilizado(), 300000.0)
+        self.assertEqual(self.cliente.get_credito_reservado(), 0.0)
+    
+    def test_reserva_vencida(self):
+        """Test: Una reserva vencida devuelve el crédito y no se puede confirmar."""
+        numero = self.cliente.reservar_credito(500000.0, duracion=0)
+        self.assertEqual(self.cliente.reservas_vigentes(), {})
+        self.assertFalse(self.cliente.confirmar_reserva(numero))
+        self.assertEqual(self.cliente.get_credito_libre(), 500000.0)
+    
+    def test_reservas_concurrentes_sin_sobregiro(self):
+        """Test: Muchos hilos reservando a la vez no superan el límite."""
+        def comprar():
+            for _ in range(20):
+                numero = self.cliente.reservar_credito(10000.0)
+                if numero is not None:
+                    self.cliente.confirmar_reserva(numero)
+        
+        hilos = [threading.Thread(target=comprar) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(self.cliente.get_credito_utilizado(), 500000.0)
 
 
 class TestGestorClientes(unittest.TestCase):
@@ -315,6 +440,38 @@ class TestGestorClientes(unittest.TestCase):
         todos = self.gestor.listar_todos()
         self.assertEqual(len(todos), 3)
     
+    def test_listar_todos_retorna_copia(self):
+        """Test: Modificar la lista retornada no afecta al gestor."""
+        self.gestor.agregar_cliente(self.cliente1)
+        self.gestor.listar_todos().clear()
+        self.assertEqual(len(self.gestor), 1)
+    
+    def test_iterar_con_cursor_estable(self):
+        """Test: El cursor no repite ni salta clientes si la lista cambia entre páginas."""
+        clientes = [ClienteRegular(f"Cliente {letra}", f"c{i}@email.com", "912345678", "Calle Uno 123")
+                    for i, letra in enumerate("ABCDEFG")]
+        self.gestor.agregar_multiples(clientes)
+        
+        pagina = self.gestor.iterar(tamano=3)
+        self.assertEqual(pagina['clientes'], clientes[:3])
+        self.assertEqual(pagina['total'], 7)
+        
+        # Cambios entre páginas: se elimina uno ya leído y uno pendiente, y se agrega otro
+        self.gestor.eliminar_multiples(emails=["c0@email.com", "c4@email.com"])
+        nuevo = ClienteRegular("Cliente Nuevo", "nuevo@email.com", "912345678", "Calle Uno 123")
+        self.gestor.agregar_cliente(nuevo)
+        
+        pagina = self.gestor.iterar(tamano=3, desde=pagina['siguiente'])
+        self.assertEqual(pagina['clientes'], [clientes[3], clientes[5], clientes[6]])
+        pagina = self.gestor.iterar(tamano=3, desde=pagina['siguiente'])
+        self.assertEqual(pagina['clientes'], [nuevo])
+        self.assertIsNone(pagina['siguiente'])
+        
+        self.assertEqual(self.gestor.iterar(pagina=2, tamano=2)['clientes'], [clientes[3], clientes[5]])
+        self.assertEqual(list(self.gestor.iterar_clientes(tamano=2)), self.gestor.listar_todos())
+        with self.assertRaises(ValidacionError):
+            self.gestor.iterar(pagina=1, desde=3)
+    
     def test_listar_por_tipo(self):
         """Test: Listar clientes por tipo."""
         self.gestor.agregar_cliente(self.cliente1)
@@ -333,6 +490,1307 @@ class TestGestorClientes(unittest.TestCase):
         exito = self.gestor.eliminar_cliente("test1@email.com")
         self.assertTrue(exito)
         self.assertEqual(len(self.gestor), 0)
+    
+    def test_buscar_por_telefono(self):
+        """Test: Buscar por teléfono sin importar el formato."""
+        self.gestor.agregar_cliente(self.cliente1)
+        self.assertEqual(self.gestor.buscar_por_telefono("+56 9 1111 1111"), [self.cliente1])
+        self.assertEqual(self.gestor.buscar_por_telefono("(56)9-2222-2222"), [])
+    
+    def test_indice_telefono_actualizado(self):
+        """Test: El índice de teléfonos sigue los cambios y eliminaciones."""
+        self.gestor.agregar_cliente(self.cliente1)
+        self.gestor.actualizar_cliente("test1@email.com", telefono="955555555")
+        self.assertEqual(self.gestor.buscar_por_telefono("911111111"), [])
+        self.assertEqual(self.gestor.buscar_por_telefono("955555555"), [self.cliente1])
+        self.gestor.eliminar_cliente("test1@email.com")
+        self.assertEqual(self.gestor.buscar_por_telefono("955555555"), [])
+    
+    def test_cambio_email_actualiza_indice(self):
+        """Test: Cambiar el email de un cliente registrado actualiza la búsqueda."""
+        self.gestor.agregar_cliente(self.cliente1)
+        self.gestor.agregar_cliente(self.cliente2)
+        self.cliente1.actualizar_email("nuevo@email.com")
+        self.assertEqual(self.gestor.buscar_por_email("nuevo@email.com"), self.cliente1)
+        with self.assertRaises(ClienteDuplicadoError):
+            self.cliente1.set_email("test2@email.com")
+        self.assertEqual(self.cliente1.get_email(), "nuevo@email.com")
+    
+    def test_buscar_por_rut_y_empresa(self):
+        """Test: Buscar clientes corporativos por RUT y por nombre de empresa."""
+        self.gestor.agregar_cliente(self.cliente3)
+        self.assertEqual(self.gestor.buscar_por_rut("11111111-1"), [self.cliente3])
+        self.assertEqual(self.gestor.listar_por_empresa("  empresa TEST "), [self.cliente3])
+        self.assertEqual(self.gestor.buscar_por_rut("76.543.210-3"), [])
+    
+    def test_resumen_empresa_incremental(self):
+        """Test: Los totales por empresa siguen el uso y pago de crédito."""
+        otro_contacto = ClienteCorporativo("Test Cinco", "test5@email.com", "955555555",
+                                           "Dirección Test Cinco Santiago", "Empresa Test",
+                                           "11.111.111-1", "Test Cinco", 500000.0)
+        self.gestor.agregar_cliente(self.cliente3)
+        self.gestor.agregar_cliente(otro_contacto)
+        self.cliente3.utilizar_credito(300000.0)
+        otro_contacto.utilizar_credito(100000.0)
+        otro_contacto.pagar_credito(40000.0)
+        
+        totales = self.gestor.resumen_empresa("11.111.111-1")
+        self.assertEqual(totales['contactos'], 2)
+        self.assertEqual(totales['limite_credito'], 1500000.0)
+        self.assertEqual(totales['credito_utilizado'], 360000.0)
+        self.assertEqual(totales['credito_disponible'], 1140000.0)
+        
+        self.gestor.eliminar_cliente("test3@email.com")
+        totales = self.gestor.resumen_empresa("11.111.111-1")
+        self.assertEqual(totales['contactos'], 1)
+        self.assertEqual(totales['credito_utilizado'], 60000.0)
+    
+    def test_credito_concurrente_sin_candado_del_gestor(self):
+        """Test: Las compras no esperan al candado del gestor y los totales quedan exactos."""
+        contactos = [ClienteCorporativo("Test Contacto", f"contacto{i}@email.com", f"94444444{i}",
+                                        "Dirección Test Contacto Santiago", "Empresa Test",
+                                        "11.111.111-1", "Test Contacto", 100000.0) for i in range(4)]
+        self.gestor.agregar_multiples(contactos)
+        
+        def comprar(cliente):
+            for _ in range(50):
+                cliente.utilizar_credito(100.0)
+            cliente.pagar_credito(1000.0)
+        
+        hilos = [threading.Thread(target=comprar, args=(cliente,)) for cliente in contactos]
+        with self.gestor._candado_indices:
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join(timeout=10)
+            self.assertFalse(any(hilo.is_alive() for hilo in hilos))
+        
+        self.assertEqual(self.gestor.resumen_empresa("11.111.111-1")['credito_utilizado'], 16000.0)
+        self.assertEqual(self.gestor.estadisticas()['credito_utilizado_total'], 16000.0)
+        self.assertCountEqual(self.gestor.rango('credito_utilizado', 4000.0, 4000.0), contactos)
+        contactos[0].set_limite_credito(200000.0)
+        contactos[1].utilizar_credito(500.0)
+        self.gestor.eliminar_cliente("contacto1@email.com")
+        self.assertEqual(self.gestor.rango('credito_disponible', desde=150000.0), [contactos[0]])
+        self.assertEqual(self.gestor.resumen_empresa("11.111.111-1")['limite_credito'], 400000.0)
+        self.assertEqual(self.gestor.estadisticas()['credito_utilizado_total'], 12000.0)
+    
+    def test_cambio_rut_mueve_totales(self):
+        """Test: Cambiar el RUT de un contacto lo pasa a la otra empresa."""
+        self.gestor.agregar_cliente(self.cliente3)
+        self.cliente3.set_rut_empresa("76.543.210-3")
+        self.assertEqual(self.gestor.buscar_por_rut("11.111.111-1"), [])
+        self.assertEqual(self.gestor.resumen_empresa("76543210-3")['contactos'], 1)
+    
+    def test_listar_y_contar_por_dominio(self):
+        """Test: El índice de dominios sigue altas, bajas y cambios de email."""
+        self.gestor.agregar_cliente(self.cliente1)
+        self.gestor.agregar_cliente(self.cliente2)
+        self.assertEqual(self.gestor.contar_por_dominio("@email.com"), 2)
+        self.cliente1.actualizar_email("test1@empresa.cl")
+        self.assertEqual(self.gestor.listar_por_dominio("EMPRESA.CL"), [self.cliente1])
+        self.assertEqual(self.gestor.conteo_dominios(), {'email.com': 1, 'empresa.cl': 1})
+        self.gestor.eliminar_cliente("test1@empresa.cl")
+        self.assertEqual(self.gestor.contar_por_dominio("empresa.cl"), 0)
+    
+    def test_operaciones_multiples_por_dominio(self):
+        """Test: Actualizar, cambiar dominio y eliminar por dominio."""
+        self.gestor.agregar_multiples([self.cliente1, self.cliente2, self.cliente3])
+        resultado = self.gestor.actualizar_multiples(dominio="email.com", direccion="Av. Apoquindo 3000, Las Condes")
+        self.assertEqual(resultado['actualizados'], 3)
+        self.assertEqual(self.cliente2.get_direccion(), "Av. Apoquindo 3000, Las Condes")
+        
+        resultado = self.gestor.cambiar_dominio("email.com", "nuevo.cl")
+        self.assertEqual(resultado['actualizados'], 3)
+        self.assertEqual(self.gestor.buscar_por_email("test2@nuevo.cl"), self.cliente2)
+        self.assertEqual(self.gestor.contar_por_dominio("email.com"), 0)
+        
+        resultado = self.gestor.eliminar_multiples(dominio="nuevo.cl")
+        self.assertEqual(resultado['eliminados'], 3)
+        self.assertEqual(len(self.gestor), 0)
+    
+    def test_operaciones_multiples_emails_repetidos(self):
+        """Test: Un email repetido (o con otras mayúsculas) elige al cliente una sola vez."""
+        self.gestor.agregar_multiples([self.cliente1, self.cliente2, self.cliente3])
+        resultado = self.gestor.actualizar_multiples(emails=["test1@email.com", "TEST1@Email.com"],
+                                                     direccion="Av. Apoquindo 3000, Las Condes")
+        self.assertEqual(resultado['actualizados'], 1)
+        
+        resultado = self.gestor.eliminar_multiples(emails=["test2@email.com", "Test2@EMAIL.com", "test2@email.com"])
+        self.assertEqual(resultado['eliminados'], 1)
+        self.assertEqual(resultado['errores'], [])
+        self.assertEqual(len(self.gestor), 2)
+        with self.assertRaises(ClienteNoEncontradoError):
+            self.gestor.buscar_por_email("test2@email.com")
+        self.assertEqual(self.gestor.listar_todos(), [self.cliente1, self.cliente3])
+    
+    def test_operacion_multiple_sin_selector(self):
+        """Test: Las operaciones múltiples exigen emails o dominio."""
+        with self.assertRaises(ValidacionError):
+            self.gestor.eliminar_multiples()
+    
+    def test_rango_puntos(self):
+        """Test: El índice de puntos sigue agregar_puntos y canjear_puntos."""
+        otro = ClientePremium("Test Seis", "test6@email.com", "966666666",
+                              "Dirección Test Seis Santiago", "Plata", 15.0)
+        self.gestor.agregar_cliente(self.cliente2)
+        self.gestor.agregar_cliente(otro)
+        self.cliente2.agregar_puntos(500)
+        otro.agregar_puntos(1500)
+        self.assertEqual(self.gestor.rango('puntos_acumulados', 1000, 2000), [otro])
+        self.assertEqual(self.gestor.rango('puntos_acumulados', descendente=True), [otro, self.cliente2])
+        otro.canjear_puntos(1200)
+        self.assertEqual(self.gestor.rango('puntos_acumulados', 100, 400), [otro])
+        self.assertEqual(self.gestor.rango('puntos_acumulados', limite=1), [otro])
+    
+    def test_rango_credito(self):
+        """Test: Los índices de crédito siguen utilizar_credito y pagar_credito."""
+        self.gestor.agregar_cliente(self.cliente3)
+        self.cliente3.utilizar_credito(999999.9)
+        self.assertEqual(self.gestor.rango('credito_disponible', hasta=10000), [self.cliente3])
+        self.cliente3.pagar_credito(0.3)
+        self.cliente3.set_limite_credito(2000000.0)
+        self.assertEqual(self.gestor.rango('credito_disponible', hasta=10000), [])
+        self.assertEqual(self.gestor.rango('credito_disponible', desde=1000000.0), [self.cliente3])
+        self.assertEqual(self.gestor.rango('credito_utilizado', desde=999999.0), [self.cliente3])
+        self.gestor.eliminar_cliente("test3@email.com")
+        self.assertEqual(self.gestor.rango('credito_utilizado'), [])
+    
+    def test_rango_fecha_registro(self):
+        """Test: Clientes regulares registrados en una ventana de fechas."""
+        self.cliente1.set_fecha_registro(date(2025, 3, 1))
+        self.gestor.agregar_cliente(self.cliente1)
+        self.assertEqual(self.gestor.rango('fecha_registro', date(2025, 1, 1), date(2025, 6, 30)),
+                         [self.cliente1])
+        self.cliente1.set_fecha_registro(date(2024, 3, 1))
+        self.assertEqual(self.gestor.rango('fecha_registro', date(2025, 1, 1)), [])
+        with self.assertRaises(ValidacionError):
+            self.gestor.rango('nombre')
+    
+    def test_estadisticas_incrementales(self):
+        """Test: Las estadísticas siguen altas, bajas y cambios de los clientes."""
+        self.gestor.agregar_multiples([self.cliente1, self.cliente2, self.cliente3])
+        self.cliente2.agregar_puntos(300)
+        self.cliente3.utilizar_credito(250000.0)
+        
+        stats = self.gestor.estadisticas()
+        self.assertEqual(stats['total_clientes'], 3)
+        self.assertEqual(stats['por_tipo'], {'Regular': 1, 'Premium': 1, 'Corporativo': 1})
+        self.assertEqual(stats['por_nivel_membresia']['Oro'], 1)
+        self.assertEqual(stats['puntos_total'], 300)
+        self.assertEqual(stats['descuento_promedio_premium'], 20.0)
+        self.assertEqual(stats['credito_disponible_total'], 750000.0)
+        
+        self.cliente2.set_nivel_membresia("Plata")
+        self.cliente2.set_descuento(15.0)
+        self.cliente2.canjear_puntos(100)
+        stats = self.gestor.estadisticas()
+        self.assertEqual(stats['por_nivel_membresia'], {'Bronce': 0, 'Plata': 1, 'Oro': 0})
+        self.assertEqual(stats['puntos_promedio'], 200.0)
+        self.assertEqual(stats['descuento_promedio_premium'], 15.0)
+        
+        self.gestor.eliminar_multiples(emails=["test2@email.com", "test3@email.com"])
+        stats = self.gestor.estadisticas()
+        self.assertEqual(stats['puntos_total'], 0)
+        self.assertEqual(stats['credito_utilizado_total'], 0.0)
+        self.assertEqual(stats['puntos_promedio'], 0.0)
+    
+    def test_agregar_multiples_telefono_duplicado(self):
+        """Test: La carga masiva puede rechazar teléfonos repetidos."""
+        self.gestor.agregar_cliente(self.cliente1)
+        repetido = ClienteRegular("Test Cuatro", "test4@email.com", "+56 9 1111 1111",
+                                  "Dirección Test Cuatro Santiago")
+        resultado = self.gestor.agregar_multiples([repetido], permitir_telefono_duplicado=False)
+        self.assertEqual(resultado['agregados'], 0)
+        self.assertEqual(len(resultado['errores']), 1)
+
+
+class TestIndiceOrdenado(unittest.TestCase):
+    """Tests para el índice ordenado por rangos."""
+    
+    def test_rango_con_bloques_divididos(self):
+        """Test: El rango es correcto aunque los bloques se dividan y vacíen."""
+        indice = IndiceOrdenado()
+        indice.TAMANO_BLOQUE = 2  # Bloques pequeños para forzar divisiones
+        objetos = [object() for _ in range(20)]
+        for i, objeto in enumerate(objetos):
+            indice.agregar(i % 7, objeto)
+        for objeto in objetos[:6]:
+            indice.quitar(objetos.index(objeto) % 7, objeto)
+        
+        esperados = [o for i, o in enumerate(objetos) if i >= 6 and 2 <= i % 7 <= 4]
+        resultado = list(indice.rango(2, 4))
+        self.assertEqual(len(indice), 14)
+        self.assertEqual(sorted(map(id, resultado)), sorted(map(id, esperados)))
+        self.assertEqual(list(indice.rango(2, 4, descendente=True)), resultado[::-1])
+
+    def test_agregar_varios_entre_bloques(self):
+        """Test: Un lote que cae entre las entradas existentes queda ordenado y se puede quitar."""
+        indice = IndiceOrdenado()
+        indice.TAMANO_BLOQUE = 2
+        objetos = [object() for _ in range(30)]
+        indice.agregar_varios((i, objeto) for i, objeto in enumerate(objetos[:10]))
+        indice.agregar_varios((i % 10 + 0.5, objeto) for i, objeto in enumerate(objetos[10:]))
+
+        # Cada objeto del lote queda justo después del que tiene su parte entera
+        esperados = []
+        for i, objeto in enumerate(objetos[:10]):
+            esperados += [objeto] + sorted(objetos[10 + i::10], key=id)
+        self.assertEqual(len(indice), 30)
+        self.assertEqual(list(indice), esperados)
+        for i, objeto in enumerate(objetos[10:]):
+            indice.quitar(i % 10 + 0.5, objeto)
+        self.assertEqual(list(indice.rango(0, 9)), objetos[:10])
+
+class TestConsultas(unittest.TestCase):
+    """Tests para el motor de consultas del gestor."""
+    
+    def setUp(self):
+        """Preparar un gestor con clientes Premium de distintos puntos."""
+        self.gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        self.premium = []
+        for i, nombre in enumerate(["Ana Soto", "Luis Soto", "Marta Rojas", "Pedro Soto"]):
+            cliente = ClientePremium(nombre, f"premium{i}@empresa.cl", f"91111111{i}",
+                                     "Dirección Premium Santiago")
+            cliente.set_puntos_acumulados(i * 1000)
+            self.premium.append(cliente)
+        self.regular = ClienteRegular("Sofía Soto", "sofia@email.com", "922222222",
+                                      "Dirección Regular Santiago")
+        self.gestor.agregar_multiples(self.premium + [self.regular])
+    
+    def test_condiciones_combinadas(self):
+        """Test: Y entre rango y nombre, con O entre dominio y tipo."""
+        consulta = self.gestor.consultar(Rango('puntos_acumulados', 1000), NombreContiene("soto"))
+        self.assertEqual(consulta.ejecutar(), [self.premium[1], self.premium[3]])
+        
+        consulta = self.gestor.consultar(NombreContiene("soto"), Dominio("email.com") | Tipo("Premium"))
+        self.assertEqual(len(consulta.ejecutar()), 4)
+    
+    def test_plan_usa_indice_mas_selectivo(self):
+        """Test: El planificador elige el índice con menos candidatos."""
+        consulta = self.gestor.consultar(Tipo("Premium"), Rango('puntos_acumulados', 2500),
+                                         NombreContiene("soto"))
+        plan = consulta.explicar()
+        self.assertEqual(plan['indice'], "Rango('puntos_acumulados', 2500, None)")
+        self.assertEqual(plan['candidatos_estimados'], 1)
+        self.assertEqual(len(plan['filtros']), 2)
+        
+        plan = self.gestor.consultar(NombreContiene("soto")).explain()
+        self.assertEqual(plan['indice'], 'recorrido completo')
+    
+    def test_orden_limite_desplazamiento(self):
+        """Test: Ordenar, saltar y limitar resultados."""
+        consulta = (self.gestor.consultar(Rango('puntos_acumulados', 0))
+                    .ordenar_por('puntos_acumulados', descendente=True)
+                    .desplazamiento(1).limite(2))
+        self.assertEqual(consulta.explicar()['orden'], 'por índice')
+        self.assertEqual(consulta.ejecutar(), [self.premium[2], self.premium[1]])
+        
+        consulta = self.gestor.consultar(NombreContiene("soto")).ordenar_por('nombre').limite(2)
+        self.assertEqual([c.get_nombre() for c in consulta], ["Ana Soto", "Luis Soto"])
+    
+    def test_ranking_puntos(self):
+        """Test: El ranking sigue los cambios de puntos."""
+        ranking = self.gestor.ranking('puntos_acumulados', k=2)
+        self.assertEqual(ranking, [(self.premium[3], 3000), (self.premium[2], 2000)])
+        self.premium[0].agregar_puntos(5000)
+        self.assertEqual(self.gestor.ranking(k=1), [(self.premium[0], 5000)])
+        self.assertEqual(self.gestor.posicion_en_ranking("premium3@empresa.cl"), 2)
+        self.assertIsNone(self.gestor.posicion_en_ranking("sofia@email.com"))
+        self.premium[0].canjear_puntos(5000)
+        self.assertEqual(self.gestor.posicion_en_ranking("premium0@empresa.cl"), 4)
+    
+    def test_ranking_credito(self):
+        """Test: Ranking de consumo de crédito corporativo."""
+        corporativos = []
+        for i in range(3):
+            cliente = ClienteCorporativo("Contacto Empresa", f"contacto{i}@corp.cl", "933333333",
+                                         "Dirección Corporativa Santiago", f"Empresa {i}",
+                                         "11.111.111-1", "Contacto Empresa", 100000.0)
+            self.gestor.agregar_cliente(cliente)
+            corporativos.append(cliente)
+        corporativos[1].utilizar_credito(50000.0)
+        corporativos[2].utilizar_credito(20000.0)
+        corporativos[1].pagar_credito(40000.0)
+        ranking = self.gestor.ranking('credito_utilizado', k=2)
+        self.assertEqual(ranking, [(corporativos[2], 20000.0), (corporativos[1], 10000.0)])
+    
+    def test_rango_fecha_igual_con_indice_y_recorrido(self):
+        """Test: Rango de fecha_registro da lo mismo con el índice que recorriendo."""
+        self.premium[1].set_fecha_registro(date(2020, 5, 1))
+        self.regular.set_fecha_registro(date(2020, 6, 1))
+        rango = Rango('fecha_registro', date(2020, 1, 1), date(2020, 12, 31))
+
+        consulta = self.gestor.consultar(rango)
+        self.assertEqual(consulta.explicar()['indice'], repr(rango))
+        recorrido = self.gestor.consultar(rango | NombreContiene("zzz"))
+        self.assertEqual(recorrido.explicar()['indice'], 'recorrido completo')
+        self.assertEqual(consulta.ejecutar(), [self.premium[1], self.regular])
+        self.assertEqual(recorrido.ejecutar(), consulta.ejecutar())
+
+        self.assertEqual(self.gestor.consultar(Tipo("Premium"), rango).ejecutar(), [self.premium[1]])
+
+    def test_listar_por_tipo_con_indice(self):
+        """Test: listar_por_tipo sigue las eliminaciones."""
+        self.gestor.eliminar_cliente("premium0@empresa.cl")
+        self.assertEqual(len(self.gestor.listar_por_tipo("Premium")), 3)
+
+class TestLibroPuntos(unittest.TestCase):
+    """Tests para el libro de movimientos de puntos."""
+    
+    def setUp(self):
+        """Configuración: gestor con dos clientes Premium y un Regular."""
+        self.directorio = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.directorio.name, "puntos.log")
+        self.gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        self.ana = ClientePremium("Ana Soto", "ana@email.com", "911111111", "Dirección Test Uno Santiago")
+        self.luis = ClientePremium("Luis Rojas", "luis@email.com", "922222222", "Dirección Test Dos Santiago")
+        self.gestor.agregar_multiples([
+            self.ana, self.luis,
+            ClienteRegular("Eva Diaz", "eva@email.com", "933333333", "Dirección Test Tres Santiago"),
+        ])
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def test_registrar_lote_y_consolidar(self):
+        """Test: Los movimientos quedan pendientes hasta consolidar y los inválidos se rechazan."""
+        libro = LibroPuntos(self.gestor, self.archivo)
+        resultado = libro.registrar_lote([
+            ("ana@email.com", 100), ("ANA@email.com", -30), ("luis@email.com", -1),
+            ("eva@email.com", 10), ("nadie@email.com", 10), ("luis@email.com", 2.5),
+        ])
+        self.assertEqual(resultado['aplicados'], 2)
+        self.assertEqual(len(resultado['errores']), 4)
+        self.assertEqual(libro.saldo("ana@email.com"), 70)
+        self.assertEqual(self.ana.get_puntos_acumulados(), 0)
+        
+        self.assertEqual(libro.consolidar(), 1)
+        self.assertEqual(self.ana.get_puntos_acumulados(), 70)
+        self.assertEqual(self.gestor.estadisticas()['puntos_total'], 70)
+        self.assertEqual(os.path.getsize(self.archivo), 0)
+        libro.cerrar()
+    
+    def test_recupera_eventos_no_consolidados(self):
+        """Test: Un libro nuevo recupera los eventos que quedaron en el registro."""
+        libro = LibroPuntos(self.gestor, self.archivo)
+        libro.acumular("luis@email.com", 40)
+        libro.canjear("luis@email.com", 15)
+        # Simulamos una caída: no se consolida ni se cierra
+        libro._archivo.close()
+        with open(self.archivo, 'a', encoding='utf-8') as archivo:
+            archivo.write("luis@email.com,9")   # línea incompleta
+        
+        with LibroPuntos(self.gestor, self.archivo) as recuperado:
+            self.assertEqual(recuperado.recuperados, 2)
+            self.assertEqual(recuperado.saldo("luis@email.com"), 25)
+        self.assertEqual(self.luis.get_puntos_acumulados(), 25)
+    
+    def test_hilos_concurrentes(self):
+        """Test: Acumular desde varios hilos no pierde puntos y consolida solo."""
+        libro = LibroPuntos(self.gestor, self.archivo, consolidar_cada=500)
+        
+        def acumular():
+            for _ in range(50):
+                libro.registrar_lote([("ana@email.com", 1), ("luis@email.com", 2)] * 5)
+        
+        hilos = [threading.Thread(target=acumular) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        self.assertEqual(libro.saldo("ana@email.com"), 1000)
+        self.assertEqual(libro.saldo("luis@email.com"), 2000)
+        self.assertGreater(self.ana.get_puntos_acumulados(), 0)
+        libro.cerrar()
+
+    def test_puntos_directos_mientras_consolida(self):
+        """Test: agregar_puntos directo en el cliente no se pierde al consolidar el libro."""
+        libro = LibroPuntos(self.gestor, self.archivo, consolidar_cada=20)
+
+        def por_el_libro():
+            for _ in range(100):
+                libro.acumular("ana@email.com", 1)
+
+        def directo():
+            for _ in range(100):
+                self.ana.agregar_puntos(1)
+
+        hilos = [threading.Thread(target=funcion) for funcion in (por_el_libro, directo) * 2]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        libro.cerrar()
+        self.assertEqual(self.ana.get_puntos_acumulados(), 400)
+        self.assertEqual(self.gestor.estadisticas()['puntos_total'], 400)
+
+    def test_consolida_por_tiempo_sin_movimientos(self):
+        """Test: Pasado el intervalo se consolida aunque no lleguen más movimientos."""
+        libro = LibroPuntos(self.gestor, self.archivo, intervalo_consolidacion=0.05)
+        libro.acumular("luis@email.com", 30)
+        limite = time.monotonic() + 5
+        while self.luis.get_puntos_acumulados() != 30 and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(self.luis.get_puntos_acumulados(), 30)
+        self.assertEqual(libro.pendientes(), 0)
+        hilos = threading.active_count()
+        libro.cerrar()
+        self.assertEqual(threading.active_count(), hilos - 1)
+
+    def test_caida_despues_de_guardar_no_repite_eventos(self):
+        """Test: Si el proceso se cae tras guardar y antes de borrar el punto de control, nada se aplica dos veces."""
+        ruta = os.path.join(self.directorio.name, "clientes.json")
+        gestor = GestorClientes(usar_logs=False)
+        gestor.persistencia = PersistenciaJSON(ruta)
+        gestor.agregar_multiples([ClientePremium("Ana Soto", "ana@email.com", "911111111",
+                                                 "Dirección Test Uno Santiago")])
+        libro = LibroPuntos(gestor, self.archivo)
+        libro.acumular("ana@email.com", 100)
+
+        # Simulamos una caída justo después de guardar el gestor
+        guardar = gestor.guardar_todos
+        def guardar_y_caer():
+            guardar()
+            raise KeyboardInterrupt
+        gestor.guardar_todos = guardar_y_caer
+        with self.assertRaises(KeyboardInterrupt):
+            libro.consolidar()
+        libro.acumular("ana@email.com", 5)   # ya va al registro nuevo
+        libro._archivo.close()
+        self.assertTrue(os.path.exists(self.archivo + ".consolidado"))
+
+        reiniciado = GestorClientes(usar_logs=False)
+        reiniciado.persistencia = PersistenciaJSON(ruta)
+        with LibroPuntos(reiniciado, self.archivo) as recuperado:
+            self.assertEqual(recuperado.recuperados, 1)
+            self.assertEqual(recuperado.saldo("ana@email.com"), 105)
+            self.assertFalse(os.path.exists(self.archivo + ".consolidado"))
+        self.assertEqual(PersistenciaJSON(ruta).cargar_todos()[0]['puntos_acumulados'], 105)
+
+    def test_saldo_negativo_al_consolidar_es_error(self):
+        """Test: Un canje directo que deja el saldo negativo no se recorta a 0: se informa y queda pendiente."""
+        self.ana.set_puntos_acumulados(100)
+        libro = LibroPuntos(self.gestor, self.archivo)
+        libro.canjear("ana@email.com", 80)
+        libro.acumular("luis@email.com", 10)
+        self.ana.canjear_puntos(50)   # por fuera del libro
+
+        with self.assertRaises(ValidacionError):
+            libro.consolidar()
+        self.assertEqual(self.ana.get_puntos_acumulados(), 50)
+        self.assertEqual(self.luis.get_puntos_acumulados(), 10)
+        self.assertEqual(libro.saldo("ana@email.com"), -30)
+        with open(self.archivo, encoding='utf-8') as archivo:
+            self.assertEqual(archivo.read(), "ana@email.com,-80\n")
+
+        # Con puntos suficientes se consolida normalmente
+        self.ana.set_puntos_acumulados(200)
+        self.assertEqual(libro.consolidar(), 1)
+        self.assertEqual(self.ana.get_puntos_acumulados(), 120)
+        libro.cerrar()
+
+
+class TestMotorNiveles(unittest.TestCase):
+    """Tests para el recálculo de niveles de membresía."""
+    
+    def setUp(self):
+        self.gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        self.clientes = []
+        for i, puntos in enumerate([0, 6000, 12000, 4999, 10000]):
+            cliente = ClientePremium("Cliente Premium", f"p{i}@email.com", "911111111",
+                                     "Dirección Test Uno Santiago", "Plata", 15.0)
+            cliente.set_puntos_acumulados(puntos)
+            self.clientes.append(cliente)
+        self.gestor.agregar_multiples(self.clientes)
+    
+    def test_recalcular_solo_cambia_los_necesarios(self):
+        """Test: Solo cambian los clientes cuyo nivel no corresponde a sus puntos."""
+        reporte = self.gestor.recalcular_niveles(procesos=2, tamano_bloque=2)
+        self.assertEqual(reporte['revisados'], 5)
+        self.assertEqual(reporte['cambiados'], 4)
+        self.assertEqual(reporte['transiciones'], {'Plata->Bronce': 2, 'Plata->Oro': 2})
+        self.assertEqual([c.get_nivel_membresia() for c in self.clientes],
+                         ['Bronce', 'Plata', 'Oro', 'Bronce', 'Oro'])
+        self.assertEqual(self.clientes[2].get_descuento(), 20.0)
+        self.assertEqual(self.gestor.estadisticas()['por_nivel_membresia'],
+                         {'Bronce': 2, 'Plata': 1, 'Oro': 2})
+        
+        # Una segunda pasada no encuentra nada que cambiar
+        self.assertEqual(self.gestor.recalcular_niveles()['cambiados'], 0)
+    
+    def test_reglas_personalizadas(self):
+        """Test: Reglas sin descuento conservan el del cliente; las reglas inválidas se rechazan."""
+        motor = MotorNiveles([
+            {'nivel': 'Oro', 'puntos_minimos': 1000, 'antiguedad_minima_dias': 365},
+            {'nivel': 'Plata', 'puntos_minimos': 1000},
+            {'nivel': 'Bronce', 'puntos_minimos': 0},
+        ])
+        # Los clientes del setUp se registraron hoy: no cumplen la antigüedad
+        self.assertEqual(motor.calcular(5000), ('Plata', None))
+        self.assertEqual(motor.calcular(5000, antiguedad_dias=400), ('Oro', None))
+        reporte = motor.recalcular(self.clientes)
+        self.assertEqual(reporte['cambiados'], 1)
+        self.assertEqual(self.clientes[0].get_descuento(), 15.0)
+        
+        with self.assertRaises(ValidacionError):
+            MotorNiveles([{'nivel': 'Oro', 'puntos_minimos': 100}])
+        with self.assertRaises(ValidacionError):
+            MotorNiveles([{'nivel': 'Diamante', 'puntos_minimos': 0}])
+
+    def test_antiguedad_con_fecha_guardada(self):
+        """Test: La fecha de registro de los Premium se guarda y la antigüedad cuenta al recalcular."""
+        reglas = [
+            {'nivel': 'Oro', 'puntos_minimos': 1000, 'antiguedad_minima_dias': 365},
+            {'nivel': 'Bronce', 'puntos_minimos': 0},
+        ]
+        antiguo = ClientePremium("Cliente Antiguo", "antiguo@email.com", "922222222",
+                                 "Dirección Test Dos Santiago", "Bronce", 10.0, date(2020, 1, 15))
+        antiguo.set_puntos_acumulados(5000)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "clientes.json")
+            PersistenciaJSON(ruta).guardar_cliente(antiguo)
+            gestor = GestorClientes(usar_logs=False)
+            gestor.persistencia = PersistenciaJSON(ruta)
+            cargado = gestor.buscar_por_email("antiguo@email.com")
+            self.assertEqual(cargado.get_fecha_registro(), date(2020, 1, 15))
+
+            ruta_csv = os.path.join(directorio, "clientes.csv")
+            gestor.exportar_csv(ruta_csv)
+            copia = GestorClientes(usar_persistencia=False, usar_logs=False)
+            copia.importar_csv(ruta_csv)
+            self.assertEqual(copia.buscar_por_email("antiguo@email.com").get_fecha_registro(),
+                             date(2020, 1, 15))
+
+            reporte = gestor.recalcular_niveles(reglas)
+            self.assertEqual(reporte['transiciones'], {'Bronce->Oro': 1})
+            self.assertEqual(cargado.get_nivel_membresia(), 'Oro')
+            gestor.cerrar()
+
+        # Con los mismos puntos, un cliente registrado hoy no llega a Oro
+        self.gestor.recalcular_niveles(reglas)
+        self.assertEqual(self.clientes[1].get_nivel_membresia(), 'Bronce')
+
+
+class TestDetectorDuplicados(unittest.TestCase):
+    """Tests para la detección de clientes duplicados."""
+    
+    def setUp(self):
+        self.juan = ClienteRegular("Juan Pérez", "juan.perez@email.com", "912345678", "Av. Libertador 1234")
+        self.juan_bis = ClienteRegular("Juan Peres", "juanperez85@gmail.com", "912345678", "Av Libertador 1234")
+        self.juan_tris = ClientePremium("Jhuan Perez", "jperez@empresa.cl", "912345678", "Avenida Libertador 1234")
+        self.otro = ClienteRegular("María Soto", "maria@email.com", "912345678", "Calle Falsa 123")
+    
+    def test_clave_fonetica(self):
+        """Test: Nombres que suenan igual tienen la misma clave."""
+        self.assertEqual(clave_fonetica("Pérez"), clave_fonetica("Peres"))
+        self.assertEqual(clave_fonetica("Valeria"), clave_fonetica("Baleria"))
+        self.assertNotEqual(clave_fonetica("Soto"), clave_fonetica("Rojas"))
+    
+    def test_agrupa_duplicados(self):
+        """Test: Los registros de la misma persona quedan en un grupo; otro cliente con el mismo teléfono no."""
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        gestor.agregar_multiples([self.juan, self.otro, self.juan_bis, self.juan_tris])
+        grupos = gestor.buscar_duplicados()
+        self.assertEqual(len(grupos), 1)
+        self.assertEqual(set(map(id, grupos[0]['clientes'])),
+                         {id(self.juan), id(self.juan_bis), id(self.juan_tris)})
+        self.assertGreaterEqual(grupos[0]['puntaje'], 0.72)
+    
+    def test_incremental(self):
+        """Test: Agregar clientes nuevos solo informa los pares nuevos."""
+        detector = DetectorDuplicados()
+        self.assertEqual(detector.agregar([self.juan, self.otro]), [])
+        pares = detector.agregar([self.juan_bis])
+        self.assertEqual(len(pares), 1)
+        self.assertIs(pares[0][1], self.juan)
+        
+        detector.quitar(self.juan)
+        self.assertEqual(detector.grupos(), [])
+        self.assertEqual(len(detector), 2)
+
+
+class TestFiltroBloom(unittest.TestCase):
+    """Tests para el filtro de Bloom de emails y su uso en la persistencia."""
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clientes.json")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def test_sin_falsos_negativos(self):
+        """Test: Todo lo agregado se encuentra y la tasa real es cercana a la pedida."""
+        filtro = FiltroBloom(capacidad=2000, tasa_objetivo=0.01)
+        filtro.agregar_varios(f"cliente{i}@email.com" for i in range(2000))
+        self.assertTrue(all(f"cliente{i}@email.com" in filtro for i in range(2000)))
+        falsos = sum(f"otro{i}@email.com" in filtro for i in range(5000))
+        self.assertLess(falsos / 5000, 0.03)
+        
+        filtro.guardar(self.ruta + ".bloom", 10, 20)
+        cargado, tamano, modificado = FiltroBloom.cargar(self.ruta + ".bloom")
+        self.assertEqual((tamano, modificado, len(cargado)), (10, 20, 2000))
+        self.assertIn("cliente7@email.com", cargado)
+    
+    def test_agregar_multiples_descarta_existentes(self):
+        """Test: La carga masiva al archivo omite emails ya guardados y repetidos en el lote."""
+        persistencia = PersistenciaJSON(self.ruta)
+        persistencia.guardar_multiples([ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123")])
+        
+        resultado = persistencia.agregar_multiples([
+            ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123"),
+            ClienteRegular("Luis Soto", "luis@email.com", "923456789", "Calle Dos 456"),
+            ClienteRegular("Luis Soto", "luis@email.com", "923456789", "Calle Dos 456"),
+        ])
+        self.assertEqual(resultado['agregados'], 1)
+        self.assertEqual(sorted(resultado['duplicados']), ["ana@email.com", "luis@email.com"])
+        self.assertEqual([c['email'] for c in persistencia.cargar_todos()], ["ana@email.com", "luis@email.com"])
+        
+        # Un email que el filtro descarta no obliga a leer el archivo
+        descartados = persistencia.estadisticas_filtro['descartados']
+        self.assertIsNone(persistencia.buscar_por_email("nadie@email.com"))
+        self.assertEqual(persistencia.estadisticas_filtro['descartados'], descartados + 1)
+    
+    def test_guardar_cliente_nuevo_no_lee_el_archivo(self):
+        """Test: Un cliente nuevo se agrega al final y el filtro se actualiza sin rearmarse."""
+        persistencia = PersistenciaJSON(self.ruta)
+        persistencia.guardar_multiples([ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123")])
+        bloom = os.stat(self.ruta + ".bloom").st_mtime_ns
+        lecturas = []
+        cargar_todos = persistencia.cargar_todos
+        persistencia.cargar_todos = lambda: lecturas.append(1) or cargar_todos()
+        
+        persistencia.guardar_cliente(ClienteRegular("Luis Soto", "luis@email.com", "923456789", "Calle Dos 456"))
+        self.assertEqual(lecturas, [])
+        self.assertTrue(persistencia.puede_existir("luis@email.com"))
+        self.assertEqual(os.stat(self.ruta + ".bloom").st_mtime_ns, bloom)
+        
+        # Actualizar sí lee el archivo, pero tampoco rearma el filtro
+        persistencia.guardar_cliente(ClienteRegular("Ana Rojas", "ana@email.com", "987654321", "Calle Uno 123"))
+        self.assertEqual(len(lecturas), 1)
+        self.assertEqual([c['email'] for c in cargar_todos()], ["ana@email.com", "luis@email.com"])
+        
+        # El .bloom se escribe al pedirlo y otra instancia lo usa sin rearmarlo
+        persistencia.guardar_filtro()
+        otra = PersistenciaJSON(self.ruta)
+        otra.reconstruir_filtro = lambda capacidad=None: self.fail("No debía rearmar el filtro")
+        self.assertTrue(otra.puede_existir("luis@email.com"))
+    
+    def test_gestor_revisa_el_archivo_al_agregar_multiples(self):
+        """Test: La carga masiva del gestor rechaza emails que están en el archivo aunque no en memoria."""
+        guardado = {'tipo_cliente': 'Regular', 'nombre': 'Ana Rojas', 'email': 'ana@email.com',
+                    'telefono': '+56912345678', 'direccion': 'Calle Uno 123'}
+        invalido = dict(guardado, nombre='X', email='eva@email.com')   # No se puede cargar
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            json.dump([guardado, invalido], archivo)
+        
+        gestor = GestorClientes(usar_logs=False)
+        gestor.persistencia = PersistenciaJSON(self.ruta)
+        resultado = gestor.agregar_multiples([
+            ClienteRegular("Eva Diaz", "eva@email.com", "923456789", "Calle Dos 456"),
+            ClienteRegular("Luis Soto", "luis@email.com", "934567890", "Calle Tres 789"),
+        ])
+        self.assertEqual(resultado['agregados'], 1)
+        self.assertEqual([error['email'] for error in resultado['errores']], ["eva@email.com"])
+        # Se agregó al final sin reescribir (ni perder) la fila que no se pudo cargar
+        self.assertEqual([c['email'] for c in gestor.persistencia.cargar_todos()],
+                         ["ana@email.com", "eva@email.com", "luis@email.com"])
+    
+    def test_filtro_desactualizado_se_reconstruye(self):
+        """Test: Si el archivo cambia por fuera, el filtro se rearma."""
+        persistencia = PersistenciaJSON(self.ruta)
+        persistencia.guardar_multiples([ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123")])
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write('[{"nombre": "Eva Diaz", "email": "eva@email.com", "telefono": "912345678", '
+                          '"direccion": "Calle Tres 789", "tipo": "Regular"}]')
+        
+        otra = PersistenciaJSON(self.ruta)
+        self.assertTrue(otra.puede_existir("eva@email.com"))
+        self.assertIsNotNone(otra.buscar_por_email("eva@email.com"))
+
+
+class TestSistemaLogs(unittest.TestCase):
+    """Tests para el sistema de logs."""
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def leer(self, nombre):
+        with open(os.path.join(self.directorio.name, nombre), encoding='utf-8') as archivo:
+            return archivo.read()
+    
+    def test_instancias_independientes(self):
+        """Test: Cada instancia escribe en su archivo y no toca el logger raíz."""
+        raiz = list(logging.getLogger().handlers)
+        norte = SistemaLogs(os.path.join(self.directorio.name, "norte.txt"), mostrar_en_consola=False)
+        sur = SistemaLogs(os.path.join(self.directorio.name, "sur.txt"), mostrar_en_consola=False)
+        norte.registrar_operacion("Agregar", "ana@email.com")
+        sur.registrar_operacion("Eliminar", "luis@email.com")
+        logging.getLogger("otra.biblioteca").warning("mensaje ajeno")
+        norte.cerrar()
+        sur.cerrar()
+        
+        self.assertIn("ana@email.com", self.leer("norte.txt"))
+        self.assertNotIn("luis@email.com", self.leer("norte.txt"))
+        self.assertIn("luis@email.com", self.leer("sur.txt"))
+        self.assertNotIn("mensaje ajeno", self.leer("norte.txt") + self.leer("sur.txt"))
+        self.assertEqual(logging.getLogger().handlers, raiz)
+    
+    def test_mismo_archivo_comparte_hilo_y_logger(self):
+        """Test: Dos instancias con el mismo archivo comparten hilo de fondo y logger."""
+        ruta = os.path.join(self.directorio.name, "compartido.txt")
+        hilos = threading.active_count()
+        uno = SistemaLogs(ruta, mostrar_en_consola=False)
+        dos = SistemaLogs(ruta, mostrar_en_consola=False, nivel=logging.WARNING)
+        self.assertIs(uno.logger, dos.logger)
+        self.assertEqual(threading.active_count(), hilos + 1)
+        
+        uno.info("de uno")
+        dos.info("informe de dos")   # Bajo el nivel de 'dos'
+        uno.cerrar()
+        dos.warning("aviso de dos")
+        dos.cerrar()
+        self.assertEqual(threading.active_count(), hilos)
+        self.assertIn("de uno", self.leer("compartido.txt"))
+        self.assertNotIn("informe de dos", self.leer("compartido.txt"))
+        self.assertIn("aviso de dos", self.leer("compartido.txt"))
+    
+    def test_gestores_cerrados_no_dejan_hilos(self):
+        """Test: Crear y cerrar muchos gestores no deja hilos ni loggers nuevos."""
+        logs = os.path.join(self.directorio.name, "gestores.txt")
+        auditoria = os.path.join(self.directorio.name, "gestores.jsonl")
+        hilos = threading.active_count()
+        loggers = len(logging.Logger.manager.loggerDict)
+        for i in range(30):
+            with GestorClientes(usar_persistencia=False, archivo_logs=logs, archivo_auditoria=auditoria) as gestor:
+                gestor.agregar_cliente(ClienteRegular("Ana Rojas", f"ana{i}@email.com", "912345678",
+                                                      "Calle Uno 123"))
+        self.assertEqual(threading.active_count(), hilos)
+        self.assertLessEqual(len(logging.Logger.manager.loggerDict), loggers + 2)
+        self.assertEqual(len(RegistroAuditoria(auditoria)), 30)
+    
+    def test_buffer_en_memoria(self):
+        """Test: Con buffer, se escribe al llenarse, con un error o al vaciar."""
+        logs = SistemaLogs(os.path.join(self.directorio.name, "buffer.txt"), mostrar_en_consola=False,
+                           buffer=3, intervalo_buffer=None)
+        self.assertEqual(self.leer("buffer.txt"), "")
+        logs.info("uno")
+        self.assertEqual(self.leer("buffer.txt").count("\n"), 0)
+        logs.info("dos")
+        self.assertEqual(self.leer("buffer.txt").count("\n"), 3)
+        logs.info("tres")
+        logs.error("falla")
+        self.assertIn("falla", self.leer("buffer.txt"))
+        logs.info("cuatro")
+        logs.vaciar()
+        self.assertIn("cuatro", self.leer("buffer.txt"))
+        logs.cerrar()
+    
+    def test_mensajes_perezosos_y_muestreo(self):
+        """Test: Con nivel WARNING no se arman los detalles; el muestreo no afecta la auditoría."""
+        ruta = os.path.join(self.directorio.name, "nivel.txt")
+        auditoria = os.path.join(self.directorio.name, "nivel.jsonl")
+        logs = SistemaLogs(ruta, mostrar_en_consola=False, nivel=logging.WARNING,
+                           archivo_auditoria=auditoria, muestreo_operaciones={'Agregar': 3})
+        llamadas = []
+        logs.registrar_operacion("Eliminar", "ana@email.com", lambda: llamadas.append(1) or "detalle")
+        self.assertEqual(llamadas, [])
+        self.assertFalse(logs.activo())
+        
+        logs.set_nivel(logging.INFO)
+        for i in range(6):
+            logs.registrar_operacion("Agregar", "ana@email.com", lambda: "Tipo: Regular")
+        logs.cerrar()
+        self.assertEqual(self.leer("nivel.txt").count("Operacion: Agregar"), 2)
+        self.assertNotIn("Eliminar", self.leer("nivel.txt"))
+        self.assertEqual(len(logs.historial_cliente("ana@email.com")), 7)
+    
+    def test_muestreo_desde_el_gestor(self):
+        """Test: El gestor pasa muestreo_operaciones a sus logs."""
+        ruta = os.path.join(self.directorio.name, "muestreo.txt")
+        with GestorClientes(usar_persistencia=False, archivo_logs=ruta,
+                            muestreo_operaciones={'Agregar': 2}) as gestor:
+            for i in range(4):
+                gestor.agregar_cliente(ClienteRegular("Ana Rojas", f"ana{i}@email.com", f"91234567{i}",
+                                                      "Calle Uno 123"))
+        self.assertEqual(self.leer("muestreo.txt").count("Operacion: Agregar"), 2)
+    
+    def test_leer_ultimas_lineas(self):
+        """Test: La lectura desde el final coincide con readlines, con o sin salto final."""
+        ruta = os.path.join(self.directorio.name, "texto.txt")
+        lineas = [f"línea {i} " + "x" * (i % 7) + "\n" for i in range(300)]
+        for contenido in ("".join(lineas), "".join(lineas) + "sin salto"):
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido)
+            esperadas = contenido.splitlines(keepends=True)
+            for cantidad in (1, 5, 299, 400):
+                self.assertEqual(leer_ultimas_lineas(ruta, cantidad, tamano_bloque=16), esperadas[-cantidad:])
+    
+    def test_rotacion_comprimida(self):
+        """Test: Al pasar el tamaño máximo se comprime el archivo y leer_logs recorre los rotados."""
+        ruta = os.path.join(self.directorio.name, "rota.txt")
+        logs = SistemaLogs(ruta, mostrar_en_consola=False, buffer=1, tamano_maximo=500, archivos_rotados=2)
+        for i in range(40):
+            logs.info(f"evento {i}")
+        self.assertTrue(os.path.exists(ruta + ".1.gz"))
+        self.assertTrue(os.path.exists(ruta + ".2.gz"))
+        self.assertFalse(os.path.exists(ruta + ".3.gz"))
+        self.assertLessEqual(os.path.getsize(ruta), 500)
+        
+        ultimas = logs.leer_logs(15)
+        self.assertEqual([linea.split(" - ")[-1].strip() for linea in ultimas],
+                         [f"evento {i}" for i in range(25, 40)])
+        logs.limpiar_logs()
+        self.assertFalse(os.path.exists(ruta + ".1.gz"))
+        self.assertEqual(logs.leer_logs(), [])
+        logs.cerrar()
+
+
+class TestAuditoria(unittest.TestCase):
+    """Tests para el registro de auditoría por cliente."""
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "auditoria.jsonl")
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def test_historial_desde_el_gestor(self):
+        """Test: Cada operación queda en el historial del cliente, con los campos cambiados."""
+        gestor = GestorClientes(usar_persistencia=False,
+                                archivo_logs=os.path.join(self.directorio.name, "logs.txt"),
+                                archivo_auditoria=self.ruta)
+        gestor.agregar_cliente(ClienteRegular("Ana Rojas", "ana@empresa.cl", "912345678", "Calle Uno 123"))
+        gestor.agregar_multiples([ClienteRegular("Luis Soto", "luis@empresa.cl", "923456789", "Calle Dos 456")])
+        gestor.actualizar_cliente("ana@empresa.cl", direccion="Calle Nueva 789")
+        gestor.cambiar_dominio("empresa.cl", "empresa.com")
+        gestor.eliminar_cliente("ana@empresa.com")
+        gestor.logs.cerrar()
+        
+        historial = gestor.historial_cliente("ana@empresa.cl")
+        self.assertEqual([r['operacion'] for r in historial], ["Agregar", "Actualizar", "Cambiar dominio"])
+        self.assertEqual(historial[1]['campos'], {'direccion': ["Calle Uno 123", "Calle Nueva 789"]})
+        self.assertEqual([r['operacion'] for r in gestor.historial_cliente("ana@empresa.com")],
+                         ["Cambiar dominio", "Eliminar"])
+        self.assertEqual([r['operacion'] for r in gestor.historial_cliente("luis@empresa.cl")],
+                         ["Agregar", "Cambiar dominio"])
+        self.assertEqual(gestor.historial_cliente("ana@empresa.cl", desde="2999-01-01"), [])
+
+    def test_sin_auditoria_por_defecto(self):
+        """Test: La auditoría se activa solo con archivo_auditoria."""
+        directorio_original = os.getcwd()
+        os.chdir(self.directorio.name)
+        try:
+            gestor = GestorClientes(usar_persistencia=False, archivo_logs="logs.txt")
+            gestor.agregar_cliente(ClienteRegular("Ana Rojas", "ana@empresa.cl", "912345678", "Calle Uno 123"))
+            self.assertIsNone(gestor.logs.auditoria)
+            self.assertEqual(gestor.historial_cliente("ana@empresa.cl"), [])
+            gestor.logs.cerrar()
+            self.assertEqual(os.listdir(self.directorio.name), ["logs.txt"])
+        finally:
+            os.chdir(directorio_original)
+    
+    def test_indice_se_recupera(self):
+        """Test: Si el índice se pierde o queda atrasado, se completa al abrir."""
+        auditoria = RegistroAuditoria(self.ruta)
+        auditoria.registrar("Agregar", "ana@email.com")
+        auditoria.registrar_varios("Actualizar", [("ana@email.com", {'nombre': ["Ana", "Ana Rojas"]}),
+                                                  ("luis@email.com", None)])
+        auditoria.cerrar()
+        with open(self.ruta, 'a', encoding='utf-8') as archivo:
+            archivo.write('{"fecha": "2024-01-01T10:00:00.000", "operac')
+        os.remove(self.ruta + ".idx")
+        
+        auditoria = RegistroAuditoria(self.ruta)
+        self.assertEqual([r['operacion'] for r in auditoria.historial("ANA@email.com")], ["Agregar", "Actualizar"])
+        self.assertEqual(len(auditoria.historial("luis@email.com")), 1)
+        auditoria.registrar("Eliminar", "luis@email.com")
+        self.assertEqual(auditoria.historial("luis@email.com")[-1]['operacion'], "Eliminar")
+        auditoria.cerrar()
+
+
+class TestMetricas(unittest.TestCase):
+    """Tests para los histogramas de latencia y los contadores de E/S."""
+    
+    def test_percentiles_del_histograma(self):
+        """Test: Los percentiles quedan dentro del error de las cubetas."""
+        histograma = HistogramaLatencia()
+        for valor in range(1, 10001):
+            histograma.registrar(valor * 1000)
+        self.assertEqual(histograma.llamadas, 10000)
+        self.assertEqual(histograma.maximo, 10000000)
+        for fraccion, esperado in ((0.5, 5000000), (0.95, 9500000), (0.99, 9900000)):
+            self.assertAlmostEqual(histograma.percentil(fraccion) / esperado, 1, delta=0.07)
+        self.assertEqual(histograma.percentil(1.0), 10000000)
+    
+    def test_metricas_del_gestor(self):
+        """Test: El gestor mide sus operaciones y se puede desactivar."""
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False, medir=True)
+        gestor.agregar_cliente(ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123"))
+        gestor.buscar_por_email("ana@email.com")
+        with self.assertRaises(ClienteNoEncontradoError):
+            gestor.buscar_por_email("otro@email.com")
+        
+        operaciones = gestor.metricas()['operaciones']
+        self.assertEqual(operaciones['gestor.agregar_cliente']['llamadas'], 1)
+        self.assertEqual(operaciones['gestor.buscar_por_email']['llamadas'], 2)
+        self.assertEqual(operaciones['gestor.buscar_por_email']['errores'], 1)
+        self.assertGreater(operaciones['gestor.agregar_cliente']['max_segundos'], 0)
+        
+        texto = gestor.metricas_prometheus()
+        self.assertIn('gic_operacion_segundos_count{operacion="gestor.buscar_por_email"} 2', texto)
+        self.assertIn('gic_operacion_errores_total{operacion="gestor.buscar_por_email"} 1', texto)
+        self.assertIn('gic_operacion_segundos{operacion="gestor.agregar_cliente",quantile="0.99"}', texto)
+        
+        gestor.desactivar_metricas()
+        self.assertNotIn('buscar_por_email', gestor.__dict__)
+        self.assertEqual(gestor.metricas(), {})
+    
+    def test_bytes_de_persistencia(self):
+        """Test: La persistencia cuenta bytes leídos, escritos y fsync."""
+        with tempfile.TemporaryDirectory() as directorio:
+            persistencia = PersistenciaJSON(os.path.join(directorio, "clientes.json"), sincronizar=True)
+            metricas = Metricas()
+            metricas.instrumentar(persistencia, persistencia.OPERACIONES_MEDIDAS, "persistencia.")
+            persistencia.metricas = metricas
+            persistencia.guardar_cliente(ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123"))
+            persistencia.cargar_todos()
+            tamano = os.path.getsize(persistencia.nombre_archivo)
+        
+        resumen = metricas.resumen()
+        self.assertEqual(resumen['operaciones']['persistencia.guardar_cliente']['llamadas'], 1)
+        self.assertGreaterEqual(resumen['bytes_escritos'], tamano)
+        self.assertGreaterEqual(resumen['bytes_leidos'], tamano)
+        self.assertGreaterEqual(resumen['fsyncs'], 1)
+        self.assertIn("gic_fsyncs_total", exportar_prometheus(metricas))
+
+
+class TestGenerador(unittest.TestCase):
+    """Tests para el generador de datos de prueba."""
+    
+    def test_registros_validos_y_deterministas(self):
+        """Test: Los registros pasan las validaciones y dependen solo de la semilla."""
+        generador = GeneradorClientes(semilla=5)
+        registros = list(generador.registros(10000))
+        self.assertEqual(validar_lote(registros), {})
+        self.assertEqual(len({registro['email'] for registro in registros}), 10000)
+        self.assertEqual(len({registro['telefono'] for registro in registros}), 10000)
+        tipos = [registro['tipo_cliente'] for registro in registros]
+        self.assertAlmostEqual(tipos.count('Premium') / 10000, 0.3, delta=0.03)
+        self.assertAlmostEqual(tipos.count('Corporativo') / 10000, 0.1, delta=0.02)
+        
+        # Misma semilla, mismos clientes; y los primeros no dependen de la cantidad
+        self.assertEqual(list(GeneradorClientes(semilla=5).registros(100)), registros[:100])
+        self.assertNotEqual(list(GeneradorClientes(semilla=6).registros(100)), registros[:100])
+    
+    def test_archivos_como_la_persistencia(self):
+        """Test: Los archivos escritos se leen con PersistenciaJSON y el gestor."""
+        generador = GeneradorClientes(semilla=1, proporciones={'Premium': 1, 'Corporativo': 1})
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_json = os.path.join(directorio, "clientes.json")
+            ruta_csv = os.path.join(directorio, "clientes.csv")
+            self.assertEqual(generador.escribir(ruta_json, 500), 500)
+            generador.escribir(ruta_csv, 500)
+            
+            with open(ruta_json, encoding='utf-8') as archivo:
+                self.assertEqual(archivo.read(),
+                                 json.dumps(list(generador.registros(500)), indent=2, ensure_ascii=False))
+            cargados = PersistenciaJSON(ruta_json).cargar_todos()
+            self.assertEqual(len(cargados), 500)
+            self.assertNotIn('Regular', {registro['tipo_cliente'] for registro in cargados})
+            
+            gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+            resultado = gestor.importar_csv(ruta_csv)
+            self.assertEqual((resultado['agregados'], resultado['errores']), (500, []))
+            
+            with self.assertRaises(ValidacionError):
+                generador.escribir(os.path.join(directorio, "clientes.xml"), 10)
+    
+    def test_duplicados(self):
+        """Test: Las tasas de duplicados repiten teléfonos y emails."""
+        registros = list(GeneradorClientes(semilla=2, tasa_duplicados=0.1, tasa_repetidos=0.05).registros(2000))
+        self.assertEqual(validar_lote(registros), {})
+        telefonos = len({registro['telefono'] for registro in registros})
+        emails = len({registro['email'] for registro in registros})
+        self.assertLess(telefonos, 1800)
+        self.assertLess(emails, 1950)
+        self.assertGreater(emails, telefonos)
+
+    def test_duplicados_de_duplicados(self):
+        """Test: Copiar una fila que ya es casi igual (nombre acortado) no falla."""
+        for semilla in (10, 11, 12, 13):
+            registros = list(GeneradorClientes(semilla=semilla, tasa_duplicados=0.05).registros(20000))
+            self.assertEqual(len(registros), 20000)
+        registros = list(GeneradorClientes(semilla=3, tasa_duplicados=0.5).registros(20000))
+        self.assertTrue(all(registro['nombre'] for registro in registros))
+
+    def test_parametros_invalidos(self):
+        """Test: Los parámetros inválidos lanzan ValidacionError."""
+        for parametros in ({'proporciones': {'Vip': 1}}, {'dominios': ['sin dominio']},
+                           {'tasa_duplicados': 1.5}, {'tasa_duplicados': 0.1, 'dominios': ['email.com']}):
+            with self.assertRaises(ValidacionError):
+                GeneradorClientes(**parametros)
+
+
+class TestArranque(unittest.TestCase):
+    """Tests para la importación diferida del paquete y el inicio del gestor."""
+    
+    def test_import_no_carga_submodulos(self):
+        """Test: import src no importa submódulos hasta que se usa un nombre."""
+        codigo = ("import sys, src; antes = sorted(m for m in sys.modules if m.startswith('src.')); "
+                  "src.ClienteRegular; print(antes, 'logging' in sys.modules, 'src.gestor_clientes' in sys.modules)")
+        raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True)
+        self.assertEqual(salida.stdout.strip(), "[] False False")
+        
+        import src
+        self.assertIs(src.GestorClientes, GestorClientes)
+        self.assertIn('GeneradorClientes', dir(src))
+        with self.assertRaises(AttributeError):
+            src.NoExiste
+    
+    def test_gestor_sin_archivos_hasta_el_primer_uso(self):
+        """Test: Crear el gestor no abre archivos; el primer uso carga los clientes."""
+        directorio_original = os.getcwd()
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                PersistenciaJSON("clientes.json").guardar_cliente(
+                    ClienteRegular("Ana Rojas", "ana@email.com", "912345678", "Calle Uno 123"))
+                archivos = sorted(os.listdir(directorio))
+                
+                gestor = GestorClientes(archivo_logs="logs.txt", archivo_auditoria=None)
+                self.assertEqual(sorted(os.listdir(directorio)), archivos)
+                self.assertNotIn('_clientes', gestor.__dict__)
+                
+                self.assertEqual(gestor.buscar_por_email("ana@email.com").get_nombre(), "Ana Rojas")
+                self.assertEqual(len(gestor), 1)
+                self.assertIn("logs.txt", os.listdir(directorio))
+                gestor.logs.cerrar()
+                
+                otro = GestorClientes(usar_logs=False).preparar()
+                self.assertIn('_clientes', otro.__dict__)
+                self.assertEqual(len(otro), 1)
+            finally:
+                os.chdir(directorio_original)
+
+
+class TestMemoria(unittest.TestCase):
+    """Tests para el reporte de memoria y el perfil con tracemalloc."""
+    
+    def test_tamano_profundo_cuenta_lo_compartido_una_vez(self):
+        """Test: Con el mismo conjunto de visitados lo compartido no se repite."""
+        texto = "x" * 1000
+        visitados = set()
+        primero = tamano_profundo({'a': texto}, visitados)
+        segundo = tamano_profundo({'a': texto}, visitados)
+        self.assertGreater(primero, sys.getsizeof(texto))
+        self.assertLess(segundo, sys.getsizeof(texto))
+        self.assertEqual(tamano_profundo([texto, texto]), sys.getsizeof([texto, texto]) + sys.getsizeof(texto))
+    
+    def test_reporte_por_parte(self):
+        """Test: reporte_memoria reparte la memoria por clase de cliente e índice."""
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        gestor.agregar_multiples(list(GeneradorClientes(semilla=3).clientes(300)))
+        reporte = gestor.reporte_memoria()
+        
+        clientes = reporte['clientes']
+        self.assertEqual(sum(datos['cantidad'] for datos in clientes.values()), 300)
+        self.assertGreater(clientes['ClienteCorporativo']['promedio_bytes'],
+                           clientes['ClienteRegular']['promedio_bytes'])
+        self.assertEqual(set(reporte['indices']),
+                         {'email', 'tipo', 'dominio', 'telefono', 'rut', 'empresa', 'rangos'})
+        self.assertGreater(reporte['indices']['email'], 0)
+        self.assertGreater(reporte['lista'], 0)
+        self.assertEqual(reporte['persistencia'], 0)
+        self.assertNotIn('tracemalloc', reporte)
+        self.assertEqual(reporte['total_bytes'],
+                         sum(datos['bytes'] for datos in clientes.values()) + reporte['lista']
+                         + sum(reporte['indices'].values()) + sum(reporte['caches'].values()))
+    
+    def test_perfil_y_diferencia_de_fotos(self):
+        """Test: La diferencia entre fotos muestra lo que crecen clientes e índices."""
+        gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        with self.assertRaises(ValidacionError):
+            gestor.foto_memoria("antes")
+        
+        # El primer cliente generado arma las tablas de nombres: mejor fuera del perfil
+        generador = GeneradorClientes(semilla=4)
+        next(generador.registros(1))
+        
+        gestor.activar_perfil_memoria()
+        try:
+            gestor.foto_memoria("antes")
+            gestor.agregar_multiples(list(generador.clientes(200)))
+            gestor.foto_memoria("despues")
+            
+            diferencia = {fila['lugar']: fila['diferencia_bytes']
+                          for fila in gestor.diferencia_memoria("antes", "despues")}
+            self.assertGreater(diferencia['gestor'], 0)
+            self.assertGreater(diferencia['indices'], 0)
+            self.assertGreater(diferencia['clientes'], 0)
+            lineas = gestor.diferencia_memoria("antes", agrupar='linea', limite=3)
+            self.assertEqual(len(lineas), 3)
+            self.assertIn('diferencia_bloques', lineas[0])
+            self.assertIn('tracemalloc', gestor.reporte_memoria())
+            with self.assertRaises(ValidacionError):
+                gestor.diferencia_memoria("no existe")
+        finally:
+            gestor.desactivar_perfil_memoria()
+        self.assertFalse(PerfilMemoria().activo())
+
+
+class TestCargaConErrores(unittest.TestCase):
+    """Tests para la carga de archivos con datos antiguos o inválidos."""
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clientes.json")
+        self.corporativo = {
+            'tipo_cliente': 'Corporativo', 'nombre': 'Pedro Soto', 'email': 'pedro@empresa.cl',
+            'telefono': '+56911111111', 'direccion': 'Avenida Principal 100',
+            'nombre_empresa': 'Empresa Antigua', 'rut_empresa': '76.123.456-7',
+            'contacto_principal': 'Pedro Soto', 'limite_credito': 500000.0, 'credito_utilizado': 1000.0,
+        }
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def _gestor(self):
+        gestor = GestorClientes(usar_logs=False)
+        gestor.persistencia = PersistenciaJSON(self.ruta)
+        return gestor
+    
+    def test_rut_antiguo_se_carga_y_se_vuelve_a_guardar(self):
+        """Test: Un RUT con dígito verificador antiguo se carga, se busca y se guarda de nuevo."""
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            json.dump([self.corporativo], archivo)
+        
+        gestor = self._gestor()
+        self.assertEqual(len(gestor), 1)
+        self.assertEqual(len(gestor.buscar_por_rut("76.123.456-7")), 1)
+        self.assertEqual(gestor.resumen_empresa("76123456-7")['credito_utilizado'], 1000.0)
+        with self.assertRaises(ValidacionError):
+            gestor.buscar_por_rut("76.543.210-9")   # No registrado y con dígito incorrecto
+        gestor.guardar_todos()
+        
+        otro = self._gestor()
+        self.assertEqual(len(otro), 1)
+        self.assertEqual(otro.buscar_por_email("pedro@empresa.cl").get_rut_empresa(), "76123456-7")
+    
+    def test_no_se_guarda_sobre_una_carga_con_errores(self):
+        """Test: Si la carga omitió clientes, guardar falla y el archivo queda igual."""
+        malo = dict(self.corporativo, email='sin-arroba', rut_empresa='12.345.678-9')
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            json.dump([self.corporativo, malo], archivo)
+        with open(self.ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        
+        gestor = self._gestor()
+        self.assertEqual(len(gestor), 1)
+        self.assertEqual(gestor.persistencia.errores_carga, 1)
+        with self.assertRaises(PersistenciaError):
+            gestor.guardar_todos()
+        with open(self.ruta, 'rb') as archivo:
+            self.assertEqual(archivo.read(), contenido)
+        
+        gestor.persistencia.descartar_errores_carga()
+        gestor.guardar_todos()
+        self.assertEqual(len(self._gestor()), 1)
+
+
+class TestImportacionCSV(unittest.TestCase):
+    """Tests para la importación y exportación CSV del gestor."""
+    
+    def setUp(self):
+        """Preparar un gestor vacío y un directorio temporal."""
+        self.gestor = GestorClientes(usar_persistencia=False, usar_logs=False)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clientes.csv")
+    
+    def tearDown(self):
+        """Eliminar el directorio temporal."""
+        self.directorio.cleanup()
+    
+    def _escribir_csv(self, lineas):
+        with open(self.ruta, 'w', encoding='utf-8', newline='') as archivo:
+            archivo.write(",".join(COLUMNAS_CSV) + "\n")
+            for linea in lineas:
+                archivo.write(linea + "\n")
+    
+    def test_importar_por_tipo(self):
+        """Test: Cada fila se crea con la clase de su columna tipo_cliente."""
+        self._escribir_csv([
+            "Regular,Ana González,ana@email.com,911223344,Calle Principal 123,2025-03-01,,,,,,,,",
+            "Premium,Carlos Díaz,carlos@email.com,922334455,Av. Brasil 456 Stgo,,Oro,20.0,150,,,,,",
+            "Corporativo,Luis Rojas,luis@empresa.com,933445566,Av. Kennedy 5000,,,,,Empresa XYZ,76.543.210-3,Luis Rojas,500000.0,1000.0",
+        ])
+        resultado = self.gestor.importar_csv(self.ruta)
+        self.assertEqual(resultado['agregados'], 3)
+        self.assertEqual(resultado['errores'], [])
+        
+        premium = self.gestor.buscar_por_email("carlos@email.com")
+        self.assertIsInstance(premium, ClientePremium)
+        self.assertEqual(premium.get_puntos_acumulados(), 150)
+        corporativo = self.gestor.buscar_por_email("luis@empresa.com")
+        self.assertIsInstance(corporativo, ClienteCorporativo)
+        self.assertEqual(corporativo.get_credito_disponible(), 499000.0)
+        regular = self.gestor.buscar_por_email("ana@email.com")
+        self.assertEqual(str(regular.get_fecha_registro()), "2025-03-01")
+    
+    def test_importar_errores_por_fila(self):
+        """Test: Las filas inválidas se informan sin detener la importación."""
+        self._escribir_csv([
+            "Regular,Ana González,ana@email.com,911223344,Calle Principal 123,,,,,,,,,",
+            "Regular,Ana Duplicada,ana@email.com,911223344,Calle Principal 123,,,,,,,,,",
+            "Premium,Juan123,juan@email.com,922334455,Av. Brasil 456 Stgo,,Oro,20.0,,,,,,",
+            "Vip,Pedro Soto,pedro@email.com,922334455,Av. Brasil 456 Stgo,,,,,,,,,",
+            "Regular,Marta Lagos,marta@email.com,911223344,Calle Principal 999,,,,,,,,,",
+        ])
+        resultado = self.gestor.importar_csv(self.ruta, tamano_lote=2)
+        self.assertEqual(resultado['agregados'], 2)
+        filas = sorted(error['fila'] for error in resultado['errores'])
+        self.assertEqual(filas, [3, 4, 5])
+        self.assertEqual(len(self.gestor), 2)
+    
+    def test_corporativo_sin_empresa_es_error(self):
+        """Test: Una fila corporativa sin RUT o sin empresa es un error de esa fila."""
+        self._escribir_csv([
+            "Corporativo,Luis Rojas,luis@empresa.com,933445566,Av. Kennedy 5000,,,,,Empresa XYZ,,Luis Rojas,500000.0,",
+            "Corporativo,Eva Mella,eva@empresa.com,933445567,Av. Kennedy 5001,,,,,,76.543.210-3,Eva Mella,500000.0,",
+            "Corporativo,Rosa Vera,rosa@empresa.com,933445568,Av. Kennedy 5002,,,,,Empresa XYZ,76.543.210-3,,500000.0,-5",
+            "Corporativo,Iván Paz,ivan@empresa.com,933445569,Av. Kennedy 5003,,,,,Empresa XYZ,76.543.210-3,,500000.0,",
+        ])
+        resultado = self.gestor.importar_csv(self.ruta)
+        self.assertEqual(resultado['agregados'], 1)
+        self.assertEqual(sorted(error['fila'] for error in resultado['errores']), [2, 3, 4])
+        self.assertEqual(self.gestor.resumen_empresa("76.543.210-3")['contactos'], 1)
+    
+    def test_exportar_e_importar(self):
+        """Test: Un CSV exportado se puede volver a importar."""
+        self.gestor.agregar_cliente(ClienteRegular("Test Uno", "test1@email.com", "911111111",
+                                                   "Dirección Test Uno Santiago"))
+        self.gestor.agregar_cliente(ClientePremium("Test Dos", "test2@email.com", "922222222",
+                                                   "Dirección Test Dos Santiago", "Plata", 15.0))
+        self.assertEqual(self.gestor.exportar_csv(self.ruta), 2)
+        
+        otro = GestorClientes(usar_persistencia=False, usar_logs=False)
+        resultado = otro.importar_csv(self.ruta)
+        self.assertEqual(resultado['agregados'], 2)
+        self.assertEqual(otro.buscar_por_email("test2@email.com").get_nivel_membresia(), "Plata")
+    
+    def test_agregar_multiples_duplicados(self):
+        """Test: La carga masiva informa los duplicados con su posición."""
+        cliente = ClienteRegular("Test Uno", "test1@email.com", "911111111", "Dirección Test Uno Santiago")
+        resultado = self.gestor.agregar_multiples([cliente, cliente])
+        self.assertEqual(resultado['agregados'], 1)
+        self.assertEqual(resultado['errores'][0]['fila'], 2)
 
 
 def ejecutar_tests():